@@ -3,16 +3,29 @@ The huginn.aircraft module contains classes that wrap the jsbsim object and
 and provide access to the simulated components of the aircraft.
 """
 import logging
+from collections import namedtuple
+from contextlib import contextmanager
 
 from huginn.unit_conversions import convert_jsbsim_force
 from huginn.sensors import Sensors
 from huginn.instruments import Instruments
-from huginn.fdm import TRIM_MODE_FULL
+from huginn.fdm import TRIM_MODE_FULL, create_state
+from huginn.trim import get_trim_key
 
 
 logger = logging.getLogger(__name__)
 
 
+EngineState = namedtuple("EngineState", ["thrust", "throttle"])
+
+ControlsState = namedtuple(
+    "ControlsState",
+    ["aileron", "elevator", "rudder", "throttle"]
+)
+
+AircraftState = namedtuple("AircraftState", ["engine", "controls"])
+
+
 class Controls(object):
     """The Controls class holds the aircraft control surfaces values"""
     def __init__(self, fdmexec):
@@ -122,18 +135,52 @@ class Aircraft(object):
             logger.debug("Starting engine %d", i)
             self.fdmexec.GetPropulsion().GetEngine(i).SetRunning(1)
 
-    def trim(self, mode=TRIM_MODE_FULL):
-        """Trim the aircraft"""
+    def trim(self, mode=TRIM_MODE_FULL, trim_cache=None):
+        """Trim the aircraft
+
+        Arguments:
+        mode: the trim mode
+        trim_cache: an optional TrimCache object. The stored trim solution
+            will be used if there is one for the current initial condition
+            and new trim solutions will be added to it
+        """
         logger.debug("Executing trim with mode = %d", mode)
 
+        if trim_cache is not None:
+            # the key is calculated before the trim because the trim might
+            # modify the initial condition values
+            trim_key = get_trim_key(self.fdmexec, mode)
+
+            if trim_cache.load_solution(self.fdmexec, trim_key):
+                return True
+
         try:
             self.fdmexec.DoTrim(mode)
         except:
             logger.warning("Failed to trim the aircraft in mode %d", mode)
             return False
 
+        if trim_cache is not None:
+            trim_cache.save_solution(self.fdmexec, trim_key)
+
         return True
 
+    def get_state(self):
+        """Returns an AircraftState object with the current values of the
+        aircraft's engine and controls"""
+        return AircraftState(
+            engine=create_state(self.engine, EngineState),
+            controls=create_state(self.controls, ControlsState)
+        )
+
+    @contextmanager
+    def snapshot(self):
+        """The aircraft values only change when the simulator executes a
+        step, so the values that are read between two steps always belong
+        to the same step. This context manager exists so that the aircraft
+        has the same interface as the aircraft of the simulator process"""
+        yield self
+
     def print_aircraft_state(self):
         """Print the aircraft state"""
         print("Aircraft state")
@@ -0,0 +1,195 @@
+"""
+The huginn.batch module contains classes and functions that are used to run
+the simulator without a reactor as fast as possible
+"""
+
+
+import csv
+import logging
+from importlib import import_module
+from runpy import run_path
+
+
+logger = logging.getLogger(__name__)
+
+
+TRAJECTORY_VARIABLES = ["time", "latitude", "longitude", "altitude",
+                        "airspeed", "climb_rate", "heading", "roll", "pitch",
+                        "x_acceleration", "y_acceleration", "z_acceleration",
+                        "roll_rate", "pitch_rate", "yaw_rate", "thrust",
+                        "aileron", "elevator", "rudder", "throttle"]
+
+CONTROL_SCHEDULE_VARIABLES = ["time", "aileron", "elevator", "rudder",
+                              "throttle"]
+
+SCRIPT_CONTROLLER_FUNCTION = "update"
+
+
+def get_trajectory_point(state):
+    """Create a dictionary with the trajectory variables from a simulator
+    state snapshot
+
+    Arguments:
+    state: a SimulatorState object
+    """
+    fdm = state.fdm
+    aircraft = state.aircraft
+
+    return {
+        "time": fdm.time,
+        "latitude": fdm.position.latitude,
+        "longitude": fdm.position.longitude,
+        "altitude": fdm.position.altitude,
+        "airspeed": fdm.velocities.true_airspeed,
+        "climb_rate": fdm.velocities.climb_rate,
+        "heading": fdm.position.heading,
+        "roll": fdm.orientation.phi,
+        "pitch": fdm.orientation.theta,
+        "x_acceleration": fdm.accelerations.x,
+        "y_acceleration": fdm.accelerations.y,
+        "z_acceleration": fdm.accelerations.z,
+        "roll_rate": fdm.velocities.p,
+        "pitch_rate": fdm.velocities.q,
+        "yaw_rate": fdm.velocities.r,
+        "thrust": aircraft.engine.thrust,
+        "aileron": aircraft.controls.aileron,
+        "elevator": aircraft.controls.elevator,
+        "rudder": aircraft.controls.rudder,
+        "throttle": aircraft.controls.throttle
+    }
+
+
+class ControlSchedule(object):
+    """The ControlSchedule is a controller that applies a time ordered list
+    of control inputs to the aircraft"""
+
+    def __init__(self, entries):
+        """Constructor for the ControlSchedule object
+
+        Arguments:
+        entries: a list of (time, aileron, elevator, rudder, throttle) tuples
+        """
+        self.entries = sorted(entries, key=lambda entry: entry[0])
+        self._next_entry = 0
+
+    def __call__(self, simulator):
+        simulation_time = simulator.simulation_time
+
+        entry = None
+        while (self._next_entry < len(self.entries) and
+               self.entries[self._next_entry][0] <= simulation_time):
+            entry = self.entries[self._next_entry]
+            self._next_entry += 1
+
+        if entry is not None:
+            simulator.set_aircraft_controls(*entry[1:])
+
+
+def load_control_schedule(schedule_file):
+    """Load a control schedule from a csv file. The file must have a header
+    with the columns time, aileron, elevator, rudder and throttle
+
+    Arguments:
+    schedule_file: a file object
+    """
+    reader = csv.DictReader(schedule_file)
+
+    entries = [
+        tuple(float(row[variable]) for variable in CONTROL_SCHEDULE_VARIABLES)
+        for row in reader
+    ]
+
+    return ControlSchedule(entries)
+
+
+def load_controller(controller):
+    """Load a controller. The controller is a callable that accepts the
+    simulator object as its argument
+
+    Arguments:
+    controller: either the path to a python script that defines an update
+        function or a module and callable name in the form module:callable
+    """
+    if controller.endswith(".py"):
+        script_globals = run_path(controller)
+
+        if SCRIPT_CONTROLLER_FUNCTION not in script_globals:
+            raise ValueError("The controller script %s doesn't define an %s "
+                             "function" % (controller,
+                                           SCRIPT_CONTROLLER_FUNCTION))
+
+        return script_globals[SCRIPT_CONTROLLER_FUNCTION]
+
+    module_name, _, callable_name = controller.partition(":")
+
+    if not callable_name:
+        raise ValueError("Invalid controller %s" % controller)
+
+    module = import_module(module_name)
+
+    return getattr(module, callable_name)
+
+
+class BatchRunner(object):
+    """The BatchRunner runs the simulator as fast as possible and records
+    the aircraft trajectory"""
+
+    def __init__(self, simulator, controller=None, trajectory_writer=None,
+                 record_interval=0.0):
+        """Constructor for the BatchRunner object
+
+        Arguments:
+        simulator: the Simulator object
+        controller: an optional callable that will be called with the
+            simulator as its argument after every simulation step
+        trajectory_writer: an optional CSVFDMDataWriter object that will be
+            used to save the trajectory
+        record_interval: the minimum simulation time in seconds between two
+            recorded trajectory points. If it is 0.0 then every step will be
+            recorded
+        """
+        self.simulator = simulator
+        self.controller = controller
+        self.trajectory_writer = trajectory_writer
+        self.record_interval = record_interval
+        self._last_record_time = None
+
+    def _record(self, simulator):
+        simulation_time = simulator.simulation_time
+
+        if (self._last_record_time is not None and
+                simulation_time - self._last_record_time <
+                self.record_interval):
+            return
+
+        self._last_record_time = simulation_time
+
+        self.trajectory_writer.write_fdm_data(
+            get_trajectory_point(simulator.state)
+        )
+
+    def _step_callback(self, simulator):
+        if self.trajectory_writer:
+            self._record(simulator)
+
+        if self.controller:
+            self.controller(simulator)
+
+    def run(self, duration):
+        """Run the simulation
+
+        Arguments:
+        duration: the simulation time in seconds
+
+        Returns True if the simulation completed successfully
+        """
+        if self.simulator.is_paused():
+            self.simulator.resume()
+
+        if self.trajectory_writer:
+            self._record(self.simulator)
+
+        if self.controller:
+            self.controller(self.simulator)
+
+        return self.simulator.run_for(duration, self._step_callback)
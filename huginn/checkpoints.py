@@ -0,0 +1,265 @@
+"""
+The huginn.checkpoints module contains the functions that are used to save
+and restore the state of a simulation.
+
+A checkpoint doesn't contain the complete JSBSim property tree. It stores
+the aircraft position, attitude and velocities, the flight control commands
+and surface positions, the throttle, mixture and running state of every
+engine, the contents of every tank, the wind and the state of the sensors,
+the instruments and the random number generators. The internal state of the
+engines and of the flight control system, for example the engine rpm, isn't
+stored. JSBSim calculates it again when the checkpoint is restored, so the
+engines need a few simulation steps to settle after a restore.
+"""
+
+import logging
+import random
+from collections import namedtuple
+from numbers import Number
+
+
+logger = logging.getLogger(__name__)
+
+
+# the initial condition properties and the properties that hold the values
+# that they will be set to when the aircraft state is loaded. The attitude
+# must be set before the body velocities because JSBSim keeps the NED
+# velocity constant when the initial attitude changes.
+INITIAL_CONDITION_PROPERTIES = [
+    ("ic/lat-gc-deg", "position/lat-gc-deg"),
+    ("ic/long-gc-deg", "position/long-gc-deg"),
+    ("ic/h-sl-ft", "position/h-sl-ft"),
+    ("ic/phi-rad", "attitude/phi-rad"),
+    ("ic/theta-rad", "attitude/theta-rad"),
+    ("ic/psi-true-rad", "attitude/psi-rad"),
+    ("ic/u-fps", "velocities/u-fps"),
+    ("ic/v-fps", "velocities/v-fps"),
+    ("ic/w-fps", "velocities/w-fps"),
+    ("ic/p-rad_sec", "velocities/p-rad_sec"),
+    ("ic/q-rad_sec", "velocities/q-rad_sec"),
+    ("ic/r-rad_sec", "velocities/r-rad_sec")
+]
+
+# the writable properties whose values are stored in a checkpoint
+CHECKPOINT_PROPERTIES = [
+    "fcs/aileron-cmd-norm",
+    "fcs/elevator-cmd-norm",
+    "fcs/rudder-cmd-norm",
+    "fcs/pitch-trim-cmd-norm",
+    "fcs/roll-trim-cmd-norm",
+    "fcs/yaw-trim-cmd-norm",
+    "fcs/left-aileron-pos-rad",
+    "fcs/right-aileron-pos-rad",
+    "fcs/elevator-pos-rad",
+    "fcs/rudder-pos-rad",
+    "atmosphere/wind-north-fps",
+    "atmosphere/wind-east-fps",
+    "atmosphere/wind-down-fps"
+]
+
+# the properties of every engine that are stored in a checkpoint
+ENGINE_CHECKPOINT_PROPERTIES = [
+    "fcs/throttle-cmd-norm[%d]",
+    "fcs/mixture-cmd-norm[%d]",
+    "fcs/throttle-pos-norm[%d]",
+    "fcs/mixture-pos-norm[%d]",
+    "propulsion/engine[%d]/set-running"
+]
+
+# the properties of every tank that are stored in a checkpoint
+TANK_CHECKPOINT_PROPERTIES = [
+    "propulsion/tank[%d]/contents-lbs"
+]
+
+
+def get_checkpoint_properties(fdmexec):
+    """Returns the names of the properties that are stored in a checkpoint
+    for the loaded aircraft model
+
+    Arguments:
+    fdmexec: the JSBSim FGFDMExec object
+    """
+    propulsion = fdmexec.GetPropulsion()
+
+    properties = list(CHECKPOINT_PROPERTIES)
+
+    for i in range(propulsion.GetNumEngines()):
+        properties.extend([name % i for name in ENGINE_CHECKPOINT_PROPERTIES])
+
+    for i in range(propulsion.GetNumTanks()):
+        properties.extend([name % i for name in TANK_CHECKPOINT_PROPERTIES])
+
+    return properties
+
+
+Checkpoint = namedtuple(
+    "Checkpoint",
+    ["simulation_time", "initial_condition", "properties", "sensors",
+     "instruments", "random_state", "crashed", "noise"]
+)
+
+
+def get_object_state(obj):
+    """Returns a dictionary with the numeric attributes of the given
+    object
+
+    Arguments:
+    obj: the sensor or instrument object
+    """
+    return dict([(name, value) for name, value in vars(obj).items()
+                 if isinstance(value, Number)])
+
+
+def set_object_state(obj, state):
+    """Update the attributes of an object using the values that were
+    returned by get_object_state
+
+    Arguments:
+    obj: the sensor or instrument object
+    state: a dictionary with the attribute values
+    """
+    for name, value in state.items():
+        setattr(obj, name, value)
+
+
+def _get_components_state(components):
+    """Returns the state of all the sensors or instruments in the given
+    container object"""
+    return dict([(name, get_object_state(component))
+                 for name, component in vars(components).items()
+                 if name != "fdmexec"])
+
+
+def _set_components_state(components, state):
+    """Restore the state of all the sensors or instruments in the given
+    container object"""
+    for name, component_state in state.items():
+        set_object_state(getattr(components, name), component_state)
+
+
+def _get_noise_state(sensors):
+    """Returns the state of the noise generator of every sensor"""
+    return dict([(name, sensor.noise.get_state())
+                 for name, sensor in vars(sensors).items()
+                 if name != "fdmexec"])
+
+
+def _set_noise_state(sensors, state):
+    """Restore the state of the noise generator of every sensor"""
+    for name, noise_state in state.items():
+        getattr(sensors, name).noise.set_state(noise_state)
+
+
+def get_aircraft_state(fdmexec):
+    """Returns the values of the initial condition properties that would
+    recreate the current aircraft state and the values of the checkpoint
+    properties
+
+    Arguments:
+    fdmexec: the JSBSim FGFDMExec object
+    """
+    initial_condition = dict(
+        [(ic_property, fdmexec.GetPropertyValue(state_property))
+         for ic_property, state_property in INITIAL_CONDITION_PROPERTIES]
+    )
+
+    properties = dict([(name, fdmexec.GetPropertyValue(name))
+                       for name in get_checkpoint_properties(fdmexec)])
+
+    return initial_condition, properties
+
+
+def _set_initial_condition(fdmexec, initial_condition):
+    """Set the initial condition properties in the required order"""
+    for ic_property, _ in INITIAL_CONDITION_PROPERTIES:
+        if ic_property in initial_condition:
+            fdmexec.SetPropertyValue(ic_property,
+                                     initial_condition[ic_property])
+
+
+def set_aircraft_state(fdmexec, initial_condition, properties):
+    """Load an aircraft state that was returned by get_aircraft_state.
+
+    The state is loaded by running it as the initial condition. The
+    original initial condition is restored afterwards so that the
+    simulator will still be reset to it.
+
+    Arguments:
+    fdmexec: the JSBSim FGFDMExec object
+    initial_condition: a dictionary with the initial condition values
+    properties: a dictionary with the property values
+    """
+    original_initial_condition = dict(
+        [(ic_property, fdmexec.GetPropertyValue(ic_property))
+         for ic_property, _ in INITIAL_CONDITION_PROPERTIES]
+    )
+
+    _set_initial_condition(fdmexec, initial_condition)
+
+    for name, value in properties.items():
+        fdmexec.SetPropertyValue(name, value)
+
+    result = fdmexec.RunIC()
+
+    _set_initial_condition(fdmexec, original_initial_condition)
+
+    if not result:
+        logger.error("Failed to load the aircraft state")
+        return False
+
+    return True
+
+
+def create_checkpoint(simulator):
+    """Capture the state of the simulation. The checkpoint contains the
+    aircraft state, the controls, the engine and tank properties of
+    get_checkpoint_properties, the wind and the sensor, instrument and
+    random number generator state. The engine rpm and the other internal
+    JSBSim state aren't stored
+
+    Arguments:
+    simulator: the Simulator object
+    """
+    aircraft = simulator.aircraft
+
+    initial_condition, properties = get_aircraft_state(simulator.fdmexec)
+
+    return Checkpoint(
+        simulation_time=simulator.simulation_time,
+        initial_condition=initial_condition,
+        properties=properties,
+        sensors=_get_components_state(aircraft.sensors),
+        instruments=_get_components_state(aircraft.instruments),
+        random_state=random.getstate(),
+        crashed=simulator.crashed,
+        noise=_get_noise_state(aircraft.sensors)
+    )
+
+
+def restore_checkpoint(simulator, checkpoint):
+    """Restore the simulation to the state that was captured in a
+    checkpoint.
+
+    The aircraft state is loaded as the fdm initial condition so the
+    aircraft doesn't have to be trimmed again.
+
+    Arguments:
+    simulator: the Simulator object
+    checkpoint: the Checkpoint object
+    """
+    fdmexec = simulator.fdmexec
+    aircraft = simulator.aircraft
+
+    if not set_aircraft_state(fdmexec, checkpoint.initial_condition,
+                              checkpoint.properties):
+        return False
+
+    fdmexec.Setsim_time(checkpoint.simulation_time)
+
+    _set_components_state(aircraft.sensors, checkpoint.sensors)
+    _set_components_state(aircraft.instruments, checkpoint.instruments)
+
+    random.setstate(checkpoint.random_state)
+    _set_noise_state(aircraft.sensors, checkpoint.noise)
+
+    return True
@@ -122,6 +122,70 @@ def update_rate(value):
     return value
 
 
+def duration(value):
+    """Simulation duration cli argument type
+
+    Arguments:
+    value: the duration in seconds
+
+    Return the duration or raises ArgumentTypeError if the duration is not
+    valid
+    """
+    try:
+        value = float(value)
+    except ValueError:
+        raise ArgumentTypeError("{} is not a number".format(value))
+
+    if value < 0.0:
+        raise ArgumentTypeError("Invalid duration")
+
+    return value
+
+
+def steps_per_tick(value):
+    """Maximum simulation steps per tick cli argument type
+
+    Arguments:
+    value: the number of steps
+
+    Return the number of steps or raises ArgumentTypeError if the number of
+    steps is not valid
+    """
+    try:
+        value = int(value)
+    except ValueError:
+        raise ArgumentTypeError("{} is not an integer".format(value))
+
+    if value < 1:
+        raise ArgumentTypeError("Invalid number of steps per tick")
+
+    return value
+
+
+def time_scale(value):
+    """Time scale cli argument type
+
+    Arguments:
+    value: the ratio of the simulation time to the wall clock time or "max"
+        to run the simulation as fast as possible
+
+    Return the time scale, None if the simulation must run as fast as
+    possible, or raises ArgumentTypeError if the time scale is not valid
+    """
+    if str(value).strip().lower() == "max":
+        return None
+
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ArgumentTypeError("{} is not a number".format(value))
+
+    if value <= 0.0:
+        raise ArgumentTypeError("Invalid time scale")
+
+    return value
+
+
 def port_number(value):
     """Check if the given value is a valid port number"""
     try:
@@ -136,15 +200,48 @@ def port_number(value):
     return parsed_port_number
 
 
+def ip_address(value):
+    """Check if the given value is a valid IPv4 address"""
+    match = re.match(r"^(\d+)\.(\d+)\.(\d+)\.(\d+)$", value.strip())
+
+    if not match or any([int(octet) > 255 for octet in match.groups()]):
+        raise ArgumentTypeError("%s is not a valid ip address" % value)
+
+    return match.group(0)
+
+
+def multicast_ttl(value):
+    """Multicast time to live cli argument type
+
+    Arguments:
+    value: the number of network hops that the multicast datagrams can
+        travel
+
+    Return the time to live or raises ArgumentTypeError if the time to live
+    is not valid
+    """
+    try:
+        value = int(value)
+    except ValueError:
+        raise ArgumentTypeError("{} is not an integer".format(value))
+
+    if value < 0 or value > 255:
+        raise ArgumentTypeError("The multicast time to live must be in the "
+                                "range 0-255")
+
+    return value
+
+
 def fdm_data_endpoint(value):
-    """Check if the given value if a valid fdm data endpoint address"""
-    match = re.match(r"^(\d+\.\d+.\d+.\d+),(\d+),(\d+\.\d+)$", value.strip())
+    """Check if the given value if a valid fdm data endpoint address. The
+    address can also be a multicast group address"""
+    match = re.match(r"^([^,]+),(\d+),(\d+\.\d+)$", value.strip())
 
     if not match:
         raise ArgumentTypeError("The fdm data endpoint must be "
                                 "in the form IP,PORT,DT")
 
-    ip = match.group(1)
+    ip = ip_address(match.group(1))
     port = port_number(match.group(2))
     dt = float(match.group(3))
 
@@ -0,0 +1,152 @@
+"""
+The huginn_batch script runs the simulator without the reactor and the
+simulator servers as fast as possible and saves the aircraft trajectory
+"""
+
+
+import sys
+import time
+from argparse import ArgumentParser
+
+from huginn import configuration
+from huginn.simulator import SimulationBuilder
+from huginn.fdm import TRIM_MODES
+from huginn.batch import (BatchRunner, TRAJECTORY_VARIABLES,
+                          load_control_schedule, load_controller)
+from huginn.io import CSVFDMDataWriter
+from huginn.cli import argtypes
+from huginn.cli.logs import initialize_logger
+
+
+def get_arguments():
+    parser = ArgumentParser(description="Run a Huginn flight simulation "
+                                        "faster than real time")
+
+    parser.add_argument("--duration", action="store", type=argtypes.duration,
+                        default=60.0,
+                        help="The simulation time in seconds")
+
+    parser.add_argument("--controller", action="store",
+                        help="A python script that defines an update "
+                             "function or a controller in the form "
+                             "module:callable")
+
+    parser.add_argument("--controls", action="store",
+                        help="A csv file with the control inputs schedule")
+
+    parser.add_argument("--record-dt", action="store",
+                        type=argtypes.duration, default=0.0,
+                        help="The time between the recorded trajectory "
+                             "points")
+
+    parser.add_argument("--seed", action="store", type=int,
+                        help="The seed of the sensor noise. Runs that use "
+                             "the same seed have the same sensor noise")
+
+    parser.add_argument("--debug", action="store_true",
+                        help="Enable debug logs")
+
+    parser.add_argument("--dt", action="store", type=argtypes.update_rate,
+                        default=configuration.DT,
+                        help="the simulation timestep")
+
+    parser.add_argument("--log", action="store",
+                        help="The output log file")
+
+    parser.add_argument("--trim", action="store", choices=TRIM_MODES.keys(),
+                        default="full", help="trim the aircraft")
+
+    parser.add_argument("--latitude", action="store", type=argtypes.latitude,
+                        default=configuration.LATITUDE,
+                        help="The starting latitude")
+
+    parser.add_argument("--longitude", action="store", type=argtypes.longitude,
+                        default=configuration.LONGITUDE,
+                        help="The starting longitude")
+
+    parser.add_argument("--altitude", action="store", type=argtypes.altitude,
+                        default=configuration.ALTITUDE,
+                        help="The starting altitude")
+
+    parser.add_argument("--airspeed", action="store", type=argtypes.airspeed,
+                        default=configuration.AIRSPEED,
+                        help="The starting airspeed")
+
+    parser.add_argument("--heading", action="store", type=argtypes.heading,
+                        default=configuration.HEADING,
+                        help="The starting heading")
+
+    parser.add_argument("output", help="the trajectory output file")
+
+    args = parser.parse_args()
+
+    if args.controller and args.controls:
+        parser.error("the --controller and --controls options can't be used "
+                     "together")
+
+    return args
+
+
+def get_controller(args):
+    if args.controller:
+        return load_controller(args.controller)
+
+    if args.controls:
+        with open(args.controls, "r") as schedule_file:
+            return load_control_schedule(schedule_file)
+
+    return None
+
+
+def main():
+    args = get_arguments()
+
+    logger = initialize_logger(args.log, args.debug)
+
+    logger.info("Starting the Huginn batch simulation")
+
+    try:
+        controller = get_controller(args)
+    except (IOError, ImportError, AttributeError, ValueError):
+        logger.exception("Failed to load the controller")
+        sys.exit(1)
+
+    simulator_builder = SimulationBuilder(configuration.get_data_path())
+    simulator_builder.trim_mode = TRIM_MODES[args.trim]
+    simulator_builder.dt = args.dt
+
+    simulator_builder.latitude = args.latitude
+    simulator_builder.longitude = args.longitude
+    simulator_builder.altitude = args.altitude
+    simulator_builder.airspeed = args.airspeed
+    simulator_builder.heading = args.heading
+    simulator_builder.sensor_seed = args.seed
+
+    logger.debug("Creating the simulator")
+    simulator = simulator_builder.create_simulator()
+
+    if not simulator:
+        logger.error("Failed to create the simulator")
+        sys.exit(1)
+
+    with open(args.output, "w") as output_file:
+        trajectory_writer = CSVFDMDataWriter(TRAJECTORY_VARIABLES,
+                                             output_file)
+        trajectory_writer.write_header()
+
+        runner = BatchRunner(simulator, controller, trajectory_writer,
+                             args.record_dt)
+
+        start_time = time.time()
+        result = runner.run(args.duration)
+        elapsed_time = time.time() - start_time
+
+    if not result:
+        logger.error("The simulator has failed to run")
+        sys.exit(1)
+
+    if simulator.crashed:
+        logger.warning("The aircraft has crashed")
+
+    logger.info("Simulated %f seconds in %f seconds",
+                simulator.simulation_time, elapsed_time)
@@ -6,6 +6,7 @@ The huginn_control scripts is used to control the simulator
 from argparse import ArgumentParser
 
 from huginn import configuration
+from huginn.cli import argtypes
 from huginn.control import SimulatorControlClient
 
 
@@ -15,7 +16,8 @@ def get_arguments():
     parser.add_argument("command",
                         action="store",
                         choices=["pause", "resume", "reset", "step",
-                                 "run_for"],
+                                 "run_for", "run_steps", "save_checkpoint",
+                                 "restore_checkpoint", "time_scale"],
                         help="the simulator control command")
 
     parser.add_argument("--time_to_run",
@@ -23,6 +25,25 @@ def get_arguments():
                         default=0.1,
                         help="The time in seconds to run the simulator")
 
+    parser.add_argument("--steps",
+                        action="store",
+                        type=int,
+                        default=1,
+                        help="The number of simulation steps to run")
+
+    parser.add_argument("--time_scale",
+                        action="store",
+                        type=argtypes.time_scale,
+                        default=1.0,
+                        help="The ratio of the simulation time to the wall "
+                             "clock time or max to run the simulation as "
+                             "fast as possible")
+
+    parser.add_argument("--checkpoint",
+                        action="store",
+                        default=configuration.DEFAULT_CHECKPOINT,
+                        help="the checkpoint name")
+
     parser.add_argument("--host",
                         action="store",
                         default="127.0.0.1",
@@ -52,6 +73,14 @@ def main():
         result = simulator_control_client.step()
     elif args.command == "run_for":
         result = simulator_control_client.run_for(args.time_to_run)
+    elif args.command == "run_steps":
+        result = simulator_control_client.run_steps(args.steps)
+    elif args.command == "save_checkpoint":
+        result = simulator_control_client.save_checkpoint(args.checkpoint)
+    elif args.command == "restore_checkpoint":
+        result = simulator_control_client.restore_checkpoint(args.checkpoint)
+    elif args.command == "time_scale":
+        result = simulator_control_client.set_time_scale(args.time_scale)
     else:
         print("Invalid command %s" % args.command)
         exit(-1)
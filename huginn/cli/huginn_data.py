@@ -7,7 +7,7 @@ from argparse import ArgumentParser
 
 from requests import ConnectionError
 
-from huginn.http import WebClient
+from huginn.clients import WebClient
 from huginn import configuration
 
 
@@ -0,0 +1,77 @@
+"""
+The huginn_montecarlo script executes a Monte Carlo sweep of simulations in
+parallel
+"""
+
+
+import json
+import sys
+from argparse import ArgumentParser
+
+from huginn import configuration
+from huginn.montecarlo import MonteCarloError, MonteCarloRunner, create_runs
+from huginn.cli import argtypes
+from huginn.cli.logs import initialize_logger
+
+
+def get_arguments():
+    parser = ArgumentParser(description="Run a Monte Carlo sweep of Huginn "
+                                        "flight simulations")
+
+    parser.add_argument("--duration", action="store", type=argtypes.duration,
+                        default=60.0,
+                        help="The simulation time of every run in seconds")
+
+    parser.add_argument("--processes", action="store", type=int,
+                        help="The number of worker processes")
+
+    parser.add_argument("--controller", action="store",
+                        help="A python script that defines an update "
+                             "function or a controller in the form "
+                             "module:callable")
+
+    parser.add_argument("--dt", action="store", type=argtypes.update_rate,
+                        default=configuration.DT,
+                        help="the simulation timestep")
+
+    parser.add_argument("--seed", action="store", type=int,
+                        help="The seed of the sensor noise. Runs that use "
+                             "the same seed have the same sensor noise")
+
+    parser.add_argument("--debug", action="store_true",
+                        help="Enable debug logs")
+
+    parser.add_argument("--log", action="store",
+                        help="The output log file")
+
+    parser.add_argument("sweep", help="the json file with the sweep "
+                                      "definition")
+
+    parser.add_argument("output", help="the result file. If the file exists "
+                                       "the sweep will be resumed")
+
+    return parser.parse_args()
+
+
+def main():
+    args = get_arguments()
+
+    logger = initialize_logger(args.log, args.debug)
+
+    try:
+        with open(args.sweep, "r") as f:
+            runs = create_runs(json.load(f))
+    except (IOError, ValueError, MonteCarloError):
+        logger.exception("Failed to load the sweep definition")
+        sys.exit(1)
+
+    logger.info("Starting a Monte Carlo sweep of %d runs", len(runs))
+
+    runner = MonteCarloRunner(runs, args.output,
+                              configuration.get_data_path(),
+                              args.duration, args.dt, args.controller,
+                              args.processes, args.seed)
+
+    executed_runs = runner.run()
+
+    logger.info("%d runs were executed", executed_runs)
@@ -3,7 +3,6 @@ The huginn_start script starts the simulator and the simulator server
 """
 
 
-import logging
 from argparse import ArgumentParser
 
 from twisted.internet import reactor
@@ -11,31 +10,26 @@ from twisted.internet.task import LoopingCall
 
 from huginn import configuration
 from huginn.simulator import SimulationBuilder
+from huginn.scheduler import RealTimeScheduler
+from huginn.jobs import JobQueue
+from huginn.process import SimulatorProcess, SimulatorProcessError
 
 from huginn.servers import (initialize_controls_server,
+                            initialize_simulator_process_controls_server,
                             initialize_simulator_data_server,
+                            initialize_telemetry_server,
+                            initialize_sensor_server,
                             initialize_websocket_server,
                             initialize_web_server)
 
-from huginn.fdm import (TRIM_MODE_FULL, TRIM_MODE_GROUND,
-                        TRIM_MODE_LONGITUDINAL, TRIM_MODE_PULLUP,
-                        TRIM_MODE_TURN)
+from huginn.fdm import TRIM_MODES
+from huginn.protocols import CONTROLS_MERGE_POLICIES
 
 from huginn.cli import argtypes
+from huginn.cli.logs import initialize_logger
 from huginn.database import create_database
 
 
-TRIM_MODES = {
-    "longitudinal": TRIM_MODE_LONGITUDINAL,
-    "full": TRIM_MODE_FULL,
-    "ground": TRIM_MODE_GROUND,
-    "pullup": TRIM_MODE_PULLUP,
-    # custom trim will not be supported by the simulator
-    # "custom": 4,
-    "turn": TRIM_MODE_TURN
-}
-
-
 def get_arguments():
     parser = ArgumentParser(description="Huginn flight simulator")
 
@@ -47,13 +41,40 @@ def get_arguments():
                         action="append",
                         type=argtypes.fdm_data_endpoint,
                         default=[],
-                        help="The fdm data endpoint")
+                        help="The fdm data endpoint. The address can be a "
+                             "multicast group")
+
+    parser.add_argument("--fdm-multicast-ttl", action="store",
+                        type=argtypes.multicast_ttl,
+                        default=configuration.FDM_MULTICAST_TTL,
+                        help="The time to live of the multicast fdm data")
+
+    parser.add_argument("--fdm-multicast-interface", action="store",
+                        type=argtypes.ip_address,
+                        help="The address of the interface that will send "
+                             "the multicast fdm data")
+
+    parser.add_argument("--telemetry", action="store",
+                        type=argtypes.port_number,
+                        default=configuration.TELEMETRY_PORT,
+                        help="The telemetry subscriptions port")
+
+    parser.add_argument("--sensors", action="store",
+                        type=argtypes.port_number,
+                        default=configuration.SENSORS_PORT,
+                        help="The sensor data port")
 
     parser.add_argument("--controls", action="store",
                         type=argtypes.port_number,
                         default=configuration.CONTROLS_PORT,
                         help="The controls port")
 
+    parser.add_argument("--controls-merge-policy", action="store",
+                        choices=CONTROLS_MERGE_POLICIES,
+                        default=configuration.CONTROLS_MERGE_POLICY,
+                        help="The way that the controls that are received "
+                             "between two simulation steps are merged")
+
     parser.add_argument("--debug", action="store_true",
                         help="Enable debug logs")
 
@@ -61,12 +82,29 @@ def get_arguments():
                         default=configuration.DT,
                         help="the simulation timestep")
 
+    parser.add_argument("--max-steps-per-tick", action="store",
+                        type=argtypes.steps_per_tick,
+                        default=configuration.MAX_STEPS_PER_TICK,
+                        help="The maximum number of simulation steps that "
+                             "will be executed in order to catch up with "
+                             "the wall clock time")
+
+    parser.add_argument("--time-scale", action="store",
+                        type=argtypes.time_scale, default=1.0,
+                        help="The ratio of the simulation time to the wall "
+                             "clock time or max to run the simulation as "
+                             "fast as possible")
+
     parser.add_argument("--log", action="store",
                         help="The output log file")
 
     parser.add_argument("--trim", action="store", choices=TRIM_MODES.keys(),
                         default="full", help="trim the aircraft")
 
+    parser.add_argument("--trim-cache", action="store",
+                        help="The file that the trim solutions will be "
+                             "stored in")
+
     parser.add_argument("--latitude", action="store", type=argtypes.latitude,
                         default=configuration.LATITUDE,
                         help="The starting latitude")
@@ -90,33 +128,10 @@ def get_arguments():
     parser.add_argument("--paused", action="store_true",
                         help="Start the simulator paused")
 
-    return parser.parse_args()
-
-
-def initialize_logger(output_file, debug):
-    logger = logging.getLogger()
-
-    logger_log_level = logging.INFO
-    if debug:
-        logger_log_level = logging.DEBUG
+    parser.add_argument("--process", action="store_true",
+                        help="Run the simulator in a dedicated process")
 
-    logger.setLevel(logger_log_level)
-
-    formater = logging.Formatter("%(asctime)s - %(module)s - "
-                                 "%(levelname)s - %(message)s")
-
-    if output_file:
-        file_logging_handler = logging.FileHandler(output_file)
-        file_logging_handler.setLevel(logger_log_level)
-        file_logging_handler.setFormatter(formater)
-        logger.addHandler(file_logging_handler)
-
-    console_logging_handler = logging.StreamHandler()
-    console_logging_handler.setLevel(logger_log_level)
-    console_logging_handler.setFormatter(formater)
-    logger.addHandler(console_logging_handler)
-
-    return logger
+    return parser.parse_args()
 
 
 def main():
@@ -135,6 +150,7 @@ def main():
 
     simulator_builder = SimulationBuilder(huginn_data_path)
     simulator_builder.trim_mode = TRIM_MODES[args.trim]
+    simulator_builder.trim_cache_file = args.trim_cache
     simulator_builder.dt = args.dt
 
     simulator_builder.latitude = args.latitude
@@ -144,16 +160,49 @@ def main():
     simulator_builder.heading = args.heading
     simulator_builder.start_paused = args.paused
 
-    logger.debug("Creating the simulator")
-    simulator = simulator_builder.create_simulator()
+    if args.process:
+        logger.debug("Starting the simulator process")
+        simulator = SimulatorProcess(simulator_builder,
+                                     args.max_steps_per_tick)
+
+        try:
+            simulator.start()
+        except SimulatorProcessError:
+            logger.exception("Failed to start the simulator process")
+            exit(1)
+
+        controls_protocol = initialize_simulator_process_controls_server(
+            reactor, simulator, args.controls, args.dt,
+            args.controls_merge_policy)
+
+        scheduler = simulator.scheduler
+        job_queue = None
+    else:
+        logger.debug("Creating the simulator")
+        simulator = simulator_builder.create_simulator()
 
-    if not simulator:
-        logger.error("Failed to create the simulator using the aircraft "
-                     "model '%s'", args.aircraft)
-        exit(1)
+        if not simulator:
+            logger.error("Failed to create the simulator using the aircraft "
+                         "model '%s'", args.aircraft)
+            exit(1)
 
-    initialize_controls_server(reactor, simulator.fdmexec, args.controls)
-    initialize_simulator_data_server(reactor, simulator, args.fdm)
+        controls_protocol = initialize_controls_server(
+            reactor, simulator.fdmexec, args.controls,
+            args.controls_merge_policy)
+
+        scheduler = RealTimeScheduler(simulator, args.max_steps_per_tick)
+        job_queue = JobQueue(simulator)
+
+    if args.time_scale != 1.0:
+        scheduler.time_scale = args.time_scale
+
+    initialize_simulator_data_server(reactor, simulator, args.fdm,
+                                     args.fdm_multicast_ttl,
+                                     args.fdm_multicast_interface)
+
+    initialize_telemetry_server(reactor, simulator, args.telemetry)
+
+    initialize_sensor_server(reactor, simulator.aircraft, args.sensors)
 
     db = create_database()
 
@@ -165,17 +214,42 @@ def main():
         db
     )
 
-    initialize_web_server(reactor, simulator, args.web, db)
-
-    def run_simulator():
-        result = simulator.run()
-
-        if not result:
-            logger.error("The simulator has failed to run")
-            reactor.stop()
-
-    fdm_updater = LoopingCall(run_simulator)
-    fdm_updater.start(args.dt)
+    initialize_web_server(reactor, simulator, args.web, db, scheduler,
+                          job_queue, controls_protocol)
+
+    if args.process:
+        def check_simulator_process():
+            if not simulator.is_alive():
+                logger.error("The simulator process has exited")
+                reactor.stop()
+
+        simulator_process_monitor = LoopingCall(check_simulator_process)
+        simulator_process_monitor.start(1.0)
+
+        reactor.addSystemEventTrigger("before", "shutdown", simulator.stop)
+    else:
+        def run_simulator():
+            # the controls that have been received since the last tick are
+            # applied once before the next simulation steps
+            controls_protocol.apply_controls()
+
+            # the properties that the web server has requested are read
+            # between the simulation steps
+            job_queue.process_property_reads()
+
+            # the jobs are executed instead of the real time steps and the
+            # scheduler synchronizes again after they have finished
+            if job_queue.is_empty():
+                result = scheduler.tick()
+            else:
+                result = job_queue.process()
+
+            if not result:
+                logger.error("The simulator has failed to run")
+                reactor.stop()
+
+        fdm_updater = LoopingCall(run_simulator)
+        fdm_updater.start(args.dt)
 
     logger.debug("starting the simulator server")
     reactor.run()
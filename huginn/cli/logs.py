@@ -0,0 +1,33 @@
+"""
+The huginn.cli.logs module contains the logging setup of the command line
+tools
+"""
+
+
+import logging
+
+
+def initialize_logger(output_file, debug):
+    logger = logging.getLogger()
+
+    logger_log_level = logging.INFO
+    if debug:
+        logger_log_level = logging.DEBUG
+
+    logger.setLevel(logger_log_level)
+
+    formater = logging.Formatter("%(asctime)s - %(module)s - "
+                                 "%(levelname)s - %(message)s")
+
+    if output_file:
+        file_logging_handler = logging.FileHandler(output_file)
+        file_logging_handler.setLevel(logger_log_level)
+        file_logging_handler.setFormatter(formater)
+        logger.addHandler(file_logging_handler)
+
+    console_logging_handler = logging.StreamHandler()
+    console_logging_handler.setLevel(logger_log_level)
+    console_logging_handler.setFormatter(formater)
+    logger.addHandler(console_logging_handler)
+
+    return logger
@@ -5,6 +5,7 @@ and control huginn
 
 
 import csv
+import json
 
 import requests
 
@@ -97,3 +98,86 @@ class MapClient(object):
             return None
 
         return response.json()
+
+
+class WebClient(object):
+    """The WebClient is used to retrieve flight data from Huginn's web
+    server"""
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+
+    def _get_json_data_from_endpoint(self, endpoint):
+        """Get the data in json format"""
+        url = "http://%s:%d/aircraft/%s" % (self.host, self.port, endpoint)
+
+        response = requests.get(url)
+
+        data = json.loads(response.text)
+
+        return data
+
+    def get_gps_data(self):
+        """Get the gps data from the simulator and return them as a
+        dictionary"""
+        return self._get_json_data_from_endpoint("instruments/gps")
+
+    def get_accelerometer_data(self):
+        """Get the accelerometer data from the simulator and return them as a
+        dictionary"""
+        return self._get_json_data_from_endpoint("sensors/accelerometer")
+
+    def get_gyroscope_data(self):
+        """Get the gyroscope data from the simulator and return them as a
+        dictionary"""
+        return self._get_json_data_from_endpoint("sensors/gyroscope")
+
+    def get_thermometer_data(self):
+        """Get the temperature data from the simulator and return them as a
+        dictionary"""
+        return self._get_json_data_from_endpoint("sensors/thermometer")
+
+    def get_pressure_sensor_data(self):
+        """Get the atmospheric pressure data from the simulator and return
+        them as a dictionary"""
+        return self._get_json_data_from_endpoint("sensors/pressure_sensor")
+
+    def get_pitot_tube_data(self):
+        """Get the pitot tube data from the simulator and return them as a
+        dictionary"""
+        return self._get_json_data_from_endpoint("sensors/pitot_tube")
+
+    def get_ins_data(self):
+        """Get the inertial navigation system  data from the simulator and
+        return them as a dictionary"""
+        return self._get_json_data_from_endpoint("sensors/ins")
+
+    def get_sensor_history(self, sensor, since=None):
+        """Get the samples of a sensor that were recorded after the given
+        simulation time and return them as a dictionary
+
+        Arguments:
+        sensor: the sensor name, for example accelerometer or ins
+        since: the simulation time. All the recorded samples are returned if
+            this is None
+        """
+        url = "http://%s:%d/aircraft/sensors/%s/history" % (
+            self.host, self.port, sensor)
+
+        params = {}
+        if since is not None:
+            params["since"] = since
+
+        response = requests.get(url, params=params)
+
+        return response.json()
+
+    def get_engine_data(self):
+        """Get the engine data from the simulator and return them as a
+        dictionary"""
+        return self._get_json_data_from_endpoint("engine")
+
+    def get_flight_controls(self):
+        """Get the flight controls data from the simulator and return them as
+        a dictionary"""
+        return self._get_json_data_from_endpoint("controls")
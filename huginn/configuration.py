@@ -3,18 +3,35 @@ The huginn.configuration module contains the default configuration values
 """
 
 
-import pkg_resources
-
 # interface settings
 SIMULATOR_CONTROL_PORT = 10500
 WEB_SERVER_PORT = 8090
 SENSORS_PORT = 10300
 CONTROLS_PORT = 10301
+CONTROLS_MERGE_POLICY = "latest"
+CONTROLS_SEQUENCE_WINDOW = 100
+CONTROLS_SEQUENCE_TIMEOUT = 1.0
 FDM_CLIENT_ADDRESS = "127.0.0.1"
 FDM_CLIENT_PORT = 10302
 FDM_CLIENT_DT = 0.1
+FDM_MULTICAST_TTL = 1
 TELEMETRY_PORT = 10400
 TELEMETRY_DT = 1.0
+TELEMETRY_UPDATE_RATE = 0.01
+TELEMETRY_LEASE = 10.0
+TELEMETRY_MAX_LEASE = 60.0
+TELEMETRY_MAX_SUBSCRIPTIONS = 64
+TELEMETRY_KEYFRAME_INTERVAL = 50
+TELEMETRY_REORDER_WINDOW = 100
+TELEMETRY_RESOLUTION = 0.001
+TELEMETRY_RESOLUTIONS = {
+    "gps.latitude": 1e-7,
+    "gps.longitude": 1e-7,
+    "ins.latitude": 1e-7,
+    "ins.longitude": 1e-7,
+    "position.latitude": 1e-7,
+    "position.longitude": 1e-7
+}
 WEBSOCKET_HOST = "localhost"
 WEBSOCKET_PORT = 8091
 WEBSOCKET_UPDATE_RATE = 20.0
@@ -23,6 +40,21 @@ AIRCRAFT = "Rascal"
 
 # simulation settings
 DT = 1.0/300.0
+MAX_STEPS_PER_TICK = 10
+MAX_SIMULATION_LAG = 1.0
+SCHEDULER_RATE_WINDOW = 1.0
+MAX_TICK_DURATION = 0.02
+MAX_FINISHED_JOBS = 100
+MAX_JOB_WAIT_TIME = 30.0
+MAX_PROPERTY_READERS = 32
+MAX_TRAJECTORY_SAMPLES = 1000000
+SENSOR_NOISE_BLOCK_SIZE = 1024
+SENSOR_HISTORY_SIZE = 2500
+DEFAULT_CHECKPOINT = "default"
+
+# simulator process settings
+SHARED_STATE_BUFFER_SIZE = 65536
+SIMULATOR_PROCESS_START_TIMEOUT = 30.0
 
 # initial condition
 LATITUDE = 37.9232547
@@ -39,4 +71,8 @@ LOG_FILE = "huginn.log"
 
 def get_data_path():
     """Returns the absolute path to the data folder of Huginn"""
+    # pkg_resources is slow to import and most of the tools that use the
+    # configuration values don't need it
+    import pkg_resources
+
     return pkg_resources.resource_filename("huginn", "data")
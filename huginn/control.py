@@ -9,6 +9,9 @@ import logging
 
 import requests
 
+from huginn import configuration
+from huginn.trajectory import decode_trajectory, BINARY_FORMAT
+
 
 logger = logging.getLogger(__name__)
 
@@ -82,12 +85,164 @@ class SimulatorControlClient(object):
 
         return True
 
-    def run_for(self, time_to_run):
-        """Run the simulation for the given time in seconds"""
+    def _wait_for_job(self, response_data, wait):
+        """Wait for the job that was created by a command to finish"""
+        if response_data.get("result") != "ok":
+            return False
+
+        job_id = response_data.get("job_id")
+
+        if not wait or job_id is None:
+            return True
+
+        while True:
+            job = self.get_job(job_id, wait=configuration.MAX_JOB_WAIT_TIME)
+
+            if job is None:
+                raise SimulatorControlError()
+
+            if job["status"] == "completed":
+                return True
+            elif job["status"] in ["failed", "cancelled"]:
+                return False
+
+    def run_for(self, time_to_run, wait=True):
+        """Run the simulation for the given time in seconds
+
+        Arguments:
+        time_to_run: the time in seconds to run the simulator
+        wait: wait for the simulator to finish running
+        """
         response_data = self._send_command("run_for",
                                            data={"time_to_run": time_to_run})
 
-        if response_data["result"] != "ok":
+        return self._wait_for_job(response_data, wait)
+
+    def run_steps(self, steps, wait=True):
+        """Run the given number of simulation steps
+
+        Arguments:
+        steps: the number of simulation steps
+        wait: wait for the simulator to finish running
+        """
+        response_data = self._send_command("run_steps",
+                                           data={"steps": steps})
+
+        return self._wait_for_job(response_data, wait)
+
+    def record_trajectory(self, properties, time_to_run=None, steps=None,
+                          sample_interval=1,
+                          payload_format=BINARY_FORMAT):
+        """Run the simulator for the given time or number of steps and
+        return a dictionary with the recorded values of the simulation time
+        and of the given properties. Returns None if the trajectory couldn't
+        be recorded
+
+        Arguments:
+        properties: a list with the JSBSim property names
+        time_to_run: the time in seconds to run the simulator
+        steps: the number of simulation steps to run if the time to run
+            isn't given
+        sample_interval: the number of simulation steps between the samples
+        payload_format: the format that the trajectory will be transferred
+            in
+        """
+        data = {
+            "properties": properties,
+            "sample_interval": sample_interval,
+            "trajectory_format": payload_format
+        }
+
+        if time_to_run is not None:
+            command = "run_for"
+            data["time_to_run"] = time_to_run
+        else:
+            command = "run_steps"
+            data["steps"] = steps
+
+        response_data = self._send_command(command, data=data)
+
+        if response_data.get("result") != "ok":
+            return None
+
+        payload = response_data.get("trajectory")
+
+        if payload is None:
+            if not self._wait_for_job(response_data, True):
+                return None
+
+            job = self.get_job(response_data["job_id"])
+
+            if job is None:
+                raise SimulatorControlError()
+
+            payload = job["trajectory"]
+
+        return decode_trajectory(payload)
+
+    def get_job(self, job_id, wait=None):
+        """Returns the data of a simulator job or None if the job doesn't
+        exist
+
+        Arguments:
+        job_id: the job id
+        wait: the maximum time in seconds to wait for the job to finish
+        """
+        url = "http://%s:%d/simulator/jobs/%d" % (
+            self.huginn_host, self.simulator_controls_port, job_id)
+
+        params = {}
+
+        if wait:
+            params["wait"] = wait
+
+        response = requests.get(url, params=params)
+
+        if response.status_code == 404:
+            return None
+
+        return response.json()
+
+    def save_checkpoint(self, name=configuration.DEFAULT_CHECKPOINT,
+                        wait=True):
+        """Store the current state of the simulation
+
+        Arguments:
+        name: the checkpoint name
+        wait: wait for the checkpoint to be saved
+        """
+        response_data = self._send_command("save_checkpoint",
+                                           data={"name": name})
+
+        return self._wait_for_job(response_data, wait)
+
+    def restore_checkpoint(self, name=configuration.DEFAULT_CHECKPOINT,
+                           wait=True):
+        """Restore the simulation to a saved checkpoint
+
+        Arguments:
+        name: the checkpoint name
+        wait: wait for the checkpoint to be restored
+        """
+        response_data = self._send_command("restore_checkpoint",
+                                           data={"name": name})
+
+        return self._wait_for_job(response_data, wait)
+
+    def set_time_scale(self, time_scale):
+        """Set the ratio of the simulation time to the wall clock time
+
+        Arguments:
+        time_scale: the time scale or None to run the simulation as fast as
+            possible
+        """
+        if time_scale is None:
+            time_scale = "max"
+
+        response_data = self._send_command(
+            "time_scale", data={"time_scale": time_scale})
+
+        if response_data.get("result") != "ok":
             return False
 
         return True
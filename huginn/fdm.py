@@ -5,10 +5,10 @@ aircraft
 """
 from os import path
 from math import degrees
+from collections import namedtuple
+from weakref import WeakValueDictionary
 import logging
 
-from PyJSBSim import FGFDMExec
-
 from huginn import configuration
 from huginn.unit_conversions import (convert_jsbsim_acceleration,
                                      convert_jsbsim_angular_acceleration,
@@ -18,7 +18,10 @@ from huginn.unit_conversions import (convert_jsbsim_acceleration,
                                      convert_jsbsim_temperature,
                                      convert_jsbsim_density,
                                      convert_jsbsim_force,
-                                     ur)
+                                     convert_feet_to_meters,
+                                     convert_meters_to_feet,
+                                     convert_knots_to_meters_per_second,
+                                     convert_meters_per_second_to_knots)
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +33,154 @@ TRIM_MODE_GROUND = 2
 TRIM_MODE_PULLUP = 3
 TRIM_MODE_TURN = 5
 
+TRIM_MODES = {
+    "longitudinal": TRIM_MODE_LONGITUDINAL,
+    "full": TRIM_MODE_FULL,
+    "ground": TRIM_MODE_GROUND,
+    "pullup": TRIM_MODE_PULLUP,
+    # custom trim will not be supported by the simulator
+    # "custom": 4,
+    "turn": TRIM_MODE_TURN
+}
+
+
+# The state objects are immutable snapshots of the values of the flight
+# dynamics model at a specific simulation time. They have the same fields as
+# the respective property wrappers below so they can be used in their place
+# by the code that only reads the fdm data.
+AccelerationsState = namedtuple(
+    "AccelerationsState",
+    ["x", "y", "z", "p_dot", "q_dot", "r_dot", "u_dot", "v_dot", "w_dot",
+     "gravity"]
+)
+
+VelocitiesState = namedtuple(
+    "VelocitiesState",
+    ["p", "q", "r", "u", "v", "w", "true_airspeed", "climb_rate",
+     "calibrated_airspeed", "equivalent_airspeed", "ground_speed"]
+)
+
+PositionState = namedtuple(
+    "PositionState",
+    ["latitude", "longitude", "altitude", "heading"]
+)
+
+OrientationState = namedtuple(
+    "OrientationState",
+    ["phi", "theta", "psi"]
+)
+
+AtmosphereState = namedtuple(
+    "AtmosphereState",
+    ["pressure", "sea_level_pressure", "temperature",
+     "sea_level_temperature", "density", "sea_level_density"]
+)
+
+ForcesState = namedtuple(
+    "ForcesState",
+    ["x_body", "y_body", "z_body", "x_wind", "y_wind", "z_wind", "x_total",
+     "y_total", "z_total"]
+)
+
+FDMState = namedtuple(
+    "FDMState",
+    ["time", "dt", "total_pressure", "accelerations", "velocities",
+     "position", "orientation", "atmosphere", "forces"]
+)
+
+
+def create_state(obj, state_class):
+    """Create a state object using the values of the given object
+
+    Arguments:
+    obj: the object that contains the values
+    state_class: the namedtuple class of the state object
+    """
+    return state_class._make(getattr(obj, field)
+                             for field in state_class._fields)
+
+
+class PropertyError(Exception):
+    """PropertyError is raised when a JSBSim property doesn't exist"""
+    pass
+
+
+def _normalize_property_name(name):
+    """Remove the leading slash and the zero indices from a property name so
+    that the names of the property catalog can be compared with the names
+    that the clients use"""
+    return name.strip().lstrip("/").replace("[0]", "")
+
+
+def get_property_catalog(fdmexec):
+    """Returns a set with the names of the properties of the flight dynamics
+    model
+
+    Arguments:
+    fdmexec: a JSBSim FGFDMExec object
+    """
+    catalog = fdmexec.QueryPropertyCatalog("")
+
+    # every line of the catalog contains a property name that might be
+    # followed by the property access mode, for example "position/h-sl-ft
+    # (RW)"
+    return set(_normalize_property_name(line.split(" (")[0])
+               for line in catalog.splitlines()
+               if line.strip())
+
+
+def get_unknown_properties(property_catalog, properties):
+    """Returns a list with the properties that don't exist in the property
+    catalog
+
+    Arguments:
+    property_catalog: the set that was returned by get_property_catalog
+    properties: a list with the property names
+    """
+    return [name for name in properties
+            if _normalize_property_name(name) not in property_catalog]
+
+
+class PropertyReader(object):
+    """The PropertyReader reads the values of a list of JSBSim properties.
+
+    The values are written in a preallocated array so reading them in
+    every simulation step doesn't create new objects.
+    """
+
+    def __init__(self, fdmexec, properties):
+        """Create a new PropertyReader object
+
+        Arguments:
+        fdmexec: a JSBSim FGFDMExec object
+        properties: a list with the property names
+        """
+        self.fdmexec = fdmexec
+        self.properties = tuple(properties)
+        self._get_property_value = fdmexec.GetPropertyValue
+
+        # numpy is imported here so that the tools that only need the
+        # configuration values of this module start quickly
+        import numpy
+
+        self.values = numpy.zeros(len(self.properties))
+
+    def read(self):
+        """Read the property values. Returns the array with the values in
+        the same order as the property names. The same array is updated
+        every time this method is called."""
+        get_property_value = self._get_property_value
+
+        self.values[:] = [get_property_value(name)
+                          for name in self.properties]
+
+        return self.values
+
+    def get_values(self):
+        """Read the property values and return them in a dictionary"""
+        return dict(zip(self.properties, [float(value)
+                                          for value in self.read()]))
+
 
 class FDMBuilder(object):
     """The FDMBuilder creates the flight dynamics model object that will be
@@ -48,6 +199,9 @@ class FDMBuilder(object):
 
     def create_fdm(self):
         """Create the flight dynamics model"""
+        # JSBSim is imported here so that the processes that don't run the
+        # flight dynamics model don't have to load it
+        from PyJSBSim import FGFDMExec
 
         fdmexec = FGFDMExec()
 
@@ -72,15 +226,9 @@ class FDMBuilder(object):
         logger.debug("Loading '%s' aircraft model", self.aircraft)
         fdmexec.LoadModel(self.aircraft)
 
-        altitude = self.altitude * ur.meter
-        altitude.ito(ur.foot)
+        altitude_in_feet = convert_meters_to_feet(self.altitude)
 
-        altitude_in_feet = altitude.magnitude
-
-        airspeed = self.airspeed * ur.meters_per_second
-        airspeed.ito(ur.knot)
-
-        airspeed_in_knots = airspeed.magnitude
+        airspeed_in_knots = convert_meters_per_second_to_knots(self.airspeed)
 
         logger.debug("Initial latitude: %f degrees", self.latitude)
         logger.debug("Initial longitude: %f degrees", self.longitude)
@@ -101,15 +249,63 @@ class FDMBuilder(object):
         return fdmexec
 
 
+# the FDMSubsystems objects that are in use, indexed by the id of their
+# FGFDMExec object
+_subsystems = WeakValueDictionary()
+
+
+class FDMSubsystems(object):
+    """The FDMSubsystems class holds the JSBSim subsystem objects of an
+    FGFDMExec object. The subsystems are resolved once so the fdm wrappers
+    don't have to look them up every time they read a value."""
+
+    __slots__ = ("fdmexec", "propagate", "auxiliary", "accelerations",
+                 "atmosphere", "aerodynamics", "__weakref__")
+
+    def __init__(self, fdmexec):
+        """Create a new FDMSubsystems object
+
+        Arguments:
+        fdmexec: a JSBSim FGFDMExec object
+        """
+        self.fdmexec = fdmexec
+        self.propagate = fdmexec.GetPropagate()
+        self.auxiliary = fdmexec.GetAuxiliary()
+        self.accelerations = fdmexec.GetAccelerations()
+        self.atmosphere = fdmexec.GetAtmosphere()
+        self.aerodynamics = fdmexec.GetAerodynamics()
+
+
+def get_subsystems(fdmexec):
+    """Returns the FDMSubsystems object of the given FGFDMExec object. The
+    same object is shared by all the fdm wrappers of an FGFDMExec object.
+
+    Arguments:
+    fdmexec: a JSBSim FGFDMExec object
+    """
+    subsystems = _subsystems.get(id(fdmexec))
+
+    if subsystems is None or subsystems.fdmexec is not fdmexec:
+        subsystems = FDMSubsystems(fdmexec)
+        _subsystems[id(fdmexec)] = subsystems
+
+    return subsystems
+
+
 class Accelerations(object):
+    __slots__ = ("fdmexec", "_subsystems", "_auxiliary", "_accelerations")
+
     def __init__(self, fdmexec):
         self.fdmexec = fdmexec
+        self._subsystems = get_subsystems(fdmexec)
+        self._auxiliary = self._subsystems.auxiliary
+        self._accelerations = self._subsystems.accelerations
 
     @property
     def x(self):
         """Returns the acceleration along the x axis of the aircraft in
         meters/sec^2"""
-        acceleration = self.fdmexec.GetAuxiliary().GetPilotAccel(1)
+        acceleration = self._auxiliary.GetPilotAccel(1)
 
         return convert_jsbsim_acceleration(acceleration)
 
@@ -117,7 +313,7 @@ class Accelerations(object):
     def y(self):
         """Returns the acceleration along the y axis of the aircraft in
         meters/sec^2"""
-        acceleration = self.fdmexec.GetAuxiliary().GetPilotAccel(2)
+        acceleration = self._auxiliary.GetPilotAccel(2)
 
         return convert_jsbsim_acceleration(acceleration)
 
@@ -125,7 +321,7 @@ class Accelerations(object):
     def z(self):
         """Returns the acceleration along the z axis of the aircraft in
         meters/sec^2"""
-        acceleration = self.fdmexec.GetAuxiliary().GetPilotAccel(3)
+        acceleration = self._auxiliary.GetPilotAccel(3)
 
         return convert_jsbsim_acceleration(acceleration)
 
@@ -133,7 +329,7 @@ class Accelerations(object):
     def p_dot(self):
         """Returns the p value of the body axis angular acceleration in
         degress/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetPQRdot(1)
+        acceleration = self._accelerations.GetPQRdot(1)
 
         return convert_jsbsim_angular_acceleration(acceleration)
 
@@ -141,7 +337,7 @@ class Accelerations(object):
     def q_dot(self):
         """Returns the q value of the body axis angular acceleration in
         degress/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetPQRdot(2)
+        acceleration = self._accelerations.GetPQRdot(2)
 
         return convert_jsbsim_angular_acceleration(acceleration)
 
@@ -149,7 +345,7 @@ class Accelerations(object):
     def r_dot(self):
         """Returns the r value of the body axis angular acceleration in
         degress/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetPQRdot(3)
+        acceleration = self._accelerations.GetPQRdot(3)
 
         return convert_jsbsim_angular_acceleration(acceleration)
 
@@ -157,7 +353,7 @@ class Accelerations(object):
     def u_dot(self):
         """Returns the u item of the the body axis acceleration in
         meters/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetUVWdot(1)
+        acceleration = self._accelerations.GetUVWdot(1)
 
         return convert_jsbsim_acceleration(acceleration)
 
@@ -165,7 +361,7 @@ class Accelerations(object):
     def v_dot(self):
         """Returns the v item of the the body axis acceleration in
         meters/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetUVWdot(2)
+        acceleration = self._accelerations.GetUVWdot(2)
 
         return convert_jsbsim_acceleration(acceleration)
 
@@ -173,47 +369,52 @@ class Accelerations(object):
     def w_dot(self):
         """Returns the w item of the the body axis acceleration in
         meters/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetUVWdot(3)
+        acceleration = self._accelerations.GetUVWdot(3)
 
         return convert_jsbsim_acceleration(acceleration)
 
     @property
     def gravity(self):
         """Returns the acceleration of the gravity in meters/sec^2"""
-        acceleration = self.fdmexec.GetAccelerations().GetGravAccelMagnitude()
+        acceleration = self._accelerations.GetGravAccelMagnitude()
 
         return convert_jsbsim_acceleration(acceleration)
 
 
 class Velocities(object):
+    __slots__ = ("fdmexec", "_subsystems", "_propagate", "_auxiliary")
+
     def __init__(self, fdmexec):
         self.fdmexec = fdmexec
+        self._subsystems = get_subsystems(fdmexec)
+        self._propagate = self._subsystems.propagate
+        self._auxiliary = self._subsystems.auxiliary
 
     @property
     def p(self):
         """Return the p item of the body angular rates in degrees/sec"""
-        velocity = self.fdmexec.GetPropagate().GetPQR(1)
+        velocity = self._propagate.GetPQR(1)
 
         return convert_jsbsim_angular_velocity(velocity)
 
     @property
     def q(self):
         """Return the q item of the body angular rates in degrees/sec"""
-        velocity = self.fdmexec.GetPropagate().GetPQR(2)
+        velocity = self._propagate.GetPQR(2)
 
         return convert_jsbsim_angular_velocity(velocity)
 
     @property
     def r(self):
         """Return the r item of the body angular rates in degrees/sec"""
-        velocity = self.fdmexec.GetPropagate().GetPQR(3)
+        velocity = self._propagate.GetPQR(3)
 
         return convert_jsbsim_angular_velocity(velocity)
 
     @property
     def true_airspeed(self):
         """Return the true airspeed in meters/second"""
-        airspeed = self.fdmexec.GetAuxiliary().GetVtrueFPS()
+        airspeed = self._auxiliary.GetVtrueFPS()
 
         return convert_jsbsim_velocity(airspeed)
 
@@ -221,7 +422,7 @@ class Velocities(object):
     def climb_rate(self):
         """Return the vertical velocity in meters/seconds"""
         # climb_rate = self.fdmexec.GetPropertyValue("velocities/v-down-fps")
-        climb_rate = -self.fdmexec.GetPropagate().GetVel(3)
+        climb_rate = -self._propagate.GetVel(3)
 
         return convert_jsbsim_velocity(climb_rate)
 
@@ -229,7 +430,7 @@ class Velocities(object):
     def u(self):
         """Returns the u item of the body frame velocity vector in
         meters/sec"""
-        velocity = self.fdmexec.GetPropagate().GetUVW(1)
+        velocity = self._propagate.GetUVW(1)
 
         return convert_jsbsim_velocity(velocity)
 
@@ -237,7 +438,7 @@ class Velocities(object):
     def v(self):
         """Returns the v item of the body frame velocity vector in
         meters/sec"""
-        velocity = self.fdmexec.GetPropagate().GetUVW(2)
+        velocity = self._propagate.GetUVW(2)
 
         return convert_jsbsim_velocity(velocity)
 
@@ -245,83 +446,93 @@ class Velocities(object):
     def w(self):
         """Returns the w item of the body frame velocity vector in
         meters/sec"""
-        velocity = self.fdmexec.GetPropagate().GetUVW(3)
+        velocity = self._propagate.GetUVW(3)
 
         return convert_jsbsim_velocity(velocity)
 
     @property
     def calibrated_airspeed(self):
         """Returns the calibrated airspeed in meters/sec"""
-        airspeed = self.fdmexec.GetAuxiliary().GetVcalibratedFPS()
+        airspeed = self._auxiliary.GetVcalibratedFPS()
 
         return convert_jsbsim_velocity(airspeed)
 
     @property
     def equivalent_airspeed(self):
         """Returns the equivalent airspeed in meters/sec"""
-        airspeed = self.fdmexec.GetAuxiliary().GetVequivalentFPS()
+        airspeed = self._auxiliary.GetVequivalentFPS()
 
         return convert_jsbsim_velocity(airspeed)
 
     @property
     def ground_speed(self):
         """Returns the ground speed in meters/sec"""
-        airspeed = self.fdmexec.GetAuxiliary().GetVground()
+        airspeed = self._auxiliary.GetVground()
 
         return convert_jsbsim_velocity(airspeed)
 
 
 class Position(object):
     """The Position class contains data about the position of the aircraft"""
+    __slots__ = ("fdmexec", "_subsystems", "_propagate")
+
     def __init__(self, fdmexec):
         self.fdmexec = fdmexec
+        self._subsystems = get_subsystems(fdmexec)
+        self._propagate = self._subsystems.propagate
 
     @property
     def latitude(self):
         """Returns the latitude in degrees"""
-        return self.fdmexec.GetPropagate().GetLatitudeDeg()
+        return self._propagate.GetLatitudeDeg()
 
     @property
     def longitude(self):
         """Returns the longitude in degrees"""
-        return self.fdmexec.GetPropagate().GetLongitudeDeg()
+        return self._propagate.GetLongitudeDeg()
 
     @property
     def altitude(self):
         """Returns the altitude in meters"""
-        return self.fdmexec.GetPropagate().GetAltitudeASLmeters()
+        return self._propagate.GetAltitudeASLmeters()
 
     @property
     def heading(self):
         """Returns the heading in degrees"""
-        return degrees(self.fdmexec.GetPropagate().GetEuler(3))
+        return degrees(self._propagate.GetEuler(3))
 
 
 class Orientation(object):
     """The Orientation class contains data about the orientation of the
     aircraft"""
+    __slots__ = ("fdmexec", "_subsystems", "_propagate")
+
     def __init__(self, fdmexec):
         self.fdmexec = fdmexec
+        self._subsystems = get_subsystems(fdmexec)
+        self._propagate = self._subsystems.propagate
 
     @property
     def phi(self):
         """Return the phi euler angle angle in degrees"""
-        return self.fdmexec.GetPropagate().GetEulerDeg(1)
+        return self._propagate.GetEulerDeg(1)
 
     @property
     def theta(self):
         """Return the theta euler angle angle in degrees"""
-        return self.fdmexec.GetPropagate().GetEulerDeg(2)
+        return self._propagate.GetEulerDeg(2)
 
     @property
     def psi(self):
         """Return the psi euler angle angle in degrees"""
-        return self.fdmexec.GetPropagate().GetEulerDeg(3)
+        return self._propagate.GetEulerDeg(3)
 
 
 class Atmosphere(object):
     """The Atmosphere contains the fdm data about the atmosphere"""
 
+    __slots__ = ("fdmexec", "_subsystems", "_atmosphere")
+
     def __init__(self, fdmexec):
         """Create a new Atmosphere object
 
@@ -329,12 +540,14 @@ class Atmosphere(object):
         fdmexec: a JSBSim FGFDMExec object
         """
         self.fdmexec = fdmexec
+        self._subsystems = get_subsystems(fdmexec)
+        self._atmosphere = self._subsystems.atmosphere
 
     @property
     def pressure(self):
         """Returns the pressure at the current altitude. The value will be in
         Pascal"""
-        pressure = self.fdmexec.GetAtmosphere().GetPressure()
+        pressure = self._atmosphere.GetPressure()
 
         return convert_jsbsim_pressure(pressure)
 
@@ -342,21 +555,21 @@ class Atmosphere(object):
     def sea_level_pressure(self):
         """Returns the pressure at the sea level. The value will be in
         Pascal"""
-        pressure = self.fdmexec.GetAtmosphere().GetPressureSL()
+        pressure = self._atmosphere.GetPressureSL()
 
         return convert_jsbsim_pressure(pressure)
 
     @property
     def temperature(self):
         """Returns the temperature in kelvin at the current altitude"""
-        temperature = self.fdmexec.GetAtmosphere().GetTemperature()
+        temperature = self._atmosphere.GetTemperature()
 
         return convert_jsbsim_temperature(temperature)
 
     @property
     def sea_level_temperature(self):
         """Returns the temperature in kelvin at the sea level"""
-        temperature = self.fdmexec.GetAtmosphere().GetTemperatureSL()
+        temperature = self._atmosphere.GetTemperatureSL()
 
         return convert_jsbsim_temperature(temperature)
 
@@ -364,14 +577,14 @@ class Atmosphere(object):
     def density(self):
         """Returns the atmospheric density at the current altitude in
         kg/meters^3"""
-        density = self.fdmexec.GetAtmosphere().GetDensity()
+        density = self._atmosphere.GetDensity()
 
         return convert_jsbsim_density(density)
 
     @property
     def sea_level_density(self):
         """Returns the atmospheric density at sea level in kg/meters^3"""
-        density = self.fdmexec.GetAtmosphere().GetDensitySL()
+        density = self._atmosphere.GetDensitySL()
 
         return convert_jsbsim_density(density)
 
@@ -379,14 +592,19 @@ class Atmosphere(object):
 class Forces(object):
     """The Forces objects contains the aerodynamics forces"""
 
+    __slots__ = ("fdmexec", "_subsystems", "_aerodynamics", "_accelerations")
+
     def __init__(self, fdmexec):
         self.fdmexec = fdmexec
+        self._subsystems = get_subsystems(fdmexec)
+        self._aerodynamics = self._subsystems.aerodynamics
+        self._accelerations = self._subsystems.accelerations
 
     @property
     def x_body(self):
         """Return the force along the x axis in the body frame. The value
         is in Newtons"""
-        force = self.fdmexec.GetAerodynamics().GetForces(1)
+        force = self._aerodynamics.GetForces(1)
 
         return convert_jsbsim_force(force)
 
@@ -394,7 +612,7 @@ class Forces(object):
     def y_body(self):
         """Return the force along the y axis in the body frame. The value
         is in Newtons"""
-        force = self.fdmexec.GetAerodynamics().GetForces(2)
+        force = self._aerodynamics.GetForces(2)
 
         return convert_jsbsim_force(force)
 
@@ -402,7 +620,7 @@ class Forces(object):
     def z_body(self):
         """Return the force along the z axis in the body frame. The value
         is in Newtons"""
-        force = self.fdmexec.GetAerodynamics().GetForces(3)
+        force = self._aerodynamics.GetForces(3)
 
         return convert_jsbsim_force(force)
 
@@ -410,7 +628,7 @@ class Forces(object):
     def x_wind(self):
         """Return the force along the x axis in the wind frame. The value
         is in Newtons"""
-        force = self.fdmexec.GetAerodynamics().GetvFw(1)
+        force = self._aerodynamics.GetvFw(1)
 
         return convert_jsbsim_force(force)
 
@@ -418,7 +636,7 @@ class Forces(object):
     def y_wind(self):
         """Return the force along the y axis in the wind frame. The value
         is in Newtons"""
-        force = self.fdmexec.GetAerodynamics().GetvFw(2)
+        force = self._aerodynamics.GetvFw(2)
 
         return convert_jsbsim_force(force)
 
@@ -426,7 +644,7 @@ class Forces(object):
     def z_wind(self):
         """Return the force along the z axis in the wind frame. The value
         is in Newtons"""
-        force = self.fdmexec.GetAerodynamics().GetvFw(3)
+        force = self._aerodynamics.GetvFw(3)
 
         return convert_jsbsim_force(force)
 
@@ -434,7 +652,7 @@ class Forces(object):
     def x_total(self):
         """Return the total force along the x axis in the body frame. The
         value is in Newtons"""
-        force = self.fdmexec.GetAccelerations().GetForces(1)
+        force = self._accelerations.GetForces(1)
 
         return convert_jsbsim_force(force)
 
@@ -442,7 +660,7 @@ class Forces(object):
     def y_total(self):
         """Return the total force along the y axis in the body frame. The
         value is in Newtons"""
-        force = self.fdmexec.GetAccelerations().GetForces(2)
+        force = self._accelerations.GetForces(2)
 
         return convert_jsbsim_force(force)
 
@@ -450,7 +668,7 @@ class Forces(object):
     def z_total(self):
         """Return the total force along the z axis in the body frame. The
         value is in Newtons"""
-        force = self.fdmexec.GetAccelerations().GetForces(3)
+        force = self._accelerations.GetForces(3)
 
         return convert_jsbsim_force(force)
 
@@ -498,11 +716,9 @@ class InitialCondition(object):
     @property
     def altitude(self):
         """Get the altitude in meters"""
-        altitude = self.fdmexec.GetIC().GetAltitudeASLFtIC() * ur.foot
+        altitude = self.fdmexec.GetIC().GetAltitudeASLFtIC()
 
-        altitude.ito(ur.meter)
-
-        return altitude.magnitude
+        return convert_feet_to_meters(altitude)
 
     @altitude.setter
     def altitude(self, value):
@@ -511,11 +727,9 @@ class InitialCondition(object):
         Arguments:
         value: the altitude in meters
         """
-        altitude = value * ur.meter
-
-        altitude.ito(ur.foot)
+        altitude = convert_meters_to_feet(value)
 
-        self.fdmexec.GetIC().SetAltitudeASLFtIC(altitude.magnitude)
+        self.fdmexec.GetIC().SetAltitudeASLFtIC(altitude)
 
     @property
     def heading(self):
@@ -534,11 +748,9 @@ class InitialCondition(object):
     @property
     def airspeed(self):
         """Get the airspeed in meters/second"""
-        airspeed = self.fdmexec.GetIC().GetVtrueKtsIC() * ur.knot
-
-        airspeed.ito(ur.meters_per_second)
+        airspeed = self.fdmexec.GetIC().GetVtrueKtsIC()
 
-        return airspeed.magnitude
+        return convert_knots_to_meters_per_second(airspeed)
 
     @airspeed.setter
     def airspeed(self, value):
@@ -547,11 +759,9 @@ class InitialCondition(object):
         Arguments:
         value: the airspeed in meters/second
         """
-        airspeed = value * ur.meters_per_second
+        airspeed = convert_meters_per_second_to_knots(value)
 
-        airspeed.ito(ur.knot)
-
-        self.fdmexec.GetIC().SetVtrueKtsIC(airspeed.magnitude)
+        self.fdmexec.GetIC().SetVtrueKtsIC(airspeed)
 
 
 class FDM(object):
@@ -559,6 +769,7 @@ class FDM(object):
     values of the flight dynamics model."""
     def __init__(self, fdmexec):
         self.fdmexec = fdmexec
+        self.subsystems = get_subsystems(fdmexec)
         self.accelerations = Accelerations(fdmexec)
         self.velocities = Velocities(fdmexec)
         self.position = Position(fdmexec)
@@ -566,3 +777,21 @@ class FDM(object):
         self.atmosphere = Atmosphere(fdmexec)
         self.forces = Forces(fdmexec)
         self.initial_condition = InitialCondition(fdmexec)
+
+    def get_state(self):
+        """Returns an FDMState object with the current values of the flight
+        dynamics model"""
+        total_pressure = self.subsystems.auxiliary.GetTotalPressure()
+
+        return FDMState(
+            time=self.fdmexec.GetSimTime(),
+            dt=self.fdmexec.GetDeltaT(),
+            total_pressure=convert_jsbsim_pressure(total_pressure),
+            accelerations=create_state(self.accelerations,
+                                       AccelerationsState),
+            velocities=create_state(self.velocities, VelocitiesState),
+            position=create_state(self.position, PositionState),
+            orientation=create_state(self.orientation, OrientationState),
+            atmosphere=create_state(self.atmosphere, AtmosphereState),
+            forces=create_state(self.forces, ForcesState)
+        )
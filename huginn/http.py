@@ -6,77 +6,16 @@ clients
 import logging
 import json
 
-import requests
 from autobahn.twisted.websocket import (WebSocketServerFactory,
                                         WebSocketServerProtocol)
 
 from tinydb import Query
 
+# the WebClient used to be defined in this module
+from huginn.clients import WebClient  # noqa: F401
 
-logger = logging.getLogger(__name__)
-
-
-class WebClient(object):
-    """The WebClient is used to retrieve flight data from Huginn's web
-    server"""
-    def __init__(self, host, port):
-        self.host = host
-        self.port = port
-
-    def _get_json_data_from_endpoint(self, endpoint):
-        """Get the data in json format"""
-        url = "http://%s:%d/aircraft/%s" % (self.host, self.port, endpoint)
-
-        response = requests.get(url)
-
-        data = json.loads(response.text)
-
-        return data
-
-    def get_gps_data(self):
-        """Get the gps data from the simulator and return them as a
-        dictionary"""
-        return self._get_json_data_from_endpoint("instruments/gps")
 
-    def get_accelerometer_data(self):
-        """Get the accelerometer data from the simulator and return them as a
-        dictionary"""
-        return self._get_json_data_from_endpoint("sensors/accelerometer")
-
-    def get_gyroscope_data(self):
-        """Get the gyroscope data from the simulator and return them as a
-        dictionary"""
-        return self._get_json_data_from_endpoint("sensors/gyroscope")
-
-    def get_thermometer_data(self):
-        """Get the temperature data from the simulator and return them as a
-        dictionary"""
-        return self._get_json_data_from_endpoint("sensors/thermometer")
-
-    def get_pressure_sensor_data(self):
-        """Get the atmospheric pressure data from the simulator and return
-        them as a dictionary"""
-        return self._get_json_data_from_endpoint("sensors/pressure_sensor")
-
-    def get_pitot_tube_data(self):
-        """Get the pitot tube data from the simulator and return them as a
-        dictionary"""
-        return self._get_json_data_from_endpoint("sensors/pitot_tube")
-
-    def get_ins_data(self):
-        """Get the inertial navigation system  data from the simulator and
-        return them as a dictionary"""
-        return self._get_json_data_from_endpoint("sensors/ins")
-
-    def get_engine_data(self):
-        """Get the engine data from the simulator and return them as a
-        dictionary"""
-        return self._get_json_data_from_endpoint("engine")
-
-    def get_flight_controls(self):
-        """Get the flight controls data from the simulator and return them as
-        a dictionary"""
-        return self._get_json_data_from_endpoint("controls")
+logger = logging.getLogger(__name__)
 
 
 class SimulatorDataWebSocketFactory(WebSocketServerFactory):
@@ -114,7 +53,7 @@ class SimulatorDataWebSocketProtocol(WebSocketServerProtocol):
 
     def send_flight_data(self):
         """Send the fdm data"""
-        fdm = self.factory.simulator.fdm
+        fdm = self.factory.simulator.state.fdm
 
         flight_data = {
             "command": "flight_data",
@@ -4,10 +4,39 @@ instruments
 """
 import math
 from math import sqrt, log
+from collections import namedtuple
 
-from huginn.fdm import Position, Velocities, Atmosphere, Orientation
+from huginn.fdm import (Position, Velocities, Atmosphere, Orientation,
+                        create_state, get_subsystems)
 from huginn.constants import a0, T0, g, M, R
-from huginn.unit_conversions import convert_jsbsim_pressure, ur
+from huginn.unit_conversions import (
+    convert_jsbsim_pressure, convert_meters_to_feet,
+    convert_inches_of_mercury_to_pascal,
+    convert_meters_per_second_to_feet_per_minute)
+
+
+# The instrument state objects contain the instrument values at a specific
+# simulation time
+GPSState = namedtuple("GPSState", ["latitude", "longitude", "altitude",
+                                   "airspeed", "heading"])
+
+AirspeedIndicatorState = namedtuple("AirspeedIndicatorState", ["airspeed"])
+
+AltimeterState = namedtuple("AltimeterState", ["altitude", "pressure"])
+
+AttitudeIndicatorState = namedtuple("AttitudeIndicatorState",
+                                    ["roll", "pitch"])
+
+HeadingIndicatorState = namedtuple("HeadingIndicatorState", ["heading"])
+
+VerticalSpeedIndicatorState = namedtuple("VerticalSpeedIndicatorState",
+                                         ["climb_rate"])
+
+InstrumentsState = namedtuple(
+    "InstrumentsState",
+    ["gps", "airspeed_indicator", "altimeter", "attitude_indicator",
+     "heading_indicator", "vertical_speed_indicator"]
+)
 
 
 def true_airspeed(total_pressure, static_pressure, temperature):
@@ -84,11 +113,12 @@ class AirspeedIndicator(object):
         """
         self.fdmexec = fdmexec
         self._atmosphere = Atmosphere(fdmexec)
+        self._auxiliary = get_subsystems(fdmexec).auxiliary
 
     @property
     def airspeed(self):
         """Returns the airspeed in knots"""
-        total_pressure = self.fdmexec.GetAuxiliary().GetTotalPressure()
+        total_pressure = self._auxiliary.GetTotalPressure()
 
         total_pressure = convert_jsbsim_pressure(total_pressure)
 
@@ -108,26 +138,24 @@ class Altimeter(object):
         """
         self.fdmexec = fdmexec
         self._atmosphere = Atmosphere(fdmexec)
-        self._pressure = 29.92130302799185 * ur.in_Hg
+        self._pressure = 29.92130302799185
 
     @property
     def altitude(self):
         """Return the altitude in feet"""
-        sea_level_pressure = self._pressure.to(ur.pascal)
+        sea_level_pressure = convert_inches_of_mercury_to_pascal(
+            self._pressure)
 
-        altitude = pressure_altitude(sea_level_pressure.magnitude,
+        altitude = pressure_altitude(sea_level_pressure,
                                      self._atmosphere.pressure,
                                      self._atmosphere.temperature)
 
-        altitude = altitude * ur.meter
-        altitude.ito(ur.foot)
-
-        return altitude.magnitude
+        return convert_meters_to_feet(altitude)
 
     @property
     def pressure(self):
         """Return the instrument's pressure setting in inHg"""
-        return self._pressure.magnitude
+        return self._pressure
 
     @pressure.setter
     def pressure(self, value):
@@ -136,7 +164,7 @@ class Altimeter(object):
         Arguments:
         value: the pressure in inHg
         """
-        self._pressure = value * ur.in_Hg
+        self._pressure = value
 
 
 class AttitudeIndicator(object):
@@ -198,10 +226,9 @@ class VerticalSpeedIndicator(object):
     @property
     def climb_rate(self):
         """Return the climb rate in feet per minutes"""
-        climb_rate = self._velocities.climb_rate * ur.meters_per_second
-        climb_rate.ito(ur.feet_per_minute)
+        climb_rate = self._velocities.climb_rate
 
-        return climb_rate.magnitude
+        return convert_meters_per_second_to_feet_per_minute(climb_rate)
 
 
 class Instruments(object):
@@ -215,3 +242,21 @@ class Instruments(object):
         self.attitude_indicator = AttitudeIndicator(fdmexec)
         self.heading_indicator = HeadingIndicator(fdmexec)
         self.vertical_speed_indicator = VerticalSpeedIndicator(fdmexec)
+
+    def get_state(self):
+        """Returns an InstrumentsState object with the current instrument
+        values"""
+        return InstrumentsState(
+            gps=create_state(self.gps, GPSState),
+            airspeed_indicator=create_state(self.airspeed_indicator,
+                                            AirspeedIndicatorState),
+            altimeter=create_state(self.altimeter, AltimeterState),
+            attitude_indicator=create_state(self.attitude_indicator,
+                                            AttitudeIndicatorState),
+            heading_indicator=create_state(self.heading_indicator,
+                                           HeadingIndicatorState),
+            vertical_speed_indicator=create_state(
+                self.vertical_speed_indicator,
+                VerticalSpeedIndicatorState
+            )
+        )
@@ -0,0 +1,476 @@
+"""
+The huginn.jobs module contains the classes that are used to execute long
+running simulator commands in the simulation loop
+"""
+
+
+from collections import OrderedDict
+from itertools import count
+from threading import Event, Lock
+import logging
+import time
+
+from huginn import configuration
+from huginn.fdm import PropertyError
+from huginn.trajectory import COLUMNS_FORMAT
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+class JobError(Exception):
+    """JobError is raised when a job can't be created"""
+    pass
+
+
+class Job(object):
+    """The Job class contains the state of a simulator command that is
+    executed in the simulation loop"""
+
+    def __init__(self, job_id, command, time_to_run=None, steps=None,
+                 trajectory=None, payload_format=COLUMNS_FORMAT,
+                 checkpoint=None):
+        """Create a new Job object
+
+        Arguments:
+        job_id: the job id
+        command: the command name
+        time_to_run: the time in seconds that the simulator will run
+        steps: the number of steps that the simulator will run
+        trajectory: an optional TrajectoryRecorder that will record the
+            aircraft trajectory while the job runs
+        payload_format: the format of the trajectory payload
+        checkpoint: the name of the checkpoint that will be saved or
+            restored
+        """
+        self.id = job_id
+        self.command = command
+        self.time_to_run = time_to_run
+        self.steps = steps
+        self.checkpoint = checkpoint
+        self.trajectory = trajectory
+        self.payload_format = payload_format
+
+        self.status = JOB_PENDING
+        self.executed_steps = 0
+        self.start_time = None
+        self.end_time = None
+        self.simulation_time = None
+
+        self._finished = Event()
+
+    @property
+    def finished(self):
+        """True if the job has finished executing"""
+        return self._finished.is_set()
+
+    @property
+    def progress(self):
+        """The fraction of the job that has been completed"""
+        if self.status == JOB_COMPLETED:
+            return 1.0
+
+        # the jobs that have been cancelled before they started haven't
+        # executed anything
+        if self.status == JOB_PENDING or self.start_time is None:
+            return 0.0
+
+        if self.steps is not None:
+            return float(self.executed_steps) / self.steps
+
+        if not self.time_to_run:
+            return 0.0
+
+        elapsed = self.simulation_time - self.start_time
+
+        return min(1.0, max(0.0, elapsed / self.time_to_run))
+
+    def wait(self, timeout=None):
+        """Wait until the job has finished. Returns True if the job has
+        finished
+
+        Arguments:
+        timeout: the maximum time to wait in seconds
+        """
+        return self._finished.wait(timeout)
+
+    def start(self, simulation_time):
+        """Mark the job as running
+
+        Arguments:
+        simulation_time: the simulation time when the job starts
+        """
+        self.status = JOB_RUNNING
+        self.start_time = simulation_time
+        self.simulation_time = simulation_time
+
+        if self.time_to_run is not None:
+            self.end_time = simulation_time + self.time_to_run
+
+    def finish(self, status):
+        """Mark the job as finished
+
+        Arguments:
+        status: the final status of the job
+        """
+        self.status = status
+        self._finished.set()
+
+    def is_done(self, simulation_time):
+        """Check if the job has executed all of its steps
+
+        Arguments:
+        simulation_time: the current simulation time
+        """
+        if self.steps is not None:
+            return self.executed_steps >= self.steps
+
+        return simulation_time > self.end_time
+
+    def to_dict(self, include_trajectory=False):
+        """Returns a dictionary with the job data
+
+        Arguments:
+        include_trajectory: add the recorded trajectory when the job has
+            completed
+        """
+        job_data = {
+            "id": self.id,
+            "command": self.command,
+            "status": self.status,
+            "progress": self.progress,
+            "time_to_run": self.time_to_run,
+            "steps": self.steps,
+            "executed_steps": self.executed_steps,
+            "start_time": self.start_time,
+            "simulation_time": self.simulation_time
+        }
+
+        if (include_trajectory and self.trajectory is not None and
+                self.status == JOB_COMPLETED):
+            job_data["trajectory"] = self.trajectory.get_payload(
+                self.payload_format)
+
+        return job_data
+
+
+class PropertyRead(object):
+    """The PropertyRead class contains a request to read the values of JSBSim
+    properties in the simulation loop"""
+
+    def __init__(self, properties):
+        """Create a new PropertyRead object
+
+        Arguments:
+        properties: a list with the property names
+        """
+        self.properties = properties
+        self.values = None
+        self.error = None
+
+        self._finished = Event()
+
+    @property
+    def finished(self):
+        """True if the property values have been read"""
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Wait until the property values have been read. Returns True if
+        the request has finished
+
+        Arguments:
+        timeout: the maximum time to wait in seconds
+        """
+        return self._finished.wait(timeout)
+
+    def finish(self, values=None, error=None):
+        """Store the property values or the error of the request
+
+        Arguments:
+        values: a dictionary with the property values
+        error: the error message if the values couldn't be read
+        """
+        self.values = values
+        self.error = error
+
+        self._finished.set()
+
+
+class JobQueue(object):
+    """The JobQueue holds the simulator jobs that have been submitted and
+    executes them in the simulation loop.
+
+    Jobs are submitted from any thread but they are only executed by the
+    process method, which must be called by the loop that runs the
+    simulator. The jobs are executed one after the other and every call to
+    process executes steps only at step boundaries and for a limited time,
+    so the other simulator servers keep running.
+    """
+
+    def __init__(self, simulator,
+                 max_tick_duration=configuration.MAX_TICK_DURATION,
+                 max_finished_jobs=configuration.MAX_FINISHED_JOBS,
+                 clock=time.time):
+        """Create a new JobQueue object
+
+        Arguments:
+        simulator: the Simulator object
+        max_tick_duration: the maximum time in seconds that a call to the
+            process method will execute simulation steps
+        max_finished_jobs: the number of finished jobs that are kept
+        clock: a function that returns the wall clock time in seconds
+        """
+        self.simulator = simulator
+        self.max_tick_duration = max_tick_duration
+        self.max_finished_jobs = max_finished_jobs
+        self.clock = clock
+
+        self._jobs = OrderedDict()
+        self._pending = []
+        self._property_reads = []
+        self._lock = Lock()
+        self._job_ids = count(1)
+
+    def _add_job(self, job):
+        """Add a job to the queue"""
+        with self._lock:
+            self._jobs[job.id] = job
+            self._pending.append(job)
+
+            finished_jobs = [job_id
+                             for job_id, finished_job in self._jobs.items()
+                             if finished_job.finished]
+
+            for job_id in finished_jobs[:-self.max_finished_jobs or None]:
+                del self._jobs[job_id]
+
+        logger.debug("Added %s job %d", job.command, job.id)
+
+        return job
+
+    def run_for(self, time_to_run, trajectory=None,
+                payload_format=COLUMNS_FORMAT):
+        """Submit a job that will run the simulator for the given time
+
+        Arguments:
+        time_to_run: the time in seconds that the simulator will run
+        trajectory: an optional TrajectoryRecorder that will record the
+            aircraft trajectory
+        payload_format: the format of the trajectory payload
+        """
+        if time_to_run is None or time_to_run < 0.0:
+            raise JobError("Invalid simulator run time length %s" %
+                           time_to_run)
+
+        return self._add_job(Job(next(self._job_ids), "run_for",
+                                 time_to_run=time_to_run,
+                                 trajectory=trajectory,
+                                 payload_format=payload_format))
+
+    def run_steps(self, steps, trajectory=None,
+                  payload_format=COLUMNS_FORMAT):
+        """Submit a job that will run the given number of simulation steps
+
+        Arguments:
+        steps: the number of steps
+        trajectory: an optional TrajectoryRecorder that will record the
+            aircraft trajectory
+        payload_format: the format of the trajectory payload
+        """
+        if steps is None or steps < 1:
+            raise JobError("Invalid number of steps %s" % steps)
+
+        return self._add_job(Job(next(self._job_ids), "run_steps",
+                                 steps=steps, trajectory=trajectory,
+                                 payload_format=payload_format))
+
+    def save_checkpoint(self, name):
+        """Submit a job that will store the state of the simulation in a
+        checkpoint
+
+        Arguments:
+        name: the checkpoint name
+        """
+        return self._add_job(Job(next(self._job_ids), "save_checkpoint",
+                                 checkpoint=name))
+
+    def is_saving_checkpoint(self, name):
+        """Returns True if a pending job will save the checkpoint with the
+        given name
+
+        Arguments:
+        name: the checkpoint name
+        """
+        with self._lock:
+            return any(job.command == "save_checkpoint" and
+                       job.checkpoint == name
+                       for job in self._pending)
+
+    def restore_checkpoint(self, name):
+        """Submit a job that will restore the simulation to a saved
+        checkpoint
+
+        Arguments:
+        name: the checkpoint name
+        """
+        return self._add_job(Job(next(self._job_ids), "restore_checkpoint",
+                                 checkpoint=name))
+
+    def read_properties(self, properties):
+        """Submit a request to read the values of JSBSim properties. The
+        values are read by the process_property_reads method between two
+        simulation steps. Returns a PropertyRead object
+
+        Arguments:
+        properties: a list with the property names
+        """
+        property_read = PropertyRead(properties)
+
+        with self._lock:
+            self._property_reads.append(property_read)
+
+        return property_read
+
+    def process_property_reads(self):
+        """Read the values of the submitted property read requests. This
+        method must be called by the loop that runs the simulator"""
+        with self._lock:
+            property_reads = self._property_reads
+            self._property_reads = []
+
+        for property_read in property_reads:
+            try:
+                values = self.simulator.get_property_values(
+                    property_read.properties)
+            except PropertyError as e:
+                property_read.finish(error=str(e))
+            else:
+                property_read.finish(values)
+
+    def get(self, job_id):
+        """Returns the job with the given id or None if it doesn't exist"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_jobs(self):
+        """Returns a list with the jobs"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        """Cancel a job. Returns False if the job doesn't exist or has
+        already finished
+
+        Arguments:
+        job_id: the job id
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+            if job is None or job.finished:
+                return False
+
+            self._pending.remove(job)
+            job.finish(JOB_CANCELLED)
+
+        logger.debug("Cancelled job %d", job_id)
+
+        return True
+
+    def is_empty(self):
+        """Returns True if there are no jobs to execute"""
+        with self._lock:
+            return len(self._pending) == 0
+
+    def process(self):
+        """Execute the submitted jobs. Returns False if the simulator has
+        failed to run"""
+        start = self.clock()
+        simulator = self.simulator
+
+        while self.clock() - start < self.max_tick_duration:
+            with self._lock:
+                if not self._pending:
+                    return True
+
+                job = self._pending[0]
+
+            if job.command == "save_checkpoint":
+                self._save_checkpoint(job)
+                continue
+
+            if job.command == "restore_checkpoint":
+                self._restore_checkpoint(job)
+                continue
+
+            if job.status == JOB_PENDING:
+                job.start(simulator.simulation_time)
+
+                if job.trajectory is not None:
+                    job.trajectory.start(simulator)
+
+            if job.is_done(simulator.simulation_time) or simulator.crashed:
+                self._finish_job(job, JOB_COMPLETED)
+                continue
+
+            if not simulator.step():
+                logger.error("The simulator has failed to execute job %d",
+                             job.id)
+                self._finish_job(job, JOB_FAILED)
+                return False
+
+            job.executed_steps += 1
+            job.simulation_time = simulator.simulation_time
+
+            if job.trajectory is not None:
+                job.trajectory(simulator)
+
+        return True
+
+    def _save_checkpoint(self, job):
+        """Execute a save_checkpoint job"""
+        simulator = self.simulator
+
+        job.start(simulator.simulation_time)
+
+        if simulator.save_checkpoint(job.checkpoint):
+            status = JOB_COMPLETED
+        else:
+            status = JOB_FAILED
+
+        job.simulation_time = simulator.simulation_time
+
+        self._finish_job(job, status)
+
+    def _restore_checkpoint(self, job):
+        """Execute a restore_checkpoint job"""
+        simulator = self.simulator
+
+        job.start(simulator.simulation_time)
+
+        if simulator.restore_checkpoint(job.checkpoint):
+            status = JOB_COMPLETED
+        else:
+            status = JOB_FAILED
+
+        job.simulation_time = simulator.simulation_time
+
+        self._finish_job(job, status)
+
+    def _finish_job(self, job, status):
+        """Remove the job from the pending jobs"""
+        with self._lock:
+            if job in self._pending:
+                self._pending.remove(job)
+
+            job.finish(status)
+
+        logger.debug("Job %d has finished with status %s", job.id, status)
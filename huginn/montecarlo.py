@@ -0,0 +1,438 @@
+"""
+The huginn.montecarlo module contains classes and functions that are used to
+execute a large number of simulations with perturbed initial conditions and
+sensor noise parameters in parallel
+"""
+
+
+import csv
+import logging
+import time
+from itertools import product
+from multiprocessing import Pool
+from os import path
+from random import Random
+
+from huginn.batch import load_controller
+from huginn.fdm import InitialCondition, TRIM_MODES
+from huginn.simulator import SimulationBuilder
+
+
+logger = logging.getLogger(__name__)
+
+
+INITIAL_CONDITION_PARAMETERS = ["latitude", "longitude", "altitude",
+                                "airspeed", "heading"]
+
+TRIM_MODE_PARAMETER = "trim_mode"
+
+# sensor noise parameters are given in the form sensors.<sensor>.<attribute>
+# for example sensors.accelerometer.x_noise_sigma
+SENSOR_PARAMETER_PREFIX = "sensors."
+
+SUMMARY_METRICS = ["result", "crashed", "simulation_time", "wall_time",
+                   "final_latitude", "final_longitude", "final_altitude",
+                   "final_airspeed", "final_heading", "min_altitude",
+                   "max_altitude", "min_airspeed", "max_airspeed"]
+
+
+class MonteCarloError(Exception):
+    """MonteCarloError is raised when a Monte Carlo sweep is not valid"""
+    pass
+
+
+def _validate_parameter(name):
+    """Check if the parameter name is supported"""
+    if name in INITIAL_CONDITION_PARAMETERS:
+        return
+
+    if name == TRIM_MODE_PARAMETER:
+        return
+
+    if name.startswith(SENSOR_PARAMETER_PREFIX) and name.count(".") == 2:
+        return
+
+    raise MonteCarloError("Invalid parameter %s" % name)
+
+
+def create_grid_runs(parameters):
+    """Create the runs of a sweep over every combination of the parameter
+    values
+
+    Arguments:
+    parameters: a dictionary with the parameter names as keys. The values
+        are either a list with the parameter values or a single value
+    """
+    names = sorted(parameters.keys())
+
+    for name in names:
+        _validate_parameter(name)
+
+    values = []
+    for name in names:
+        value = parameters[name]
+        values.append(value if isinstance(value, list) else [value])
+
+    return [dict(zip(names, combination), run_id=run_id)
+            for run_id, combination in enumerate(product(*values))]
+
+
+def create_random_runs(parameters, runs, seed=None):
+    """Create the runs of a sweep with randomly sampled parameter values.
+    The same seed will always create the same runs.
+
+    Arguments:
+    parameters: a dictionary with the parameter names as keys. The values
+        are either a dictionary with a min and max value for a uniformly
+        sampled parameter, a list of values from which one is selected or
+        a single value
+    runs: the number of runs
+    seed: the random number generator seed
+    """
+    names = sorted(parameters.keys())
+
+    for name in names:
+        _validate_parameter(name)
+
+    generator = Random(seed)
+
+    sweep = []
+    for run_id in range(runs):
+        run = {"run_id": run_id}
+
+        for name in names:
+            value = parameters[name]
+
+            if isinstance(value, dict):
+                run[name] = generator.uniform(value["min"], value["max"])
+            elif isinstance(value, list):
+                run[name] = generator.choice(value)
+            else:
+                run[name] = value
+
+        sweep.append(run)
+
+    return sweep
+
+
+def create_runs(sweep):
+    """Create the runs of a sweep definition
+
+    Arguments:
+    sweep: a dictionary with the sweep mode, which is either grid or random,
+        the parameters and for random sweeps the number of runs and the
+        random number generator seed
+    """
+    mode = sweep.get("mode", "grid")
+    parameters = sweep.get("parameters", {})
+
+    if mode == "grid":
+        return create_grid_runs(parameters)
+    elif mode == "random":
+        if "runs" not in sweep:
+            raise MonteCarloError("The number of runs of the random sweep "
+                                  "has not been set")
+
+        return create_random_runs(parameters, sweep["runs"],
+                                  sweep.get("seed"))
+
+    raise MonteCarloError("Invalid sweep mode %s" % mode)
+
+
+class RunStatistics(object):
+    """The RunStatistics object collects the summary metrics of a run"""
+
+    def __init__(self):
+        self.min_altitude = None
+        self.max_altitude = None
+        self.min_airspeed = None
+        self.max_airspeed = None
+
+    def __call__(self, simulator):
+        fdm = simulator.state.fdm
+        altitude = fdm.position.altitude
+        airspeed = fdm.velocities.true_airspeed
+
+        if self.min_altitude is None:
+            self.min_altitude = self.max_altitude = altitude
+            self.min_airspeed = self.max_airspeed = airspeed
+            return
+
+        self.min_altitude = min(self.min_altitude, altitude)
+        self.max_altitude = max(self.max_altitude, altitude)
+        self.min_airspeed = min(self.min_airspeed, airspeed)
+        self.max_airspeed = max(self.max_airspeed, airspeed)
+
+
+class MonteCarloWorker(object):
+    """The MonteCarloWorker executes the runs of a sweep on a single
+    simulator. The simulator is reset to the initial condition of every run
+    so the aircraft model has to be loaded only once"""
+
+    def __init__(self, simulator, duration, controller=None,
+                 sensor_seed=None):
+        """Constructor for the MonteCarloWorker object
+
+        Arguments:
+        simulator: the Simulator object
+        duration: the simulation time of every run in seconds
+        controller: an optional callable that will be called with the
+            simulator as its argument after every simulation step
+        sensor_seed: the seed of the sensor noise. The sensors of every run
+            are seeded with this value plus the run id so the sensor noise
+            of a run is the same on every worker
+        """
+        self.simulator = simulator
+        self.duration = duration
+        self.controller = controller
+        self.sensor_seed = sensor_seed
+        self._initial_condition = InitialCondition(simulator.fdmexec)
+        self._default_trim_mode = simulator.trim_mode
+        self._default_initial_condition = dict(
+            (name, getattr(self._initial_condition, name))
+            for name in INITIAL_CONDITION_PARAMETERS
+        )
+        self._default_sensor_parameters = {}
+
+    def _get_sensor(self, name):
+        _, sensor_name, attribute = name.split(".")
+
+        sensor = getattr(self.simulator.aircraft.sensors, sensor_name, None)
+
+        if sensor is None or not hasattr(sensor, attribute):
+            raise MonteCarloError("Invalid sensor parameter %s" % name)
+
+        return sensor, attribute
+
+    def _setup(self, run):
+        """Set the initial condition, the trim mode and the sensor noise
+        parameters of the run. Parameters that are not set by the run will
+        use the values that the simulator was created with"""
+        for name in INITIAL_CONDITION_PARAMETERS:
+            value = run.get(name, self._default_initial_condition[name])
+            setattr(self._initial_condition, name, value)
+
+        trim_mode = run.get(TRIM_MODE_PARAMETER)
+        if trim_mode is None:
+            self.simulator.trim_mode = self._default_trim_mode
+        else:
+            self.simulator.trim_mode = TRIM_MODES[trim_mode]
+
+        for name, value in self._default_sensor_parameters.items():
+            sensor, attribute = self._get_sensor(name)
+            setattr(sensor, attribute, value)
+
+        for name, value in run.items():
+            if not name.startswith(SENSOR_PARAMETER_PREFIX):
+                continue
+
+            sensor, attribute = self._get_sensor(name)
+
+            if name not in self._default_sensor_parameters:
+                self._default_sensor_parameters[name] = getattr(sensor,
+                                                                attribute)
+
+            setattr(sensor, attribute, value)
+
+    def execute(self, run):
+        """Execute a run and return the summary metrics
+
+        Arguments:
+        run: a dictionary with the run parameters
+        """
+        start_time = time.time()
+
+        self._setup(run)
+
+        if self.sensor_seed is not None:
+            self.simulator.aircraft.sensors.seed(self.sensor_seed +
+                                                 run["run_id"])
+
+        self.simulator.start_paused = False
+        result = self.simulator.reset()
+
+        statistics = RunStatistics()
+
+        def step_callback(simulator):
+            statistics(simulator)
+
+            if self.controller:
+                self.controller(simulator)
+
+        if result:
+            statistics(self.simulator)
+            result = self.simulator.run_for(self.duration, step_callback)
+
+        fdm = self.simulator.state.fdm
+
+        summary = dict(run)
+        summary.update({
+            "result": result,
+            "crashed": self.simulator.crashed,
+            "simulation_time": fdm.time,
+            "wall_time": time.time() - start_time,
+            "final_latitude": fdm.position.latitude,
+            "final_longitude": fdm.position.longitude,
+            "final_altitude": fdm.position.altitude,
+            "final_airspeed": fdm.velocities.true_airspeed,
+            "final_heading": fdm.position.heading,
+            "min_altitude": statistics.min_altitude,
+            "max_altitude": statistics.max_altitude,
+            "min_airspeed": statistics.min_airspeed,
+            "max_airspeed": statistics.max_airspeed
+        })
+
+        return summary
+
+
+# every worker process has its own MonteCarloWorker object
+_worker = None
+
+
+def _initialize_worker(data_path, dt, duration, controller,
+                       sensor_seed=None):
+    """Create the simulator of the worker process"""
+    global _worker
+
+    simulation_builder = SimulationBuilder(data_path)
+    simulation_builder.dt = dt
+
+    simulator = simulation_builder.create_simulator()
+
+    if not simulator:
+        raise MonteCarloError("Failed to create the simulator")
+
+    if controller:
+        controller = load_controller(controller)
+
+    _worker = MonteCarloWorker(simulator, duration, controller, sensor_seed)
+
+
+def _execute_run(run):
+    """Execute a run on the simulator of the worker process"""
+    try:
+        return _worker.execute(run)
+    except Exception:
+        logger.exception("Run %d has failed", run["run_id"])
+
+        summary = dict(run)
+        summary["result"] = False
+
+        return summary
+
+
+def get_result_columns(runs):
+    """Get the result file columns of the given runs"""
+    parameters = set()
+    for run in runs:
+        parameters.update(run.keys())
+
+    parameters.discard("run_id")
+
+    return ["run_id"] + sorted(parameters) + SUMMARY_METRICS
+
+
+def get_completed_runs(output_file):
+    """Get the ids of the runs that have been saved in a result file. The
+    runs that have failed are not included so they will be executed again
+    when the sweep is resumed
+
+    Arguments:
+    output_file: the path to the result file
+    """
+    if not path.exists(output_file):
+        return set()
+
+    with open(output_file, "r") as f:
+        reader = csv.DictReader(f)
+
+        return set(int(row["run_id"]) for row in reader
+                   if row["run_id"] and row.get("result") != "False")
+
+
+class MonteCarloRunner(object):
+    """The MonteCarloRunner executes the runs of a sweep on a pool of worker
+    processes and saves the summary metrics of every run in a csv file as
+    soon as the run has completed. Runs that already exist in the result
+    file are skipped so an interrupted sweep can be resumed. The failed runs
+    are executed again"""
+
+    def __init__(self, runs, output_file, data_path, duration, dt,
+                 controller=None, processes=None, sensor_seed=None):
+        """Constructor for the MonteCarloRunner object
+
+        Arguments:
+        runs: a list with the run parameter dictionaries
+        output_file: the path to the result file
+        data_path: the JSBSim data path
+        duration: the simulation time of every run in seconds
+        dt: the simulation time step
+        controller: an optional controller in the format accepted by
+            huginn.batch.load_controller
+        processes: the number of worker processes. All of the cpu cores will
+            be used if this is None
+        sensor_seed: the seed of the sensor noise or None to use random
+            sensor noise
+        """
+        self.runs = runs
+        self.output_file = output_file
+        self.data_path = data_path
+        self.duration = duration
+        self.dt = dt
+        self.controller = controller
+        self.processes = processes
+        self.sensor_seed = sensor_seed
+
+    def run(self):
+        """Execute the runs that haven't been completed
+
+        Returns the number of runs that were executed
+        """
+        completed_runs = get_completed_runs(self.output_file)
+
+        pending_runs = [run for run in self.runs
+                        if run["run_id"] not in completed_runs]
+
+        logger.info("%d runs have been completed, %d runs are pending",
+                    len(completed_runs), len(pending_runs))
+
+        if not pending_runs:
+            return 0
+
+        columns = get_result_columns(self.runs)
+        write_header = (not path.exists(self.output_file) or
+                        path.getsize(self.output_file) == 0)
+
+        pool = Pool(self.processes,
+                    _initialize_worker,
+                    (self.data_path, self.dt, self.duration, self.controller,
+                     self.sensor_seed))
+
+        executed_runs = 0
+
+        try:
+            with open(self.output_file, "a") as f:
+                writer = csv.DictWriter(f, columns, extrasaction="ignore")
+
+                if write_header:
+                    writer.writeheader()
+
+                for summary in pool.imap_unordered(_execute_run,
+                                                   pending_runs):
+                    writer.writerow(summary)
+                    f.flush()
+
+                    executed_runs += 1
+
+                    logger.debug("Run %d has completed (%d/%d)",
+                                 summary["run_id"], executed_runs,
+                                 len(pending_runs))
+
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+        return executed_runs
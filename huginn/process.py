@@ -0,0 +1,780 @@
+"""
+The huginn.process module contains classes that are used to run the
+simulator in a dedicated process. The simulator process publishes its state
+through shared memory and receives the controls and the simulator commands
+through a queue, so the network interfaces that run in the main process
+don't affect the timing of the simulation steps.
+"""
+
+
+import ctypes
+import logging
+import pickle
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import Process, Queue, RawArray, RawValue
+from threading import Lock, local
+
+try:
+    from Queue import Empty
+except ImportError:
+    from queue import Empty
+
+from huginn import configuration
+from huginn.fdm import PropertyError
+from huginn.protocols import ControlsProtocol
+from huginn.scheduler import RealTimeScheduler
+from huginn.sensors import SensorsState
+from huginn.trajectory import COLUMNS_FORMAT
+
+
+logger = logging.getLogger(__name__)
+
+
+PublishedState = namedtuple(
+    "PublishedState",
+    ["simulator", "sensors", "instruments", "aircraft_type", "dt", "paused",
+     "crashed", "start_paused", "scheduler"]
+)
+
+
+# the initial condition values that can be read and updated through the
+# simulator process
+INITIAL_CONDITION_FIELDS = ("latitude", "longitude", "altitude", "airspeed",
+                            "heading")
+
+
+class SimulatorProcessError(Exception):
+    """SimulatorProcessError is raised when the simulator process fails"""
+    pass
+
+
+class SharedStateBuffer(object):
+    """The SharedStateBuffer is a shared memory buffer with a single writer
+    and many readers.
+
+    The writer never waits for the readers. A sequence number is incremented
+    before and after every write, so a reader knows that the data it has
+    read are valid if the sequence number was even and didn't change while
+    it was reading them.
+    """
+
+    def __init__(self, size=configuration.SHARED_STATE_BUFFER_SIZE):
+        """Constructor for the SharedStateBuffer object
+
+        Arguments:
+        size: the size of the buffer in bytes
+        """
+        self.size = size
+        self._sequence = RawValue(ctypes.c_ulonglong, 0)
+        self._length = RawValue(ctypes.c_ulonglong, 0)
+        self._buffer = RawArray(ctypes.c_char, size)
+
+    @property
+    def sequence(self):
+        """The sequence number of the last write. It is 0 if no data have
+        been written"""
+        return self._sequence.value
+
+    def write(self, data):
+        """Write the data to the buffer
+
+        Arguments:
+        data: a byte string
+        """
+        length = len(data)
+
+        if length > self.size:
+            raise SimulatorProcessError("The data don't fit in the shared "
+                                        "state buffer")
+
+        self._sequence.value += 1
+        ctypes.memmove(self._buffer, data, length)
+        self._length.value = length
+        self._sequence.value += 1
+
+    def read(self):
+        """Read the buffer
+
+        Returns a tuple with the sequence number and the data
+        """
+        while True:
+            sequence = self._sequence.value
+
+            if sequence % 2:
+                # a write is in progress
+                time.sleep(0)
+                continue
+
+            data = ctypes.string_at(self._buffer, self._length.value)
+
+            if self._sequence.value == sequence:
+                return sequence, data
+
+
+class SimulatorProcessRunner(object):
+    """The SimulatorProcessRunner executes the simulator in the simulator
+    process"""
+
+    def __init__(self, simulator, shared_state, commands, responses,
+                 max_steps_per_tick=configuration.MAX_STEPS_PER_TICK):
+        """Constructor for the SimulatorProcessRunner object
+
+        Arguments:
+        simulator: the Simulator object
+        shared_state: the SharedStateBuffer that the state is published to
+        commands: the queue that the commands are received from
+        responses: the queue that the command responses are send to
+        max_steps_per_tick: the maximum number of simulation steps that will
+            be executed in a single tick
+        """
+        self.simulator = simulator
+        self.shared_state = shared_state
+        self.commands = commands
+        self.responses = responses
+        self.scheduler = RealTimeScheduler(simulator, max_steps_per_tick)
+        self.running = False
+
+    def execute_command(self, command, params):
+        """Execute a simulator command
+
+        Arguments:
+        command: the command name
+        params: a dictionary with the command parameters
+        """
+        simulator = self.simulator
+
+        if command == "set_controls":
+            simulator.set_aircraft_controls(**params)
+        elif command == "pause":
+            simulator.pause()
+        elif command == "resume":
+            simulator.resume()
+        elif command == "reset":
+            return simulator.reset()
+        elif command == "step":
+            return simulator.step()
+        elif command == "run_for":
+            return simulator.run_for(params["time_to_run"])
+        elif command == "run_steps":
+            return simulator.run_steps(params["steps"])
+        elif command == "record_trajectory":
+            return simulator.record_trajectory(**params)
+        elif command == "sensor_history":
+            return getattr(simulator.aircraft.sensors,
+                           params["sensor"]).history
+        elif command == "get_property_values":
+            try:
+                return simulator.get_property_values(params["properties"])
+            except PropertyError as e:
+                # the error is sent to the main process so that the client
+                # is notified about the unknown properties
+                return e
+        elif command == "get_initial_condition":
+            initial_condition = simulator.initial_condition
+
+            return dict((name, getattr(initial_condition, name))
+                        for name in INITIAL_CONDITION_FIELDS)
+        elif command == "update_initial_condition":
+            for name, value in params.items():
+                if name not in INITIAL_CONDITION_FIELDS:
+                    logger.error("Invalid initial condition %s", name)
+                    return False
+
+                setattr(simulator.initial_condition, name, value)
+        elif command == "save_checkpoint":
+            return simulator.save_checkpoint(params["name"])
+        elif command == "restore_checkpoint":
+            return simulator.restore_checkpoint(params["name"])
+        elif command == "start_paused":
+            simulator.start_paused = params["start_paused"]
+        elif command == "time_scale":
+            self.scheduler.time_scale = params["time_scale"]
+        elif command == "stop":
+            self.running = False
+        else:
+            logger.error("Unknown simulator process command %s", command)
+            return False
+
+        return True
+
+    def process_commands(self):
+        """Execute the commands that have been received"""
+        while True:
+            try:
+                command, params, respond = self.commands.get_nowait()
+            except Empty:
+                return
+
+            try:
+                result = self.execute_command(command, params)
+            except Exception:
+                logger.exception("Failed to execute command %s", command)
+                result = False
+
+            if respond:
+                # publish the state before responding so that the effects
+                # of the command are visible when the response is received
+                self.publish()
+                self.responses.put(result)
+
+    def publish(self):
+        """Write the simulator state to the shared memory"""
+        simulator = self.simulator
+        aircraft = simulator.aircraft
+
+        published_state = PublishedState(
+            simulator=simulator.state,
+            sensors=aircraft.sensors.get_state(),
+            instruments=aircraft.instruments.get_state(),
+            aircraft_type=aircraft.type,
+            dt=simulator.dt,
+            paused=simulator.is_paused(),
+            crashed=simulator.crashed,
+            start_paused=simulator.start_paused,
+            scheduler=self.scheduler.get_statistics()
+        )
+
+        self.shared_state.write(
+            pickle.dumps(published_state, pickle.HIGHEST_PROTOCOL)
+        )
+
+    def run(self):
+        """Run the simulator until the stop command is received"""
+        self.running = True
+        tick_interval = self.simulator.dt
+        next_tick = time.time()
+
+        self.publish()
+
+        while self.running:
+            self.process_commands()
+
+            if not self.scheduler.tick():
+                logger.error("The simulator has failed to run")
+                return False
+
+            self.publish()
+
+            next_tick += tick_interval
+            delay = next_tick - time.time()
+
+            if delay > 0.0:
+                time.sleep(delay)
+            else:
+                next_tick = time.time()
+
+        return True
+
+
+def _run_simulator_process(simulation_builder, shared_state, commands,
+                           responses, max_steps_per_tick):
+    """The entry point of the simulator process"""
+    simulator = simulation_builder.create_simulator()
+
+    if not simulator:
+        logger.error("Failed to create the simulator")
+        return
+
+    runner = SimulatorProcessRunner(simulator, shared_state, commands,
+                                    responses, max_steps_per_tick)
+
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        pass
+
+
+class StateProxy(object):
+    """The StateProxy returns the attributes of the latest published state
+    object. Attributes that are state objects themselves are returned as
+    StateProxy objects, so references to them always return the latest
+    values"""
+
+    def __init__(self, get_state):
+        """Constructor for the StateProxy object
+
+        Arguments:
+        get_state: a function that returns the latest state object
+        """
+        self._get_state = get_state
+
+    def __getattr__(self, name):
+        value = getattr(self._get_state(), name)
+
+        if hasattr(value, "_fields"):
+            return StateProxy(lambda: getattr(self._get_state(), name))
+
+        return value
+
+
+class SensorProxy(StateProxy):
+    """The SensorProxy returns the latest published measurements of a sensor
+    of the simulator process. The sensor history isn't published, so it is
+    requested from the simulator process"""
+
+    def __init__(self, simulator_process, name):
+        """Constructor for the SensorProxy object
+
+        Arguments:
+        simulator_process: the SimulatorProcess object
+        name: the sensor name
+        """
+        StateProxy.__init__(
+            self,
+            lambda: getattr(simulator_process.published_state.sensors, name)
+        )
+
+        self.simulator_process = simulator_process
+        self.name = name
+
+    @property
+    def history(self):
+        """A copy of the SensorHistory of the sensor"""
+        return self.simulator_process.get_sensor_history(self.name)
+
+
+class SensorsProxy(object):
+    """The SensorsProxy provides the sensors of the simulator process"""
+
+    def __init__(self, simulator_process):
+        """Constructor for the SensorsProxy object
+
+        Arguments:
+        simulator_process: the SimulatorProcess object
+        """
+        for name in SensorsState._fields:
+            setattr(self, name, SensorProxy(simulator_process, name))
+
+
+class AircraftProxy(object):
+    """The AircraftProxy provides the aircraft data of the simulator
+    process"""
+
+    def __init__(self, simulator_process):
+        """Constructor for the AircraftProxy object
+
+        Arguments:
+        simulator_process: the SimulatorProcess object
+        """
+        self.simulator_process = simulator_process
+
+        self.engine = StateProxy(
+            lambda: simulator_process.state.aircraft.engine)
+        self.controls = StateProxy(
+            lambda: simulator_process.state.aircraft.controls)
+        self.sensors = SensorsProxy(simulator_process)
+        self.instruments = StateProxy(
+            lambda: simulator_process.published_state.instruments)
+
+    def snapshot(self):
+        """Returns a context manager that serves every aircraft value that is
+        read in the current thread from the same published state"""
+        return self.simulator_process.snapshot()
+
+    @property
+    def type(self):
+        """The aircraft type"""
+        return self.simulator_process.published_state.aircraft_type
+
+
+def _initial_condition_property(name):
+    """Create a property that gets/sets an initial condition value of the
+    simulator process"""
+    def get_value(self):
+        return self.simulator_process.get_initial_condition()[name]
+
+    def set_value(self, value):
+        self.simulator_process.update_initial_condition({name: value})
+
+    return property(get_value, set_value,
+                    doc="The %s initial condition" % name)
+
+
+class InitialConditionProxy(object):
+    """The InitialConditionProxy gets/sets the initial conditions of the
+    simulator process. It has the same interface as the InitialCondition
+    object"""
+
+    def __init__(self, simulator_process):
+        """Constructor for the InitialConditionProxy object
+
+        Arguments:
+        simulator_process: the SimulatorProcess object
+        """
+        self.simulator_process = simulator_process
+
+    latitude = _initial_condition_property("latitude")
+    longitude = _initial_condition_property("longitude")
+    altitude = _initial_condition_property("altitude")
+    airspeed = _initial_condition_property("airspeed")
+    heading = _initial_condition_property("heading")
+
+
+class SchedulerProxy(object):
+    """The SchedulerProxy provides the statistics and the time scale of the
+    scheduler of the simulator process"""
+
+    def __init__(self, simulator_process):
+        """Constructor for the SchedulerProxy object
+
+        Arguments:
+        simulator_process: the SimulatorProcess object
+        """
+        self.simulator_process = simulator_process
+
+    @property
+    def time_scale(self):
+        """The time scale of the simulator process scheduler"""
+        return self.get_statistics()["time_scale"]
+
+    @time_scale.setter
+    def time_scale(self, value):
+        """Set the time scale of the simulator process scheduler
+
+        Arguments:
+        value: the time scale or None to run the simulation as fast as
+            possible
+        """
+        if value is not None and value <= 0.0:
+            raise ValueError("Invalid time scale %s" % value)
+
+        self.simulator_process._execute_command("time_scale",
+                                                {"time_scale": value})
+
+    def get_statistics(self):
+        """Return a dictionary with the scheduler statistics"""
+        return self.simulator_process.published_state.scheduler
+
+
+class SimulatorProcess(object):
+    """The SimulatorProcess runs the simulator in a dedicated process. It
+    has the same interface as the Simulator object so that it can be used
+    by the simulator servers. The sensor and instrument values are those
+    that were published after the last simulator process tick.
+
+    Every read returns the values of the latest published state, so a
+    client that reads several values must read them inside a snapshot block
+    in order to get values of the same tick."""
+
+    # the flight dynamics model isn't available outside of the simulator
+    # process
+    fdmexec = None
+
+    def __init__(self, simulation_builder,
+                 max_steps_per_tick=configuration.MAX_STEPS_PER_TICK):
+        """Constructor for the SimulatorProcess object
+
+        Arguments:
+        simulation_builder: the SimulationBuilder that will be used to
+            create the simulator in the simulator process
+        max_steps_per_tick: the maximum number of simulation steps that will
+            be executed in a single tick
+        """
+        self.simulation_builder = simulation_builder
+        self.max_steps_per_tick = max_steps_per_tick
+
+        self._shared_state = SharedStateBuffer()
+        self._commands = Queue()
+        self._responses = Queue()
+        self._command_lock = Lock()
+        self._process = None
+        self._published_state = (0, None)
+        self._snapshots = local()
+
+        self.aircraft = AircraftProxy(self)
+        self.scheduler = SchedulerProxy(self)
+        self.initial_condition = InitialConditionProxy(self)
+
+    def start(self, timeout=configuration.SIMULATOR_PROCESS_START_TIMEOUT):
+        """Start the simulator process and wait until the simulator state
+        has been published
+
+        Arguments:
+        timeout: the maximum time in seconds to wait for the simulator
+        """
+        self._process = Process(
+            target=_run_simulator_process,
+            args=(self.simulation_builder, self._shared_state,
+                  self._commands, self._responses, self.max_steps_per_tick)
+        )
+        self._process.daemon = True
+        self._process.start()
+
+        start_time = time.time()
+
+        while self._shared_state.sequence == 0:
+            if not self._process.is_alive():
+                raise SimulatorProcessError("The simulator process has "
+                                            "exited")
+
+            if time.time() - start_time > timeout:
+                self.stop()
+                raise SimulatorProcessError("The simulator process failed "
+                                            "to start")
+
+            time.sleep(0.01)
+
+    def stop(self):
+        """Stop the simulator process"""
+        if not self._process:
+            return
+
+        if self._process.is_alive():
+            self._commands.put(("stop", None, False))
+            self._process.join(1.0)
+
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+
+        self._process = None
+
+    def is_alive(self):
+        """Check if the simulator process is running"""
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def published_state(self):
+        """The PublishedState object that the simulator process published
+        last, or the snapshot state if it is read inside a snapshot block"""
+        published_state = getattr(self._snapshots, "state", None)
+
+        if published_state is not None:
+            return published_state
+
+        sequence, published_state = self._published_state
+
+        if sequence == self._shared_state.sequence:
+            return published_state
+
+        sequence, data = self._shared_state.read()
+        published_state = pickle.loads(data)
+        self._published_state = (sequence, published_state)
+
+        return published_state
+
+    @contextmanager
+    def snapshot(self):
+        """Serve every read of the simulator state in the current thread from
+        the state that was published when the block started. The nested
+        blocks use the snapshot of the outer block"""
+        if getattr(self._snapshots, "state", None) is not None:
+            yield self
+            return
+
+        self._snapshots.state = self.published_state
+
+        try:
+            yield self
+        finally:
+            self._snapshots.state = None
+
+    def _send_command(self, command, params=None):
+        """Send a command to the simulator process without waiting for the
+        response"""
+        self._commands.put((command, params, False))
+
+    def _execute_command(self, command, params=None):
+        """Send a command to the simulator process and wait for the
+        response"""
+        with self._command_lock:
+            self._commands.put((command, params, True))
+
+            while True:
+                try:
+                    return self._responses.get(timeout=1.0)
+                except Empty:
+                    if not self.is_alive():
+                        raise SimulatorProcessError("The simulator process "
+                                                    "has exited")
+
+    @property
+    def state(self):
+        """The SimulatorState snapshot that was published last"""
+        return self.published_state.simulator
+
+    @property
+    def crashed(self):
+        """Returns True if the aircraft has crashed"""
+        return self.published_state.crashed
+
+    @property
+    def dt(self):
+        """The simulation time step"""
+        return self.published_state.dt
+
+    @property
+    def simulation_time(self):
+        """The current simulation time"""
+        return self.published_state.simulator.fdm.time
+
+    @property
+    def start_paused(self):
+        """True if the simulator is paused after a reset"""
+        return self.published_state.start_paused
+
+    @start_paused.setter
+    def start_paused(self, value):
+        self._execute_command("start_paused", {"start_paused": value})
+
+    def pause(self):
+        """Pause the simulator"""
+        self._execute_command("pause")
+
+    def resume(self):
+        """Resume the simulation"""
+        self._execute_command("resume")
+
+    def is_paused(self):
+        """Check if the simulator is paused"""
+        return self.published_state.paused
+
+    def reset(self):
+        """Reset the simulation"""
+        return self._execute_command("reset")
+
+    def step(self):
+        """Run the simulation one time"""
+        return self._execute_command("step")
+
+    def run_for(self, time_to_run):
+        """Run the simulation for the given time in seconds
+
+        Arguments:
+        time_to_run: the time in seconds that the simulator will run
+        """
+        return self._execute_command("run_for", {"time_to_run": time_to_run})
+
+    def run_steps(self, steps):
+        """Run the given number of simulation steps
+
+        Arguments:
+        steps: the number of simulation steps
+        """
+        return self._execute_command("run_steps", {"steps": steps})
+
+    def record_trajectory(self, properties, time_to_run=None, steps=None,
+                          sample_interval=1,
+                          payload_format=COLUMNS_FORMAT):
+        """Run the simulator for the given time or number of steps and
+        return the recorded values of the given properties
+
+        Arguments:
+        properties: a list with the property names
+        time_to_run: the time in seconds that the simulator will run
+        steps: the number of steps that the simulator will run
+        sample_interval: the number of simulation steps between the samples
+        payload_format: the format of the returned trajectory payload
+        """
+        return self._execute_command("record_trajectory", {
+            "properties": properties,
+            "time_to_run": time_to_run,
+            "steps": steps,
+            "sample_interval": sample_interval,
+            "payload_format": payload_format
+        })
+
+    def get_sensor_history(self, name):
+        """Returns a copy of the SensorHistory of a sensor of the simulator
+        process
+
+        Arguments:
+        name: the sensor name
+        """
+        history = self._execute_command("sensor_history", {"sensor": name})
+
+        if history is False:
+            raise SimulatorProcessError("Failed to get the history of the "
+                                        "sensor %s" % name)
+
+        return history
+
+    def get_property_values(self, properties):
+        """Returns a dictionary with the values of the given JSBSim
+        properties. The values are read by the simulator process between
+        two simulation steps. A PropertyError is raised if a property
+        doesn't exist
+
+        Arguments:
+        properties: a list with the property names
+        """
+        values = self._execute_command("get_property_values",
+                                       {"properties": list(properties)})
+
+        if isinstance(values, PropertyError):
+            raise values
+
+        if values is False:
+            raise SimulatorProcessError("Failed to read the properties")
+
+        return values
+
+    def get_initial_condition(self):
+        """Returns a dictionary with the initial conditions of the simulator
+        process"""
+        initial_condition = self._execute_command("get_initial_condition")
+
+        if initial_condition is False:
+            raise SimulatorProcessError("Failed to get the initial "
+                                        "condition")
+
+        return initial_condition
+
+    def update_initial_condition(self, initial_condition):
+        """Update the initial conditions of the simulator process
+
+        Arguments:
+        initial_condition: a dictionary with the initial condition values
+        """
+        if not self._execute_command("update_initial_condition",
+                                     dict(initial_condition)):
+            raise SimulatorProcessError("Failed to update the initial "
+                                        "condition")
+
+    def save_checkpoint(self, name=configuration.DEFAULT_CHECKPOINT):
+        """Store the current state of the simulation in the simulator
+        process
+
+        Arguments:
+        name: the checkpoint name
+        """
+        return self._execute_command("save_checkpoint", {"name": name})
+
+    def restore_checkpoint(self, name=configuration.DEFAULT_CHECKPOINT):
+        """Restore the simulation to a saved checkpoint
+
+        Arguments:
+        name: the checkpoint name
+        """
+        return self._execute_command("restore_checkpoint", {"name": name})
+
+    def set_aircraft_controls(self, aileron, elevator, rudder, throttle):
+        """Update the aircraft controls. The controls are applied before the
+        next simulator process tick"""
+        self._send_command("set_controls", {"aileron": aileron,
+                                            "elevator": elevator,
+                                            "rudder": rudder,
+                                            "throttle": throttle})
+
+
+class SimulatorProcessControlsProtocol(ControlsProtocol):
+    """The SimulatorProcessControlsProtocol receives the aircraft controls
+    and sends them to the simulator process"""
+
+    def __init__(self, simulator_process,
+                 merge_policy=configuration.CONTROLS_MERGE_POLICY):
+        """Create a new SimulatorProcessControlsProtocol object
+
+        Arguments:
+        simulator_process: the SimulatorProcess object
+        merge_policy: the way that the buffered controls are merged
+        """
+        ControlsProtocol.__init__(self, None, merge_policy)
+
+        self.simulator_process = simulator_process
+
+    def set_aircraft_controls(self, aileron, elevator, rudder, throttle):
+        self.simulator_process.set_aircraft_controls(aileron, elevator,
+                                                     rudder, throttle)
@@ -14,7 +14,7 @@ from google.protobuf import descriptor_pb2
 DESCRIPTOR = _descriptor.FileDescriptor(
   name='fdm.proto',
   package='huginn',
-  serialized_pb='\n\tfdm.proto\x12\x06huginn\"_\n\x03GPS\x12\x10\n\x08latitude\x18\x01 \x02(\x01\x12\x11\n\tlongitude\x18\x02 \x02(\x01\x12\x10\n\x08\x61ltitude\x18\x03 \x02(\x01\x12\x10\n\x08\x61irspeed\x18\x04 \x02(\x01\x12\x0f\n\x07heading\x18\x05 \x02(\x01\"0\n\rAccelerometer\x12\t\n\x01x\x18\x01 \x02(\x01\x12\t\n\x01y\x18\x02 \x02(\x01\x12\t\n\x01z\x18\x03 \x02(\x01\"D\n\tGyroscope\x12\x11\n\troll_rate\x18\x01 \x02(\x01\x12\x12\n\npitch_rate\x18\x02 \x02(\x01\x12\x10\n\x08yaw_rate\x18\x03 \x02(\x01\"\"\n\x0bThermometer\x12\x13\n\x0btemperature\x18\x01 \x02(\x01\"\"\n\x0ePressureSensor\x12\x10\n\x08pressure\x18\x01 \x02(\x01\"\x1d\n\tPitotTube\x12\x10\n\x08pressure\x18\x01 \x02(\x01\"*\n\x06\x45ngine\x12\x0e\n\x06thrust\x18\x01 \x02(\x01\x12\x10\n\x08throttle\x18\x02 \x02(\x01\"O\n\x08\x43ontrols\x12\x0f\n\x07\x61ileron\x18\x01 \x02(\x01\x12\x10\n\x08\x65levator\x18\x02 \x02(\x01\x12\x0e\n\x06rudder\x18\x03 \x02(\x01\x12\x10\n\x08throttle\x18\x04 \x02(\x01\"|\n\x03INS\x12\x0c\n\x04roll\x18\x01 \x02(\x01\x12\r\n\x05pitch\x18\x02 \x02(\x01\x12\x10\n\x08latitude\x18\x03 \x02(\x01\x12\x11\n\tlongitude\x18\x04 \x02(\x01\x12\x10\n\x08\x61ltitude\x18\x05 \x02(\x01\x12\x10\n\x08\x61irspeed\x18\x06 \x02(\x01\x12\x0f\n\x07heading\x18\x07 \x02(\x01\"\x9b\x01\n\rAccelerations\x12\t\n\x01x\x18\x01 \x02(\x01\x12\t\n\x01y\x18\x02 \x02(\x01\x12\t\n\x01z\x18\x03 \x02(\x01\x12\r\n\x05p_dot\x18\x04 \x02(\x01\x12\r\n\x05q_dot\x18\x05 \x02(\x01\x12\r\n\x05r_dot\x18\x06 \x02(\x01\x12\r\n\x05u_dot\x18\x07 \x02(\x01\x12\r\n\x05v_dot\x18\x08 \x02(\x01\x12\r\n\x05w_dot\x18\t \x02(\x01\x12\x0f\n\x07gravity\x18\n \x02(\x01\"\xc9\x01\n\nVelocities\x12\t\n\x01p\x18\x01 \x02(\x01\x12\t\n\x01q\x18\x02 \x02(\x01\x12\t\n\x01r\x18\x03 \x02(\x01\x12\x15\n\rtrue_airspeed\x18\x04 \x02(\x01\x12\x12\n\nclimb_rate\x18\x05 \x02(\x01\x12\t\n\x01u\x18\x06 \x02(\x01\x12\t\n\x01v\x18\x07 \x02(\x01\x12\t\n\x01w\x18\x08 \x02(\x01\x12\x1b\n\x13\x63\x61librated_airspeed\x18\t \x02(\x01\x12\x1b\n\x13\x65quivalent_airspeed\x18\n \x02(\x01\x12\x14\n\x0cground_speed\x18\x0b \x02(\x01\"R\n\x08Position\x12\x10\n\x08latitude\x18\x01 \x02(\x01\x12\x11\n\tlongitude\x18\x02 \x02(\x01\x12\x10\n\x08\x61ltitude\x18\x03 \x02(\x01\x12\x0f\n\x07heading\x18\x04 \x02(\x01\"6\n\x0bOrientation\x12\x0b\n\x03phi\x18\x01 \x02(\x01\x12\r\n\x05theta\x18\x02 \x02(\x01\x12\x0b\n\x03psi\x18\x03 \x02(\x01\"\x9a\x01\n\nAtmosphere\x12\x10\n\x08pressure\x18\x01 \x02(\x01\x12\x1a\n\x12sea_level_pressure\x18\x02 \x02(\x01\x12\x13\n\x0btemperature\x18\x03 \x02(\x01\x12\x1d\n\x15sea_level_temperature\x18\x04 \x02(\x01\x12\x0f\n\x07\x64\x65nsity\x18\x05 \x02(\x01\x12\x19\n\x11sea_level_density\x18\x06 \x02(\x01\"\x9b\x01\n\x06\x46orces\x12\x0e\n\x06x_body\x18\x01 \x02(\x01\x12\x0e\n\x06y_body\x18\x02 \x02(\x01\x12\x0e\n\x06z_body\x18\x03 \x02(\x01\x12\x0e\n\x06x_wind\x18\x04 \x02(\x01\x12\x0e\n\x06y_wind\x18\x05 \x02(\x01\x12\x0e\n\x06z_wind\x18\x06 \x02(\x01\x12\x0f\n\x07x_total\x18\x07 \x02(\x01\x12\x0f\n\x07y_total\x18\x08 \x02(\x01\x12\x0f\n\x07z_total\x18\t \x02(\x01\"\xd7\x04\n\rSimulatorData\x12\x0c\n\x04time\x18\x01 \x02(\x01\x12\x18\n\x03gps\x18\x02 \x02(\x0b\x32\x0b.huginn.GPS\x12,\n\raccelerometer\x18\x03 \x02(\x0b\x32\x15.huginn.Accelerometer\x12$\n\tgyroscope\x18\x04 \x02(\x0b\x32\x11.huginn.Gyroscope\x12(\n\x0bthermometer\x18\x05 \x02(\x0b\x32\x13.huginn.Thermometer\x12/\n\x0fpressure_sensor\x18\x06 \x02(\x0b\x32\x16.huginn.PressureSensor\x12%\n\npitot_tube\x18\x07 \x02(\x0b\x32\x11.huginn.PitotTube\x12\x1e\n\x06\x65ngine\x18\x08 \x02(\x0b\x32\x0e.huginn.Engine\x12\"\n\x08\x63ontrols\x18\t \x02(\x0b\x32\x10.huginn.Controls\x12\x18\n\x03ins\x18\n \x02(\x0b\x32\x0b.huginn.INS\x12,\n\raccelerations\x18\x0b \x02(\x0b\x32\x15.huginn.Accelerations\x12&\n\nvelocities\x18\x0c \x02(\x0b\x32\x12.huginn.Velocities\x12\"\n\x08position\x18\r \x02(\x0b\x32\x10.huginn.Position\x12(\n\x0borientation\x18\x0e \x02(\x0b\x32\x13.huginn.Orientation\x12&\n\natmosphere\x18\x0f \x02(\x0b\x32\x12.huginn.Atmosphere\x12\x1e\n\x06\x66orces\x18\x10 \x02(\x0b\x32\x0e.huginn.Forces\"@\n\x11SensorDataRequest\x12+\n\x04type\x18\x01 \x02(\x0e\x32\x1d.huginn.SensorDataRequestType\"\x8f\x03\n\x12SensorDataResponse\x12+\n\x04type\x18\x01 \x02(\x0e\x32\x1d.huginn.SensorDataRequestType\x12\x18\n\x03gps\x18\x02 \x01(\x0b\x32\x0b.huginn.GPS\x12,\n\raccelerometer\x18\x03 \x01(\x0b\x32\x15.huginn.Accelerometer\x12$\n\tgyroscope\x18\x04 \x01(\x0b\x32\x11.huginn.Gyroscope\x12(\n\x0bthermometer\x18\x05 \x01(\x0b\x32\x13.huginn.Thermometer\x12/\n\x0fpressure_sensor\x18\x06 \x01(\x0b\x32\x16.huginn.PressureSensor\x12%\n\npitot_tube\x18\x07 \x01(\x0b\x32\x11.huginn.PitotTube\x12\x1e\n\x06\x65ngine\x18\x08 \x01(\x0b\x32\x0e.huginn.Engine\x12\"\n\x08\x63ontrols\x18\t \x01(\x0b\x32\x10.huginn.Controls\x12\x18\n\x03ins\x18\n \x01(\x0b\x32\x0b.huginn.INS*\xf8\x01\n\x15SensorDataRequestType\x12\x13\n\x0fINVALID_REQUEST\x10\x00\x12\x0f\n\x0bGPS_REQUEST\x10\x01\x12\x19\n\x15\x41\x43\x43\x45LEROMETER_REQUEST\x10\x02\x12\x15\n\x11GYROSCOPE_REQUEST\x10\x03\x12\x17\n\x13THERMOMETER_REQUEST\x10\x04\x12\x1b\n\x17PRESSURE_SENSOR_REQUEST\x10\x05\x12\x16\n\x12PITOT_TUBE_REQUEST\x10\x06\x12\x12\n\x0e\x45NGINE_REQUEST\x10\x07\x12\x14\n\x10\x43ONTROLS_REQUEST\x10\x08\x12\x0f\n\x0bINS_REQUEST\x10\t')
+  serialized_pb='\n\tfdm.proto\x12\x06huginn\"_\n\x03GPS\x12\x10\n\x08latitude\x18\x01 \x02(\x01\x12\x11\n\tlongitude\x18\x02 \x02(\x01\x12\x10\n\x08\x61ltitude\x18\x03 \x02(\x01\x12\x10\n\x08\x61irspeed\x18\x04 \x02(\x01\x12\x0f\n\x07heading\x18\x05 \x02(\x01\"0\n\rAccelerometer\x12\t\n\x01x\x18\x01 \x02(\x01\x12\t\n\x01y\x18\x02 \x02(\x01\x12\t\n\x01z\x18\x03 \x02(\x01\"D\n\tGyroscope\x12\x11\n\troll_rate\x18\x01 \x02(\x01\x12\x12\n\npitch_rate\x18\x02 \x02(\x01\x12\x10\n\x08yaw_rate\x18\x03 \x02(\x01\"\"\n\x0bThermometer\x12\x13\n\x0btemperature\x18\x01 \x02(\x01\"\"\n\x0ePressureSensor\x12\x10\n\x08pressure\x18\x01 \x02(\x01\"\x1d\n\tPitotTube\x12\x10\n\x08pressure\x18\x01 \x02(\x01\"*\n\x06\x45ngine\x12\x0e\n\x06thrust\x18\x01 \x02(\x01\x12\x10\n\x08throttle\x18\x02 \x02(\x01\"O\n\x08\x43ontrols\x12\x0f\n\x07\x61ileron\x18\x01 \x02(\x01\x12\x10\n\x08\x65levator\x18\x02 \x02(\x01\x12\x0e\n\x06rudder\x18\x03 \x02(\x01\x12\x10\n\x08throttle\x18\x04 \x02(\x01\"g\n\x0e\x43ontrolsUpdate\x12\x0f\n\x07\x61ileron\x18\x01 \x02(\x01\x12\x10\n\x08\x65levator\x18\x02 \x02(\x01\x12\x0e\n\x06rudder\x18\x03 \x02(\x01\x12\x10\n\x08throttle\x18\x04 \x02(\x01\x12\x10\n\x08sequence\x18\x05 \x01(\r\"|\n\x03INS\x12\x0c\n\x04roll\x18\x01 \x02(\x01\x12\r\n\x05pitch\x18\x02 \x02(\x01\x12\x10\n\x08latitude\x18\x03 \x02(\x01\x12\x11\n\tlongitude\x18\x04 \x02(\x01\x12\x10\n\x08\x61ltitude\x18\x05 \x02(\x01\x12\x10\n\x08\x61irspeed\x18\x06 \x02(\x01\x12\x0f\n\x07heading\x18\x07 \x02(\x01\"\x9b\x01\n\rAccelerations\x12\t\n\x01x\x18\x01 \x02(\x01\x12\t\n\x01y\x18\x02 \x02(\x01\x12\t\n\x01z\x18\x03 \x02(\x01\x12\r\n\x05p_dot\x18\x04 \x02(\x01\x12\r\n\x05q_dot\x18\x05 \x02(\x01\x12\r\n\x05r_dot\x18\x06 \x02(\x01\x12\r\n\x05u_dot\x18\x07 \x02(\x01\x12\r\n\x05v_dot\x18\x08 \x02(\x01\x12\r\n\x05w_dot\x18\t \x02(\x01\x12\x0f\n\x07gravity\x18\n \x02(\x01\"\xc9\x01\n\nVelocities\x12\t\n\x01p\x18\x01 \x02(\x01\x12\t\n\x01q\x18\x02 \x02(\x01\x12\t\n\x01r\x18\x03 \x02(\x01\x12\x15\n\rtrue_airspeed\x18\x04 \x02(\x01\x12\x12\n\nclimb_rate\x18\x05 \x02(\x01\x12\t\n\x01u\x18\x06 \x02(\x01\x12\t\n\x01v\x18\x07 \x02(\x01\x12\t\n\x01w\x18\x08 \x02(\x01\x12\x1b\n\x13\x63\x61librated_airspeed\x18\t \x02(\x01\x12\x1b\n\x13\x65quivalent_airspeed\x18\n \x02(\x01\x12\x14\n\x0cground_speed\x18\x0b \x02(\x01\"R\n\x08Position\x12\x10\n\x08latitude\x18\x01 \x02(\x01\x12\x11\n\tlongitude\x18\x02 \x02(\x01\x12\x10\n\x08\x61ltitude\x18\x03 \x02(\x01\x12\x0f\n\x07heading\x18\x04 \x02(\x01\"6\n\x0bOrientation\x12\x0b\n\x03phi\x18\x01 \x02(\x01\x12\r\n\x05theta\x18\x02 \x02(\x01\x12\x0b\n\x03psi\x18\x03 \x02(\x01\"\x9a\x01\n\nAtmosphere\x12\x10\n\x08pressure\x18\x01 \x02(\x01\x12\x1a\n\x12sea_level_pressure\x18\x02 \x02(\x01\x12\x13\n\x0btemperature\x18\x03 \x02(\x01\x12\x1d\n\x15sea_level_temperature\x18\x04 \x02(\x01\x12\x0f\n\x07\x64\x65nsity\x18\x05 \x02(\x01\x12\x19\n\x11sea_level_density\x18\x06 \x02(\x01\"\x9b\x01\n\x06\x46orces\x12\x0e\n\x06x_body\x18\x01 \x02(\x01\x12\x0e\n\x06y_body\x18\x02 \x02(\x01\x12\x0e\n\x06z_body\x18\x03 \x02(\x01\x12\x0e\n\x06x_wind\x18\x04 \x02(\x01\x12\x0e\n\x06y_wind\x18\x05 \x02(\x01\x12\x0e\n\x06z_wind\x18\x06 \x02(\x01\x12\x0f\n\x07x_total\x18\x07 \x02(\x01\x12\x0f\n\x07y_total\x18\x08 \x02(\x01\x12\x0f\n\x07z_total\x18\t \x02(\x01\"\xfc\x04\n\rSimulatorData\x12\x0c\n\x04time\x18\x01 \x02(\x01\x12\x18\n\x03gps\x18\x02 \x01(\x0b\x32\x0b.huginn.GPS\x12,\n\raccelerometer\x18\x03 \x01(\x0b\x32\x15.huginn.Accelerometer\x12$\n\tgyroscope\x18\x04 \x01(\x0b\x32\x11.huginn.Gyroscope\x12(\n\x0bthermometer\x18\x05 \x01(\x0b\x32\x13.huginn.Thermometer\x12/\n\x0fpressure_sensor\x18\x06 \x01(\x0b\x32\x16.huginn.PressureSensor\x12%\n\npitot_tube\x18\x07 \x01(\x0b\x32\x11.huginn.PitotTube\x12\x1e\n\x06\x65ngine\x18\x08 \x01(\x0b\x32\x0e.huginn.Engine\x12\"\n\x08\x63ontrols\x18\t \x01(\x0b\x32\x10.huginn.Controls\x12\x18\n\x03ins\x18\n \x01(\x0b\x32\x0b.huginn.INS\x12,\n\raccelerations\x18\x0b \x01(\x0b\x32\x15.huginn.Accelerations\x12&\n\nvelocities\x18\x0c \x01(\x0b\x32\x12.huginn.Velocities\x12\"\n\x08position\x18\r \x01(\x0b\x32\x10.huginn.Position\x12(\n\x0borientation\x18\x0e \x01(\x0b\x32\x13.huginn.Orientation\x12&\n\natmosphere\x18\x0f \x01(\x0b\x32\x12.huginn.Atmosphere\x12\x1e\n\x06\x66orces\x18\x10 \x01(\x0b\x32\x0e.huginn.Forces\x12\x10\n\x08sequence\x18\x11 \x01(\x04\x12\x11\n\tsend_time\x18\x12 \x01(\x01\"\xda\x01\n\x1cTelemetrySubscriptionRequest\x12\x0c\n\x04port\x18\x01 \x02(\x05\x12\x13\n\x0bupdate_rate\x18\x02 \x01(\x01\x12\x0e\n\x06\x66ields\x18\x03 \x03(\t\x12\r\n\x05lease\x18\x04 \x01(\x01\x12\x13\n\x0bunsubscribe\x18\x05 \x01(\x08\x12\x16\n\x0e\x64\x65lta_encoding\x18\x06 \x01(\x08\x12\x19\n\x11keyframe_interval\x18\x07 \x01(\x05\x12\x30\n\x0bresolutions\x18\x08 \x03(\x0b\x32\x1b.huginn.TelemetryResolution\"8\n\x13TelemetryResolution\x12\r\n\x05\x66ield\x18\x01 \x02(\t\x12\x12\n\nresolution\x18\x02 \x02(\x01\"\xc5\x01\n\x0eTelemetryFrame\x12\x0c\n\x04time\x18\x01 \x02(\x01\x12\x10\n\x08keyframe\x18\x02 \x01(\x08\x12\x0e\n\x06\x66ields\x18\x03 \x03(\t\x12\x17\n\x0bresolutions\x18\x04 \x03(\x02\x42\x02\x10\x01\x12\x12\n\x06values\x18\x05 \x03(\x01\x42\x02\x10\x01\x12\x13\n\x07indexes\x18\x06 \x03(\rB\x02\x10\x01\x12\x1c\n\x10quantized_values\x18\x07 \x03(\x12\x42\x02\x10\x01\x12\x10\n\x08sequence\x18\x08 \x01(\x04\x12\x11\n\tsend_time\x18\t \x01(\x01\"O\n\x1dTelemetrySubscriptionResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x02(\x08\x12\r\n\x05lease\x18\x02 \x01(\x01\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"\x91\x01\n\x11SensorDataRequest\x12+\n\x04type\x18\x01 \x02(\x0e\x32\x1d.huginn.SensorDataRequestType\x12\r\n\x05since\x18\x02 \x01(\x01\x12,\n\x05types\x18\x03 \x03(\x0e\x32\x1d.huginn.SensorDataRequestType\x12\x12\n\nrequest_id\x18\x04 \x01(\r\"X\n\rSensorHistory\x12\x0e\n\x06\x66ields\x18\x01 \x03(\t\x12\x10\n\x04time\x18\x02 \x03(\x01\x42\x02\x10\x01\x12\x12\n\x06values\x18\x03 \x03(\x01\x42\x02\x10\x01\x12\x11\n\ttruncated\x18\x04 \x01(\x08\"\xcb\x03\n\x12SensorDataResponse\x12+\n\x04type\x18\x01 \x02(\x0e\x32\x1d.huginn.SensorDataRequestType\x12\x18\n\x03gps\x18\x02 \x01(\x0b\x32\x0b.huginn.GPS\x12,\n\raccelerometer\x18\x03 \x01(\x0b\x32\x15.huginn.Accelerometer\x12$\n\tgyroscope\x18\x04 \x01(\x0b\x32\x11.huginn.Gyroscope\x12(\n\x0bthermometer\x18\x05 \x01(\x0b\x32\x13.huginn.Thermometer\x12/\n\x0fpressure_sensor\x18\x06 \x01(\x0b\x32\x16.huginn.PressureSensor\x12%\n\npitot_tube\x18\x07 \x01(\x0b\x32\x11.huginn.PitotTube\x12\x1e\n\x06\x65ngine\x18\x08 \x01(\x0b\x32\x0e.huginn.Engine\x12\"\n\x08\x63ontrols\x18\t \x01(\x0b\x32\x10.huginn.Controls\x12\x18\n\x03ins\x18\n \x01(\x0b\x32\x0b.huginn.INS\x12&\n\x07history\x18\x0b \x01(\x0b\x32\x15.huginn.SensorHistory\x12\x12\n\nrequest_id\x18\x0c \x01(\r*\x8b\x02\n\x15SensorDataRequestType\x12\x13\n\x0fINVALID_REQUEST\x10\x00\x12\x0f\n\x0bGPS_REQUEST\x10\x01\x12\x19\n\x15\x41\x43\x43\x45LEROMETER_REQUEST\x10\x02\x12\x15\n\x11GYROSCOPE_REQUEST\x10\x03\x12\x17\n\x13THERMOMETER_REQUEST\x10\x04\x12\x1b\n\x17PRESSURE_SENSOR_REQUEST\x10\x05\x12\x16\n\x12PITOT_TUBE_REQUEST\x10\x06\x12\x12\n\x0e\x45NGINE_REQUEST\x10\x07\x12\x14\n\x10\x43ONTROLS_REQUEST\x10\x08\x12\x0f\n\x0bINS_REQUEST\x10\t\x12\x11\n\rBATCH_REQUEST\x10\n')
 
 _SENSORDATAREQUESTTYPE = _descriptor.EnumDescriptor(
   name='SensorDataRequestType',
@@ -62,11 +62,15 @@ _SENSORDATAREQUESTTYPE = _descriptor.EnumDescriptor(
       name='INS_REQUEST', index=9, number=9,
       options=None,
       type=None),
+    _descriptor.EnumValueDescriptor(
+      name='BATCH_REQUEST', index=10, number=10,
+      options=None,
+      type=None),
   ],
   containing_type=None,
   options=None,
-  serialized_start=2480,
-  serialized_end=2728,
+  serialized_start=3414,
+  serialized_end=3681,
 )
 
 SensorDataRequestType = enum_type_wrapper.EnumTypeWrapper(_SENSORDATAREQUESTTYPE)
@@ -80,6 +84,7 @@ PITOT_TUBE_REQUEST = 6
 ENGINE_REQUEST = 7
 CONTROLS_REQUEST = 8
 INS_REQUEST = 9
+BATCH_REQUEST = 10
 
 
 
@@ -391,6 +396,62 @@ _CONTROLS = _descriptor.Descriptor(
 )
 
 
+_CONTROLSUPDATE = _descriptor.Descriptor(
+  name='ControlsUpdate',
+  full_name='huginn.ControlsUpdate',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='aileron', full_name='huginn.ControlsUpdate.aileron', index=0,
+      number=1, type=1, cpp_type=5, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='elevator', full_name='huginn.ControlsUpdate.elevator', index=1,
+      number=2, type=1, cpp_type=5, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='rudder', full_name='huginn.ControlsUpdate.rudder', index=2,
+      number=3, type=1, cpp_type=5, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='throttle', full_name='huginn.ControlsUpdate.throttle', index=3,
+      number=4, type=1, cpp_type=5, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='sequence', full_name='huginn.ControlsUpdate.sequence', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  extension_ranges=[],
+  serialized_start=466,
+  serialized_end=569,
+)
+
+
 _INS = _descriptor.Descriptor(
   name='INS',
   full_name='huginn.INS',
@@ -456,8 +517,8 @@ _INS = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=466,
-  serialized_end=590,
+  serialized_start=571,
+  serialized_end=695,
 )
 
 
@@ -547,8 +608,8 @@ _ACCELERATIONS = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=593,
-  serialized_end=748,
+  serialized_start=698,
+  serialized_end=853,
 )
 
 
@@ -645,8 +706,8 @@ _VELOCITIES = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=751,
-  serialized_end=952,
+  serialized_start=856,
+  serialized_end=1057,
 )
 
 
@@ -694,8 +755,8 @@ _POSITION = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=954,
-  serialized_end=1036,
+  serialized_start=1059,
+  serialized_end=1141,
 )
 
 
@@ -736,8 +797,8 @@ _ORIENTATION = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=1038,
-  serialized_end=1092,
+  serialized_start=1143,
+  serialized_end=1197,
 )
 
 
@@ -799,8 +860,8 @@ _ATMOSPHERE = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=1095,
-  serialized_end=1249,
+  serialized_start=1200,
+  serialized_end=1354,
 )
 
 
@@ -883,8 +944,8 @@ _FORCES = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=1252,
-  serialized_end=1407,
+  serialized_start=1357,
+  serialized_end=1512,
 )
 
 
@@ -904,109 +965,123 @@ _SIMULATORDATA = _descriptor.Descriptor(
       options=None),
     _descriptor.FieldDescriptor(
       name='gps', full_name='huginn.SimulatorData.gps', index=1,
-      number=2, type=11, cpp_type=10, label=2,
+      number=2, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='accelerometer', full_name='huginn.SimulatorData.accelerometer', index=2,
-      number=3, type=11, cpp_type=10, label=2,
+      number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='gyroscope', full_name='huginn.SimulatorData.gyroscope', index=3,
-      number=4, type=11, cpp_type=10, label=2,
+      number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='thermometer', full_name='huginn.SimulatorData.thermometer', index=4,
-      number=5, type=11, cpp_type=10, label=2,
+      number=5, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='pressure_sensor', full_name='huginn.SimulatorData.pressure_sensor', index=5,
-      number=6, type=11, cpp_type=10, label=2,
+      number=6, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='pitot_tube', full_name='huginn.SimulatorData.pitot_tube', index=6,
-      number=7, type=11, cpp_type=10, label=2,
+      number=7, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='engine', full_name='huginn.SimulatorData.engine', index=7,
-      number=8, type=11, cpp_type=10, label=2,
+      number=8, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='controls', full_name='huginn.SimulatorData.controls', index=8,
-      number=9, type=11, cpp_type=10, label=2,
+      number=9, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='ins', full_name='huginn.SimulatorData.ins', index=9,
-      number=10, type=11, cpp_type=10, label=2,
+      number=10, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='accelerations', full_name='huginn.SimulatorData.accelerations', index=10,
-      number=11, type=11, cpp_type=10, label=2,
+      number=11, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='velocities', full_name='huginn.SimulatorData.velocities', index=11,
-      number=12, type=11, cpp_type=10, label=2,
+      number=12, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='position', full_name='huginn.SimulatorData.position', index=12,
-      number=13, type=11, cpp_type=10, label=2,
+      number=13, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='orientation', full_name='huginn.SimulatorData.orientation', index=13,
-      number=14, type=11, cpp_type=10, label=2,
+      number=14, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='atmosphere', full_name='huginn.SimulatorData.atmosphere', index=14,
-      number=15, type=11, cpp_type=10, label=2,
+      number=15, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
       name='forces', full_name='huginn.SimulatorData.forces', index=15,
-      number=16, type=11, cpp_type=10, label=2,
+      number=16, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='sequence', full_name='huginn.SimulatorData.sequence', index=16,
+      number=17, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='send_time', full_name='huginn.SimulatorData.send_time', index=17,
+      number=18, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -1016,8 +1091,246 @@ _SIMULATORDATA = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=1410,
-  serialized_end=2009,
+  serialized_start=1515,
+  serialized_end=2151,
+)
+
+
+_TELEMETRYSUBSCRIPTIONREQUEST = _descriptor.Descriptor(
+  name='TelemetrySubscriptionRequest',
+  full_name='huginn.TelemetrySubscriptionRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='port', full_name='huginn.TelemetrySubscriptionRequest.port', index=0,
+      number=1, type=5, cpp_type=1, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='update_rate', full_name='huginn.TelemetrySubscriptionRequest.update_rate', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='fields', full_name='huginn.TelemetrySubscriptionRequest.fields', index=2,
+      number=3, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='lease', full_name='huginn.TelemetrySubscriptionRequest.lease', index=3,
+      number=4, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='unsubscribe', full_name='huginn.TelemetrySubscriptionRequest.unsubscribe', index=4,
+      number=5, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='delta_encoding', full_name='huginn.TelemetrySubscriptionRequest.delta_encoding', index=5,
+      number=6, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='keyframe_interval', full_name='huginn.TelemetrySubscriptionRequest.keyframe_interval', index=6,
+      number=7, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='resolutions', full_name='huginn.TelemetrySubscriptionRequest.resolutions', index=7,
+      number=8, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  extension_ranges=[],
+  serialized_start=2154,
+  serialized_end=2372,
+)
+
+
+_TELEMETRYRESOLUTION = _descriptor.Descriptor(
+  name='TelemetryResolution',
+  full_name='huginn.TelemetryResolution',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='field', full_name='huginn.TelemetryResolution.field', index=0,
+      number=1, type=9, cpp_type=9, label=2,
+      has_default_value=False, default_value=unicode("", "utf-8"),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='resolution', full_name='huginn.TelemetryResolution.resolution', index=1,
+      number=2, type=1, cpp_type=5, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  extension_ranges=[],
+  serialized_start=2374,
+  serialized_end=2430,
+)
+
+
+_TELEMETRYFRAME = _descriptor.Descriptor(
+  name='TelemetryFrame',
+  full_name='huginn.TelemetryFrame',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='time', full_name='huginn.TelemetryFrame.time', index=0,
+      number=1, type=1, cpp_type=5, label=2,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='keyframe', full_name='huginn.TelemetryFrame.keyframe', index=1,
+      number=2, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='fields', full_name='huginn.TelemetryFrame.fields', index=2,
+      number=3, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='resolutions', full_name='huginn.TelemetryFrame.resolutions', index=3,
+      number=4, type=2, cpp_type=6, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')),
+    _descriptor.FieldDescriptor(
+      name='values', full_name='huginn.TelemetryFrame.values', index=4,
+      number=5, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')),
+    _descriptor.FieldDescriptor(
+      name='indexes', full_name='huginn.TelemetryFrame.indexes', index=5,
+      number=6, type=13, cpp_type=3, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')),
+    _descriptor.FieldDescriptor(
+      name='quantized_values', full_name='huginn.TelemetryFrame.quantized_values', index=6,
+      number=7, type=18, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')),
+    _descriptor.FieldDescriptor(
+      name='sequence', full_name='huginn.TelemetryFrame.sequence', index=7,
+      number=8, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='send_time', full_name='huginn.TelemetryFrame.send_time', index=8,
+      number=9, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  extension_ranges=[],
+  serialized_start=2433,
+  serialized_end=2630,
+)
+
+
+_TELEMETRYSUBSCRIPTIONRESPONSE = _descriptor.Descriptor(
+  name='TelemetrySubscriptionResponse',
+  full_name='huginn.TelemetrySubscriptionResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='accepted', full_name='huginn.TelemetrySubscriptionResponse.accepted', index=0,
+      number=1, type=8, cpp_type=7, label=2,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='lease', full_name='huginn.TelemetrySubscriptionResponse.lease', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='huginn.TelemetrySubscriptionResponse.error', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=unicode("", "utf-8"),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  extension_ranges=[],
+  serialized_start=2632,
+  serialized_end=2711,
 )
 
 
@@ -1035,6 +1348,27 @@ _SENSORDATAREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='since', full_name='huginn.SensorDataRequest.since', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='types', full_name='huginn.SensorDataRequest.types', index=2,
+      number=3, type=14, cpp_type=8, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='request_id', full_name='huginn.SensorDataRequest.request_id', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -1044,8 +1378,57 @@ _SENSORDATAREQUEST = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=2011,
-  serialized_end=2075,
+  serialized_start=2714,
+  serialized_end=2859,
+)
+
+
+_SENSORHISTORY = _descriptor.Descriptor(
+  name='SensorHistory',
+  full_name='huginn.SensorHistory',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='fields', full_name='huginn.SensorHistory.fields', index=0,
+      number=1, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='time', full_name='huginn.SensorHistory.time', index=1,
+      number=2, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')),
+    _descriptor.FieldDescriptor(
+      name='values', full_name='huginn.SensorHistory.values', index=2,
+      number=3, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=_descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')),
+    _descriptor.FieldDescriptor(
+      name='truncated', full_name='huginn.SensorHistory.truncated', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  extension_ranges=[],
+  serialized_start=2861,
+  serialized_end=2949,
 )
 
 
@@ -1126,6 +1509,20 @@ _SENSORDATARESPONSE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='history', full_name='huginn.SensorDataResponse.history', index=10,
+      number=11, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='request_id', full_name='huginn.SensorDataResponse.request_id', index=11,
+      number=12, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -1135,8 +1532,8 @@ _SENSORDATARESPONSE = _descriptor.Descriptor(
   options=None,
   is_extendable=False,
   extension_ranges=[],
-  serialized_start=2078,
-  serialized_end=2477,
+  serialized_start=2952,
+  serialized_end=3411,
 )
 
 _SIMULATORDATA.fields_by_name['gps'].message_type = _GPS
@@ -1154,7 +1551,9 @@ _SIMULATORDATA.fields_by_name['position'].message_type = _POSITION
 _SIMULATORDATA.fields_by_name['orientation'].message_type = _ORIENTATION
 _SIMULATORDATA.fields_by_name['atmosphere'].message_type = _ATMOSPHERE
 _SIMULATORDATA.fields_by_name['forces'].message_type = _FORCES
+_TELEMETRYSUBSCRIPTIONREQUEST.fields_by_name['resolutions'].message_type = _TELEMETRYRESOLUTION
 _SENSORDATAREQUEST.fields_by_name['type'].enum_type = _SENSORDATAREQUESTTYPE
+_SENSORDATAREQUEST.fields_by_name['types'].enum_type = _SENSORDATAREQUESTTYPE
 _SENSORDATARESPONSE.fields_by_name['type'].enum_type = _SENSORDATAREQUESTTYPE
 _SENSORDATARESPONSE.fields_by_name['gps'].message_type = _GPS
 _SENSORDATARESPONSE.fields_by_name['accelerometer'].message_type = _ACCELEROMETER
@@ -1165,6 +1564,7 @@ _SENSORDATARESPONSE.fields_by_name['pitot_tube'].message_type = _PITOTTUBE
 _SENSORDATARESPONSE.fields_by_name['engine'].message_type = _ENGINE
 _SENSORDATARESPONSE.fields_by_name['controls'].message_type = _CONTROLS
 _SENSORDATARESPONSE.fields_by_name['ins'].message_type = _INS
+_SENSORDATARESPONSE.fields_by_name['history'].message_type = _SENSORHISTORY
 DESCRIPTOR.message_types_by_name['GPS'] = _GPS
 DESCRIPTOR.message_types_by_name['Accelerometer'] = _ACCELEROMETER
 DESCRIPTOR.message_types_by_name['Gyroscope'] = _GYROSCOPE
@@ -1173,6 +1573,7 @@ DESCRIPTOR.message_types_by_name['PressureSensor'] = _PRESSURESENSOR
 DESCRIPTOR.message_types_by_name['PitotTube'] = _PITOTTUBE
 DESCRIPTOR.message_types_by_name['Engine'] = _ENGINE
 DESCRIPTOR.message_types_by_name['Controls'] = _CONTROLS
+DESCRIPTOR.message_types_by_name['ControlsUpdate'] = _CONTROLSUPDATE
 DESCRIPTOR.message_types_by_name['INS'] = _INS
 DESCRIPTOR.message_types_by_name['Accelerations'] = _ACCELERATIONS
 DESCRIPTOR.message_types_by_name['Velocities'] = _VELOCITIES
@@ -1181,7 +1582,12 @@ DESCRIPTOR.message_types_by_name['Orientation'] = _ORIENTATION
 DESCRIPTOR.message_types_by_name['Atmosphere'] = _ATMOSPHERE
 DESCRIPTOR.message_types_by_name['Forces'] = _FORCES
 DESCRIPTOR.message_types_by_name['SimulatorData'] = _SIMULATORDATA
+DESCRIPTOR.message_types_by_name['TelemetrySubscriptionRequest'] = _TELEMETRYSUBSCRIPTIONREQUEST
+DESCRIPTOR.message_types_by_name['TelemetryResolution'] = _TELEMETRYRESOLUTION
+DESCRIPTOR.message_types_by_name['TelemetryFrame'] = _TELEMETRYFRAME
+DESCRIPTOR.message_types_by_name['TelemetrySubscriptionResponse'] = _TELEMETRYSUBSCRIPTIONRESPONSE
 DESCRIPTOR.message_types_by_name['SensorDataRequest'] = _SENSORDATAREQUEST
+DESCRIPTOR.message_types_by_name['SensorHistory'] = _SENSORHISTORY
 DESCRIPTOR.message_types_by_name['SensorDataResponse'] = _SENSORDATARESPONSE
 
 class GPS(_message.Message):
@@ -1232,6 +1638,12 @@ class Controls(_message.Message):
 
   # @@protoc_insertion_point(class_scope:huginn.Controls)
 
+class ControlsUpdate(_message.Message):
+  __metaclass__ = _reflection.GeneratedProtocolMessageType
+  DESCRIPTOR = _CONTROLSUPDATE
+
+  # @@protoc_insertion_point(class_scope:huginn.ControlsUpdate)
+
 class INS(_message.Message):
   __metaclass__ = _reflection.GeneratedProtocolMessageType
   DESCRIPTOR = _INS
@@ -1280,12 +1692,42 @@ class SimulatorData(_message.Message):
 
   # @@protoc_insertion_point(class_scope:huginn.SimulatorData)
 
+class TelemetrySubscriptionRequest(_message.Message):
+  __metaclass__ = _reflection.GeneratedProtocolMessageType
+  DESCRIPTOR = _TELEMETRYSUBSCRIPTIONREQUEST
+
+  # @@protoc_insertion_point(class_scope:huginn.TelemetrySubscriptionRequest)
+
+class TelemetryResolution(_message.Message):
+  __metaclass__ = _reflection.GeneratedProtocolMessageType
+  DESCRIPTOR = _TELEMETRYRESOLUTION
+
+  # @@protoc_insertion_point(class_scope:huginn.TelemetryResolution)
+
+class TelemetryFrame(_message.Message):
+  __metaclass__ = _reflection.GeneratedProtocolMessageType
+  DESCRIPTOR = _TELEMETRYFRAME
+
+  # @@protoc_insertion_point(class_scope:huginn.TelemetryFrame)
+
+class TelemetrySubscriptionResponse(_message.Message):
+  __metaclass__ = _reflection.GeneratedProtocolMessageType
+  DESCRIPTOR = _TELEMETRYSUBSCRIPTIONRESPONSE
+
+  # @@protoc_insertion_point(class_scope:huginn.TelemetrySubscriptionResponse)
+
 class SensorDataRequest(_message.Message):
   __metaclass__ = _reflection.GeneratedProtocolMessageType
   DESCRIPTOR = _SENSORDATAREQUEST
 
   # @@protoc_insertion_point(class_scope:huginn.SensorDataRequest)
 
+class SensorHistory(_message.Message):
+  __metaclass__ = _reflection.GeneratedProtocolMessageType
+  DESCRIPTOR = _SENSORHISTORY
+
+  # @@protoc_insertion_point(class_scope:huginn.SensorHistory)
+
 class SensorDataResponse(_message.Message):
   __metaclass__ = _reflection.GeneratedProtocolMessageType
   DESCRIPTOR = _SENSORDATARESPONSE
@@ -1293,4 +1735,17 @@ class SensorDataResponse(_message.Message):
   # @@protoc_insertion_point(class_scope:huginn.SensorDataResponse)
 
 
+_TELEMETRYFRAME.fields_by_name['resolutions'].has_options = True
+_TELEMETRYFRAME.fields_by_name['resolutions']._options = _descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')
+_TELEMETRYFRAME.fields_by_name['values'].has_options = True
+_TELEMETRYFRAME.fields_by_name['values']._options = _descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')
+_TELEMETRYFRAME.fields_by_name['indexes'].has_options = True
+_TELEMETRYFRAME.fields_by_name['indexes']._options = _descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')
+_TELEMETRYFRAME.fields_by_name['quantized_values'].has_options = True
+_TELEMETRYFRAME.fields_by_name['quantized_values']._options = _descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')
+_SENSORHISTORY.fields_by_name['time'].has_options = True
+_SENSORHISTORY.fields_by_name['time']._options = _descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')
+_SENSORHISTORY.fields_by_name['values'].has_options = True
+_SENSORHISTORY.fields_by_name['values']._options = _descriptor._ParseOptions(descriptor_pb2.FieldOptions(), '\020\001')
+
 # @@protoc_insertion_point(module_scope)
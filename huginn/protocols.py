@@ -5,23 +5,106 @@ to transmit and receive simulation data.
 
 
 import logging
+import time
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
 
-from twisted.internet.protocol import DatagramProtocol, Factory
+from twisted.internet.protocol import (DatagramProtocol, Factory,
+                                       ClientFactory)
+from twisted.internet.task import LoopingCall
 from twisted.protocols.basic import Int32StringReceiver
 from google.protobuf.message import DecodeError
 
+from huginn import configuration
 from huginn.protobuf import fdm_pb2
+from huginn.telemetry import (TelemetryEncoder, TelemetryDecoder,
+                              TelemetryError, TelemetryStatistics)
 
 
 logger = logging.getLogger(__name__)
 
 
+def is_multicast_address(address):
+    """Returns True if the address is an IPv4 multicast group address
+
+    Arguments:
+    address: the IPv4 address
+    """
+    try:
+        first_octet = int(address.split(".")[0])
+    except ValueError:
+        return False
+
+    return 224 <= first_octet <= 239
+
+
+# the controls of the packets that are received between two simulation steps
+# are merged by using the latest values or the average values
+CONTROLS_MERGE_LATEST = "latest"
+CONTROLS_MERGE_AVERAGE = "average"
+
+CONTROLS_MERGE_POLICIES = (CONTROLS_MERGE_LATEST, CONTROLS_MERGE_AVERAGE)
+
+
 class ControlsProtocol(DatagramProtocol):
     """The ControlsProtocol is used to receive and update tha aircraft's
-    controls"""
-    def __init__(self, fdmexec):
+    controls.
+
+    The received controls are buffered and they are applied to the flight
+    dynamics model by the apply_controls method, which must be called before
+    the simulation steps. The packets that are received between two calls
+    are merged, so the flight dynamics model is updated only once no matter
+    how many packets the clients have sent. The packets that have an older
+    sequence number than a packet that has already been received from the
+    same client are dropped. The sequence numbers of a client are forgotten
+    if no packet has been accepted from it for a while, so a client that
+    restarts its sequence numbers is accepted again.
+    """
+    def __init__(self, fdmexec,
+                 merge_policy=configuration.CONTROLS_MERGE_POLICY,
+                 sequence_window=configuration.CONTROLS_SEQUENCE_WINDOW,
+                 sequence_timeout=configuration.CONTROLS_SEQUENCE_TIMEOUT,
+                 clock=time.time):
+        """Create a new ControlsProtocol object
+
+        Arguments:
+        fdmexec: the JSBSim FGFDMExec object
+        merge_policy: the way that the buffered controls are merged. One of
+            CONTROLS_MERGE_LATEST or CONTROLS_MERGE_AVERAGE
+        sequence_window: the number of sequence numbers that a packet can be
+            late before the client is considered to have restarted
+        sequence_timeout: the time in seconds without an accepted packet
+            after which the client is considered to have restarted
+        clock: a function that returns the wall clock time in seconds
+        """
+        if merge_policy not in CONTROLS_MERGE_POLICIES:
+            raise ValueError("Invalid controls merge policy %s" %
+                             merge_policy)
+
         self.fdmexec = fdmexec
+        self.merge_policy = merge_policy
+        self.sequence_window = sequence_window
+        self.sequence_timeout = sequence_timeout
+        self.clock = clock
+
+        self.received = 0
+        self.invalid = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.applied = 0
+
+        self._sequences = {}
+        self._pending_controls = []
+        self._pending_packets = 0
+
+    def set_aircraft_controls(self, aileron, elevator, rudder, throttle):
+        """Apply the controls values to the flight dynamics model"""
+        self.fdmexec.GetFCS().SetDaCmd(aileron)
+        self.fdmexec.GetFCS().SetDeCmd(elevator)
+        self.fdmexec.GetFCS().SetDrCmd(rudder)
+
+        for i in range(self.fdmexec.GetPropulsion().GetNumEngines()):
+            self.fdmexec.GetFCS().SetThrottleCmd(i, throttle)
 
     def update_aircraft_controls(self, aileron, elevator, rudder, throttle):
         """Set the new aircraft controls values"""
@@ -30,44 +113,134 @@ class ControlsProtocol(DatagramProtocol):
         elif aileron < -1.0:
             aileron = -1.0
 
-        self.fdmexec.GetFCS().SetDaCmd(aileron)
-
         if elevator > 1.0:
             elevator = 1.0
         elif elevator < -1.0:
             elevator = -1.0
 
-        self.fdmexec.GetFCS().SetDeCmd(elevator)
-
         if rudder > 1.0:
             rudder = 1.0
         elif rudder < -1.0:
             rudder = -1.0
 
-        self.fdmexec.GetFCS().SetDrCmd(rudder)
-
         if throttle > 1.0:
             throttle = 1.0
         elif throttle < 0.0:
             throttle = 0.0
 
-        for i in range(self.fdmexec.GetPropulsion().GetNumEngines()):
-            self.fdmexec.GetFCS().SetThrottleCmd(i, throttle)
+        self.set_aircraft_controls(aileron, elevator, rudder, throttle)
+
+    def is_stale(self, address, sequence):
+        """Returns True if a packet with the same or a newer sequence number
+        has already been received from the address
+
+        Arguments:
+        address: the address of the client
+        sequence: the sequence number of the packet
+        """
+        now = self.clock()
+        last_packet = self._sequences.get(address)
+
+        # a sequence number that is older than the window or a client that
+        # hasn't sent a packet for a while means that the client has
+        # restarted
+        if last_packet is not None:
+            last_sequence, last_time = last_packet
+
+            if (now - last_time < self.sequence_timeout and
+                    last_sequence - self.sequence_window <= sequence <=
+                    last_sequence):
+                return True
+
+        self._sequences[address] = (sequence, now)
+
+        return False
 
     def datagramReceived(self, datagram, addr):
-        controls = fdm_pb2.Controls()
+        controls = fdm_pb2.ControlsUpdate()
 
         try:
             controls.ParseFromString(datagram)
         except DecodeError:
             logger.exception("Failed to parse control data")
             print("Failed to parse control data")
+            self.invalid += 1
             return
 
-        self.update_aircraft_controls(controls.aileron,
-                                      controls.elevator,
-                                      controls.rudder,
-                                      controls.throttle)
+        self.received += 1
+
+        if (controls.HasField("sequence") and
+                self.is_stale(addr, controls.sequence)):
+            self.dropped += 1
+            return
+
+        values = (controls.aileron, controls.elevator, controls.rudder,
+                  controls.throttle)
+
+        if self.merge_policy == CONTROLS_MERGE_LATEST:
+            self._pending_controls = [values]
+        else:
+            self._pending_controls.append(values)
+
+        self._pending_packets += 1
+
+    def apply_controls(self):
+        """Apply the controls that have been received since the last call
+        to the flight dynamics model. Returns True if the controls have been
+        updated"""
+        if self._pending_packets == 0:
+            return False
+
+        if len(self._pending_controls) == 1:
+            values = self._pending_controls[0]
+        else:
+            packets = float(len(self._pending_controls))
+            values = [sum(value) / packets
+                      for value in zip(*self._pending_controls)]
+
+        self.coalesced += self._pending_packets - 1
+        self.applied += 1
+
+        self._pending_controls = []
+        self._pending_packets = 0
+
+        self.update_aircraft_controls(*values)
+
+        return True
+
+    def get_statistics(self):
+        """Return a dictionary with the number of received, invalid,
+        dropped, coalesced and applied packets"""
+        return {
+            "received": self.received,
+            "invalid": self.invalid,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "applied": self.applied
+        }
+
+
+# the SimulatorData fields that can be selected by the telemetry clients
+# and the methods that fill them
+FILL_METHODS = OrderedDict([
+    ("gps", "_fill_gps_data"),
+    ("accelerometer", "_fill_accelerometer_data"),
+    ("gyroscope", "_fill_gyroscope_data"),
+    ("thermometer", "_fill_thermometer_data"),
+    ("pressure_sensor", "_fill_pressure_sensor_data"),
+    ("pitot_tube", "_fill_pitot_tube_data"),
+    ("engine", "_fill_engine_data"),
+    ("controls", "_fill_aircraft_controls_data"),
+    ("ins", "_fill_ins_data"),
+    ("accelerations", "_fill_accelerations"),
+    ("velocities", "_fill_velocities"),
+    ("position", "_fill_position"),
+    ("orientation", "_fill_orientation"),
+    ("atmosphere", "_fill_atmosphere"),
+    ("forces", "_fill_forces")
+])
+
+SIMULATOR_DATA_FIELDS = tuple(FILL_METHODS.keys())
 
 
 class SimulatorDataProtocol(DatagramProtocol):
@@ -79,24 +252,35 @@ class SimulatorDataProtocol(DatagramProtocol):
         self.aircraft = simulator.aircraft
         self.remote_host = remote_host
         self.port = port
+        self.clock = time.time
+        self.sequence = 0
 
-    def _fill_gps_data(self, simulator_data):
+        self.encoded_messages = 0
+        self._encoded_state = None
+        self._messages = {}
+        self._datagrams = {}
+
+    def _fill_gps_data(self, simulator_data, state):
         """Fill the gps data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        simulator_data.gps.latitude = self.aircraft.instruments.gps.latitude
-        simulator_data.gps.longitude = self.aircraft.instruments.gps.longitude
-        simulator_data.gps.altitude = self.aircraft.instruments.gps.altitude
-        simulator_data.gps.airspeed = self.aircraft.instruments.gps.airspeed
-        simulator_data.gps.heading = self.aircraft.instruments.gps.heading
+        position = state.fdm.position
+
+        simulator_data.gps.latitude = position.latitude
+        simulator_data.gps.longitude = position.longitude
+        simulator_data.gps.altitude = position.altitude
+        simulator_data.gps.airspeed = state.fdm.velocities.true_airspeed
+        simulator_data.gps.heading = position.heading
 
-    def _fill_accelerometer_data(self, simulator_data):
+    def _fill_accelerometer_data(self, simulator_data, state):
         """Fill the accelerometer data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
         sensors = self.aircraft.sensors
 
@@ -104,11 +288,12 @@ class SimulatorDataProtocol(DatagramProtocol):
         simulator_data.accelerometer.y = sensors.accelerometer.y
         simulator_data.accelerometer.z = sensors.accelerometer.z
 
-    def _fill_gyroscope_data(self, simulator_data):
+    def _fill_gyroscope_data(self, simulator_data, state):
         """Fill the gyroscope data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
         sensors = self.aircraft.sensors
 
@@ -116,54 +301,72 @@ class SimulatorDataProtocol(DatagramProtocol):
         simulator_data.gyroscope.pitch_rate = sensors.gyroscope.pitch_rate
         simulator_data.gyroscope.yaw_rate = sensors.gyroscope.yaw_rate
 
-    def _fill_thermometer_data(self, simulator_data):
+    def _fill_thermometer_data(self, simulator_data, state):
         """Fill the thermometer data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
         thermometer = self.aircraft.sensors.thermometer
 
         simulator_data.thermometer.temperature = thermometer.temperature
 
-    def _fill_pressure_sensor_data(self, simulator_data):
+    def _fill_pressure_sensor_data(self, simulator_data, state):
         """Fill the pressure sensor data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
         pressure_sensor = self.aircraft.sensors.pressure_sensor
-        pitot_tube = self.aircraft.sensors.pitot_tube
 
         simulator_data.pressure_sensor.pressure = pressure_sensor.pressure
+
+    def _fill_pitot_tube_data(self, simulator_data, state):
+        """Fill the pitot tube data in the SimulatorData object
+
+        Arguments:
+        simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
+        """
+        pitot_tube = self.aircraft.sensors.pitot_tube
+
         simulator_data.pitot_tube.pressure = pitot_tube.pressure
 
-    def _fill_engine_data(self, simulator_data):
+    def _fill_engine_data(self, simulator_data, state):
         """Fill the engine data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        simulator_data.engine.thrust = self.aircraft.engine.thrust
-        simulator_data.engine.throttle = self.aircraft.engine.throttle
+        engine = state.aircraft.engine
 
-    def _fill_aircraft_controls_data(self, simulator_data):
+        simulator_data.engine.thrust = engine.thrust
+        simulator_data.engine.throttle = engine.throttle
+
+    def _fill_aircraft_controls_data(self, simulator_data, state):
         """Fill the aircraft controls data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        simulator_data.controls.aileron = self.aircraft.controls.aileron
-        simulator_data.controls.elevator = self.aircraft.controls.elevator
-        simulator_data.controls.rudder = self.aircraft.controls.rudder
-        simulator_data.controls.throttle = self.aircraft.controls.throttle
+        controls = state.aircraft.controls
+
+        simulator_data.controls.aileron = controls.aileron
+        simulator_data.controls.elevator = controls.elevator
+        simulator_data.controls.rudder = controls.rudder
+        simulator_data.controls.throttle = controls.throttle
 
-    def _fill_ins_data(self, simulator_data):
+    def _fill_ins_data(self, simulator_data, state):
         """Fill the inertial navigation system data in the SimulatorData
         object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
         ins = self.aircraft.sensors.inertial_navigation_system
 
@@ -175,13 +378,14 @@ class SimulatorDataProtocol(DatagramProtocol):
         simulator_data.ins.airspeed = ins.airspeed
         simulator_data.ins.heading = ins.heading
 
-    def _fill_accelerations(self, simulator_data):
+    def _fill_accelerations(self, simulator_data, state):
         """Fill the fdm accelerations data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        accelerations = self.simulator.fdm.accelerations
+        accelerations = state.fdm.accelerations
 
         simulator_data.accelerations.x = accelerations.x
         simulator_data.accelerations.y = accelerations.y
@@ -194,13 +398,14 @@ class SimulatorDataProtocol(DatagramProtocol):
         simulator_data.accelerations.w_dot = accelerations.w_dot
         simulator_data.accelerations.gravity = accelerations.gravity
 
-    def _fill_velocities(self, simulator_data):
+    def _fill_velocities(self, simulator_data, state):
         """Fill the fdm velocities data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        velocities = self.simulator.fdm.velocities
+        velocities = state.fdm.velocities
 
         simulator_data.velocities.p = velocities.p
         simulator_data.velocities.q = velocities.q
@@ -219,38 +424,41 @@ class SimulatorDataProtocol(DatagramProtocol):
         simulator_data.velocities.climb_rate = velocities.climb_rate
         simulator_data.velocities.ground_speed = velocities.ground_speed
 
-    def _fill_position(self, simulator_data):
+    def _fill_position(self, simulator_data, state):
         """Fill the fdm position data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        position = self.simulator.fdm.position
+        position = state.fdm.position
 
         simulator_data.position.latitude = position.latitude
         simulator_data.position.longitude = position.longitude
         simulator_data.position.altitude = position.altitude
         simulator_data.position.heading = position.heading
 
-    def _fill_orientation(self, simulator_data):
+    def _fill_orientation(self, simulator_data, state):
         """Fill the fdm orientation data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        orientation = self.simulator.fdm.orientation
+        orientation = state.fdm.orientation
 
         simulator_data.orientation.phi = orientation.phi
         simulator_data.orientation.theta = orientation.theta
         simulator_data.orientation.psi = orientation.psi
 
-    def _fill_atmosphere(self, simulator_data):
+    def _fill_atmosphere(self, simulator_data, state):
         """Fill the fdm atmospheric data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        atmosphere = self.simulator.fdm.atmosphere
+        atmosphere = state.fdm.atmosphere
 
         simulator_data.atmosphere.pressure = atmosphere.pressure
 
@@ -267,13 +475,14 @@ class SimulatorDataProtocol(DatagramProtocol):
         sea_level_density = atmosphere.sea_level_density
         simulator_data.atmosphere.sea_level_density = sea_level_density
 
-    def _fill_forces(self, simulator_data):
+    def _fill_forces(self, simulator_data, state):
         """Fill the fdm atmospheric data in the SimulatorData object
 
         Arguments:
         simulator_data: the protocol buffer SimulatorData object
+        state: the SimulatorState snapshot to use
         """
-        forces = self.simulator.fdm.forces
+        forces = state.fdm.forces
 
         simulator_data.forces.x_body = forces.x_body
         simulator_data.forces.y_body = forces.y_body
@@ -285,37 +494,540 @@ class SimulatorDataProtocol(DatagramProtocol):
         simulator_data.forces.y_total = forces.y_total
         simulator_data.forces.z_total = forces.z_total
 
-    def get_simulator_data(self):
-        """Return the simulator data"""
+    def get_simulator_data(self, fields=None):
+        """Return the simulator data
+
+        Arguments:
+        fields: the names of the SimulatorData fields to fill. All the fields
+            are filled if this is not set
+        """
+        if fields is None:
+            fields = SIMULATOR_DATA_FIELDS
+
         simulator_data = fdm_pb2.SimulatorData()
 
-        simulator_data.time = self.fdmexec.GetSimTime()
-
-        self._fill_gps_data(simulator_data)
-        self._fill_accelerometer_data(simulator_data)
-        self._fill_gyroscope_data(simulator_data)
-        self._fill_thermometer_data(simulator_data)
-        self._fill_pressure_sensor_data(simulator_data)
-        self._fill_engine_data(simulator_data)
-        self._fill_aircraft_controls_data(simulator_data)
-        self._fill_ins_data(simulator_data)
-        self._fill_accelerations(simulator_data)
-        self._fill_velocities(simulator_data)
-        self._fill_position(simulator_data)
-        self._fill_orientation(simulator_data)
-        self._fill_atmosphere(simulator_data)
-        self._fill_forces(simulator_data)
+        # the sensor values are read from the aircraft, so all the values
+        # must be read from the same snapshot of the simulator
+        with self.simulator.snapshot():
+            state = self.simulator.state
+
+            simulator_data.time = state.fdm.time
+
+            for field in fields:
+                getattr(self, FILL_METHODS[field])(simulator_data, state)
+
+        return simulator_data
+
+    def _update_cache(self):
+        """Clear the cached messages if the simulator state has changed"""
+        state = self.simulator.state
+
+        if state is not self._encoded_state:
+            self._messages = {}
+            self._datagrams = {}
+            self._encoded_state = state
+
+    def get_message(self, fields=None):
+        """Return the simulator data. The message for a list of fields is
+        created only once for every simulator state snapshot
+
+        Arguments:
+        fields: a tuple with the names of the SimulatorData fields to send.
+            All the fields are sent if this is not set
+        """
+        with self.simulator.snapshot():
+            self._update_cache()
+
+            simulator_data = self._messages.get(fields)
+
+            if simulator_data is None:
+                simulator_data = self.get_simulator_data(fields)
+
+                self._messages[fields] = simulator_data
 
         return simulator_data
 
+    def get_datagram(self, fields=None):
+        """Return the serialized simulator data. The message for a list of
+        fields is encoded only once for every simulator state snapshot
+
+        Arguments:
+        fields: a tuple with the names of the SimulatorData fields to send.
+            All the fields are sent if this is not set
+        """
+        with self.simulator.snapshot():
+            self._update_cache()
+
+            datagram = self._datagrams.get(fields)
+
+            if datagram is None:
+                datagram = self.get_message(fields).SerializeToString()
+
+                self._datagrams[fields] = datagram
+                self.encoded_messages += 1
+
+        return datagram
+
+    def get_header(self, sequence):
+        """Return the serialized sequence number and send time of a message.
+        The header is appended to the shared datagram of the simulator data,
+        so every client receives its own sequence numbers without encoding
+        the simulator data again
+
+        Arguments:
+        sequence: the message sequence number
+        """
+        header = fdm_pb2.SimulatorData()
+        header.sequence = sequence
+        header.send_time = self.clock()
+
+        return header.SerializePartialToString()
+
     def send_simulator_data(self):
         """Transmit the simulator data"""
-        simulator_data = self.get_simulator_data()
-
-        datagram = simulator_data.SerializeToString()
+        datagram = self.get_datagram() + self.get_header(self.sequence)
 
         self.transport.write(datagram, (self.remote_host, self.port))
 
+        self.sequence += 1
+
+
+class SimulatorDataPublisher(SimulatorDataProtocol):
+    """The SimulatorDataPublisher transmits the simulator data to a number of
+    clients using a single socket. The simulator data are encoded once and
+    the same datagram is sent to every client, even if the clients are
+    updated at different rates.
+
+    A subscriber can also be a multicast group. In that case a single
+    datagram is sent to the group and the network delivers it to every
+    client that has joined the group. The publisher must be used with a
+    multicast transport, for example by using reactor.listenMulticast.
+    """
+    def __init__(self, simulator, multicast_ttl=None,
+                 multicast_interface=None):
+        """Create a new SimulatorDataPublisher object
+
+        Arguments:
+        simulator: the Simulator object
+        multicast_ttl: the time to live of the multicast datagrams
+        multicast_interface: the address of the interface that will be used
+            to send the multicast datagrams
+        """
+        super(SimulatorDataPublisher, self).__init__(simulator, None, None)
+
+        self.multicast_ttl = multicast_ttl
+        self.multicast_interface = multicast_interface
+        self.subscribers = []
+        self.sequences = {}
+
+    def startProtocol(self):
+        if self.multicast_ttl is not None:
+            self.transport.setTTL(self.multicast_ttl)
+
+        if self.multicast_interface is not None:
+            self.transport.setOutgoingInterface(self.multicast_interface)
+
+    def has_multicast_subscribers(self):
+        """Returns True if any of the subscribers is a multicast group"""
+        return any([is_multicast_address(address)
+                    for address, _ in self.subscribers])
+
+    def add_subscriber(self, address, port):
+        """Add a client that will receive the simulator data
+
+        Arguments:
+        address: the client address
+        port: the client port
+        """
+        self.subscribers.append((address, port))
+
+    def publish(self, subscribers=None):
+        """Transmit the simulator data to the subscribers
+
+        Arguments:
+        subscribers: the (address, port) tuples of the clients to send the
+            data to. The data will be sent to every subscriber if this is not
+            set
+        """
+        if subscribers is None:
+            subscribers = self.subscribers
+
+        if not subscribers:
+            return
+
+        datagram = self.get_datagram()
+
+        for subscriber in subscribers:
+            sequence = self.sequences.get(subscriber, 0)
+
+            self.transport.write(datagram + self.get_header(sequence),
+                                 subscriber)
+
+            self.sequences[subscriber] = sequence + 1
+
+    def send_simulator_data(self):
+        """Transmit the simulator data to every subscriber"""
+        self.publish()
+
+
+class TelemetrySubscription(object):
+    """The TelemetrySubscription class contains the settings of a client that
+    has subscribed to the simulator telemetry"""
+
+    def __init__(self, address, update_rate, fields, expires_at,
+                 encoder=None):
+        """Create a new TelemetrySubscription object
+
+        Arguments:
+        address: the (host, port) tuple that the data will be sent to
+        update_rate: the time in seconds between the messages
+        fields: a tuple with the names of the SimulatorData fields to send or
+            None to send all of them
+        expires_at: the time when the subscription expires
+        encoder: the TelemetryEncoder that will encode the simulator data or
+            None to send SimulatorData messages
+        """
+        self.address = address
+        self.update_rate = update_rate
+        self.fields = fields
+        self.expires_at = expires_at
+        self.encoder = encoder
+        self.next_update = None
+        self.sequence = 0
+
+
+class TelemetryProtocol(SimulatorDataProtocol):
+    """The TelemetryProtocol sends the simulator data to the clients that
+    have subscribed to the simulator telemetry.
+
+    A client subscribes by sending a TelemetrySubscriptionRequest with the
+    update rate and the fields that it needs. The subscription expires if it
+    isn't renewed before the end of its lease. The request is renewed by
+    sending it again. The clients that request the same fields share the
+    encoded message.
+    """
+
+    def __init__(self, simulator,
+                 max_subscriptions=configuration.TELEMETRY_MAX_SUBSCRIPTIONS,
+                 max_lease=configuration.TELEMETRY_MAX_LEASE,
+                 clock=time.time):
+        """Create a new TelemetryProtocol object
+
+        Arguments:
+        simulator: the Simulator object
+        max_subscriptions: the maximum number of subscriptions
+        max_lease: the maximum subscription lease in seconds
+        clock: a function that returns the wall clock time in seconds
+        """
+        super(TelemetryProtocol, self).__init__(simulator, None, None)
+
+        self.max_subscriptions = max_subscriptions
+        self.max_lease = max_lease
+        self.clock = clock
+
+        self.subscriptions = OrderedDict()
+
+    def _get_fields(self, request):
+        """Returns the requested fields in the SimulatorData order or None if
+        all the fields have been requested"""
+        invalid_fields = [field for field in request.fields
+                          if field not in FILL_METHODS]
+
+        if invalid_fields:
+            raise ValueError("Invalid telemetry fields %s" %
+                             ", ".join(invalid_fields))
+
+        if not request.fields:
+            return None
+
+        fields = tuple([field for field in SIMULATOR_DATA_FIELDS
+                        if field in request.fields])
+
+        if fields == SIMULATOR_DATA_FIELDS:
+            return None
+
+        return fields
+
+    def _get_encoder(self, request, fields, subscription):
+        """Returns the TelemetryEncoder of the subscription or None if the
+        simulator data will not be delta encoded. The encoder of an existing
+        subscription is kept if its settings haven't changed"""
+        if not request.delta_encoding:
+            return None
+
+        keyframe_interval = configuration.TELEMETRY_KEYFRAME_INTERVAL
+        if request.HasField("keyframe_interval"):
+            keyframe_interval = request.keyframe_interval
+
+        resolutions = dict([(resolution.field, resolution.resolution)
+                            for resolution in request.resolutions])
+
+        encoder = TelemetryEncoder(fields, resolutions, keyframe_interval)
+
+        if subscription is not None and subscription.encoder is not None:
+            previous_encoder = subscription.encoder
+
+            if (previous_encoder.fields == encoder.fields and
+                    previous_encoder.resolutions == encoder.resolutions and
+                    previous_encoder.keyframe_interval == keyframe_interval):
+                return previous_encoder
+
+        return encoder
+
+    def handle_subscription_request(self, request, host):
+        """Add, renew or cancel a subscription. Returns a
+        TelemetrySubscriptionResponse object
+
+        Arguments:
+        request: a TelemetrySubscriptionRequest object
+        host: the address of the client
+        """
+        response = fdm_pb2.TelemetrySubscriptionResponse()
+        address = (host, request.port)
+
+        if request.unsubscribe:
+            if self.subscriptions.pop(address, None) is not None:
+                logger.debug("Removed the telemetry subscription of %s:%d",
+                             host, request.port)
+
+            response.accepted = True
+
+            return response
+
+        update_rate = configuration.TELEMETRY_DT
+        if request.HasField("update_rate"):
+            update_rate = request.update_rate
+
+        lease = configuration.TELEMETRY_LEASE
+        if request.HasField("lease"):
+            lease = min(request.lease, self.max_lease)
+
+        try:
+            fields = self._get_fields(request)
+        except ValueError as e:
+            response.accepted = False
+            response.error = str(e)
+
+            return response
+
+        if request.port < 1 or request.port > 65535:
+            response.accepted = False
+            response.error = "Invalid telemetry port %d" % request.port
+
+            return response
+
+        if update_rate <= 0.0 or lease <= 0.0:
+            response.accepted = False
+            response.error = "Invalid update rate or lease"
+
+            return response
+
+        if (address not in self.subscriptions and
+                len(self.subscriptions) >= self.max_subscriptions):
+            response.accepted = False
+            response.error = "Too many telemetry subscriptions"
+
+            return response
+
+        subscription = self.subscriptions.get(address)
+
+        try:
+            encoder = self._get_encoder(request, fields, subscription)
+        except TelemetryError as e:
+            response.accepted = False
+            response.error = str(e)
+
+            return response
+
+        now = self.clock()
+
+        if subscription is None:
+            logger.debug("Sending telemetry to %s:%d every %f seconds",
+                         host, request.port, update_rate)
+
+            subscription = TelemetrySubscription(address, update_rate, fields,
+                                                 now + lease, encoder)
+
+            self.subscriptions[address] = subscription
+        else:
+            subscription.update_rate = update_rate
+            subscription.fields = fields
+            subscription.expires_at = now + lease
+            subscription.encoder = encoder
+
+        response.accepted = True
+        response.lease = lease
+
+        return response
+
+    def datagramReceived(self, datagram, addr):
+        request = fdm_pb2.TelemetrySubscriptionRequest()
+
+        try:
+            request.ParseFromString(datagram)
+        except DecodeError:
+            logger.exception("Failed to parse the telemetry subscription "
+                             "request")
+            return
+
+        response = self.handle_subscription_request(request, addr[0])
+
+        self.transport.write(response.SerializeToString(), addr)
+
+    def update(self):
+        """Remove the expired subscriptions and send the simulator data to
+        the clients that must be updated"""
+        now = self.clock()
+
+        for address, subscription in list(self.subscriptions.items()):
+            if now > subscription.expires_at:
+                logger.debug("The telemetry subscription of %s:%d has "
+                             "expired", address[0], address[1])
+
+                del self.subscriptions[address]
+                continue
+
+            if (subscription.next_update is not None and
+                    now < subscription.next_update):
+                continue
+
+            if subscription.encoder is None:
+                datagram = self.get_datagram(subscription.fields)
+                datagram += self.get_header(subscription.sequence)
+            else:
+                simulator_data = self.get_message(subscription.fields)
+
+                frame = subscription.encoder.encode(simulator_data)
+                frame.sequence = subscription.sequence
+                frame.send_time = self.clock()
+
+                datagram = frame.SerializeToString()
+
+            self.transport.write(datagram, address)
+
+            subscription.sequence += 1
+
+            # the updates stay aligned to the update rate unless the client
+            # has fallen behind by more than one update
+            if (subscription.next_update is None or
+                    now - subscription.next_update > subscription.update_rate):
+                subscription.next_update = now
+
+            subscription.next_update += subscription.update_rate
+
+
+class TelemetrySubscriptionClient(DatagramProtocol):
+    """The TelemetrySubscriptionClient subscribes to the Huginn telemetry and
+    renews the subscription before its lease expires. The simulator data
+    must be received with a SimulatorDataClient that listens to the
+    telemetry port"""
+
+    def __init__(self, host, port, telemetry_port,
+                 update_rate=configuration.TELEMETRY_DT, fields=None,
+                 lease=configuration.TELEMETRY_LEASE, delta_encoding=False,
+                 keyframe_interval=None, resolutions=None):
+        """Create a new TelemetrySubscriptionClient object
+
+        Arguments:
+        host: the simulator address
+        port: the simulator telemetry port
+        telemetry_port: the port that the simulator data will be sent to
+        update_rate: the time in seconds between the simulator data messages
+        fields: a list with the names of the SimulatorData fields to receive.
+            All the fields are received if this is not set
+        lease: the requested subscription lease in seconds
+        delta_encoding: receive TelemetryFrame messages. The
+            SimulatorDataClient must also be created with delta encoding
+        keyframe_interval: the number of frames between two keyframes
+        resolutions: a dictionary with the resolutions of the SimulatorData
+            fields, for example position, or of their values, for example
+            position.altitude
+        """
+        self.host = host
+        self.port = port
+        self.telemetry_port = telemetry_port
+        self.update_rate = update_rate
+        self.fields = fields or []
+        self.lease = lease
+        self.delta_encoding = delta_encoding
+        self.keyframe_interval = keyframe_interval
+        self.resolutions = resolutions or {}
+
+        self.accepted = None
+        self.error = None
+
+        self._renewal = None
+
+    def startProtocol(self):
+        self.transport.connect(self.host, self.port)
+
+        # the subscription is renewed when half of its lease has passed, so
+        # a lost request doesn't cancel it
+        self._renewal = LoopingCall(self.subscribe)
+        self._renewal.start(self.lease / 2.0)
+
+    def stopProtocol(self):
+        if self._renewal is not None and self._renewal.running:
+            self._renewal.stop()
+
+    def create_request(self, unsubscribe=False):
+        """Returns the TelemetrySubscriptionRequest object
+
+        Arguments:
+        unsubscribe: create a request that cancels the subscription
+        """
+        request = fdm_pb2.TelemetrySubscriptionRequest()
+        request.port = self.telemetry_port
+
+        if unsubscribe:
+            request.unsubscribe = True
+        else:
+            request.update_rate = self.update_rate
+            request.lease = self.lease
+            request.fields.extend(self.fields)
+
+            if self.delta_encoding:
+                request.delta_encoding = True
+
+                if self.keyframe_interval is not None:
+                    request.keyframe_interval = self.keyframe_interval
+
+                for field in sorted(self.resolutions):
+                    resolution = request.resolutions.add()
+                    resolution.field = field
+                    resolution.resolution = self.resolutions[field]
+
+        return request
+
+    def subscribe(self):
+        """Send the subscription request"""
+        self.transport.write(self.create_request().SerializeToString())
+
+    def unsubscribe(self):
+        """Cancel the subscription"""
+        if self._renewal is not None and self._renewal.running:
+            self._renewal.stop()
+
+        self.transport.write(
+            self.create_request(unsubscribe=True).SerializeToString())
+
+    def datagramReceived(self, datagram, addr):
+        response = fdm_pb2.TelemetrySubscriptionResponse()
+
+        try:
+            response.ParseFromString(datagram)
+        except DecodeError:
+            logger.exception("Failed to parse the telemetry subscription "
+                             "response")
+            return
+
+        self.accepted = response.accepted
+        self.error = response.error if response.HasField("error") else None
+
+        if not response.accepted:
+            logger.error("The telemetry subscription was rejected: %s",
+                         self.error)
+
 
 class SimulatorDataListener(object):
     """The methods of the FDMDataListener class must be implemented by any
@@ -333,12 +1045,69 @@ class SimulatorDataListener(object):
         pass
 
 
+class TelemetryStatisticsListener(object):
+    """The methods of the TelemetryStatisticsListener class must be
+    implemented by any object that wants to receive the statistics of the
+    simulator data messages"""
+    __metaclass = ABCMeta
+
+    @abstractmethod
+    def packet_received(self, packet):
+        """This function is called when a simulator data message has been
+        received
+
+        Arguments:
+        packet: a TelemetryPacket object with the sequence number, the
+            latency and the loss and reordering information of the message
+        """
+        pass
+
+
 class SimulatorDataClient(DatagramProtocol):
     """The SimulatorDataClient is used to receive simulator data from
-    Huginn"""
+    Huginn.
 
-    def __init__(self):
+    The client joins the given multicast group when the protocol starts. In
+    that case the client must be used with reactor.listenMulticast and the
+    listenMultiple argument set to True, so that many clients on the same
+    host can receive the simulator data.
+
+    The client can also receive the delta encoded TelemetryFrame messages of
+    a telemetry subscription. The frames are converted to SimulatorData
+    messages before the listeners are notified.
+
+    The sequence numbers and the send times of the messages are used in
+    order to measure the packet loss, the reordering, the jitter and the
+    latency of the link. The statistics listeners are notified for every
+    message and the statistics attribute contains the totals.
+    """
+
+    def __init__(self, multicast_group=None, interface="",
+                 delta_encoding=False):
+        """Create a new SimulatorDataClient object
+
+        Arguments:
+        multicast_group: the multicast group address to join
+        interface: the address of the interface that will join the group
+        delta_encoding: receive TelemetryFrame messages instead of
+            SimulatorData messages
+        """
+        self.multicast_group = multicast_group
+        self.interface = interface
         self.listeners = []
+        self.statistics_listeners = []
+        self.statistics = TelemetryStatistics()
+
+        self.decoder = None
+        if delta_encoding:
+            self.decoder = TelemetryDecoder()
+
+    def startProtocol(self):
+        if self.multicast_group is not None:
+            logger.debug("Joining the multicast group %s",
+                         self.multicast_group)
+
+            self.transport.joinGroup(self.multicast_group, self.interface)
 
     def add_simulator_data_listener(self, listener):
         """Add an simulator data listener"""
@@ -358,10 +1127,51 @@ class SimulatorDataClient(DatagramProtocol):
         for simulator_data_listener in self.listeners:
             simulator_data_listener.simulator_data_received(simulator_data)
 
+    def add_statistics_listener(self, listener):
+        """Add a listener that will receive the statistics of every message
+        that has a sequence number"""
+        self.statistics_listeners.append(listener)
+
+    def remove_statistics_listener(self, listener):
+        """Remove a statistics listener"""
+        self.statistics_listeners.remove(listener)
+
+    def _notify_statistics_listeners(self, packet):
+        """Update the statistics listeners
+
+        Arguments:
+        packet: a TelemetryPacket object with the message statistics
+        """
+        for statistics_listener in self.statistics_listeners:
+            statistics_listener.packet_received(packet)
+
     def datagramReceived(self, datagram, addr):
-        simulator_data = fdm_pb2.SimulatorData()
+        receive_time = self.statistics.clock()
+
+        if self.decoder is not None:
+            message = fdm_pb2.TelemetryFrame()
+        else:
+            message = fdm_pb2.SimulatorData()
+
+        try:
+            message.ParseFromString(datagram)
+        except DecodeError:
+            logger.exception("Failed to parse the simulator data")
+            return
 
-        simulator_data.ParseFromString(datagram)
+        if message.HasField("sequence") and message.HasField("send_time"):
+            packet = self.statistics.update(message.sequence, message.time,
+                                            message.send_time, receive_time)
+
+            self._notify_statistics_listeners(packet)
+
+        if self.decoder is not None:
+            simulator_data = self.decoder.decode(message)
+
+            if simulator_data is None:
+                return
+        else:
+            simulator_data = message
 
         self._notify_simulator_data_listeners(simulator_data)
 
@@ -372,6 +1182,7 @@ class ControlsClient(DatagramProtocol):
     def __init__(self, host, port):
         self.host = host
         self.port = port
+        self.sequence = 0
 
     def startProtocol(self):
         self.transport.connect(self.host, self.port)
@@ -387,15 +1198,44 @@ class ControlsClient(DatagramProtocol):
 
     def transmit_controls(self, aileron, elevator, rudder, throttle):
         """Send the aircraft controls to Huginn"""
-        controls = fdm_pb2.Controls()
+        controls = fdm_pb2.ControlsUpdate()
         controls.aileron = aileron
         controls.elevator = elevator
         controls.rudder = rudder
         controls.throttle = throttle
+        controls.sequence = self.sequence
+
+        self.sequence = (self.sequence + 1) % 2 ** 32
 
         self.send_datagram(controls.SerializeToString())
 
 
+# the sensors whose history can be requested with a sensor data request
+HISTORY_SENSORS = {
+    fdm_pb2.ACCELEROMETER_REQUEST: "accelerometer",
+    fdm_pb2.GYROSCOPE_REQUEST: "gyroscope",
+    fdm_pb2.THERMOMETER_REQUEST: "thermometer",
+    fdm_pb2.PRESSURE_SENSOR_REQUEST: "pressure_sensor",
+    fdm_pb2.PITOT_TUBE_REQUEST: "pitot_tube",
+    fdm_pb2.INS_REQUEST: "inertial_navigation_system"
+}
+
+
+# the SensorDataProtocol methods that add the data of every sensor to a
+# sensor data response
+SENSOR_DATA_FILL_METHODS = {
+    fdm_pb2.GPS_REQUEST: "fill_gps_data",
+    fdm_pb2.ACCELEROMETER_REQUEST: "fill_accelerometer_data",
+    fdm_pb2.GYROSCOPE_REQUEST: "fill_gyroscope_data",
+    fdm_pb2.THERMOMETER_REQUEST: "fill_thermometer_data",
+    fdm_pb2.PRESSURE_SENSOR_REQUEST: "fill_pressure_sensor_data",
+    fdm_pb2.PITOT_TUBE_REQUEST: "fill_pitot_tube_data",
+    fdm_pb2.ENGINE_REQUEST: "fill_engine_data",
+    fdm_pb2.CONTROLS_REQUEST: "fill_controls_data",
+    fdm_pb2.INS_REQUEST: "fill_ins_data"
+}
+
+
 class SensorDataProtocol(Int32StringReceiver):
     """The SensorDataProtocol is used to transmit the aircraft's sensor data"""
     def fill_gps_data(self, sensor_data_response):
@@ -488,47 +1328,95 @@ class SensorDataProtocol(Int32StringReceiver):
         sensor_data_response.ins.airspeed = ins.airspeed
         sensor_data_response.ins.heading = ins.heading
 
+    def fill_history_data(self, sensor_data_response, request_type, since):
+        """Add the sensor samples that were recorded after the given
+        simulation time to the response object"""
+        sensor_data_response.type = request_type
+
+        sensor = getattr(self.factory.aircraft.sensors,
+                         HISTORY_SENSORS[request_type])
+        history = sensor.history
+
+        sensor_data_response.history.fields.extend(history.fields)
+        sensor_data_response.history.truncated = history.is_truncated(since)
+
+        for sample in history.get_samples(since):
+            sensor_data_response.history.time.append(sample[0])
+            sensor_data_response.history.values.extend(sample[1:])
+
     def fill_error_response(self, sensor_data_response):
         """Set the error code in the response object"""
         sensor_data_response.type = fdm_pb2.INVALID_REQUEST
 
+    def fill_batch_data(self, sensor_data_response, request_types):
+        """Add the data of several sensors to the response object"""
+        if (not request_types or
+                any([request_type not in SENSOR_DATA_FILL_METHODS
+                     for request_type in request_types])):
+            self.fill_error_response(sensor_data_response)
+            return
+
+        for request_type in request_types:
+            fill_method = getattr(self, SENSOR_DATA_FILL_METHODS[request_type])
+            fill_method(sensor_data_response)
+
+        sensor_data_response.type = fdm_pb2.BATCH_REQUEST
+
     def send_response_string(self, response_string):
-        """Transmit the response"""
+        """Transmit the response. The connection stays open so that the
+        client can send more requests"""
         self.sendString(response_string)
 
-        self.transport.loseConnection()
-
     def handle_sensor_data_request(self, sensor_data_request):
         """Fills the required data on the response object and sends the
         response back to the requesting client"""
         sensor_data_response = fdm_pb2.SensorDataResponse()
 
-        if sensor_data_request.type == fdm_pb2.GPS_REQUEST:
-            self.fill_gps_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.ACCELEROMETER_REQUEST:
-            self.fill_accelerometer_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.GYROSCOPE_REQUEST:
-            self.fill_accelerometer_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.THERMOMETER_REQUEST:
-            self.fill_thermometer_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.PRESSURE_SENSOR_REQUEST:
-            self.fill_pressure_sensor_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.PITOT_TUBE_REQUEST:
-            self.fill_pitot_tube_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.ENGINE_REQUEST:
-            self.fill_engine_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.CONTROLS_REQUEST:
-            self.fill_controls_data(sensor_data_response)
-        elif sensor_data_request.type == fdm_pb2.INS_REQUEST:
-            self.fill_ins_data(sensor_data_response)
-        else:
-            self.fill_error_response(sensor_data_response)
+        request_type = sensor_data_request.type
+
+        # all the values of a response are read from the same snapshot of
+        # the aircraft
+        with self.factory.aircraft.snapshot():
+            if sensor_data_request.HasField("since"):
+                if request_type in HISTORY_SENSORS:
+                    self.fill_history_data(sensor_data_response,
+                                           request_type,
+                                           sensor_data_request.since)
+                else:
+                    self.fill_error_response(sensor_data_response)
+            elif request_type == fdm_pb2.BATCH_REQUEST:
+                self.fill_batch_data(sensor_data_response,
+                                     sensor_data_request.types)
+            elif request_type in SENSOR_DATA_FILL_METHODS:
+                fill_method = getattr(self,
+                                      SENSOR_DATA_FILL_METHODS[request_type])
+                fill_method(sensor_data_response)
+            else:
+                self.fill_error_response(sensor_data_response)
+
+        if sensor_data_request.HasField("request_id"):
+            sensor_data_response.request_id = sensor_data_request.request_id
 
         self.send_response_string(sensor_data_response.SerializeToString())
 
     def stringReceived(self, string):
+        """Handle a sensor data request. The requests of a connection are
+        handled in the order that they were received, so a client can send
+        several requests without waiting for the responses"""
         sensor_data_request = fdm_pb2.SensorDataRequest()
-        sensor_data_request.ParseFromString(string)
+
+        try:
+            sensor_data_request.ParseFromString(string)
+        except DecodeError:
+            logger.warning("Received an invalid sensor data request")
+
+            sensor_data_response = fdm_pb2.SensorDataResponse()
+            self.fill_error_response(sensor_data_response)
+
+            self.send_response_string(
+                sensor_data_response.SerializeToString())
+
+            return
 
         self.handle_sensor_data_request(sensor_data_request)
 
@@ -557,8 +1445,30 @@ class SensorDataClientProtocol(Int32StringReceiver):
     simulator"""
 
     def connectionMade(self):
+        self.pending_requests = 0
+        self.factory.connection = self
+
+        self.send_request(self.factory.request_type,
+                          self.factory.request_types)
+
+    def connectionLost(self, reason):
+        self.factory.connection = None
+
+    def send_request(self, request_type, request_types=None):
+        """Send a sensor data request. More requests can be sent before the
+        responses of the previous requests have been received
+
+        Arguments:
+        request_type: the SensorDataRequestType of the request
+        request_types: the sensor data request types of a batch request
+        """
         sensor_data_request = fdm_pb2.SensorDataRequest()
-        sensor_data_request.type = self.factory.request_type
+        sensor_data_request.type = request_type
+
+        if request_types:
+            sensor_data_request.types.extend(request_types)
+
+        self.pending_requests += 1
 
         self.sendString(sensor_data_request.SerializeToString())
 
@@ -567,17 +1477,38 @@ class SensorDataClientProtocol(Int32StringReceiver):
         sensor_data_response = fdm_pb2.SensorDataResponse()
         sensor_data_response.ParseFromString(string)
 
+        self.pending_requests -= 1
+
         self.factory.received_responce(sensor_data_response)
 
+        if not self.factory.keep_alive and self.pending_requests == 0:
+            self.transport.loseConnection()
 
-class SensorDataClientProtocolFactory(Factory):
+
+class SensorDataClientProtocolFactory(ClientFactory):
     """Protocol factory object for the SensorDataClientProtocol protocol
     class"""
 
-    def __init__(self, request_type, sensor_data_responce_listener):
+    def __init__(self, request_type, sensor_data_responce_listener,
+                 request_types=None, keep_alive=False):
+        """Create a new SensorDataClientProtocolFactory object
+
+        Arguments:
+        request_type: the type of the request that is sent when the client
+            connects
+        sensor_data_responce_listener: the object that will receive the
+            responses
+        request_types: the sensor data request types of a batch request
+        keep_alive: keep the connection open after the responses have been
+            received. More requests can be sent with the send_request method
+            of the connection
+        """
         self.protocol = SensorDataClientProtocol
         self.request_type = request_type
+        self.request_types = request_types
         self.sensor_data_responce_listener = sensor_data_responce_listener
+        self.keep_alive = keep_alive
+        self.connection = None
 
     def received_responce(self, sensor_data_responce):
         """Notify the sensor data listeners
@@ -11,3 +11,19 @@ waypoint.add_argument("longitude", required=True,
                       location="json", type=argtypes.longitude)
 waypoint.add_argument("altitude", required=True,
                       location="json", type=argtypes.altitude)
+
+# the properties request parser is used to parse the names of the properties
+# that will be returned by the bulk property endpoint
+properties = reqparse.RequestParser()
+properties.add_argument("property", required=True, action="append",
+                        location="args")
+
+# the job request parser is used to parse the time that a job progress
+# request will wait for the job to finish
+job = reqparse.RequestParser()
+job.add_argument("wait", type=float, location="args")
+
+# the sensor history request parser is used to parse the simulation time
+# after which the sensor samples will be returned
+sensor_history = reqparse.RequestParser()
+sensor_history.add_argument("since", type=float, location="args")
@@ -2,6 +2,7 @@
 The huginn.rest module contains the rest interface endpoints
 """
 from logging import getLogger
+from argparse import ArgumentTypeError
 
 from flask import request
 from flask_restful import Resource, reqparse, marshal_with, abort
@@ -14,11 +15,13 @@ from huginn.schemas import (AccelerationsSchema, VelocitiesSchema,
                             AttitudeIndicatorSchema, HeadingIndicatorSchema,
                             VerticalSpeedIndicatorSchema)
 
-from huginn.fdm import (Accelerations, Velocities, Orientation, Atmosphere,
-                        Forces, InitialCondition, Position)
 
+from huginn import configuration
+from huginn.fdm import PropertyError
 from huginn import request_models
 from huginn import request_parsers
+from huginn import trajectory
+from huginn.cli import argtypes
 
 
 logger = getLogger(__name__)
@@ -27,40 +30,38 @@ logger = getLogger(__name__)
 class FDMResource(Resource):
     """The FDMResource will return the data from the flight dynamics model"""
 
-    def __init__(self, fdm, aircraft):
+    def __init__(self, simulator):
         """Create a new FDMResource object
 
         Arguments:
-        fdm: an FDM object
-        aircraft: an aircraft object
+        simulator: a Simulator object
         """
-        self.fdm = fdm
-        self.aircraft = aircraft
+        self.simulator = simulator
 
     def get(self):
         """Get the fdm data"""
-        sensors = self.aircraft.sensors
+        fdm = self.simulator.state.fdm
 
         flight_data = {
-            "time": self.fdm.fdmexec.GetSimTime(),
-            "dt": self.fdm.fdmexec.GetDeltaT(),
-            "latitude": self.fdm.position.latitude,
-            "longitude": self.fdm.position.longitude,
-            "altitude": self.fdm.position.altitude,
-            "airspeed": self.fdm.velocities.true_airspeed,
-            "heading": self.fdm.orientation.psi,
-            "x_acceleration": self.fdm.accelerations.x,
-            "y_acceleration": self.fdm.accelerations.y,
-            "z_acceleration": self.fdm.accelerations.z,
-            "roll_rate": self.fdm.velocities.p,
-            "pitch_rate": self.fdm.velocities.q,
-            "yaw_rate": self.fdm.velocities.r,
-            "temperature": self.fdm.atmosphere.temperature,
-            "static_pressure": self.fdm.atmosphere.pressure,
-            "total_pressure": sensors.pitot_tube.true_pressure,
-            "roll": self.fdm.orientation.phi,
-            "pitch": self.fdm.orientation.theta,
-            "climb_rate": self.fdm.velocities.climb_rate
+            "time": fdm.time,
+            "dt": fdm.dt,
+            "latitude": fdm.position.latitude,
+            "longitude": fdm.position.longitude,
+            "altitude": fdm.position.altitude,
+            "airspeed": fdm.velocities.true_airspeed,
+            "heading": fdm.orientation.psi,
+            "x_acceleration": fdm.accelerations.x,
+            "y_acceleration": fdm.accelerations.y,
+            "z_acceleration": fdm.accelerations.z,
+            "roll_rate": fdm.velocities.p,
+            "pitch_rate": fdm.velocities.q,
+            "yaw_rate": fdm.velocities.r,
+            "temperature": fdm.atmosphere.temperature,
+            "static_pressure": fdm.atmosphere.pressure,
+            "total_pressure": fdm.total_pressure,
+            "roll": fdm.orientation.phi,
+            "pitch": fdm.orientation.theta,
+            "climb_rate": fdm.velocities.climb_rate
         }
 
         return flight_data
@@ -239,6 +240,35 @@ class InertialNavigationSystemResource(Resource):
         return inertial_navigation_system_data
 
 
+class SensorHistoryResource(Resource):
+    """The SensorHistoryResource returns the latest samples of a sensor"""
+
+    def __init__(self, sensor):
+        """Create a new SensorHistoryResource object
+
+        Arguments:
+        sensor: a Sensor object
+        """
+        self.sensor = sensor
+
+    def get_history_data(self, since=None):
+        """Returns the samples that were recorded after the given simulation
+        time
+
+        Arguments:
+        since: the simulation time. All the samples are returned if this is
+            None
+        """
+        return self.sensor.history.to_dict(since)
+
+    def get(self):
+        """Returns the sensor samples. If the since argument is given then
+        only the samples after that simulation time are returned"""
+        args = request_parsers.sensor_history.parse_args()
+
+        return self.get_history_data(args.since)
+
+
 class EngineResource(Resource):
     """The EngineResource class returns the engine data"""
     def __init__(self, engine):
@@ -286,13 +316,19 @@ class SimulatorControlResource(Resource):
     """The SimulatorControlResource provides the endpoint that is used to
     control the simulator"""
 
-    def __init__(self, simulator):
+    def __init__(self, simulator, scheduler=None, job_queue=None):
         """Create a new SimulatorControlResource object
 
         Arguments:
         simulator: a Simulator object
+        scheduler: the RealTimeScheduler that runs the simulator
+        job_queue: the JobQueue that will execute the run_for, run_steps,
+            save_checkpoint and restore_checkpoint commands. The commands
+            are executed immediately if it is not given
         """
         self.simulator = simulator
+        self.scheduler = scheduler
+        self.job_queue = job_queue
 
     def get(self):
         """Returns the simulator state"""
@@ -305,6 +341,177 @@ class SimulatorControlResource(Resource):
 
         return simulator_state
 
+    def _get_checkpoint_name(self, params):
+        """Returns the checkpoint name from the command parameters"""
+        if params and params.get("name"):
+            return params["name"]
+
+        return configuration.DEFAULT_CHECKPOINT
+
+    def _set_time_scale(self, params):
+        """Set the time scale of the scheduler"""
+        if self.scheduler is None:
+            return {"error": "the simulator doesn't run in real time",
+                    "command": "time_scale"}
+
+        if not params or "time_scale" not in params:
+            return {"error": "no time scale provided",
+                    "command": "time_scale"}
+
+        try:
+            time_scale = argtypes.time_scale(params["time_scale"])
+        except ArgumentTypeError:
+            return {"error": "invalid time scale",
+                    "command": "time_scale"}
+
+        self.scheduler.time_scale = time_scale
+
+        return {"result": "ok",
+                "command": "time_scale"}
+
+    def _record_trajectory(self, command, params, time_to_run=None,
+                           steps=None):
+        """Run the simulator and record the trajectory properties that were
+        given in the command parameters"""
+        properties = params["properties"]
+        sample_interval = params.get("sample_interval", 1)
+        payload_format = params.get("trajectory_format",
+                                    trajectory.COLUMNS_FORMAT)
+
+        if payload_format not in trajectory.PAYLOAD_FORMATS:
+            return {"error": "invalid trajectory format",
+                    "command": command}
+
+        if self.job_queue is None:
+            try:
+                payload = self.simulator.record_trajectory(
+                    properties, time_to_run, steps, sample_interval,
+                    payload_format)
+            except trajectory.TrajectoryError:
+                payload = None
+
+            if not payload:
+                return {"error": "failed to record the trajectory",
+                        "command": command}
+
+            return {"result": "ok",
+                    "command": command,
+                    "trajectory": payload}
+
+        try:
+            recorder = trajectory.create_recorder(
+                self.simulator, properties, sample_interval, time_to_run,
+                steps)
+        except trajectory.TrajectoryError:
+            return {"error": "failed to record the trajectory",
+                    "command": command}
+
+        if steps is not None:
+            job = self.job_queue.run_steps(steps, recorder, payload_format)
+        else:
+            job = self.job_queue.run_for(time_to_run, recorder,
+                                         payload_format)
+
+        return {"result": "ok",
+                "command": command,
+                "job_id": job.id}
+
+    def _run_for(self, params):
+        """Run the simulator for the requested time"""
+        if params:
+            time_to_run = params.get("time_to_run")
+        else:
+            time_to_run = None
+
+        if not time_to_run or time_to_run < 0.0:
+            return {"error": "no time to run provided",
+                    "command": "run_for"}
+
+        if params.get("properties"):
+            return self._record_trajectory("run_for", params,
+                                           time_to_run=time_to_run)
+
+        if self.job_queue is None:
+            self.simulator.run_for(time_to_run)
+
+            return {"result": "ok",
+                    "command": "run_for"}
+
+        job = self.job_queue.run_for(time_to_run)
+
+        return {"result": "ok",
+                "command": "run_for",
+                "job_id": job.id}
+
+    def _run_steps(self, params):
+        """Run the requested number of simulation steps"""
+        if params:
+            steps = params.get("steps")
+        else:
+            steps = None
+
+        if not steps or steps < 1:
+            return {"error": "no number of steps provided",
+                    "command": "run_steps"}
+
+        if params.get("properties"):
+            return self._record_trajectory("run_steps", params, steps=steps)
+
+        if self.job_queue is None:
+            self.simulator.run_steps(steps)
+
+            return {"result": "ok",
+                    "command": "run_steps"}
+
+        job = self.job_queue.run_steps(steps)
+
+        return {"result": "ok",
+                "command": "run_steps",
+                "job_id": job.id}
+
+    def _save_checkpoint(self, params):
+        """Store the state of the simulation in a checkpoint"""
+        name = self._get_checkpoint_name(params)
+
+        if self.job_queue is None:
+            if self.simulator.save_checkpoint(name):
+                return {"result": "ok",
+                        "command": "save_checkpoint"}
+
+            return {"error": "failed to save checkpoint %s" % name,
+                    "command": "save_checkpoint"}
+
+        job = self.job_queue.save_checkpoint(name)
+
+        return {"result": "ok",
+                "command": "save_checkpoint",
+                "job_id": job.id}
+
+    def _restore_checkpoint(self, params):
+        """Restore the simulation to a saved checkpoint"""
+        name = self._get_checkpoint_name(params)
+
+        if self.job_queue is None:
+            if self.simulator.restore_checkpoint(name):
+                return {"result": "ok",
+                        "command": "restore_checkpoint"}
+
+            return {"error": "failed to restore checkpoint %s" % name,
+                    "command": "restore_checkpoint"}
+
+        # the checkpoint might be saved by a job that hasn't been executed
+        # yet
+        if (name not in self.simulator.checkpoints and
+                not self.job_queue.is_saving_checkpoint(name)):
+            return {"error": "failed to restore checkpoint %s" % name,
+                    "command": "restore_checkpoint"}
+
+        job = self.job_queue.restore_checkpoint(name)
+
+        return {"result": "ok",
+                "command": "restore_checkpoint",
+                "job_id": job.id}
+
     def execute_command(self, command, params=None):
         """Execute the simulator command
 
@@ -333,19 +540,15 @@ class SimulatorControlResource(Resource):
             response = {"result": "ok",
                         "command": command}
         elif command == "run_for":
-            if params:
-                time_to_run = params["time_to_run"]
-            else:
-                time_to_run = None
-
-            if not time_to_run:
-                response = {"error": "no time to run provided",
-                            "command": command}
-            else:
-                self.simulator.run_for(time_to_run)
-
-                response = {"result": "ok",
-                            "command": "run_for"}
+            response = self._run_for(params)
+        elif command == "run_steps":
+            response = self._run_steps(params)
+        elif command == "save_checkpoint":
+            response = self._save_checkpoint(params)
+        elif command == "restore_checkpoint":
+            response = self._restore_checkpoint(params)
+        elif command == "time_scale":
+            response = self._set_time_scale(params)
         elif command == "start_paused":
             self.simulator.start_paused = True
 
@@ -369,6 +572,12 @@ class SimulatorControlResource(Resource):
         parser.add_argument("command", type=str, required=True)
         parser.add_argument("time_to_run", type=float)
         parser.add_argument("paused", type=bool)
+        parser.add_argument("name", type=str)
+        parser.add_argument("time_scale")
+        parser.add_argument("steps", type=int)
+        parser.add_argument("properties", action="append")
+        parser.add_argument("sample_interval", type=int)
+        parser.add_argument("trajectory_format", type=str)
 
         args = parser.parse_args()
 
@@ -382,9 +591,133 @@ class SimulatorControlResource(Resource):
         if args.paused:
             params["paused"] = args.paused
 
+        if args.name:
+            params["name"] = args.name
+
+        if args.time_scale is not None:
+            params["time_scale"] = args.time_scale
+
+        if args.steps:
+            params["steps"] = args.steps
+
+        if args.properties:
+            params["properties"] = args.properties
+
+        if args.sample_interval is not None:
+            params["sample_interval"] = args.sample_interval
+
+        if args.trajectory_format:
+            params["trajectory_format"] = args.trajectory_format
+
         return self.execute_command(command, params)
 
 
+class JobResource(Resource):
+    """The JobResource returns the progress of a simulator job and is used
+    to cancel it"""
+
+    def __init__(self, job_queue):
+        """Create a new JobResource object
+
+        Arguments:
+        job_queue: the JobQueue object
+        """
+        self.job_queue = job_queue
+
+    def get_job_data(self, job_id, wait=None):
+        """Returns the job data or None if the job doesn't exist
+
+        Arguments:
+        job_id: the job id
+        wait: the maximum time in seconds to wait for the job to finish
+        """
+        job = self.job_queue.get(job_id)
+
+        if job is None:
+            return None
+
+        if wait:
+            job.wait(min(wait, configuration.MAX_JOB_WAIT_TIME))
+
+        return job.to_dict(include_trajectory=True)
+
+    def get(self, job_id):
+        """Returns the job data. If the wait argument is given then the
+        request will wait at most that many seconds for the job to finish"""
+        args = request_parsers.job.parse_args()
+
+        job_data = self.get_job_data(job_id, args.wait)
+
+        if job_data is None:
+            abort(404, error="job doesn't exist", job_id=job_id)
+
+        return job_data
+
+    def delete(self, job_id):
+        """Cancel the job"""
+        job = self.job_queue.get(job_id)
+
+        if job is None:
+            abort(404, error="job doesn't exist", job_id=job_id)
+
+        if not self.job_queue.cancel(job_id):
+            abort(409, error="job has finished", job_id=job_id)
+
+        return job.to_dict()
+
+
+class JobsResource(Resource):
+    """The JobsResource returns the simulator jobs"""
+
+    def __init__(self, job_queue):
+        """Create a new JobsResource object
+
+        Arguments:
+        job_queue: the JobQueue object
+        """
+        self.job_queue = job_queue
+
+    def get(self):
+        """Returns the data of the simulator jobs"""
+        return [job.to_dict() for job in self.job_queue.get_jobs()]
+
+
+class SchedulerResource(Resource):
+    """The SchedulerResource returns the statistics of the real time
+    scheduler"""
+
+    def __init__(self, scheduler):
+        """Create a new SchedulerResource object
+
+        Arguments:
+        scheduler: a RealTimeScheduler object
+        """
+        self.scheduler = scheduler
+
+    def get(self):
+        """Returns the scheduler statistics"""
+        return self.scheduler.get_statistics()
+
+
+class ControlsResource(Resource):
+    """The ControlsResource returns the statistics of the controls server"""
+
+    def __init__(self, controls_protocol):
+        """Create a new ControlsResource object
+
+        Arguments:
+        controls_protocol: a ControlsProtocol object
+        """
+        self.controls_protocol = controls_protocol
+
+    def get(self):
+        """Returns the controls server statistics and merge policy"""
+        statistics = self.controls_protocol.get_statistics()
+        statistics["merge_policy"] = self.controls_protocol.merge_policy
+
+        return statistics
+
+
 class ObjectResource(Resource):
     """The ObjectResource is using an object and a marshmallow schema to return
     the representation of an object"""
@@ -399,112 +732,117 @@ class ObjectResource(Resource):
         self.obj = obj
         self.schema = schema
 
+    def get_object(self):
+        """Return the object that will be encoded"""
+        return self.obj
+
     def get(self):
         """return the object data when a GET request is executed"""
-        result = self.schema.dump(self.obj)
+        result = self.schema.dump(self.get_object())
 
         return result.data
 
 
-class AccelerationsResource(ObjectResource):
+class FDMStateResource(ObjectResource):
+    """The FDMStateResource returns a part of the fdm state snapshot that was
+    captured by the simulator after the last simulation step"""
+
+    def __init__(self, simulator, state_field, schema):
+        """Create a new FDMStateResource object
+
+        Arguments:
+        simulator: a Simulator object
+        state_field: the name of the FDMState field to encode
+        schema: the marshmallow schema object
+        """
+        self.simulator = simulator
+        self.state_field = state_field
+
+        super(FDMStateResource, self).__init__(None, schema)
+
+    def get_object(self):
+        """Return the fdm state data that will be encoded"""
+        return getattr(self.simulator.state.fdm, self.state_field)
+
+
+class AccelerationsResource(FDMStateResource):
     """The AccelerationsResource object returns the fdm accelerations"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, simulator):
         """Create a new AccelerationsResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        simulator: a Simulator object
         """
-        self.fdmexec = fdmexec
-        self.accelerations = Accelerations(self.fdmexec)
-        self.acceleration_schema = AccelerationsSchema()
-
-        super(AccelerationsResource, self).__init__(self.accelerations,
-                                                    self.acceleration_schema)
+        super(AccelerationsResource, self).__init__(simulator, "accelerations",
+                                                    AccelerationsSchema())
 
 
-class VelocitiesResource(ObjectResource):
+class VelocitiesResource(FDMStateResource):
     """The VelocitiesResource object returns the fdm velocities"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, simulator):
         """Create a new VelocitiesResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        simulator: a Simulator object
         """
-        self.fdmexec = fdmexec
-        self.velocities = Velocities(self.fdmexec)
-        self.velocities_schema = VelocitiesSchema()
-
-        super(VelocitiesResource, self).__init__(self.velocities,
-                                                 self.velocities_schema)
+        super(VelocitiesResource, self).__init__(simulator, "velocities",
+                                                 VelocitiesSchema())
 
 
-class OrientationResource(ObjectResource):
+class OrientationResource(FDMStateResource):
     """The OrientationResource object returns the orientations of the
     aircraft"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, simulator):
         """Create a new OrientationResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        simulator: a Simulator object
         """
-        self.fdmexec = fdmexec
-        self.orientation = Orientation(fdmexec)
-        self.orientation_schema = OrientationSchema()
-
-        super(OrientationResource, self).__init__(self.orientation,
-                                                  self.orientation_schema)
+        super(OrientationResource, self).__init__(simulator, "orientation",
+                                                  OrientationSchema())
 
 
-class AtmosphereResource(ObjectResource):
+class AtmosphereResource(FDMStateResource):
     """The AtmosphereResource object return the fdm atmospheric data"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, simulator):
         """Create a new AtmosphereResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        simulator: a Simulator object
         """
-        self.fdmexec = fdmexec
-        self.atmosphere = Atmosphere(fdmexec)
-        self.atmosphere_schema = AtmosphereShema()
+        super(AtmosphereResource, self).__init__(simulator, "atmosphere",
+                                                 AtmosphereShema())
 
-        super(AtmosphereResource, self).__init__(self.atmosphere,
-                                                 self.atmosphere_schema)
 
-
-class ForcesResource(ObjectResource):
+class ForcesResource(FDMStateResource):
     """The ForcesResource object contains the forces that act on the
     aircraft"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, simulator):
         """Create a new ForcesResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        simulator: a Simulator object
         """
-        self.fdmexec = fdmexec
-        self.forces = Forces(fdmexec)
-        self.forces_schema = ForcesSchema()
-
-        super(ForcesResource, self).__init__(self.forces,
-                                             self.forces_schema)
+        super(ForcesResource, self).__init__(simulator, "forces",
+                                             ForcesSchema())
 
 
 class InitialConditionResource(ObjectResource):
     """The InitialConditionResource object contain the simulator initial
     conditions"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, initial_condition):
         """Create a new InitialConditionResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        initial_condition: the InitialCondition object of the simulator
         """
-        self.fdmexec = fdmexec
-        self.initial_condition = InitialCondition(fdmexec)
+        self.initial_condition = initial_condition
         self.initial_condition_schema = InitialConditionSchema()
 
         super(InitialConditionResource, self).__init__(
@@ -547,23 +885,69 @@ class InitialConditionResource(ObjectResource):
         return {"result": "ok"}
 
 
-class PositionResource(ObjectResource):
+class PropertiesResource(Resource):
+    """The PropertiesResource returns the values of any number of JSBSim
+    properties in a single request"""
+
+    def __init__(self, simulator, job_queue=None):
+        """Create a new PropertiesResource object
+
+        Arguments:
+        simulator: a Simulator object
+        job_queue: the JobQueue that will read the properties in the
+            simulation loop. The properties are read by the simulator
+            immediately if it is not given
+        """
+        self.simulator = simulator
+        self.job_queue = job_queue
+
+    def get_property_values(self, properties):
+        """Returns a dictionary with the values of the given properties or
+        None if the simulation loop hasn't read them in time. A
+        PropertyError is raised if a property doesn't exist
+
+        Arguments:
+        properties: a list with the property names
+        """
+        if self.job_queue is None:
+            return self.simulator.get_property_values(properties)
+
+        property_read = self.job_queue.read_properties(properties)
+
+        if not property_read.wait(configuration.MAX_JOB_WAIT_TIME):
+            return None
+
+        if property_read.error is not None:
+            raise PropertyError(property_read.error)
+
+        return property_read.values
+
+    def get(self):
+        """Returns the values of the requested properties"""
+        args = request_parsers.properties.parse_args()
+
+        try:
+            property_values = self.get_property_values(args.property)
+        except PropertyError as e:
+            abort(400, error=str(e))
+
+        if property_values is None:
+            abort(503, error="the properties haven't been read")
+
+        return property_values
+
+
+class PositionResource(FDMStateResource):
     """The PositionResource object contain the aircraft position data"""
 
-    def __init__(self, fdmexec):
+    def __init__(self, simulator):
         """Create a new PositionResource object
 
         Arguments:
-        fdmexec: a jsbsim FGFDMExec object
+        simulator: a Simulator object
         """
-        self.fdmexec = fdmexec
-        self.position = Position(fdmexec)
-        self.position_schema = PositionSchema()
-
-        super(PositionResource, self).__init__(
-            self.position,
-            self.position_schema
-        )
+        super(PositionResource, self).__init__(simulator, "position",
+                                               PositionSchema())
 
 
 class AirspeedIndicatorResource(ObjectResource):
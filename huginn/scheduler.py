@@ -0,0 +1,244 @@
+"""
+The huginn.scheduler module contains the classes that are used to execute
+the simulation in real time
+"""
+
+
+import logging
+import math
+import time
+
+from huginn import configuration
+
+
+logger = logging.getLogger(__name__)
+
+
+class RealTimeScheduler(object):
+    """The RealTimeScheduler keeps the simulation time synchronized with the
+    wall clock time.
+
+    Every time the tick method is called the scheduler calculates how far
+    the simulation time has fallen behind the wall clock time and executes
+    as many simulation steps as needed to catch up, up to a maximum number
+    of steps per tick. If the simulation falls behind by more than the
+    maximum lag then the remaining time is dropped and the scheduler
+    synchronizes with the wall clock again.
+
+    The simulation can run faster or slower than the wall clock time by
+    setting the time scale. If the time scale is None then the simulation
+    runs as fast as possible.
+    """
+
+    def __init__(self, simulator,
+                 max_steps_per_tick=configuration.MAX_STEPS_PER_TICK,
+                 max_lag=configuration.MAX_SIMULATION_LAG,
+                 clock=time.time):
+        """Constructor for the RealTimeScheduler object
+
+        Arguments:
+        simulator: the Simulator object
+        max_steps_per_tick: the maximum number of simulation steps that will
+            be executed in a single tick
+        max_lag: the maximum time in seconds that the simulation is allowed
+            to fall behind the wall clock time
+        clock: a function that returns the wall clock time in seconds
+        """
+        self.simulator = simulator
+        self.max_steps_per_tick = max_steps_per_tick
+        self.max_lag = max_lag
+        self.clock = clock
+
+        self.ticks = 0
+        self.steps = 0
+        self.overruns = 0
+        self.resynchronizations = 0
+        self.dropped_time = 0.0
+        self.lag = 0.0
+        self.achieved_rate = 0.0
+        self.real_time_factor = 0.0
+
+        self._time_scale = 1.0
+        self._synchronized = False
+        self._wall_time_reference = 0.0
+        self._simulation_time_reference = 0.0
+        self._last_simulation_time = None
+
+        self._rate_window_start = None
+        self._rate_window_steps = 0
+        self._rate_window_simulation_time = 0.0
+
+    @property
+    def time_scale(self):
+        """The ratio of the simulation time to the wall clock time, or None
+        if the simulation runs as fast as possible"""
+        return self._time_scale
+
+    @time_scale.setter
+    def time_scale(self, value):
+        """Set the time scale
+
+        Arguments:
+        value: the time scale or None to run the simulation as fast as
+            possible
+        """
+        if value is not None and value <= 0.0:
+            raise ValueError("Invalid time scale %s" % value)
+
+        logger.debug("Setting the time scale to %s", value)
+
+        self._time_scale = value
+        self._synchronized = False
+        self.lag = 0.0
+
+    def _synchronize(self, now):
+        """Use the current wall clock and simulation time as the reference
+        point of the scheduler"""
+        self._wall_time_reference = now
+        self._simulation_time_reference = self.simulator.simulation_time
+        self._last_simulation_time = self._simulation_time_reference
+        self._synchronized = True
+        self.lag = 0.0
+
+    def _update_rate(self, now, steps, simulation_time_advance):
+        """Update the achieved step rate and the real time factor"""
+        if self._rate_window_start is None:
+            self._rate_window_start = now
+            return
+
+        self._rate_window_steps += steps
+        self._rate_window_simulation_time += simulation_time_advance
+
+        window_length = now - self._rate_window_start
+
+        if window_length < configuration.SCHEDULER_RATE_WINDOW:
+            return
+
+        self.achieved_rate = self._rate_window_steps / window_length
+        self.real_time_factor = (self._rate_window_simulation_time /
+                                 window_length)
+
+        self._rate_window_start = now
+        self._rate_window_steps = 0
+        self._rate_window_simulation_time = 0.0
+
+    def _get_lag(self, now):
+        """Calculate how far the simulation time is behind the wall clock
+        time"""
+        wall_time_elapsed = now - self._wall_time_reference
+        simulation_time_elapsed = (self.simulator.simulation_time -
+                                   self._simulation_time_reference)
+
+        return wall_time_elapsed * self._time_scale - simulation_time_elapsed
+
+    def _run_as_fast_as_possible(self, now):
+        """Execute simulation steps until the maximum tick duration has
+        passed"""
+        # synchronize again when a time scale is set
+        self._synchronized = False
+        self.lag = 0.0
+
+        start_simulation_time = self.simulator.simulation_time
+        steps = 0
+
+        while self.clock() - now < configuration.MAX_TICK_DURATION:
+            if not self.simulator.step():
+                return False
+
+            steps += 1
+
+            if self.simulator.is_paused():
+                break
+
+        self.steps += steps
+
+        self._update_rate(
+            now, steps, self.simulator.simulation_time - start_simulation_time)
+
+        return True
+
+    def tick(self):
+        """Execute the simulation steps that are needed to catch up with
+        the wall clock time
+
+        Returns False if the simulator has failed to run
+        """
+        now = self.clock()
+        self.ticks += 1
+
+        if self.simulator.is_paused():
+            # the simulation time doesn't advance while the simulator is
+            # paused so synchronize again after it has been resumed
+            self._synchronized = False
+            self.lag = 0.0
+            self._update_rate(now, 0, 0.0)
+            return True
+
+        if self._time_scale is None:
+            return self._run_as_fast_as_possible(now)
+
+        # the simulation time has changed outside of the scheduler, for
+        # example the simulator has been reset
+        if (not self._synchronized or
+                self.simulator.simulation_time != self._last_simulation_time):
+            self._synchronize(now)
+
+        lag = self._get_lag(now)
+
+        # the limits are given in wall clock time so they have to be scaled
+        # when the simulation runs faster than real time
+        scale = max(1.0, self._time_scale)
+        max_steps_per_tick = int(math.ceil(self.max_steps_per_tick * scale))
+
+        if self.max_lag is not None and lag > self.max_lag * scale:
+            logger.debug("The simulation is %f seconds behind the wall "
+                         "clock time", lag)
+
+            self.resynchronizations += 1
+            self.dropped_time += lag
+            self._synchronize(now)
+            lag = 0.0
+
+        # the small tolerance prevents floating point errors in the
+        # accumulated simulation time from delaying a step by a whole tick
+        steps_due = int(lag / self.simulator.dt + 1e-6)
+
+        if steps_due > max_steps_per_tick:
+            self.overruns += 1
+            steps_due = max_steps_per_tick
+
+        start_simulation_time = self.simulator.simulation_time
+        steps = 0
+
+        for _ in range(steps_due):
+            if not self.simulator.step():
+                return False
+
+            steps += 1
+
+            if self.simulator.is_paused():
+                break
+
+        self.steps += steps
+        self._last_simulation_time = self.simulator.simulation_time
+        self.lag = self._get_lag(now)
+
+        self._update_rate(now, steps,
+                          self._last_simulation_time - start_simulation_time)
+
+        return True
+
+    def get_statistics(self):
+        """Return a dictionary with the scheduler statistics"""
+        return {
+            "ticks": self.ticks,
+            "steps": self.steps,
+            "overruns": self.overruns,
+            "resynchronizations": self.resynchronizations,
+            "dropped_time": self.dropped_time,
+            "lag": self.lag,
+            "achieved_rate": self.achieved_rate,
+            "real_time_factor": self.real_time_factor,
+            "time_scale": self._time_scale,
+            "max_steps_per_tick": self.max_steps_per_tick
+        }
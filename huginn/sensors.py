@@ -1,12 +1,253 @@
 """
 The hugin.sensors module contains classes that simulate the aircraft's sensors
 """
-from random import normalvariate
+from collections import namedtuple
 from abc import ABCMeta, abstractmethod
 
+from huginn import configuration
 from huginn.unit_conversions import convert_jsbsim_pressure
 from huginn.fdm import (Velocities, Orientation, Position, Accelerations,
-                        Atmosphere)
+                        Atmosphere, create_state, get_subsystems)
+
+
+# The sensor state objects contain the sensor measurements at a specific
+# simulation time
+AccelerometerState = namedtuple("AccelerometerState", ["x", "y", "z"])
+
+GyroscopeState = namedtuple("GyroscopeState",
+                            ["roll_rate", "pitch_rate", "yaw_rate"])
+
+ThermometerState = namedtuple("ThermometerState", ["temperature"])
+
+PressureSensorState = namedtuple("PressureSensorState", ["pressure"])
+
+PitotTubeState = namedtuple("PitotTubeState", ["pressure"])
+
+InertialNavigationSystemState = namedtuple(
+    "InertialNavigationSystemState",
+    ["roll", "pitch", "latitude", "longitude", "altitude", "airspeed",
+     "heading"]
+)
+
+SensorsState = namedtuple(
+    "SensorsState",
+    ["accelerometer", "gyroscope", "thermometer", "pressure_sensor",
+     "pitot_tube", "inertial_navigation_system"]
+)
+
+
+# a sensor is updated when the simulation time is within this many seconds of
+# its update time, so the floating point error of the simulation time doesn't
+# delay the update by a whole simulation step
+UPDATE_TIME_TOLERANCE = 1e-6
+
+
+class NoiseGenerator(object):
+    """The NoiseGenerator creates the normally distributed measurement noise
+    of a sensor.
+
+    The samples are generated in blocks so that a sensor update doesn't
+    have to call the random number generator for every value. The same
+    seed will always create the same noise values.
+    """
+
+    def __init__(self, seed=None,
+                 block_size=configuration.SENSOR_NOISE_BLOCK_SIZE):
+        """Create a new NoiseGenerator object
+
+        Arguments:
+        seed: the random number generator seed
+        block_size: the number of samples that are generated at once
+        """
+        self.block_size = block_size
+
+        from numpy.random import RandomState
+
+        self._generator = RandomState(seed)
+
+        self._samples = []
+        self._index = 0
+
+    def seed(self, seed=None):
+        """Seed the random number generator and discard the samples that
+        have already been generated
+
+        Arguments:
+        seed: the random number generator seed
+        """
+        self._generator.seed(seed)
+
+        self._samples = []
+        self._index = 0
+
+    def _fill(self):
+        """Generate a new block of standard normal samples"""
+        self._samples = self._generator.standard_normal(
+            self.block_size).tolist()
+
+        self._index = 0
+
+    def normal(self, mu, sigma):
+        """Returns a normally distributed sample
+
+        Arguments:
+        mu: the mean
+        sigma: the standard deviation
+        """
+        if self._index >= len(self._samples):
+            self._fill()
+
+        sample = self._samples[self._index]
+        self._index += 1
+
+        return mu + sigma * sample
+
+    def get_state(self):
+        """Returns the state of the generator"""
+        return self._generator.get_state(), list(self._samples), self._index
+
+    def set_state(self, state):
+        """Restore a state that was returned by get_state
+
+        Arguments:
+        state: the generator state
+        """
+        generator_state, samples, index = state
+
+        self._generator.set_state(generator_state)
+
+        self._samples = list(samples)
+        self._index = index
+
+
+class SensorHistory(object):
+    """The SensorHistory keeps the latest samples of a sensor in a fixed size
+    ring buffer.
+
+    Every row of the buffer contains the simulation time of the sample
+    followed by the measurement values. The oldest samples are overwritten
+    when the buffer is full.
+    """
+
+    def __init__(self, fields, capacity=configuration.SENSOR_HISTORY_SIZE):
+        """Create a new SensorHistory object
+
+        Arguments:
+        fields: a list with the names of the measurements
+        capacity: the maximum number of samples
+        """
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.columns = len(self.fields) + 1
+
+        import numpy
+
+        self.buffer = numpy.zeros(capacity * self.columns)
+
+        self.clear()
+
+    def clear(self):
+        """Remove all the samples"""
+        self.samples = 0
+        self.overwritten_time = None
+        self._index = 0
+
+    @property
+    def last_time(self):
+        """The simulation time of the latest sample or None if there are no
+        samples"""
+        if self.samples == 0:
+            return None
+
+        row = (self._index - 1) % self.capacity
+
+        return float(self.buffer[row * self.columns])
+
+    def add(self, simulation_time, values):
+        """Add a sample to the history. The history is cleared if the
+        simulation time has moved backwards because the simulator was reset
+
+        Arguments:
+        simulation_time: the simulation time of the sample
+        values: a list with the measurement values
+        """
+        if self.samples and simulation_time < self.last_time:
+            self.clear()
+
+        offset = self._index * self.columns
+
+        if self.samples == self.capacity:
+            self.overwritten_time = float(self.buffer[offset])
+        else:
+            self.samples += 1
+
+        self.buffer[offset] = simulation_time
+        self.buffer[offset + 1:offset + self.columns] = values
+
+        self._index = (self._index + 1) % self.capacity
+
+    def get_samples(self, since=None):
+        """Returns a list with the samples that were recorded after the given
+        simulation time, the oldest first. Every sample is a list with the
+        simulation time followed by the measurement values
+
+        Arguments:
+        since: the simulation time. All the samples are returned if this is
+            None
+        """
+        samples = []
+        row = self._index
+
+        # the samples are read from the latest to the oldest so only the
+        # requested samples are visited
+        for _ in range(self.samples):
+            row = (row - 1) % self.capacity
+            offset = row * self.columns
+
+            if since is not None and self.buffer[offset] <= since:
+                break
+
+            samples.append(
+                [float(value)
+                 for value in self.buffer[offset:offset + self.columns]]
+            )
+
+        samples.reverse()
+
+        return samples
+
+    def is_truncated(self, since=None):
+        """Check if samples that were recorded after the given simulation
+        time have been overwritten
+
+        Arguments:
+        since: the simulation time
+        """
+        if self.overwritten_time is None:
+            return False
+
+        return since is None or since < self.overwritten_time
+
+    def to_dict(self, since=None):
+        """Returns a dictionary with a list of values for the simulation
+        time and for every measurement of the samples that were recorded
+        after the given simulation time
+
+        Arguments:
+        since: the simulation time
+        """
+        samples = self.get_samples(since)
+
+        return {
+            "fields": list(self.fields),
+            "samples": len(samples),
+            "truncated": self.is_truncated(since),
+            "time": [sample[0] for sample in samples],
+            "values": dict(
+                [(field, [sample[index + 1] for sample in samples])
+                 for index, field in enumerate(self.fields)]
+            )
+        }
 
 
 class Sensor(object):
@@ -15,28 +256,51 @@ class Sensor(object):
 
     __metaclass__ = ABCMeta
 
-    def __init__(self, fdmexec, update_rate):
+    # the names of the measurements that are stored in the sensor history
+    fields = ()
+
+    def __init__(self, fdmexec, update_rate, seed=None):
         """initialize the Sensor object
 
         Arguments:
         fdmexec: an JSBSim FGFDMExec object
         update_rate: the sensor update rate in Hz
+        seed: the seed of the measurement noise generator
         """
         self.fdmexec = fdmexec
         self.update_rate = update_rate
+        self.noise = NoiseGenerator(seed)
+        self.history = SensorHistory(self.fields)
+        self._updated_at = 0.0
         self._update_at = 0.0
 
+        self.update(fdmexec.GetSimTime())
+
+    def update(self, simulation_time):
+        """Update the sensor measurements and set the time of the next
+        update
+
+        Arguments:
+        simulation_time: the current simulation time
+        """
         self._update_sensor()
-        self._schedule_update()
 
-    def _schedule_update(self):
-        """Set the time when the sensor data will be updated"""
-        self._update_at = self.fdmexec.GetSimTime() + (1.0/self.update_rate)
+        self.history.add(simulation_time,
+                         [getattr(self, field) for field in self.fields])
 
-    def _needs_update(self):
-        """Check if the sensor data needs to be updated because the time for
-        which they are valid has passed"""
-        return self.fdmexec.GetSimTime() > self._update_at
+        self._updated_at = simulation_time
+        self._update_at = simulation_time + (1.0/self.update_rate)
+
+    def needs_update(self, simulation_time):
+        """Check if the sensor measurements must be updated because the time
+        for which they are valid has passed or because the simulation time
+        has moved backwards after a reset
+
+        Arguments:
+        simulation_time: the current simulation time
+        """
+        return (simulation_time + UPDATE_TIME_TOLERANCE >= self._update_at or
+                simulation_time < self._updated_at)
 
     @abstractmethod
     def _update_sensor(self):
@@ -46,17 +310,10 @@ class Sensor(object):
 
     @staticmethod
     def sensor_property(f):
-        """The sensor_measurement decorator is used to define with properties
-        are sensor measurements and updated them according to the update
-        rate"""
-        @property
-        def wrapper(self, *args, **kwargs):
-            if self._needs_update():
-                self._update_sensor()
-                self._schedule_update()
-
-            return f(self, *args, **kwargs)
-        return wrapper
+        """The sensor_property decorator is used to define which properties
+        are sensor measurements. The measurements are updated by the
+        SensorScheduler so reading them doesn't check the simulation time"""
+        return property(f)
 
 
 class Accelerometer(Sensor):
@@ -67,7 +324,9 @@ class Accelerometer(Sensor):
 
     acceleration = true_acceleration + bias + measurement_noise
     """
-    def __init__(self, fdmexec, update_rate=250.0):
+    fields = AccelerometerState._fields
+
+    def __init__(self, fdmexec, update_rate=250.0, seed=None):
         self.x_noise_mu = 0.0
         self.x_noise_sigma = 0.09
         self.y_noise_mu = 0.0
@@ -77,17 +336,23 @@ class Accelerometer(Sensor):
 
         self._accelerations = Accelerations(fdmexec)
 
-        super(Accelerometer, self).__init__(fdmexec, update_rate)
+        super(Accelerometer, self).__init__(fdmexec, update_rate, seed)
 
     def _update_sensor(self):
-        self._x_measurement_noise = normalvariate(self.x_noise_mu,
-                                                  self.x_noise_sigma)
+        self._x_measurement_noise = self.noise.normal(
+            self.x_noise_mu,
+            self.x_noise_sigma
+        )
 
-        self._y_measurement_noise = normalvariate(self.y_noise_mu,
-                                                  self.y_noise_sigma)
+        self._y_measurement_noise = self.noise.normal(
+            self.y_noise_mu,
+            self.y_noise_sigma
+        )
 
-        self._z_measurement_noise = normalvariate(self.z_noise_mu,
-                                                  self.z_noise_sigma)
+        self._z_measurement_noise = self.noise.normal(
+            self.z_noise_mu,
+            self.z_noise_sigma
+        )
 
         self._true_x = self._accelerations.x
         self._true_y = self._accelerations.y
@@ -111,17 +376,17 @@ class Accelerometer(Sensor):
     @Sensor.sensor_property
     def x(self):
         """Return the acceleration along the x axis in meters/sec^2"""
-        return self.true_x + self.x_measurement_noise
+        return self._true_x + self._x_measurement_noise
 
     @Sensor.sensor_property
     def y(self):
         """Return the acceleration along the y axis in meters/sec^2"""
-        return self.true_y + self.y_measurement_noise
+        return self._true_y + self._y_measurement_noise
 
     @Sensor.sensor_property
     def z(self):
         """Return the acceleration along the z axis in meters/sec^2"""
-        return self.true_z + self.z_measurement_noise
+        return self._true_z + self._z_measurement_noise
 
     @Sensor.sensor_property
     def x_measurement_noise(self):
@@ -142,7 +407,9 @@ class Accelerometer(Sensor):
 class Gyroscope(Sensor):
     """The Gyroscope class contains the angular velocities measured on the
     body axis."""
-    def __init__(self, fdmexec, update_rate=100.0):
+    fields = GyroscopeState._fields
+
+    def __init__(self, fdmexec, update_rate=100.0, seed=None):
         self.roll_rate_noise_sigma = 0.0005
         self.roll_rate_noise_mu = 0.002
         self.pitch_rate_noise_sigma = 0.0005
@@ -152,20 +419,20 @@ class Gyroscope(Sensor):
 
         self._velocities = Velocities(fdmexec)
 
-        super(Gyroscope, self).__init__(fdmexec, update_rate)
+        super(Gyroscope, self).__init__(fdmexec, update_rate, seed)
 
     def _update_sensor(self):
-        self._roll_rate_measurement_noise = normalvariate(
+        self._roll_rate_measurement_noise = self.noise.normal(
             self.roll_rate_noise_mu,
             self.roll_rate_noise_sigma
         )
 
-        self._pitch_rate_measurement_noise = normalvariate(
+        self._pitch_rate_measurement_noise = self.noise.normal(
             self.pitch_rate_noise_mu,
             self.pitch_rate_noise_sigma
         )
 
-        self._yaw_rate_measurement_noise = normalvariate(
+        self._yaw_rate_measurement_noise = self.noise.normal(
             self.yaw_rate_noise_mu,
             self.yaw_rate_noise_sigma
         )
@@ -192,20 +459,20 @@ class Gyroscope(Sensor):
     @Sensor.sensor_property
     def roll_rate(self):
         """The roll rate in degrees/sec"""
-        return (self.true_roll_rate +
-                self.roll_rate_measurement_noise)
+        return (self._true_roll_rate +
+                self._roll_rate_measurement_noise)
 
     @Sensor.sensor_property
     def pitch_rate(self):
         """The pitch rate in degrees/sec"""
-        return (self.true_pitch_rate +
-                self.pitch_rate_measurement_noise)
+        return (self._true_pitch_rate +
+                self._pitch_rate_measurement_noise)
 
     @Sensor.sensor_property
     def yaw_rate(self):
         """The yaw rate in degrees/sec"""
-        return (self.true_yaw_rate +
-                self.yaw_rate_measurement_noise)
+        return (self._true_yaw_rate +
+                self._yaw_rate_measurement_noise)
 
     @Sensor.sensor_property
     def roll_rate_measurement_noise(self):
@@ -226,16 +493,19 @@ class Gyroscope(Sensor):
 class Thermometer(Sensor):
     """The Thermometer class contains the temperature measured by the
     aircraft's sensors."""
-    def __init__(self, fdmexec, update_rate=50.0):
+    fields = ThermometerState._fields
+
+    def __init__(self, fdmexec, update_rate=50.0, seed=None):
         self.mu = 0.1
         self.sigma = 0.5
 
         self._atmosphere = Atmosphere(fdmexec)
 
-        super(Thermometer, self).__init__(fdmexec, update_rate)
+        super(Thermometer, self).__init__(fdmexec, update_rate, seed)
 
     def _update_sensor(self):
-        self._measurement_noise = normalvariate(self.mu, self.sigma)
+        self._measurement_noise = self.noise.normal(self.mu, self.sigma)
+        self._true_temperature = self._atmosphere.temperature
 
     @Sensor.sensor_property
     def measurement_noise(self):
@@ -245,27 +515,30 @@ class Thermometer(Sensor):
     @Sensor.sensor_property
     def true_temperature(self):
         """return the actual temperature in Kelvin"""
-        return self._atmosphere.temperature
+        return self._true_temperature
 
     @Sensor.sensor_property
     def temperature(self):
         """return the temperature in Kelvin"""
-        return self.true_temperature + self.measurement_noise
+        return self._true_temperature + self._measurement_noise
 
 
 class PressureSensor(Sensor):
     """The PressureSensor class contains the static presured measured by the
     aircraft's sensors."""
-    def __init__(self, fdmexec, update_rate=250.0):
+    fields = PressureSensorState._fields
+
+    def __init__(self, fdmexec, update_rate=250.0, seed=None):
         self.mu = 100.0
         self.sigma = 10.0
 
         self._atmosphere = Atmosphere(fdmexec)
 
-        super(PressureSensor, self).__init__(fdmexec, update_rate)
+        super(PressureSensor, self).__init__(fdmexec, update_rate, seed)
 
     def _update_sensor(self):
-        self._measurement_noise = normalvariate(self.mu, self.sigma)
+        self._measurement_noise = self.noise.normal(self.mu, self.sigma)
+        self._true_pressure = self._atmosphere.pressure
 
     @Sensor.sensor_property
     def measurement_noise(self):
@@ -275,24 +548,30 @@ class PressureSensor(Sensor):
     @Sensor.sensor_property
     def true_pressure(self):
         """Returns the true pressure in Pascal"""
-        return self._atmosphere.pressure
+        return self._true_pressure
 
     @Sensor.sensor_property
     def pressure(self):
         """Returns the pressure in Pascal"""
-        return self.true_pressure + self.measurement_noise
+        return self._true_pressure + self._measurement_noise
 
 
 class PitotTube(Sensor):
     """The PitosTure class simulates the aircraft's pitot system."""
-    def __init__(self, fdmexec, update_rate=250.0):
+    fields = PitotTubeState._fields
+
+    def __init__(self, fdmexec, update_rate=250.0, seed=None):
         self.mu = 100.0
         self.sigma = 10.0
 
-        super(PitotTube, self).__init__(fdmexec, update_rate)
+        self._auxiliary = get_subsystems(fdmexec).auxiliary
+
+        super(PitotTube, self).__init__(fdmexec, update_rate, seed)
 
     def _update_sensor(self):
-        self._measurement_noise = normalvariate(self.mu, self.sigma)
+        self._measurement_noise = self.noise.normal(self.mu, self.sigma)
+        self._true_pressure = convert_jsbsim_pressure(
+            self._auxiliary.GetTotalPressure())
 
     @Sensor.sensor_property
     def measurement_noise(self):
@@ -302,20 +581,20 @@ class PitotTube(Sensor):
     @Sensor.sensor_property
     def true_pressure(self):
         """Return the true pressure in pascal"""
-        pressure = self.fdmexec.GetAuxiliary().GetTotalPressure()
-
-        return convert_jsbsim_pressure(pressure)
+        return self._true_pressure
 
     @Sensor.sensor_property
     def pressure(self):
         """Return the pressure in pascal"""
-        return self.true_pressure + self.measurement_noise
+        return self._true_pressure + self._measurement_noise
 
 
 class InertialNavigationSystem(Sensor):
     """The InertialNavigationSystem class is used to simulate the aircraft's
     inertial navigation system."""
-    def __init__(self, fdmexec, update_rate=5.0):
+    fields = InertialNavigationSystemState._fields
+
+    def __init__(self, fdmexec, update_rate=5.0, seed=None):
         self.roll_mu = 1.0
         self.roll_sigma = 0.5
         self.pitch_mu = 0.7
@@ -335,31 +614,52 @@ class InertialNavigationSystem(Sensor):
         self._position = Position(fdmexec)
         self._orientation = Orientation(fdmexec)
 
-        super(InertialNavigationSystem, self).__init__(fdmexec, update_rate)
+        super(InertialNavigationSystem, self).__init__(fdmexec, update_rate,
+                                                       seed)
 
     def _update_sensor(self):
-        self._roll_measurement_noise = normalvariate(self.roll_mu,
-                                                     self.roll_sigma)
+        self._roll_measurement_noise = self.noise.normal(
+            self.roll_mu,
+            self.roll_sigma
+        )
 
-        self._pitch_measurement_noise = normalvariate(self.pitch_mu,
-                                                      self.pitch_sigma)
+        self._pitch_measurement_noise = self.noise.normal(
+            self.pitch_mu,
+            self.pitch_sigma
+        )
 
-        self._heading_measurement_noise = normalvariate(self.heading_mu,
-                                                        self.heading_sigma)
+        self._heading_measurement_noise = self.noise.normal(
+            self.heading_mu,
+            self.heading_sigma
+        )
 
-        self._latitude_measurement_noise = normalvariate(self.latitude_mu,
-                                                         self.latitude_sigma)
+        self._latitude_measurement_noise = self.noise.normal(
+            self.latitude_mu,
+            self.latitude_sigma
+        )
 
-        self._longitude_measurement_noise = normalvariate(
+        self._longitude_measurement_noise = self.noise.normal(
             self.longitude_mu,
             self.longitude_sigma
         )
 
-        self._altitude_measurement_noise = normalvariate(self.altitude_mu,
-                                                         self.altitude_sigma)
+        self._altitude_measurement_noise = self.noise.normal(
+            self.altitude_mu,
+            self.altitude_sigma
+        )
 
-        self._airspeed_measurement_noise = normalvariate(self.airspeed_mu,
-                                                         self.airspeed_sigma)
+        self._airspeed_measurement_noise = self.noise.normal(
+            self.airspeed_mu,
+            self.airspeed_sigma
+        )
+
+        self._true_roll = self._orientation.phi
+        self._true_pitch = self._orientation.theta
+        self._true_heading = self._position.heading
+        self._true_latitude = self._position.latitude
+        self._true_longitude = self._position.longitude
+        self._true_altitude = self._position.altitude
+        self._true_airspeed = self._velocities.true_airspeed
 
     @Sensor.sensor_property
     def roll_measurement_noise(self):
@@ -399,81 +699,176 @@ class InertialNavigationSystem(Sensor):
     @Sensor.sensor_property
     def roll(self):
         """Returns the roll in degrees"""
-        return self.true_roll + self.roll_measurement_noise
+        return self._true_roll + self._roll_measurement_noise
 
     @Sensor.sensor_property
     def pitch(self):
         """Returns the pitch in degrees"""
-        return self.true_pitch + self.pitch_measurement_noise
+        return self._true_pitch + self._pitch_measurement_noise
 
     @Sensor.sensor_property
     def heading(self):
         """Returns the heading in degrees"""
-        return self.true_heading + self.heading_measurement_noise
+        return self._true_heading + self._heading_measurement_noise
 
     @Sensor.sensor_property
     def latitude(self):
         """Returns the latitude in degrees"""
-        return self.true_latitude + self.latitude_measurement_noise
+        return self._true_latitude + self._latitude_measurement_noise
 
     @Sensor.sensor_property
     def longitude(self):
         """Returns the longitude in degrees"""
-        return self.true_longitude + self.longitude_measurement_noise
+        return self._true_longitude + self._longitude_measurement_noise
 
     @Sensor.sensor_property
     def altitude(self):
         """Returns the altitude in meters"""
-        return self.true_altitude + self.altitude_measurement_noise
+        return self._true_altitude + self._altitude_measurement_noise
 
     @Sensor.sensor_property
     def airspeed(self):
         """Returns the airspeed in meters/second"""
-        return self.true_airspeed + self.airspeed_measurement_noise
+        return self._true_airspeed + self._airspeed_measurement_noise
 
     @Sensor.sensor_property
     def true_roll(self):
         """Return the true roll angle in degrees"""
-        return self._orientation.phi
+        return self._true_roll
 
     @Sensor.sensor_property
     def true_pitch(self):
         """Return the true pitch angle in degrees"""
-        return self._orientation.theta
+        return self._true_pitch
 
     @Sensor.sensor_property
     def true_latitude(self):
         """Returns the true latitude in degrees"""
-        return self._position.latitude
+        return self._true_latitude
 
     @Sensor.sensor_property
     def true_longitude(self):
         """Returns the true longitude in degrees"""
-        return self._position.longitude
+        return self._true_longitude
 
     @Sensor.sensor_property
     def true_altitude(self):
         """Returns the true altitude in meters"""
-        return self._position.altitude
+        return self._true_altitude
 
     @Sensor.sensor_property
     def true_airspeed(self):
         """Returns the true airspeed in meters per second"""
-        return self._velocities.true_airspeed
+        return self._true_airspeed
 
     @Sensor.sensor_property
     def true_heading(self):
         """Returns the true heading in degrees"""
-        return self._position.heading
+        return self._true_heading
+
+
+class SensorScheduler(object):
+    """The SensorScheduler updates the sensor measurements at the update
+    rate of every sensor.
+
+    The simulation loop must call the tick method after every simulation
+    step. Reading a sensor measurement returns the value that was calculated
+    at the last update.
+    """
+
+    def __init__(self, sensors):
+        """Create a new SensorScheduler object
+
+        Arguments:
+        sensors: a list with the Sensor objects
+        """
+        self.sensors = list(sensors)
+
+    def tick(self, simulation_time):
+        """Update the sensors whose measurements are no longer valid
+
+        Arguments:
+        simulation_time: the current simulation time
+        """
+        for sensor in self.sensors:
+            if sensor.needs_update(simulation_time):
+                sensor.update(simulation_time)
+
+    def update(self, simulation_time):
+        """Update the measurements of all the sensors
+
+        Arguments:
+        simulation_time: the current simulation time
+        """
+        for sensor in self.sensors:
+            sensor.update(simulation_time)
+
+
+def get_sensor_seed(seed, name):
+    """Returns the noise generator seed of a sensor. Every sensor gets a
+    different seed so their noise values are not correlated
+
+    Arguments:
+    seed: the seed of all the sensors
+    name: the sensor name
+    """
+    if seed is None:
+        return None
+
+    return seed * len(SensorsState._fields) + SensorsState._fields.index(name)
 
 
 class Sensors(object):
     """The Sensors class contains all of the aircraft sensors"""
-    def __init__(self, fdmexec):
+    def __init__(self, fdmexec, seed=None):
+        """Create a new Sensors object
+
+        Arguments:
+        fdmexec: a JSBSim FGFDMExec object
+        seed: the seed that the noise generator seeds of the sensors are
+            derived from
+        """
         self.fdmexec = fdmexec
-        self.accelerometer = Accelerometer(fdmexec)
-        self.gyroscope = Gyroscope(fdmexec)
-        self.thermometer = Thermometer(fdmexec)
-        self.pressure_sensor = PressureSensor(fdmexec)
-        self.pitot_tube = PitotTube(fdmexec)
-        self.inertial_navigation_system = InertialNavigationSystem(fdmexec)
+        self.accelerometer = Accelerometer(
+            fdmexec, seed=get_sensor_seed(seed, "accelerometer"))
+        self.gyroscope = Gyroscope(
+            fdmexec, seed=get_sensor_seed(seed, "gyroscope"))
+        self.thermometer = Thermometer(
+            fdmexec, seed=get_sensor_seed(seed, "thermometer"))
+        self.pressure_sensor = PressureSensor(
+            fdmexec, seed=get_sensor_seed(seed, "pressure_sensor"))
+        self.pitot_tube = PitotTube(
+            fdmexec, seed=get_sensor_seed(seed, "pitot_tube"))
+        self.inertial_navigation_system = InertialNavigationSystem(
+            fdmexec, seed=get_sensor_seed(seed, "inertial_navigation_system"))
+
+    def get_sensors(self):
+        """Returns a list with the sensor objects"""
+        return [getattr(self, name) for name in SensorsState._fields]
+
+    def seed(self, seed=None):
+        """Seed the noise generators of the sensors so that the same
+        measurement noise is generated every time the same seed is used
+
+        Arguments:
+        seed: the seed that the noise generator seeds are derived from
+        """
+        for name, sensor in zip(SensorsState._fields, self.get_sensors()):
+            sensor.noise.seed(get_sensor_seed(seed, name))
+
+    def get_state(self):
+        """Returns a SensorsState object with the current sensor
+        measurements"""
+        return SensorsState(
+            accelerometer=create_state(self.accelerometer,
+                                       AccelerometerState),
+            gyroscope=create_state(self.gyroscope, GyroscopeState),
+            thermometer=create_state(self.thermometer, ThermometerState),
+            pressure_sensor=create_state(self.pressure_sensor,
+                                         PressureSensorState),
+            pitot_tube=create_state(self.pitot_tube, PitotTubeState),
+            inertial_navigation_system=create_state(
+                self.inertial_navigation_system,
+                InertialNavigationSystemState
+            )
+        )
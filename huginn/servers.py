@@ -1,77 +1,173 @@
 """
 The huginn.servers module contains classes that can be used to create
 a simulator that transmits and receives data from/to the network
+
+The modules that every server needs are imported when the server is
+initialized so that the tools that use only some of the servers don't have to
+load all of their dependencies.
 """
 
 
+from collections import OrderedDict
 import logging
 
-from twisted.web import server
 from twisted.internet.task import LoopingCall
-from twisted.web.wsgi import WSGIResource
-from flask import Flask, render_template
-from flask_restful import Api
-
-from huginn.protocols import ControlsProtocol, SimulatorDataProtocol
-from huginn.http import (SimulatorDataWebSocketFactory,
-                         SimulatorDataWebSocketProtocol)
-
-from huginn.rest import (FDMResource, AircraftResource, GPSResource,
-                         AccelerometerResource, GyroscopeResource,
-                         ThermometerResource, PressureSensorResource,
-                         PitotTubeResource, InertialNavigationSystemResource,
-                         EngineResource, FlightControlsResource,
-                         SimulatorControlResource, AccelerationsResource,
-                         VelocitiesResource, OrientationResource,
-                         AtmosphereResource, ForcesResource,
-                         InitialConditionResource, PositionResource,
-                         AirspeedIndicatorResource, AltimeterResource,
-                         AttitudeIndicatorResource, HeadingIndicatorResource,
-                         VerticalSpeedIndicatorResource, WaypointResource,
-                         WaypointsResource)
+
+from huginn import configuration
 
 
 logger = logging.getLogger(__name__)
 
 
-def initialize_controls_server(reactor, fdmexec, port):
-    """Initialize the controls server
+def initialize_controls_server(
+        reactor, fdmexec, port,
+        merge_policy=configuration.CONTROLS_MERGE_POLICY):
+    """Initialize the controls server. Returns the ControlsProtocol object.
+    Its apply_controls method must be called before the simulation steps
 
     Arguments:
     reactor: a Twisted reactor to use
     fdmexec: an JSBSim FGFDMExec object
     port: the ports to listen for the flight control data
+    merge_policy: the way that the controls that are received between two
+        updates are merged
     """
+    from huginn.protocols import ControlsProtocol
+
     logger.debug("Starting aircraft controls server at port %d", port)
 
-    controls_protocol = ControlsProtocol(fdmexec)
+    controls_protocol = ControlsProtocol(fdmexec, merge_policy)
 
     reactor.listenUDP(port, controls_protocol)
 
+    return controls_protocol
+
 
-def initialize_simulator_data_server(reactor, simulator, clients):
-    """Initialize the simulator data server
+def initialize_simulator_process_controls_server(
+        reactor, simulator_process, port, update_rate=configuration.DT,
+        merge_policy=configuration.CONTROLS_MERGE_POLICY):
+    """Initialize the controls server of a simulator that runs in a
+    dedicated process. Returns the SimulatorProcessControlsProtocol object
+
+    Arguments:
+    reactor: a Twisted reactor to use
+    simulator_process: a SimulatorProcess object
+    port: the ports to listen for the flight control data
+    update_rate: the time in seconds between the updates of the controls
+        of the simulator process
+    merge_policy: the way that the controls that are received between two
+        updates are merged
+    """
+    from huginn.process import SimulatorProcessControlsProtocol
+
+    logger.debug("Starting aircraft controls server at port %d", port)
+
+    controls_protocol = SimulatorProcessControlsProtocol(simulator_process,
+                                                         merge_policy)
+
+    reactor.listenUDP(port, controls_protocol)
+
+    # the received controls are merged, so only one command is sent to the
+    # simulator process for every update
+    controls_updater = LoopingCall(controls_protocol.apply_controls)
+    controls_updater.start(update_rate)
+
+    return controls_protocol
+
+
+def initialize_simulator_data_server(
+        reactor, simulator, clients,
+        multicast_ttl=configuration.FDM_MULTICAST_TTL,
+        multicast_interface=None):
+    """Initialize the simulator data server. A single publisher sends the
+    simulator data to all the clients and the clients that have the same
+    update rate are updated together. A client can also be a multicast
+    group, so that any number of applications can receive the simulator data
+    without any extra cost for the simulator. Returns the
+    SimulatorDataPublisher object
 
     Arguments:
     reactor: a Twisted reactor to use
     simulator: a Simulator object
-    clients: a list of (address, port) tuples of the listening clients
+    clients: a list of (address, port, update_rate) tuples of the listening
+        clients
+    multicast_ttl: the time to live of the multicast datagrams
+    multicast_interface: the address of the interface that will be used to
+        send the multicast datagrams
     """
+    from huginn.protocols import SimulatorDataPublisher
+
+    publisher = SimulatorDataPublisher(simulator)
+
+    update_groups = OrderedDict()
+
     for address, port, update_rate in clients:
         logger.debug("Sending fdm data to %s:%d every %f seconds",
                      address, port, update_rate)
 
-        simulator_data_protocol = SimulatorDataProtocol(simulator,
-                                                        address,
-                                                        port)
+        publisher.add_subscriber(address, port)
+
+        update_groups.setdefault(update_rate, []).append((address, port))
 
-        reactor.listenUDP(0, simulator_data_protocol)
+    if publisher.has_multicast_subscribers():
+        publisher.multicast_ttl = multicast_ttl
+        publisher.multicast_interface = multicast_interface
 
-        simulator_data_updater = LoopingCall(
-            simulator_data_protocol.send_simulator_data)
+        reactor.listenMulticast(0, publisher)
+    else:
+        reactor.listenUDP(0, publisher)
+
+    for update_rate, subscribers in update_groups.items():
+        simulator_data_updater = LoopingCall(publisher.publish, subscribers)
 
         simulator_data_updater.start(update_rate)
 
+    return publisher
+
+
+def initialize_telemetry_server(reactor, simulator, port):
+    """Initialize the telemetry server that sends the simulator data to the
+    clients that have subscribed to it. Returns the TelemetryProtocol object
+
+    Arguments:
+    reactor: a Twisted reactor to use
+    simulator: a Simulator object
+    port: the port to listen for the telemetry subscriptions
+    """
+    from huginn.protocols import TelemetryProtocol
+
+    logger.debug("Starting the telemetry server at port %d", port)
+
+    telemetry_protocol = TelemetryProtocol(simulator)
+
+    reactor.listenUDP(port, telemetry_protocol)
+
+    telemetry_updater = LoopingCall(telemetry_protocol.update)
+    telemetry_updater.start(configuration.TELEMETRY_UPDATE_RATE)
+
+    return telemetry_protocol
+
+
+def initialize_sensor_server(reactor, aircraft, port):
+    """Initialize the sensor data server. The clients can keep the connection
+    open and send several sensor data requests over it. Returns the
+    SensorDataFactory object
+
+    Arguments:
+    reactor: a Twisted reactor to use
+    aircraft: the Aircraft object whose sensor data will be transmitted
+    port: the port to listen for the sensor data requests
+    """
+    from huginn.protocols import SensorDataFactory
+
+    logger.debug("Starting the sensor data server at port %d", port)
+
+    factory = SensorDataFactory(aircraft)
+
+    reactor.listenTCP(port, factory)
+
+    return factory
+
 
 def initialize_websocket_server(reactor, simulator, host, port, database):
     """Initialize the web socket server
@@ -83,6 +179,9 @@ def initialize_websocket_server(reactor, simulator, host, port, database):
     port: the port to listen to
     database: the database that contains the simulator data
     """
+    from huginn.http import (SimulatorDataWebSocketFactory,
+                             SimulatorDataWebSocketProtocol)
+
     logger.debug("The websocket interface runs on %s:%d", host, port)
 
     factory = SimulatorDataWebSocketFactory(
@@ -96,33 +195,47 @@ def initialize_websocket_server(reactor, simulator, host, port, database):
     reactor.listenTCP(port, factory)
 
 
-def _add_fdm_resources(api, fdm, aircraft):
+def _add_fdm_resources(api, simulator, job_queue=None):
+    from huginn.rest import (FDMResource, AccelerationsResource,
+                             VelocitiesResource, OrientationResource,
+                             AtmosphereResource, ForcesResource,
+                             InitialConditionResource, PositionResource,
+                             PropertiesResource)
+
     api.add_resource(FDMResource, "/fdm",
-                     resource_class_args=(fdm, aircraft))
+                     resource_class_args=(simulator,))
 
     api.add_resource(AccelerationsResource, "/fdm/accelerations",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator,))
 
     api.add_resource(VelocitiesResource, "/fdm/velocities",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator,))
 
     api.add_resource(OrientationResource, "/fdm/orientation",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator,))
 
     api.add_resource(AtmosphereResource, "/fdm/atmosphere",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator,))
 
     api.add_resource(ForcesResource, "/fdm/forces",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator,))
 
     api.add_resource(InitialConditionResource, "/fdm/initial_condition",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator.initial_condition,))
+
+    api.add_resource(PropertiesResource, "/fdm/properties",
+                     resource_class_args=(simulator, job_queue))
 
     api.add_resource(PositionResource, "/fdm/position",
-                     resource_class_args=(fdm.fdmexec,))
+                     resource_class_args=(simulator,))
 
 
 def _add_instrument_resources(api, instruments):
+    from huginn.rest import (GPSResource, AirspeedIndicatorResource,
+                             AltimeterResource, AttitudeIndicatorResource,
+                             HeadingIndicatorResource,
+                             VerticalSpeedIndicatorResource)
+
     api.add_resource(GPSResource, "/aircraft/instruments/gps",
                      resource_class_args=(instruments.gps,))
 
@@ -158,6 +271,12 @@ def _add_instrument_resources(api, instruments):
 
 
 def _add_sensor_resources(api, sensors):
+    from huginn.rest import (AccelerometerResource, GyroscopeResource,
+                             ThermometerResource, PressureSensorResource,
+                             PitotTubeResource,
+                             InertialNavigationSystemResource,
+                             SensorHistoryResource)
+
     api.add_resource(
         AccelerometerResource,
         "/aircraft/sensors/accelerometer",
@@ -194,22 +313,56 @@ def _add_sensor_resources(api, sensors):
         resource_class_args=(sensors.inertial_navigation_system,)
     )
 
-
-def initialize_web_server(reactor, simulator, port, database):
+    sensor_history_resources = [
+        ("accelerometer", sensors.accelerometer),
+        ("gyroscope", sensors.gyroscope),
+        ("thermometer", sensors.thermometer),
+        ("pressure_sensor", sensors.pressure_sensor),
+        ("pitot_tube", sensors.pitot_tube),
+        ("ins", sensors.inertial_navigation_system)
+    ]
+
+    for name, sensor in sensor_history_resources:
+        api.add_resource(
+            SensorHistoryResource,
+            "/aircraft/sensors/%s/history" % name,
+            endpoint="%s_history" % name,
+            resource_class_args=(sensor,)
+        )
+
+
+def initialize_web_server(reactor, simulator, port, database,
+                          scheduler=None, job_queue=None,
+                          controls_protocol=None):
     """Initialize the web server
 
     :param reactor: the twisted reactor to use
     :param simulator: the Simulator ubject that will be used
     :param port: the port that the server will listen to
     :param database: the database to use
+    :param scheduler: the RealTimeScheduler that runs the simulator
+    :param job_queue: the JobQueue that executes the simulator jobs
+    :param controls_protocol: the ControlsProtocol that receives the
+        aircraft controls
     """
+    from twisted.web import server
+    from twisted.web.wsgi import WSGIResource
+    from flask import Flask, render_template
+    from flask_restful import Api
+
+    from huginn.rest import (AircraftResource, EngineResource,
+                             FlightControlsResource, SimulatorControlResource,
+                             SchedulerResource, ControlsResource,
+                             WaypointResource,
+                             WaypointsResource, JobResource, JobsResource)
+
     logger.debug("The web server will listen at port %d", port)
 
     app = Flask(__name__)
 
     api = Api()
 
-    _add_fdm_resources(api, simulator.fdm, simulator.aircraft)
+    _add_fdm_resources(api, simulator, job_queue)
 
     _add_instrument_resources(api, simulator.aircraft.instruments)
 
@@ -233,9 +386,35 @@ def initialize_web_server(reactor, simulator, port, database):
     api.add_resource(
         SimulatorControlResource,
         "/simulator",
-        resource_class_args=(simulator,)
+        resource_class_args=(simulator, scheduler, job_queue)
     )
 
+    if job_queue:
+        api.add_resource(JobsResource, "/simulator/jobs",
+                         resource_class_args=(job_queue,))
+
+        api.add_resource(JobResource, "/simulator/jobs/<int:job_id>",
+                         resource_class_args=(job_queue,))
+    else:
+        logger.warning("The simulator commands aren't executed by a job "
+                       "queue. The run_for and run_steps commands will "
+                       "block the web server request until the simulator "
+                       "has executed them")
+
+    if scheduler:
+        api.add_resource(
+            SchedulerResource,
+            "/simulator/scheduler",
+            resource_class_args=(scheduler,)
+        )
+
+    if controls_protocol:
+        api.add_resource(
+            ControlsResource,
+            "/simulator/controls",
+            resource_class_args=(controls_protocol,)
+        )
+
     api.add_resource(WaypointResource, "/map/waypoint/<name>",
                      resource_class_args=(database,))
 
@@ -248,7 +427,13 @@ def initialize_web_server(reactor, simulator, port, database):
     def index():
         return render_template("index.html")
 
-    resource = WSGIResource(reactor, reactor.getThreadPool(), app)
+    def application(environ, start_response):
+        # the values of a response are read from the same snapshot of the
+        # simulator
+        with simulator.snapshot():
+            return app(environ, start_response)
+
+    resource = WSGIResource(reactor, reactor.getThreadPool(), application)
     site = server.Site(resource)
 
     reactor.listenTCP(port, site)
@@ -5,15 +5,26 @@ simulation
 
 
 import logging
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
 
 from huginn import configuration
 from huginn.aircraft import Aircraft
-from huginn.fdm import FDM, FDMBuilder, TRIM_MODE_FULL
+from huginn.fdm import (FDM, FDMBuilder, PropertyReader, PropertyError,
+                        TRIM_MODE_FULL, get_property_catalog,
+                        get_unknown_properties)
+from huginn.checkpoints import create_checkpoint, restore_checkpoint
+from huginn.sensors import SensorScheduler
+from huginn.trim import TrimCache
+from huginn.trajectory import create_recorder, COLUMNS_FORMAT
 
 
 logger = logging.getLogger(__name__)
 
 
+SimulatorState = namedtuple("SimulatorState", ["fdm", "aircraft"])
+
+
 class SimulationError(Exception):
     """SimulationError raised when an error occurs during simulation"""
     pass
@@ -33,7 +44,9 @@ class SimulationBuilder(object):
         self.heading = configuration.HEADING
 
         self.trim_mode = TRIM_MODE_FULL
+        self.trim_cache_file = None
         self.start_paused = False
+        self.sensor_seed = None
 
     def create_simulator(self):
         """Create the Simulator object"""
@@ -51,9 +64,11 @@ class SimulationBuilder(object):
 
         aircraft.start_engines()
 
+        trim_cache = TrimCache(self.trim_cache_file)
+
         logger.debug("trimming the aircraft at mode %d", self.trim_mode)
 
-        trim_result = aircraft.trim(self.trim_mode)
+        trim_result = aircraft.trim(self.trim_mode, trim_cache)
         if not trim_result:
             logger.warning("Failed to trim the aircraft")
 
@@ -66,8 +81,13 @@ class SimulationBuilder(object):
 
         simulator = Simulator(fdmexec)
         simulator.trim_mode = self.trim_mode
+        simulator.trim_cache = trim_cache
         simulator.start_paused = self.start_paused
 
+        if self.sensor_seed is not None:
+            simulator.aircraft.sensors.seed(self.sensor_seed)
+            simulator.sensor_scheduler.update(simulator.simulation_time)
+
         result = simulator.step()
 
         if not result:
@@ -92,9 +112,91 @@ class Simulator(object):
         self.aircraft = Aircraft(fdmexec)
         self.fdmexec = fdmexec
         self.fdm = FDM(fdmexec)
+        self.sensor_scheduler = SensorScheduler(
+            self.aircraft.sensors.get_sensors())
         self.trim_mode = TRIM_MODE_FULL
+        self.trim_cache = None
         self._crashed = False
         self.start_paused = False
+        self.checkpoints = {}
+        self._state = None
+        self._property_catalog = None
+        self._property_readers = OrderedDict()
+
+        self._update_state()
+
+    @property
+    def state(self):
+        """The SimulatorState snapshot that was captured after the last
+        simulation step. All the fdm and aircraft values in this object
+        refer to the same simulation time. The snapshot is captured by the
+        thread that runs the simulator and it is replaced as a whole, so the
+        other threads can read it while the simulator runs."""
+        return self._state
+
+    @contextmanager
+    def snapshot(self):
+        """The simulator values only change when the simulator executes a
+        step, so the values that are read between two steps always belong
+        to the same step. This context manager exists so that the simulator
+        has the same interface as the SimulatorProcess"""
+        yield self
+
+    def _update_state(self):
+        """Capture the simulator state snapshot"""
+        self._state = SimulatorState(
+            fdm=self.fdm.get_state(),
+            aircraft=self.aircraft.get_state()
+        )
+
+    @property
+    def initial_condition(self):
+        """The InitialCondition object of the flight dynamics model"""
+        return self.fdm.initial_condition
+
+    def get_property_reader(self, properties):
+        """Returns a PropertyReader for the given JSBSim properties. The
+        readers of the most recently used property lists are kept so that
+        they aren't created again in every request. A PropertyError is
+        raised if a property doesn't exist
+
+        Arguments:
+        properties: a list with the property names
+        """
+        properties = tuple(properties)
+
+        property_reader = self._property_readers.pop(properties, None)
+
+        if property_reader is None:
+            if self._property_catalog is None:
+                self._property_catalog = get_property_catalog(self.fdmexec)
+
+            unknown_properties = get_unknown_properties(
+                self._property_catalog, properties)
+
+            if unknown_properties:
+                raise PropertyError("Unknown properties %s" %
+                                    ", ".join(unknown_properties))
+
+            property_reader = PropertyReader(self.fdmexec, properties)
+
+            if len(self._property_readers) >= \
+                    configuration.MAX_PROPERTY_READERS:
+                self._property_readers.popitem(last=False)
+
+        self._property_readers[properties] = property_reader
+
+        return property_reader
+
+    def get_property_values(self, properties):
+        """Returns a dictionary with the values of the given JSBSim
+        properties. This method must be called by the thread that runs the
+        simulator
+
+        Arguments:
+        properties: a list with the property names
+        """
+        return self.get_property_reader(properties).get_values()
 
     @property
     def crashed(self):
@@ -152,7 +254,7 @@ class Simulator(object):
         logger.debug("starting the aircraft's engines")
         self.aircraft.start_engines()
 
-        trim_result = self.aircraft.trim(self.trim_mode)
+        trim_result = self.aircraft.trim(self.trim_mode, self.trim_cache)
         if not trim_result:
             logger.warning("Failed to trim the aircraft")
 
@@ -175,6 +277,46 @@ class Simulator(object):
 
         return True
 
+    def save_checkpoint(self, name=configuration.DEFAULT_CHECKPOINT):
+        """Store the current state of the simulation in memory
+
+        Arguments:
+        name: the checkpoint name
+        """
+        logger.debug("Saving checkpoint %s", name)
+
+        self.checkpoints[name] = create_checkpoint(self)
+
+        return True
+
+    def restore_checkpoint(self, name=configuration.DEFAULT_CHECKPOINT):
+        """Restore the simulation to a saved checkpoint. This is much
+        faster than a reset because the aircraft isn't trimmed again.
+
+        Arguments:
+        name: the checkpoint name
+        """
+        checkpoint = self.checkpoints.get(name)
+
+        if checkpoint is None:
+            logger.error("Unknown checkpoint %s", name)
+            return False
+
+        logger.debug("Restoring checkpoint %s", name)
+
+        self.pause()
+
+        if not restore_checkpoint(self, checkpoint):
+            return False
+
+        self._crashed = checkpoint.crashed
+        self._update_state()
+
+        if not self.start_paused:
+            self.resume()
+
+        return True
+
     def step(self):
         """Run the simulation one time"""
         if not self.crashed and self.fdm.position.altitude < 0.0:
@@ -204,6 +346,9 @@ class Simulator(object):
             if was_paused:
                 self.pause()
 
+            self.sensor_scheduler.tick(self.simulation_time)
+            self._update_state()
+
             return True
         else:
             if was_paused:
@@ -212,11 +357,13 @@ class Simulator(object):
             logger.error("The simulator has failed to run")
             return False
 
-    def run_for(self, time_to_run):
+    def run_for(self, time_to_run, callback=None):
         """Run the simulation for the given time in seconds
 
         Arguments:
         time_to_run: the time in seconds that the simulator will run
+        callback: an optional callable that will be called with the simulator
+            object as its argument after every simulation step
         """
         if time_to_run < 0.0:
             logger.error("Invalid simulator run time length %f",
@@ -233,8 +380,74 @@ class Simulator(object):
             if not result:
                 return False
 
+            if callback:
+                callback(self)
+
+            # the simulation time doesn't advance after the aircraft has
+            # crashed
+            if self.crashed:
+                logger.warning("Aircraft crashed at %f seconds",
+                               self.fdmexec.GetSimTime())
+                break
+
+        return True
+
+    def run_steps(self, steps, callback=None):
+        """Run the given number of simulation steps
+
+        Arguments:
+        steps: the number of simulation steps
+        callback: an optional callable that will be called with the simulator
+            object as its argument after every simulation step
+        """
+        if steps < 1:
+            logger.error("Invalid number of simulation steps %d", steps)
+
+            return False
+
+        for _ in range(steps):
+            if not self.step():
+                return False
+
+            if callback:
+                callback(self)
+
+            if self.crashed:
+                logger.warning("Aircraft crashed at %f seconds",
+                               self.fdmexec.GetSimTime())
+                break
+
         return True
 
+    def record_trajectory(self, properties, time_to_run=None, steps=None,
+                          sample_interval=1,
+                          payload_format=COLUMNS_FORMAT):
+        """Run the simulator for the given time or number of steps and
+        return the recorded values of the given properties. Returns None if
+        the simulator has failed to run
+
+        Arguments:
+        properties: a list with the property names
+        time_to_run: the time in seconds that the simulator will run
+        steps: the number of steps that the simulator will run
+        sample_interval: the number of simulation steps between the samples
+        payload_format: the format of the returned trajectory payload
+        """
+        recorder = create_recorder(self, properties, sample_interval,
+                                   time_to_run, steps)
+
+        recorder.start(self)
+
+        if steps is not None:
+            result = self.run_steps(steps, recorder)
+        else:
+            result = self.run_for(time_to_run, recorder)
+
+        if not result:
+            return None
+
+        return recorder.get_payload(payload_format)
+
     def run(self):
         """Run the simulation"""
         if not self.fdmexec.Holding():
@@ -0,0 +1,480 @@
+"""
+The huginn.telemetry module contains the classes that are used to encode the
+simulator data as keyframes and delta frames, so that the telemetry can be
+transmitted over slow links, and to measure the quality of the telemetry
+link
+"""
+
+
+from collections import namedtuple
+import logging
+import math
+import struct
+import time
+
+from huginn import configuration
+from huginn.protobuf import fdm_pb2
+
+
+logger = logging.getLogger(__name__)
+
+
+# the SimulatorData fields that contain the simulator values
+SIMULATOR_DATA_FIELDS = tuple(
+    [field.name for field in fdm_pb2.SimulatorData.DESCRIPTOR.fields
+     if field.message_type is not None]
+)
+
+
+class TelemetryError(Exception):
+    """TelemetryError is raised when the telemetry encoding settings are not
+    valid"""
+    pass
+
+
+def get_values(fields=None):
+    """Returns a list of (field, value) tuples with the values of the given
+    SimulatorData fields in the order that they are encoded
+
+    Arguments:
+    fields: the names of the SimulatorData fields. All the fields are used if
+        this is not set
+    """
+    if fields is None:
+        fields = SIMULATOR_DATA_FIELDS
+
+    descriptor_fields = fdm_pb2.SimulatorData.DESCRIPTOR.fields_by_name
+
+    values = []
+
+    for field in fields:
+        if field not in SIMULATOR_DATA_FIELDS:
+            raise TelemetryError("Invalid telemetry field %s" % field)
+
+        message_type = descriptor_fields[field].message_type
+
+        values.extend([(field, value.name)
+                       for value in message_type.fields])
+
+    return values
+
+
+def get_resolution(resolutions, field, value):
+    """Returns the resolution of a SimulatorData value. The resolution is
+    rounded to a 32 bit float, because this is how it is transmitted
+
+    Arguments:
+    resolutions: a dictionary with the resolutions of the SimulatorData
+        fields, for example position, or of their values, for example
+        position.altitude
+    field: the SimulatorData field
+    value: the name of the value
+    """
+    resolution = resolutions.get(
+        "%s.%s" % (field, value),
+        resolutions.get(field, configuration.TELEMETRY_RESOLUTION)
+    )
+
+    return struct.unpack("<f", struct.pack("<f", resolution))[0]
+
+
+def quantize(value, resolution):
+    """Returns the value rounded to its resolution as an integer or None if
+    the value is NaN or infinite
+
+    Arguments:
+    value: the value to quantize
+    resolution: the resolution of the value
+    """
+    if math.isnan(value) or math.isinf(value):
+        return None
+
+    return int(round(value / resolution))
+
+
+class TelemetryEncoder(object):
+    """The TelemetryEncoder converts the SimulatorData messages to
+    TelemetryFrame messages.
+
+    A keyframe that contains every value is created every few messages. The
+    other frames contain only the values that have changed by at least their
+    resolution since they were last sent. The values are rounded to their
+    resolution and they are transmitted as integers. A NaN or infinite value
+    can't be rounded, so a keyframe is sent when a value becomes NaN or
+    infinite.
+    """
+
+    def __init__(self, fields=None, resolutions=None,
+                 keyframe_interval=configuration.TELEMETRY_KEYFRAME_INTERVAL):
+        """Create a new TelemetryEncoder object
+
+        Arguments:
+        fields: the names of the SimulatorData fields to encode. All the
+            fields are encoded if this is not set
+        resolutions: a dictionary with the resolutions of the fields or of
+            their values. The resolutions in
+            configuration.TELEMETRY_RESOLUTIONS are used if a value isn't set
+        keyframe_interval: the number of frames between two keyframes
+        """
+        if keyframe_interval < 1:
+            raise TelemetryError("Invalid keyframe interval %s" %
+                                 keyframe_interval)
+
+        all_resolutions = dict(configuration.TELEMETRY_RESOLUTIONS)
+        all_resolutions.update(resolutions or {})
+
+        all_values = get_values()
+        valid_names = set(SIMULATOR_DATA_FIELDS)
+        valid_names.update(["%s.%s" % value for value in all_values])
+
+        for name, resolution in all_resolutions.items():
+            if name not in valid_names:
+                raise TelemetryError("Invalid telemetry field %s" % name)
+
+            if resolution <= 0.0:
+                raise TelemetryError("Invalid resolution %s for %s" %
+                                     (resolution, name))
+
+        if fields is None:
+            fields = SIMULATOR_DATA_FIELDS
+
+        self.fields = tuple(fields)
+        self.values = get_values(self.fields)
+        self.resolutions = [get_resolution(all_resolutions, field, value)
+                            for field, value in self.values]
+        self.keyframe_interval = keyframe_interval
+
+        self.frames = 0
+        self._sent_values = None
+
+    def encode(self, simulator_data):
+        """Returns a TelemetryFrame object with the simulator data
+
+        Arguments:
+        simulator_data: a SimulatorData object that contains the encoded
+            fields
+        """
+        values = [getattr(getattr(simulator_data, field), value)
+                  for field, value in self.values]
+
+        quantized_values = [quantize(value, resolution)
+                            for value, resolution
+                            in zip(values, self.resolutions)]
+
+        keyframe = self.frames % self.keyframe_interval == 0
+
+        # the delta frames can only contain finite values
+        if not keyframe:
+            keyframe = any(
+                quantized_value is None and sent_value is not None
+                for quantized_value, sent_value
+                in zip(quantized_values, self._sent_values)
+            )
+
+        frame = fdm_pb2.TelemetryFrame()
+        frame.time = simulator_data.time
+
+        if keyframe:
+            frame.keyframe = True
+            frame.fields.extend(self.fields)
+            frame.resolutions.extend(self.resolutions)
+            frame.values.extend(values)
+        else:
+            for index, quantized_value in enumerate(quantized_values):
+                if quantized_value != self._sent_values[index]:
+                    frame.indexes.append(index)
+                    frame.quantized_values.append(quantized_value)
+
+        self._sent_values = quantized_values
+        self.frames += 1
+
+        return frame
+
+
+class TelemetryDecoder(object):
+    """The TelemetryDecoder converts the TelemetryFrame messages back to
+    SimulatorData messages. The frames that are received before the first
+    keyframe can't be decoded and they are dropped.
+
+    The delta frames contain the changes since the previous frame, so they
+    must be applied in order. A delta frame that is older than the last
+    applied frame is dropped. If a frame has been lost then the delta frames
+    are dropped until the next keyframe is received.
+    """
+
+    def __init__(self):
+        self.fields = None
+        self.dropped_frames = 0
+
+        self._values = None
+        self._resolutions = None
+        self._current_values = None
+        self._last_sequence = None
+
+    def _decode_keyframe(self, frame):
+        """Replace the decoder values with the keyframe values"""
+        values = get_values(list(frame.fields))
+
+        if (len(values) != len(frame.values) or
+                len(values) != len(frame.resolutions)):
+            raise TelemetryError("Invalid telemetry keyframe")
+
+        self.fields = tuple(frame.fields)
+        self._values = values
+        self._resolutions = list(frame.resolutions)
+        self._current_values = list(frame.values)
+
+    def _check_sequence(self, frame):
+        """Check that the delta frame follows the last applied frame"""
+        if self._last_sequence is None or not frame.HasField("sequence"):
+            return
+
+        if frame.sequence <= self._last_sequence:
+            raise TelemetryError("Out of order telemetry frame %d" %
+                                 frame.sequence)
+
+        if frame.sequence != self._last_sequence + 1:
+            # the values of the lost frames are missing so the values can
+            # only be decoded again when the next keyframe is received
+            self._current_values = None
+
+            raise TelemetryError("Lost telemetry frames before frame %d" %
+                                 frame.sequence)
+
+    def _decode_delta_frame(self, frame):
+        """Update the decoder values with the changed values of the frame"""
+        current_values = self._current_values
+        resolutions = self._resolutions
+
+        if (len(frame.indexes) != len(frame.quantized_values) or
+                any([index >= len(current_values)
+                     for index in frame.indexes])):
+            raise TelemetryError("Invalid telemetry frame")
+
+        for index, quantized_value in zip(frame.indexes,
+                                          frame.quantized_values):
+            current_values[index] = quantized_value * resolutions[index]
+
+    def decode(self, frame):
+        """Returns a SimulatorData object with the decoded values or None if
+        the frame can't be decoded
+
+        Arguments:
+        frame: a TelemetryFrame object
+        """
+        try:
+            if frame.keyframe:
+                self._decode_keyframe(frame)
+            elif self._current_values is None:
+                raise TelemetryError("A telemetry keyframe hasn't been "
+                                     "received")
+            else:
+                self._check_sequence(frame)
+                self._decode_delta_frame(frame)
+        except TelemetryError as e:
+            logger.debug("Dropped telemetry frame: %s", e)
+
+            self.dropped_frames += 1
+            return None
+
+        if frame.HasField("sequence"):
+            self._last_sequence = frame.sequence
+        else:
+            self._last_sequence = None
+
+        simulator_data = fdm_pb2.SimulatorData()
+        simulator_data.time = frame.time
+
+        if frame.HasField("sequence"):
+            simulator_data.sequence = frame.sequence
+
+        if frame.HasField("send_time"):
+            simulator_data.send_time = frame.send_time
+
+        for (field, value), current_value in zip(self._values,
+                                                 self._current_values):
+            setattr(getattr(simulator_data, field), value, current_value)
+
+        return simulator_data
+
+
+TelemetryPacket = namedtuple("TelemetryPacket", ["sequence", "simulation_time",
+                                                 "send_time", "receive_time",
+                                                 "latency", "lost",
+                                                 "reordered", "duplicate"])
+
+
+class TelemetryStatistics(object):
+    """The TelemetryStatistics class uses the sequence numbers and the send
+    times of the telemetry messages in order to measure the packet loss, the
+    reordering, the jitter and the one way latency of the telemetry link.
+
+    The jitter is the interarrival jitter of RFC 3550. The latency is
+    accurate only if the clocks of the simulator and of the client are
+    synchronized.
+    """
+
+    def __init__(self, reorder_window=configuration.TELEMETRY_REORDER_WINDOW,
+                 clock=time.time):
+        """Create a new TelemetryStatistics object
+
+        Arguments:
+        reorder_window: the number of messages that a message can be late
+            before the sender is considered to have restarted
+        clock: a function that returns the wall clock time in seconds
+        """
+        self.reorder_window = reorder_window
+        self.clock = clock
+
+        self.resets = 0
+
+        self.reset()
+
+    def reset(self):
+        """Clear the statistics"""
+        self.received = 0
+        self.reordered = 0
+        self.duplicates = 0
+        self.jitter = 0.0
+        self.latency = None
+        self.min_latency = None
+        self.max_latency = None
+
+        self._latency_sum = 0.0
+        self._first_sequence = None
+        self._highest_sequence = None
+        self._recent_sequences = set()
+        self._previous_latency = None
+
+    @property
+    def expected(self):
+        """The number of messages that the sender has sent"""
+        if self._first_sequence is None:
+            return 0
+
+        return self._highest_sequence - self._first_sequence + 1
+
+    @property
+    def lost(self):
+        """The number of messages that haven't been received"""
+        return max(0, self.expected - self.received)
+
+    @property
+    def loss_rate(self):
+        """The fraction of the messages that haven't been received"""
+        if self.expected == 0:
+            return 0.0
+
+        return float(self.lost) / self.expected
+
+    @property
+    def mean_latency(self):
+        """The mean one way latency in seconds"""
+        if self.received == 0:
+            return None
+
+        return self._latency_sum / self.received
+
+    def _add_sequence(self, sequence):
+        """Update the received sequence numbers. Returns the number of
+        messages that are missing before this message and True if the
+        message was received out of order"""
+        self.received += 1
+        self._recent_sequences.add(sequence)
+
+        lost = 0
+        reordered = False
+
+        if self._first_sequence is None:
+            self._first_sequence = sequence
+            self._highest_sequence = sequence
+        elif sequence > self._highest_sequence:
+            lost = sequence - self._highest_sequence - 1
+            self._highest_sequence = sequence
+        else:
+            reordered = True
+            self.reordered += 1
+            self._first_sequence = min(self._first_sequence, sequence)
+
+        # only the recent sequence numbers are needed in order to detect the
+        # duplicate messages
+        if len(self._recent_sequences) > 2 * self.reorder_window:
+            oldest_sequence = self._highest_sequence - self.reorder_window
+
+            self._recent_sequences = set(
+                [recent_sequence for recent_sequence in self._recent_sequences
+                 if recent_sequence > oldest_sequence])
+
+        return lost, reordered
+
+    def _add_latency(self, latency):
+        """Update the latency and jitter statistics"""
+        self.latency = latency
+        self._latency_sum += latency
+
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+
+        if self.max_latency is None or latency > self.max_latency:
+            self.max_latency = latency
+
+        if self._previous_latency is not None:
+            difference = abs(latency - self._previous_latency)
+
+            self.jitter += (difference - self.jitter) / 16.0
+
+        self._previous_latency = latency
+
+    def update(self, sequence, simulation_time, send_time,
+               receive_time=None):
+        """Update the statistics with a received message. Returns a
+        TelemetryPacket object with the message statistics
+
+        Arguments:
+        sequence: the message sequence number
+        simulation_time: the simulation time of the message
+        send_time: the wall clock time when the message was sent
+        receive_time: the wall clock time when the message was received. The
+            current time is used if this is not set
+        """
+        if receive_time is None:
+            receive_time = self.clock()
+
+        if (self._highest_sequence is not None and
+                sequence + self.reorder_window < self._highest_sequence):
+            logger.debug("The telemetry sequence has restarted")
+
+            self.resets += 1
+            self.reset()
+
+        latency = receive_time - send_time
+        duplicate = sequence in self._recent_sequences
+
+        if duplicate:
+            self.duplicates += 1
+            lost = 0
+            reordered = False
+        else:
+            lost, reordered = self._add_sequence(sequence)
+            self._add_latency(latency)
+
+        return TelemetryPacket(sequence, simulation_time, send_time,
+                               receive_time, latency, lost, reordered,
+                               duplicate)
+
+    def get_summary(self):
+        """Returns a dictionary with the statistics"""
+        return {
+            "received": self.received,
+            "expected": self.expected,
+            "lost": self.lost,
+            "loss_rate": self.loss_rate,
+            "reordered": self.reordered,
+            "duplicates": self.duplicates,
+            "resets": self.resets,
+            "jitter": self.jitter,
+            "latency": self.latency,
+            "min_latency": self.min_latency,
+            "max_latency": self.max_latency,
+            "mean_latency": self.mean_latency
+        }
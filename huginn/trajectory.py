@@ -0,0 +1,222 @@
+"""
+The huginn.trajectory module contains the classes that are used to record
+the aircraft trajectory while the simulator runs
+"""
+
+
+from base64 import b64decode, b64encode
+import logging
+import struct
+
+from huginn import configuration
+from huginn.fdm import PropertyReader
+
+
+logger = logging.getLogger(__name__)
+
+
+COLUMNS_FORMAT = "columns"
+BINARY_FORMAT = "binary"
+
+PAYLOAD_FORMATS = [COLUMNS_FORMAT, BINARY_FORMAT]
+
+
+class TrajectoryError(Exception):
+    """TrajectoryError is raised when a trajectory recorder can't be
+    created"""
+    pass
+
+
+def get_sample_capacity(dt, sample_interval, time_to_run=None, steps=None):
+    """Returns the number of samples that will be recorded while the
+    simulator runs for the given time or number of steps
+
+    Arguments:
+    dt: the simulation time step
+    sample_interval: the number of simulation steps between the samples
+    time_to_run: the time in seconds that the simulator will run
+    steps: the number of steps that the simulator will run
+    """
+    if steps is None:
+        # run_for executes one more step when the end time isn't a multiple
+        # of the time step
+        steps = int(time_to_run / dt) + 2
+
+    # the first sample is recorded before the simulator starts running
+    return steps // sample_interval + 1
+
+
+class TrajectoryRecorder(object):
+    """The TrajectoryRecorder records the values of a list of JSBSim
+    properties every few simulation steps.
+
+    The samples are written in a preallocated buffer with one row for every
+    sample. The first column of every row is the simulation time.
+    """
+
+    def __init__(self, fdmexec, properties, capacity, sample_interval=1):
+        """Create a new TrajectoryRecorder object
+
+        Arguments:
+        fdmexec: a JSBSim FGFDMExec object
+        properties: a list with the property names
+        capacity: the maximum number of samples
+        sample_interval: the number of simulation steps between the samples
+        """
+        if not properties:
+            raise TrajectoryError("No trajectory properties provided")
+
+        if sample_interval < 1:
+            raise TrajectoryError("Invalid sample interval %s" %
+                                  sample_interval)
+
+        if capacity > configuration.MAX_TRAJECTORY_SAMPLES:
+            raise TrajectoryError("The trajectory can't have more than %d "
+                                  "samples" %
+                                  configuration.MAX_TRAJECTORY_SAMPLES)
+
+        self.reader = PropertyReader(fdmexec, properties)
+        self.properties = self.reader.properties
+        self.capacity = capacity
+        self.sample_interval = sample_interval
+        self.columns = len(self.properties) + 1
+
+        self.samples = 0
+        self.steps = 0
+        self.truncated = False
+
+        import numpy
+
+        self.buffer = numpy.zeros(capacity * self.columns)
+
+    def _add_sample(self, simulation_time):
+        """Write the current property values in the buffer"""
+        if self.samples >= self.capacity:
+            self.truncated = True
+            return
+
+        offset = self.samples * self.columns
+
+        self.buffer[offset] = simulation_time
+        self.buffer[offset + 1:offset + self.columns] = self.reader.read()
+
+        self.samples += 1
+
+    def start(self, simulator):
+        """Record the first sample before the simulator starts running
+
+        Arguments:
+        simulator: the Simulator object
+        """
+        self._add_sample(simulator.simulation_time)
+
+    def __call__(self, simulator):
+        """Update the recorder after a simulation step. The recorder can be
+        used as the callback of Simulator.run_for
+
+        Arguments:
+        simulator: the Simulator object
+        """
+        self.steps += 1
+
+        if self.steps % self.sample_interval == 0:
+            self._add_sample(simulator.simulation_time)
+
+    def get_column(self, index):
+        """Returns the values of a buffer column as a list
+
+        Arguments:
+        index: the column index. The simulation time is in column 0
+        """
+        end = self.samples * self.columns
+
+        return [float(value)
+                for value in self.buffer[index:end:self.columns]]
+
+    def get_payload(self, payload_format=COLUMNS_FORMAT):
+        """Returns a dictionary with the recorded samples
+
+        Arguments:
+        payload_format: columns to return a list of values for every
+            property or binary to return the buffer as little endian 64 bit
+            floats encoded in base64
+        """
+        payload = {
+            "format": payload_format,
+            "properties": list(self.properties),
+            "sample_interval": self.sample_interval,
+            "samples": self.samples,
+            "truncated": self.truncated
+        }
+
+        if payload_format == BINARY_FORMAT:
+            values = self.buffer[:self.samples * self.columns]
+
+            if hasattr(values, "astype"):
+                data = values.astype("<f8").tobytes()
+            else:
+                data = struct.pack("<%dd" % len(values), *values)
+
+            payload["columns"] = self.columns
+            payload["data"] = b64encode(data).decode("ascii")
+        elif payload_format == COLUMNS_FORMAT:
+            payload["time"] = self.get_column(0)
+            payload["values"] = dict(
+                [(name, self.get_column(index + 1))
+                 for index, name in enumerate(self.properties)]
+            )
+        else:
+            raise TrajectoryError("Invalid trajectory format %s" %
+                                  payload_format)
+
+        return payload
+
+
+def create_recorder(simulator, properties, sample_interval=1,
+                    time_to_run=None, steps=None):
+    """Create a TrajectoryRecorder with enough capacity for the samples that
+    will be recorded while the simulator runs for the given time or number
+    of steps
+
+    Arguments:
+    simulator: the Simulator object
+    properties: a list with the property names
+    sample_interval: the number of simulation steps between the samples
+    time_to_run: the time in seconds that the simulator will run
+    steps: the number of steps that the simulator will run
+    """
+    if sample_interval is None or sample_interval < 1:
+        raise TrajectoryError("Invalid sample interval %s" % sample_interval)
+
+    capacity = get_sample_capacity(simulator.dt, sample_interval,
+                                   time_to_run, steps)
+
+    return TrajectoryRecorder(simulator.fdmexec, properties, capacity,
+                              sample_interval)
+
+
+def decode_trajectory(payload):
+    """Convert a trajectory payload to a dictionary with a list of values
+    for the simulation time and for every property
+
+    Arguments:
+    payload: the payload that was returned by TrajectoryRecorder.get_payload
+    """
+    properties = payload["properties"]
+
+    if payload["format"] == COLUMNS_FORMAT:
+        trajectory = dict(payload["values"])
+        trajectory["time"] = payload["time"]
+
+        return trajectory
+
+    columns = payload["columns"]
+    data = b64decode(payload["data"])
+    values = struct.unpack("<%dd" % (len(data) // 8), data)
+
+    trajectory = {"time": list(values[0::columns])}
+
+    for index, name in enumerate(properties):
+        trajectory[name] = list(values[index + 1::columns])
+
+    return trajectory
@@ -0,0 +1,126 @@
+"""
+The huginn.trim module contains the classes that are used to store the
+aircraft trim solutions
+"""
+
+
+import logging
+
+from huginn.fdm import InitialCondition
+from huginn.checkpoints import get_aircraft_state, set_aircraft_state
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_trim_key(fdmexec, trim_mode):
+    """Returns the key of the trim solution for the loaded aircraft model
+    and the current initial condition. The initial condition values are
+    quantized so that nearly identical initial conditions share the same
+    trim solution.
+
+    Arguments:
+    fdmexec: a JSBSim FGFDMExec object
+    trim_mode: the trim mode
+    """
+    initial_condition = InitialCondition(fdmexec)
+
+    return "%s,%.6f,%.6f,%.1f,%.1f,%.1f,%d" % (
+        fdmexec.GetModelName(),
+        initial_condition.latitude,
+        initial_condition.longitude,
+        initial_condition.altitude,
+        initial_condition.airspeed,
+        initial_condition.heading,
+        trim_mode
+    )
+
+
+class TrimCache(object):
+    """The TrimCache stores the trimmed aircraft state for every initial
+    condition and trim mode so that the trim solver doesn't have to run
+    again when the aircraft is trimmed at a known initial condition.
+
+    The trim solutions are kept in memory. If a file is given then they are
+    also stored in it and loaded the next time the cache is created.
+    The trim solution keys contain the aircraft model name, so the same
+    file can be used for every aircraft.
+    """
+
+    def __init__(self, path=None):
+        """Create a new TrimCache object
+
+        Arguments:
+        path: the file that will be used to store the trim solutions
+        """
+        # tinydb is imported here so that the modules which only need the
+        # trim keys don't depend on it
+        from tinydb import TinyDB
+        from tinydb.storages import MemoryStorage
+
+        if path:
+            self.db = TinyDB(path)
+        else:
+            self.db = TinyDB(storage=MemoryStorage)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._solutions = dict(
+            [(record["key"], (record["initial_condition"],
+                              record["properties"]))
+             for record in self.db.all()]
+        )
+
+        logger.debug("Loaded %d trim solutions", len(self._solutions))
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def load_solution(self, fdmexec, key):
+        """Load a stored trim solution. Returns False if there isn't one.
+
+        Arguments:
+        fdmexec: a JSBSim FGFDMExec object
+        key: the trim solution key that was returned by get_trim_key
+        """
+        solution = self._solutions.get(key)
+
+        if solution is None:
+            self.misses += 1
+            return False
+
+        logger.debug("Using the stored trim solution for %s", key)
+
+        initial_condition, properties = solution
+
+        if not set_aircraft_state(fdmexec, initial_condition, properties):
+            self.misses += 1
+            return False
+
+        self.hits += 1
+
+        return True
+
+    def save_solution(self, fdmexec, key):
+        """Store the current aircraft state as a trim solution
+
+        Arguments:
+        fdmexec: a JSBSim FGFDMExec object that has just been trimmed
+        key: the trim solution key that was returned by get_trim_key
+        """
+        initial_condition, properties = get_aircraft_state(fdmexec)
+
+        logger.debug("Storing the trim solution for %s", key)
+
+        self._solutions[key] = (initial_condition, properties)
+
+        from tinydb import Query
+
+        record = Query()
+        self.db.remove(record.key == key)
+        self.db.insert({
+            "key": key,
+            "initial_condition": initial_condition,
+            "properties": properties
+        })
@@ -1,95 +1,170 @@
 """
 the huginn.unit_conversions module contains function that perform conversions
 between different measurement unit types
+
+The conversions are performed using precomputed factors (and offsets where a
+unit conversion is affine) so that they can be used in the simulation loop
+and the request handlers without the overhead of creating pint quantities.
+The pint unit registry is still available for code that needs it.
 """
 
 
-from pint import UnitRegistry
+from math import pi
+
+
+class _LazyUnitRegistry(object):
+    """The pint unit registry is slow to create so it is created the first
+    time that it is used"""
+
+    def __init__(self):
+        self._registry = None
+
+    def _get_registry(self):
+        if self._registry is None:
+            from pint import UnitRegistry
+
+            registry = UnitRegistry()
+
+            registry.define("pound_foot = pound / foot = lbsft = pound_feet")
+            registry.define(
+                "newton_meter = 0.737562149277 * pound_foot  = N_m")
+            registry.define("feet_per_second = feet / second = fps")
+            registry.define("meters_per_second = meter / second = mps")
+            registry.define("feet_per_minute = foot / minute = fpm")
+            registry.define("pound_force_per_square_foot = "
+                            "pound * gravity / foot ** 2 = psf")
+            registry.define("slug = 14.5939 * kilogram")
+            registry.define("slug_per_cubic_feet = slug / (foot ** 3.0)")
+            registry.define(
+                "kilogram_per_cubic_meter = kilogram / (meter ** 3.0)")
+
+            self._registry = registry
+
+        return self._registry
+
+    def __getattr__(self, name):
+        return getattr(self._get_registry(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._get_registry()(*args, **kwargs)
 
 
-ur = UnitRegistry()
+ur = _LazyUnitRegistry()
 
-ur.define("pound_foot = pound / foot = lbsft = pound_feet")
-ur.define("newton_meter = 0.737562149277 * pound_foot  = N_m")
-ur.define("feet_per_second = feet / second = fps")
-ur.define("meters_per_second = meter / second = mps")
-ur.define("feet_per_minute = foot / minute = fpm")
-ur.define("pound_force_per_square_foot = pound * gravity / foot ** 2 = psf")
-ur.define("slug = 14.5939 * kilogram")
-ur.define("slug_per_cubic_feet = slug / (foot ** 3.0)")
-ur.define("kilogram_per_cubic_meter = kilogram / (meter ** 3.0)")
+
+# base unit definitions
+FOOT = 0.3048  # meters
+INCH = 0.0254  # meters
+POUND = 0.45359237  # kilograms
+SLUG = 14.5939  # kilograms
+NAUTICAL_MILE = 1852.0  # meters
+STANDARD_GRAVITY = 9.80665  # meters/sec^2
+MERCURY_DENSITY = 13595.1  # kilograms/meters^3
+
+# conversion factors
+FEET_TO_METERS = FOOT
+METERS_TO_FEET = 1.0 / FOOT
+RADIANS_TO_DEGREES = 180.0 / pi
+POUND_FORCE_TO_NEWTONS = POUND * STANDARD_GRAVITY
+PSF_TO_PASCAL = POUND_FORCE_TO_NEWTONS / (FOOT ** 2)
+SLUG_PER_CUBIC_FOOT_TO_KILOGRAM_PER_CUBIC_METER = SLUG / (FOOT ** 3)
+KNOTS_TO_METERS_PER_SECOND = NAUTICAL_MILE / 3600.0
+METERS_PER_SECOND_TO_KNOTS = 1.0 / KNOTS_TO_METERS_PER_SECOND
+METERS_PER_SECOND_TO_FEET_PER_MINUTE = 60.0 / FOOT
+INCHES_OF_MERCURY_TO_PASCAL = INCH * MERCURY_DENSITY * STANDARD_GRAVITY
+
+# the temperature conversions are affine so they also need an offset
+RANKINE_TO_KELVIN = 5.0 / 9.0
+RANKINE_TO_KELVIN_OFFSET = 0.0
+
+
+def convert_values(values, factor, offset=0.0):
+    """Convert a batch of values
+
+    Arguments:
+    values: a sequence of values or an array object that supports arithmetic
+        operations, like a numpy array
+    factor: the conversion factor
+    offset: the offset that will be added after the values have been
+        multiplied with the factor
+
+    Array objects are converted in a single operation and an array is
+    returned. Any other sequence will be converted to a list.
+    """
+    if hasattr(values, "__array__"):
+        return values * factor + offset
+
+    return [value * factor + offset for value in values]
 
 
 def convert_jsbsim_acceleration(acceleration):
     """Convert the acceleration from the units used in JSBSim to
     meters/sec^2"""
-    acceleration = acceleration * (ur.foot / (ur.second ** 2.0))
-
-    acceleration.ito(ur.meter / (ur.second ** 2.0))
-
-    return acceleration.magnitude
+    return acceleration * FEET_TO_METERS
 
 
 def convert_jsbsim_angular_acceleration(acceleration):
     """Convert the angular acceleration from the units used in JSBSim to
     degrees/sec^2"""
-    acceleration = acceleration * (ur.radian / (ur.second ** 2.0))
-
-    acceleration.ito(ur.degree / (ur.second ** 2.0))
-
-    return acceleration.magnitude
+    return acceleration * RADIANS_TO_DEGREES
 
 
 def convert_jsbsim_angular_velocity(velocity):
     """Convert the angular velocity from the units used in JSBSim to
     degrees/sec"""
-    velocity = velocity * (ur.radian / ur.second)
-
-    velocity.ito(ur.degree / ur.second)
-
-    return velocity.magnitude
+    return velocity * RADIANS_TO_DEGREES
 
 
 def convert_jsbsim_velocity(velocity):
     """Convert the velocity from the units used in JSBSim to meters/sec"""
-    velocity = velocity * ur.feet_per_second
-
-    velocity.ito(ur.meters_per_second)
-
-    return velocity.magnitude
+    return velocity * FEET_TO_METERS
 
 
 def convert_jsbsim_pressure(pressure):
     """Convert the pressure from the units used in JSBSim to pascal"""
-    pressure = pressure * ur.pound_force_per_square_foot
-
-    pressure.ito(ur.pascal)
-
-    return pressure.magnitude
+    return pressure * PSF_TO_PASCAL
 
 
 def convert_jsbsim_temperature(temperature):
     """Convert the temperature from the units used in JSBSim to Kelvin"""
-    temperature = temperature * ur.rankine
-
-    temperature.ito(ur.kelvin)
-
-    return temperature.magnitude
+    return temperature * RANKINE_TO_KELVIN + RANKINE_TO_KELVIN_OFFSET
 
 
 def convert_jsbsim_density(density):
     """Convert the density from the units used in JSBSim to kg/meters^3"""
-    density = density * ur.slug_per_cubic_feet
-
-    density.ito(ur.kilogram_per_cubic_meter)
-
-    return density.magnitude
+    return density * SLUG_PER_CUBIC_FOOT_TO_KILOGRAM_PER_CUBIC_METER
 
 
 def convert_jsbsim_force(force):
     """Convert the force from the units used in JSBSim to Newtons"""
-    force = force * ur.force_pound
+    return force * POUND_FORCE_TO_NEWTONS
+
+
+def convert_feet_to_meters(value):
+    """Convert a length from feet to meters"""
+    return value * FEET_TO_METERS
+
+
+def convert_meters_to_feet(value):
+    """Convert a length from meters to feet"""
+    return value * METERS_TO_FEET
+
+
+def convert_knots_to_meters_per_second(value):
+    """Convert a velocity from knots to meters/sec"""
+    return value * KNOTS_TO_METERS_PER_SECOND
+
+
+def convert_meters_per_second_to_knots(value):
+    """Convert a velocity from meters/sec to knots"""
+    return value * METERS_PER_SECOND_TO_KNOTS
+
+
+def convert_meters_per_second_to_feet_per_minute(value):
+    """Convert a velocity from meters/sec to feet/minute"""
+    return value * METERS_PER_SECOND_TO_FEET_PER_MINUTE
 
-    force.ito(ur.newton)
 
-    return force.magnitude
+def convert_inches_of_mercury_to_pascal(value):
+    """Convert a pressure from inHg to pascal"""
+    return value * INCHES_OF_MERCURY_TO_PASCAL
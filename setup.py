@@ -52,6 +52,7 @@ setup(name="huginn",
                           "Flask-RESTful>=0.3.5",
                           "marshmallow>=2.7.3",
                           "Pint>=0.7.2",
+                          "numpy>=1.11.0",
                           "tinydb==3.2.1"],
       setup_requires=["nose>=1.3.7"],
       tests_require=["coverage>=4.0.3",
@@ -64,6 +65,8 @@ setup(name="huginn",
                                         "huginn_control=huginn.cli.huginn_control:main",
                                         "huginn_record=huginn.cli.huginn_record:main",
                                         "huginn_data=huginn.cli.huginn_data:main",
-                                        "huginn_waypoints=huginn.cli.huginn_waypoints:main"]
+                                        "huginn_waypoints=huginn.cli.huginn_waypoints:main",
+                                        "huginn_batch=huginn.cli.huginn_batch:main",
+                                        "huginn_montecarlo=huginn.cli.huginn_montecarlo:main"]
                     }
       )
@@ -0,0 +1,132 @@
+from unittest import TestCase
+from io import StringIO
+from os import path
+from tempfile import mkdtemp
+from shutil import rmtree
+from os.path import join
+
+from huginn.batch import (BatchRunner, ControlSchedule, TRAJECTORY_VARIABLES,
+                          get_trajectory_point, load_control_schedule,
+                          load_controller)
+from huginn.simulator import SimulationBuilder
+from huginn import configuration
+
+
+class ControlScheduleTests(TestCase):
+    def test_apply_control_inputs(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        control_schedule = ControlSchedule([
+            (0.0, 0.1, 0.2, 0.3, 0.4),
+            (1000.0, 0.0, 0.0, 0.0, 0.0)
+        ])
+
+        control_schedule(simulator)
+
+        self.assertAlmostEqual(simulator.aircraft.controls.aileron, 0.1, 3)
+        self.assertAlmostEqual(simulator.aircraft.controls.elevator, 0.2, 3)
+        self.assertAlmostEqual(simulator.aircraft.controls.rudder, 0.3, 3)
+        self.assertAlmostEqual(simulator.aircraft.controls.throttle, 0.4, 3)
+
+    def test_load_control_schedule(self):
+        schedule_file = StringIO(u"time,aileron,elevator,rudder,throttle\n"
+                                 u"10.0,0.1,0.2,0.3,0.4\n"
+                                 u"5.0,0.0,0.0,0.0,1.0\n")
+
+        control_schedule = load_control_schedule(schedule_file)
+
+        self.assertEqual(control_schedule.entries,
+                         [(5.0, 0.0, 0.0, 0.0, 1.0),
+                          (10.0, 0.1, 0.2, 0.3, 0.4)])
+
+
+class LoadControllerTests(TestCase):
+    def setUp(self):
+        self.temp_directory = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.temp_directory)
+
+    def test_load_controller_from_module(self):
+        controller = load_controller("os.path:join")
+
+        self.assertIs(controller, path.join)
+
+    def test_load_controller_from_script(self):
+        script_path = join(self.temp_directory, "controller.py")
+
+        with open(script_path, "w") as script_file:
+            script_file.write("def update(simulator):\n"
+                              "    return simulator\n")
+
+        controller = load_controller(script_path)
+
+        self.assertEqual(controller(1), 1)
+
+    def test_fail_to_load_script_without_update_function(self):
+        script_path = join(self.temp_directory, "controller.py")
+
+        with open(script_path, "w") as script_file:
+            script_file.write("x = 1\n")
+
+        self.assertRaises(ValueError, load_controller, script_path)
+
+    def test_fail_to_load_invalid_controller(self):
+        self.assertRaises(ValueError, load_controller, "os.path")
+
+
+class MockTrajectoryWriter(object):
+    def __init__(self):
+        self.points = []
+
+    def write_fdm_data(self, data):
+        self.points.append(data)
+
+
+class BatchRunnerTests(TestCase):
+    def test_run(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        controller_calls = []
+
+        def controller(simulator):
+            controller_calls.append(simulator.simulation_time)
+
+        trajectory_writer = MockTrajectoryWriter()
+
+        runner = BatchRunner(simulator, controller, trajectory_writer, 0.1)
+
+        start_time = simulator.simulation_time
+
+        result = runner.run(1.0)
+
+        self.assertTrue(result)
+        self.assertAlmostEqual(simulator.simulation_time,
+                               start_time + 1.0,
+                               2)
+        self.assertGreater(len(controller_calls), 10)
+        self.assertGreaterEqual(len(trajectory_writer.points), 10)
+        self.assertLessEqual(len(trajectory_writer.points), 12)
+
+        for point in trajectory_writer.points:
+            self.assertEqual(sorted(point.keys()),
+                             sorted(TRAJECTORY_VARIABLES))
+
+    def test_get_trajectory_point(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        point = get_trajectory_point(simulator.state)
+
+        self.assertAlmostEqual(point["time"], simulator.simulation_time, 6)
+        self.assertAlmostEqual(point["altitude"],
+                               simulator.fdm.position.altitude,
+                               3)
+        self.assertAlmostEqual(point["throttle"],
+                               simulator.aircraft.controls.throttle,
+                               3)
@@ -96,6 +96,42 @@ class UpdateRateArgtypeTests(TestCase):
 
         self.assertRaises(ArgumentTypeError, argtypes.update_rate, update_rate)
 
+class DurationArgtypeTests(TestCase):
+    def test_valid_duration(self):
+        duration = 60.0
+
+        arg_duration = argtypes.duration(duration)
+
+        self.assertEqual(arg_duration, duration)
+
+    def test_invalid_duration(self):
+        self.assertRaises(ArgumentTypeError, argtypes.duration, -1.0)
+
+    def test_duration_is_not_a_number(self):
+        self.assertRaises(ArgumentTypeError, argtypes.duration, "abc")
+
+class StepsPerTickArgtypeTests(TestCase):
+    def test_valid_steps_per_tick(self):
+        self.assertEqual(argtypes.steps_per_tick("5"), 5)
+
+    def test_invalid_steps_per_tick(self):
+        self.assertRaises(ArgumentTypeError, argtypes.steps_per_tick, 0)
+
+    def test_steps_per_tick_is_not_an_integer(self):
+        self.assertRaises(ArgumentTypeError, argtypes.steps_per_tick, "abc")
+
+class TimeScaleArgtypeTests(TestCase):
+    def test_valid_time_scale(self):
+        self.assertEqual(argtypes.time_scale("4"), 4.0)
+        self.assertEqual(argtypes.time_scale(0.5), 0.5)
+
+    def test_run_as_fast_as_possible(self):
+        self.assertIsNone(argtypes.time_scale("max"))
+
+    def test_invalid_time_scale(self):
+        self.assertRaises(ArgumentTypeError, argtypes.time_scale, 0.0)
+        self.assertRaises(ArgumentTypeError, argtypes.time_scale, "abc")
+
 class TestPortNumber(TestCase):
     def test_port_number(self):
         port_number_string = "1234"
@@ -144,5 +180,37 @@ class TestFDMDataEndpoint(TestCase):
 
         self.assertRaises(ArgumentTypeError, argtypes.fdm_data_endpoint, fdm_endpoint_string)
 
+    def test_fdm_data_multicast_endpoint(self):
+        fdm_endpoint_string = "239.1.2.3,1234,0.01"
+
+        fdm_host, fdm_port, fdm_dt = argtypes.fdm_data_endpoint(fdm_endpoint_string)
+
+        self.assertEqual(fdm_host, "239.1.2.3")
+        self.assertEqual(fdm_port, 1234)
+        self.assertAlmostEqual(fdm_dt, 0.01, 3)
+
+    def test_fail_to_parse_fdm_endpoint_with_invalid_ip_octet(self):
+        fdm_endpoint_string = "127.0.0.256,1234,0.01"
+
+        self.assertRaises(ArgumentTypeError, argtypes.fdm_data_endpoint, fdm_endpoint_string)
+
+class TestIPAddress(TestCase):
+    def test_ip_address(self):
+        self.assertEqual(argtypes.ip_address(" 192.168.1.10 "), "192.168.1.10")
+
+    def test_fail_to_parse_invalid_ip_address(self):
+        self.assertRaises(ArgumentTypeError, argtypes.ip_address, "192.168.1")
+        self.assertRaises(ArgumentTypeError, argtypes.ip_address, "192.168.1.300")
+        self.assertRaises(ArgumentTypeError, argtypes.ip_address, "localhost")
+
+class TestMulticastTTL(TestCase):
+    def test_multicast_ttl(self):
+        self.assertEqual(argtypes.multicast_ttl("32"), 32)
+
+    def test_fail_to_parse_invalid_multicast_ttl(self):
+        self.assertRaises(ArgumentTypeError, argtypes.multicast_ttl, "1.5")
+        self.assertRaises(ArgumentTypeError, argtypes.multicast_ttl, "-1")
+        self.assertRaises(ArgumentTypeError, argtypes.multicast_ttl, "256")
+
 if __name__ == "__main__":
     main()
@@ -3,6 +3,7 @@ from unittest import TestCase
 from mock import MagicMock
 
 from huginn.control import SimulatorControlClient
+from huginn import configuration
 
 class TestSimulatorControlClient(TestCase):
     def test_reset(self):
@@ -60,4 +61,21 @@ class TestSimulatorControlClient(TestCase):
 
         self.assertTrue(result)
 
-        simulator_control_client._send_command.assert_called_once_with("start_running")
\ No newline at end of file
+        simulator_control_client._send_command.assert_called_once_with("start_running")
+
+    def test_save_checkpoint(self):
+        simulator_control_client = SimulatorControlClient("127.0.0.1", 12345)
+
+        simulator_control_client._send_command = MagicMock(
+            return_value={"result": "ok", "job_id": 1})
+        simulator_control_client.get_job = MagicMock(
+            return_value={"status": "completed"})
+
+        result = simulator_control_client.save_checkpoint("test")
+
+        self.assertTrue(result)
+
+        simulator_control_client._send_command.assert_called_once_with(
+            "save_checkpoint", data={"name": "test"})
+        simulator_control_client.get_job.assert_called_once_with(
+            1, wait=configuration.MAX_JOB_WAIT_TIME)
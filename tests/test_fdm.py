@@ -1,8 +1,12 @@
 import math
 from unittest import TestCase, main
 
+from mock import MagicMock
+
 from huginn.fdm import (FDMBuilder, Accelerations, FDM, Velocities, Position,
-                        Orientation, Atmosphere, Forces, InitialCondition)
+                        Orientation, Atmosphere, Forces, InitialCondition,
+                        PropertyReader, get_subsystems,
+                        get_property_catalog, get_unknown_properties)
 
 from huginn import configuration
 from huginn.unit_conversions import (convert_jsbsim_acceleration,
@@ -44,6 +48,40 @@ class TestCreateFDMExec(TestCase):
         
         self.assertAlmostEqual(fdm.GetIC().GetVtrueKtsIC(), airspeed_in_knots, 3)
 
+class FDMSubsystemsTests(TestCase):
+    def test_wrappers_share_the_subsystems(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        fdm = FDM(fdmexec)
+        velocities = Velocities(fdmexec)
+
+        subsystems = get_subsystems(fdmexec)
+
+        self.assertIs(fdm.subsystems, subsystems)
+        self.assertIs(fdm.velocities._subsystems, subsystems)
+        self.assertIs(velocities._subsystems, subsystems)
+        self.assertIs(subsystems.fdmexec, fdmexec)
+
+        other_fdmexec = fdm_builder.create_fdm()
+
+        self.assertIsNot(get_subsystems(other_fdmexec), subsystems)
+
+    def test_wrappers_use_slots(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        for wrapper_class in [Accelerations, Velocities, Position,
+                              Orientation, Atmosphere, Forces]:
+            wrapper = wrapper_class(fdmexec)
+
+            self.assertFalse(hasattr(wrapper, "__dict__"))
+
+
 class AccelerationsTests(TestCase):
     def test_accelerations(self):
         huginn_data_path = configuration.get_data_path()
@@ -287,3 +325,73 @@ class InitialConditionTests(TestCase):
 
 if __name__ == "__main__":
     main()
+
+
+class PropertyReaderTests(TestCase):
+    def test_read_property_values(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        property_names = ["position/h-sl-ft", "velocities/u-fps",
+                          "fcs/throttle-cmd-norm"]
+
+        property_reader = PropertyReader(fdmexec, property_names)
+
+        values = property_reader.read()
+
+        self.assertEqual(len(values), 3)
+
+        for property_name, value in zip(property_names, values):
+            self.assertAlmostEqual(value,
+                                   fdmexec.GetPropertyValue(property_name),
+                                   6)
+
+        fdmexec.Run()
+
+        self.assertIs(property_reader.read(), values)
+        self.assertAlmostEqual(values[1],
+                               fdmexec.GetPropertyValue("velocities/u-fps"),
+                               6)
+
+    def test_get_property_values(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        property_reader = PropertyReader(fdmexec, ["position/h-sl-ft"])
+
+        self.assertEqual(property_reader.get_values(),
+                         {"position/h-sl-ft":
+                          fdmexec.GetPropertyValue("position/h-sl-ft")})
+
+
+class PropertyCatalogTests(TestCase):
+    def test_get_property_catalog(self):
+        fdmexec = MagicMock()
+        fdmexec.QueryPropertyCatalog.return_value = (
+            "/position/h-sl-ft (RW)\n"
+            "velocities/u-fps\n"
+            "fcs/throttle-cmd-norm (RW)\n"
+            "fcs/throttle-cmd-norm[1] (RW)\n"
+        )
+
+        property_catalog = get_property_catalog(fdmexec)
+
+        self.assertEqual(property_catalog,
+                         set(["position/h-sl-ft", "velocities/u-fps",
+                              "fcs/throttle-cmd-norm",
+                              "fcs/throttle-cmd-norm[1]"]))
+
+    def test_get_unknown_properties(self):
+        property_catalog = set(["position/h-sl-ft", "fcs/throttle-cmd-norm"])
+
+        unknown_properties = get_unknown_properties(
+            property_catalog,
+            ["position/h-sl-ft", "fcs/throttle-cmd-norm[0]",
+             "position/invalid"]
+        )
+
+        self.assertEqual(unknown_properties, ["position/invalid"])
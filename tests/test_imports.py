@@ -0,0 +1,37 @@
+from unittest import TestCase
+import subprocess
+import sys
+
+
+def get_loaded_modules(module, modules):
+    """Import a module in a new interpreter and return the given modules
+    that have been loaded"""
+    code = ("import sys\n"
+            "import %s\n"
+            "print(','.join([name for name in %r if name in sys.modules]))"
+            % (module, modules))
+
+    output = subprocess.check_output([sys.executable, "-c", code])
+
+    return [name for name in output.decode("utf8").strip().split(",")
+            if name]
+
+
+class ImportTests(TestCase):
+    def test_control_tool_does_not_load_the_simulator_dependencies(self):
+        modules = get_loaded_modules(
+            "huginn.cli.huginn_control",
+            ["PyJSBSim", "pint", "flask", "autobahn", "tinydb",
+             "marshmallow", "twisted", "pkg_resources"]
+        )
+
+        self.assertEqual(modules, [])
+
+    def test_batch_tool_does_not_load_the_server_dependencies(self):
+        modules = get_loaded_modules(
+            "huginn.cli.huginn_batch",
+            ["PyJSBSim", "pint", "flask", "autobahn", "marshmallow",
+             "twisted"]
+        )
+
+        self.assertEqual(modules, [])
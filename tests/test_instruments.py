@@ -44,6 +44,34 @@ class InstrumentsTests(TestCase):
         self.assertAlmostEqual(instruments.gps.airspeed, convert_jsbsim_velocity(fdmexec.GetAuxiliary().GetVtrueFPS()))
         self.assertAlmostEqual(instruments.gps.heading, math.degrees(fdmexec.GetPropagate().GetEuler(3)))
 
+    def test_get_state(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        instruments = Instruments(fdmexec)
+
+        state = instruments.get_state()
+
+        self.assertAlmostEqual(state.gps.latitude,
+                               instruments.gps.latitude, 6)
+        self.assertAlmostEqual(state.airspeed_indicator.airspeed,
+                               instruments.airspeed_indicator.airspeed, 6)
+        self.assertAlmostEqual(state.altimeter.altitude,
+                               instruments.altimeter.altitude, 6)
+        self.assertAlmostEqual(state.altimeter.pressure,
+                               instruments.altimeter.pressure, 6)
+        self.assertAlmostEqual(state.attitude_indicator.roll,
+                               instruments.attitude_indicator.roll, 6)
+        self.assertAlmostEqual(state.heading_indicator.heading,
+                               instruments.heading_indicator.heading, 6)
+        self.assertAlmostEqual(
+            state.vertical_speed_indicator.climb_rate,
+            instruments.vertical_speed_indicator.climb_rate,
+            6
+        )
+
 class TrueAirspeedEquationTests(TestCase):
     def test_true_airspeed(self):
         total_pressure = 2051.465699
@@ -0,0 +1,272 @@
+from unittest import TestCase
+
+from mock import MagicMock
+
+from huginn.jobs import (JobQueue, JobError, JOB_PENDING, JOB_RUNNING,
+                         JOB_COMPLETED, JOB_CANCELLED, JOB_FAILED)
+from huginn.simulator import Simulator
+from huginn.trajectory import create_recorder
+from huginn.fdm import FDMBuilder, PropertyError
+from huginn import configuration
+
+
+class MockClock(object):
+    def __init__(self, increment=0.0):
+        self.time = 100.0
+        self.increment = increment
+
+    def __call__(self):
+        current_time = self.time
+        self.time += self.increment
+
+        return current_time
+
+
+def create_simulator():
+    huginn_data_path = configuration.get_data_path()
+
+    fdm_builder = FDMBuilder(huginn_data_path)
+    fdmexec = fdm_builder.create_fdm()
+
+    return Simulator(fdmexec)
+
+
+class JobQueueTests(TestCase):
+    def test_run_steps_job(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        start_time = simulator.simulation_time
+
+        job = job_queue.run_steps(10)
+
+        self.assertEqual(job.status, JOB_PENDING)
+        self.assertEqual(job.progress, 0.0)
+        self.assertFalse(job_queue.is_empty())
+        self.assertIs(job_queue.get(job.id), job)
+
+        self.assertTrue(job_queue.process())
+
+        self.assertTrue(job_queue.is_empty())
+        self.assertTrue(job.wait(0.0))
+        self.assertEqual(job.status, JOB_COMPLETED)
+        self.assertEqual(job.progress, 1.0)
+        self.assertEqual(job.executed_steps, 10)
+        self.assertAlmostEqual(simulator.simulation_time,
+                               start_time + 10 * simulator.dt,
+                               6)
+
+    def test_run_for_job(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        start_time = simulator.simulation_time
+
+        job = job_queue.run_for(1.0)
+
+        self.assertTrue(job_queue.process())
+
+        self.assertEqual(job.status, JOB_COMPLETED)
+        self.assertGreater(simulator.simulation_time, start_time + 1.0)
+        self.assertAlmostEqual(simulator.simulation_time, start_time + 1.0,
+                               1)
+
+    def test_jobs_are_executed_over_multiple_ticks(self):
+        simulator = create_simulator()
+        clock = MockClock(0.25)
+        job_queue = JobQueue(simulator, 1.0, 10, clock)
+
+        job = job_queue.run_steps(12)
+
+        self.assertTrue(job_queue.process())
+
+        self.assertEqual(job.status, JOB_RUNNING)
+        self.assertEqual(job.executed_steps, 3)
+        self.assertAlmostEqual(job.progress, 3.0 / 12.0, 6)
+
+        to_dict = job.to_dict()
+        self.assertEqual(to_dict["id"], job.id)
+        self.assertEqual(to_dict["command"], "run_steps")
+        self.assertEqual(to_dict["status"], JOB_RUNNING)
+
+        while not job_queue.is_empty():
+            self.assertTrue(job_queue.process())
+
+        self.assertEqual(job.status, JOB_COMPLETED)
+        self.assertEqual(job.executed_steps, 12)
+
+    def test_jobs_are_executed_in_order(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        first_job = job_queue.run_steps(5)
+        second_job = job_queue.run_steps(3)
+
+        self.assertNotEqual(first_job.id, second_job.id)
+
+        self.assertTrue(job_queue.process())
+
+        self.assertEqual(first_job.status, JOB_COMPLETED)
+        self.assertEqual(second_job.status, JOB_COMPLETED)
+        self.assertLess(first_job.start_time, second_job.start_time)
+
+    def test_cancel_job(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        start_time = simulator.simulation_time
+
+        job = job_queue.run_steps(10)
+
+        self.assertTrue(job_queue.cancel(job.id))
+        self.assertEqual(job.status, JOB_CANCELLED)
+        self.assertTrue(job_queue.is_empty())
+
+        self.assertFalse(job_queue.cancel(job.id))
+        self.assertFalse(job_queue.cancel(1000))
+
+        self.assertTrue(job_queue.process())
+        self.assertEqual(simulator.simulation_time, start_time)
+
+    def test_restore_checkpoint_job(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        self.assertTrue(simulator.save_checkpoint("test"))
+
+        start_time = simulator.simulation_time
+
+        run_job = job_queue.run_steps(10)
+        restore_job = job_queue.restore_checkpoint("test")
+
+        self.assertEqual(restore_job.status, JOB_PENDING)
+
+        self.assertTrue(job_queue.process())
+
+        self.assertEqual(run_job.status, JOB_COMPLETED)
+        self.assertEqual(restore_job.status, JOB_COMPLETED)
+        self.assertEqual(restore_job.progress, 1.0)
+        self.assertAlmostEqual(simulator.simulation_time, start_time, 6)
+
+    def test_save_checkpoint_job(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        run_job = job_queue.run_steps(10)
+        save_job = job_queue.save_checkpoint("test")
+
+        self.assertTrue(job_queue.is_saving_checkpoint("test"))
+        self.assertFalse(job_queue.is_saving_checkpoint("abc"))
+        self.assertNotIn("test", simulator.checkpoints)
+
+        self.assertTrue(job_queue.process())
+
+        self.assertEqual(run_job.status, JOB_COMPLETED)
+        self.assertEqual(save_job.status, JOB_COMPLETED)
+        self.assertFalse(job_queue.is_saving_checkpoint("test"))
+        self.assertIn("test", simulator.checkpoints)
+        self.assertEqual(save_job.simulation_time, run_job.simulation_time)
+
+    def test_fail_to_restore_unknown_checkpoint(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        job = job_queue.restore_checkpoint("abc")
+
+        self.assertTrue(job_queue.process())
+
+        self.assertTrue(job.finished)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.progress, 0.0)
+
+    def test_cancel_pending_run_for_job(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        job = job_queue.run_for(10.0)
+
+        self.assertTrue(job_queue.cancel(job.id))
+
+        job_data = job.to_dict()
+
+        self.assertEqual(job_data["status"], JOB_CANCELLED)
+        self.assertEqual(job_data["progress"], 0.0)
+        self.assertIsNone(job_data["start_time"])
+
+        jobs_data = [queued_job.to_dict()
+                     for queued_job in job_queue.get_jobs()]
+
+        self.assertEqual(len(jobs_data), 1)
+
+    def test_invalid_jobs(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator)
+
+        self.assertRaises(JobError, job_queue.run_steps, 0)
+        self.assertRaises(JobError, job_queue.run_for, -1.0)
+
+    def test_remove_old_finished_jobs(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 2, MockClock())
+
+        jobs = [job_queue.run_steps(1) for _ in range(3)]
+
+        self.assertTrue(job_queue.process())
+
+        job_queue.run_steps(1)
+
+        self.assertIsNone(job_queue.get(jobs[0].id))
+        self.assertIs(job_queue.get(jobs[1].id), jobs[1])
+        self.assertEqual(len(job_queue.get_jobs()), 3)
+
+    def test_record_trajectory(self):
+        simulator = create_simulator()
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        recorder = create_recorder(simulator, ["position/h-sl-ft"], steps=10)
+
+        job = job_queue.run_steps(10, recorder)
+
+        self.assertNotIn("trajectory", job.to_dict(include_trajectory=True))
+
+        self.assertTrue(job_queue.process())
+
+        job_data = job.to_dict(include_trajectory=True)
+
+        self.assertEqual(job_data["trajectory"]["samples"], 11)
+        self.assertNotIn("trajectory", job.to_dict())
+
+    def test_read_properties(self):
+        simulator = MagicMock()
+        simulator.get_property_values.return_value = {"position/h-sl-ft": 1.0}
+
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        property_read = job_queue.read_properties(["position/h-sl-ft"])
+
+        self.assertFalse(property_read.finished)
+        self.assertTrue(job_queue.is_empty())
+
+        job_queue.process_property_reads()
+
+        self.assertTrue(property_read.wait(0.0))
+        self.assertEqual(property_read.values, {"position/h-sl-ft": 1.0})
+        self.assertIsNone(property_read.error)
+        simulator.get_property_values.assert_called_once_with(
+            ["position/h-sl-ft"])
+
+    def test_fail_to_read_unknown_properties(self):
+        simulator = MagicMock()
+        simulator.get_property_values.side_effect = PropertyError(
+            "Unknown properties position/invalid")
+
+        job_queue = JobQueue(simulator, 1.0, 10, MockClock())
+
+        property_read = job_queue.read_properties(["position/invalid"])
+
+        job_queue.process_property_reads()
+
+        self.assertTrue(property_read.finished)
+        self.assertIsNone(property_read.values)
+        self.assertEqual(property_read.error,
+                         "Unknown properties position/invalid")
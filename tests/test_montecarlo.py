@@ -0,0 +1,173 @@
+from unittest import TestCase
+from tempfile import mkdtemp
+from shutil import rmtree
+from os.path import join
+
+from huginn.montecarlo import (MonteCarloError, MonteCarloWorker,
+                               SUMMARY_METRICS, create_grid_runs,
+                               create_random_runs, create_runs,
+                               get_completed_runs, get_result_columns)
+from huginn.simulator import SimulationBuilder
+from huginn.fdm import TRIM_MODE_LONGITUDINAL
+from huginn import configuration
+
+
+class CreateRunsTests(TestCase):
+    def test_create_grid_runs(self):
+        runs = create_grid_runs({
+            "altitude": [300.0, 500.0],
+            "airspeed": [25.0, 30.0, 35.0],
+            "heading": 90.0
+        })
+
+        self.assertEqual(len(runs), 6)
+        self.assertEqual([run["run_id"] for run in runs], list(range(6)))
+        self.assertEqual(runs[0], {"run_id": 0, "airspeed": 25.0,
+                                   "altitude": 300.0, "heading": 90.0})
+        self.assertEqual(runs[5], {"run_id": 5, "airspeed": 35.0,
+                                   "altitude": 500.0, "heading": 90.0})
+
+    def test_create_random_runs(self):
+        parameters = {
+            "altitude": {"min": 300.0, "max": 500.0},
+            "trim_mode": ["full", "longitudinal"],
+            "heading": 90.0
+        }
+
+        runs = create_random_runs(parameters, 10, 42)
+
+        self.assertEqual(len(runs), 10)
+
+        for run in runs:
+            self.assertGreaterEqual(run["altitude"], 300.0)
+            self.assertLessEqual(run["altitude"], 500.0)
+            self.assertIn(run["trim_mode"], ["full", "longitudinal"])
+            self.assertEqual(run["heading"], 90.0)
+
+        self.assertEqual(runs, create_random_runs(parameters, 10, 42))
+
+    def test_fail_to_create_runs_with_invalid_parameter(self):
+        self.assertRaises(MonteCarloError, create_grid_runs, {"abc": [1.0]})
+        self.assertRaises(MonteCarloError, create_grid_runs,
+                          {"sensors.accelerometer": [1.0]})
+
+    def test_create_runs(self):
+        runs = create_runs({"mode": "random",
+                            "runs": 5,
+                            "seed": 1,
+                            "parameters": {"altitude": [300.0]}})
+
+        self.assertEqual(len(runs), 5)
+
+    def test_fail_to_create_runs_with_invalid_mode(self):
+        self.assertRaises(MonteCarloError, create_runs, {"mode": "abc"})
+
+    def test_fail_to_create_random_runs_without_run_count(self):
+        self.assertRaises(MonteCarloError, create_runs, {"mode": "random"})
+
+
+class ResultFileTests(TestCase):
+    def setUp(self):
+        self.temp_directory = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.temp_directory)
+
+    def test_get_completed_runs(self):
+        output_file = join(self.temp_directory, "results.csv")
+
+        with open(output_file, "w") as f:
+            f.write("run_id,altitude\n0,300.0\n2,500.0\n")
+
+        self.assertEqual(get_completed_runs(output_file), set([0, 2]))
+
+    def test_failed_runs_are_not_completed(self):
+        output_file = join(self.temp_directory, "results.csv")
+
+        with open(output_file, "w") as f:
+            f.write("run_id,altitude,result\n0,300.0,True\n1,400.0,False\n"
+                    "2,500.0,True\n1,400.0,True\n3,600.0,False\n")
+
+        self.assertEqual(get_completed_runs(output_file), set([0, 1, 2]))
+
+    def test_get_completed_runs_of_missing_file(self):
+        output_file = join(self.temp_directory, "results.csv")
+
+        self.assertEqual(get_completed_runs(output_file), set())
+
+    def test_get_result_columns(self):
+        runs = [{"run_id": 0, "altitude": 300.0, "heading": 10.0}]
+
+        self.assertEqual(get_result_columns(runs),
+                         ["run_id", "altitude", "heading"] + SUMMARY_METRICS)
+
+
+class MonteCarloWorkerTests(TestCase):
+    def test_execute_run(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        worker = MonteCarloWorker(simulator, 1.0)
+
+        summary = worker.execute({
+            "run_id": 3,
+            "altitude": 500.0,
+            "trim_mode": "longitudinal",
+            "sensors.accelerometer.x_noise_sigma": 0.5
+        })
+
+        self.assertEqual(summary["run_id"], 3)
+        self.assertTrue(summary["result"])
+        self.assertFalse(summary["crashed"])
+        self.assertGreater(summary["simulation_time"], 1.0)
+        self.assertLessEqual(summary["min_altitude"],
+                             summary["max_altitude"])
+        self.assertAlmostEqual(summary["max_altitude"], 500.0, delta=20.0)
+        self.assertEqual(simulator.trim_mode, TRIM_MODE_LONGITUDINAL)
+        self.assertEqual(
+            simulator.aircraft.sensors.accelerometer.x_noise_sigma,
+            0.5
+        )
+
+    def test_sensor_parameters_are_restored(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+        accelerometer = simulator.aircraft.sensors.accelerometer
+        x_noise_sigma = accelerometer.x_noise_sigma
+
+        worker = MonteCarloWorker(simulator, 0.1)
+
+        worker.execute({"run_id": 0,
+                        "sensors.accelerometer.x_noise_sigma": 0.5})
+        worker.execute({"run_id": 1})
+
+        self.assertEqual(accelerometer.x_noise_sigma, x_noise_sigma)
+
+    def test_runs_with_sensor_seed_are_repeatable(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+        accelerometer = simulator.aircraft.sensors.accelerometer
+
+        worker = MonteCarloWorker(simulator, 0.1, sensor_seed=42)
+
+        worker.execute({"run_id": 1})
+        x_measurement_noise = accelerometer.x_measurement_noise
+
+        worker.execute({"run_id": 2})
+        worker.execute({"run_id": 1})
+
+        self.assertEqual(accelerometer.x_measurement_noise,
+                         x_measurement_noise)
+
+    def test_fail_to_execute_run_with_invalid_sensor_parameter(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        worker = MonteCarloWorker(simulator, 0.1)
+
+        self.assertRaises(MonteCarloError, worker.execute,
+                          {"run_id": 0, "sensors.abc.x_noise_sigma": 0.5})
@@ -0,0 +1,342 @@
+from unittest import TestCase
+from collections import namedtuple
+import pickle
+import time
+
+from mock import MagicMock
+
+from huginn.process import (SharedStateBuffer, SimulatorProcess,
+                            SimulatorProcessError, StateProxy,
+                            PublishedState, SimulatorProcessControlsProtocol)
+from huginn.simulator import SimulationBuilder
+from huginn.sensors import SensorHistory
+from huginn.protocols import SensorDataFactory
+from huginn.protobuf import fdm_pb2
+from huginn.rest import (SensorHistoryResource, InitialConditionResource,
+                         PropertiesResource)
+from huginn.fdm import PropertyError
+from huginn import configuration
+
+
+class SharedStateBufferTests(TestCase):
+    def test_read_written_data(self):
+        shared_state = SharedStateBuffer(100)
+
+        self.assertEqual(shared_state.sequence, 0)
+
+        shared_state.write(b"test data")
+
+        sequence, data = shared_state.read()
+
+        self.assertEqual(sequence, 2)
+        self.assertEqual(data, b"test data")
+
+        shared_state.write(b"data")
+
+        sequence, data = shared_state.read()
+
+        self.assertEqual(sequence, 4)
+        self.assertEqual(data, b"data")
+
+    def test_fail_to_write_data_larger_than_the_buffer(self):
+        shared_state = SharedStateBuffer(4)
+
+        self.assertRaises(SimulatorProcessError, shared_state.write,
+                          b"test data")
+
+
+Point = namedtuple("Point", ["x", "y"])
+Line = namedtuple("Line", ["start", "end"])
+
+
+class StateProxyTests(TestCase):
+    def test_return_the_latest_state_values(self):
+        states = [Line(Point(1.0, 2.0), Point(3.0, 4.0))]
+
+        proxy = StateProxy(lambda: states[-1])
+
+        start = proxy.start
+
+        self.assertIsInstance(start, StateProxy)
+        self.assertEqual(start.x, 1.0)
+        self.assertEqual(proxy.end.y, 4.0)
+
+        states.append(Line(Point(5.0, 6.0), Point(7.0, 8.0)))
+
+        self.assertEqual(start.x, 5.0)
+        self.assertEqual(proxy.end.y, 8.0)
+
+
+class SimulatorProcessSnapshotTests(TestCase):
+    def publish(self, simulator_process, paused):
+        published_state = PublishedState(
+            simulator=None, sensors=None, instruments=None,
+            aircraft_type="Rascal", dt=configuration.DT, paused=paused,
+            crashed=False, start_paused=False, scheduler={})
+
+        simulator_process._shared_state.write(
+            pickle.dumps(published_state, pickle.HIGHEST_PROTOCOL))
+
+    def test_read_the_same_state_inside_a_snapshot(self):
+        simulator_process = SimulatorProcess(None)
+
+        self.publish(simulator_process, False)
+
+        with simulator_process.snapshot():
+            published_state = simulator_process.published_state
+
+            self.publish(simulator_process, True)
+
+            self.assertIs(simulator_process.published_state, published_state)
+            self.assertFalse(simulator_process.is_paused())
+
+            # the nested blocks use the snapshot of the outer block
+            with simulator_process.aircraft.snapshot():
+                self.assertFalse(simulator_process.is_paused())
+
+            self.assertFalse(simulator_process.is_paused())
+
+        self.assertTrue(simulator_process.is_paused())
+
+
+class SensorProxyTests(TestCase):
+    def test_request_the_history_from_the_simulator_process(self):
+        simulator_process = SimulatorProcess(None)
+
+        history = SensorHistory(["x", "y", "z"])
+        history.add(1.0, [1.0, 2.0, 3.0])
+
+        simulator_process._execute_command = MagicMock(return_value=history)
+
+        accelerometer = simulator_process.aircraft.sensors.accelerometer
+
+        self.assertIs(accelerometer.history, history)
+        simulator_process._execute_command.assert_called_once_with(
+            "sensor_history", {"sensor": "accelerometer"})
+
+    def test_fail_to_get_the_history(self):
+        simulator_process = SimulatorProcess(None)
+        simulator_process._execute_command = MagicMock(return_value=False)
+
+        sensors = simulator_process.aircraft.sensors
+
+        with self.assertRaises(SimulatorProcessError):
+            sensors.inertial_navigation_system.history
+
+
+class InitialConditionProxyTests(TestCase):
+    def test_get_the_initial_condition_from_the_simulator_process(self):
+        simulator_process = SimulatorProcess(None)
+        simulator_process._execute_command = MagicMock(
+            return_value={"latitude": 10.0, "longitude": 20.0,
+                          "altitude": 150.0, "airspeed": 60.0,
+                          "heading": 90.0})
+
+        initial_condition = simulator_process.initial_condition
+
+        self.assertAlmostEqual(initial_condition.latitude, 10.0, 3)
+        self.assertAlmostEqual(initial_condition.heading, 90.0, 3)
+        simulator_process._execute_command.assert_called_with(
+            "get_initial_condition")
+
+    def test_update_the_initial_condition_of_the_simulator_process(self):
+        simulator_process = SimulatorProcess(None)
+        simulator_process._execute_command = MagicMock(return_value=True)
+
+        simulator_process.initial_condition.altitude = 150.0
+
+        simulator_process._execute_command.assert_called_once_with(
+            "update_initial_condition", {"altitude": 150.0})
+
+    def test_fail_to_update_the_initial_condition(self):
+        simulator_process = SimulatorProcess(None)
+        simulator_process._execute_command = MagicMock(return_value=False)
+
+        with self.assertRaises(SimulatorProcessError):
+            simulator_process.initial_condition.altitude = 150.0
+
+
+class SimulatorProcessPropertiesTests(TestCase):
+    def test_read_the_properties_in_the_simulator_process(self):
+        simulator_process = SimulatorProcess(None)
+        simulator_process._execute_command = MagicMock(
+            return_value={"position/h-sl-ft": 1000.0})
+
+        property_values = simulator_process.get_property_values(
+            ["position/h-sl-ft"])
+
+        self.assertEqual(property_values, {"position/h-sl-ft": 1000.0})
+        simulator_process._execute_command.assert_called_once_with(
+            "get_property_values", {"properties": ["position/h-sl-ft"]})
+
+    def test_fail_to_read_unknown_properties(self):
+        simulator_process = SimulatorProcess(None)
+        simulator_process._execute_command = MagicMock(
+            return_value=PropertyError("Unknown properties position/invalid"))
+
+        with self.assertRaises(PropertyError):
+            simulator_process.get_property_values(["position/invalid"])
+
+
+class SimulatorProcessControlsProtocolTests(TestCase):
+    def test_send_the_averaged_controls_to_the_simulator_process(self):
+        simulator_process = MagicMock()
+
+        controls_protocol = SimulatorProcessControlsProtocol(
+            simulator_process, "average")
+
+        controls_protocol._pending_controls = [(0.1, 0.2, 0.3, 0.4),
+                                               (0.3, 0.4, 0.5, 0.6)]
+        controls_protocol._pending_packets = 2
+
+        self.assertTrue(controls_protocol.apply_controls())
+
+        aileron, elevator, rudder, throttle = \
+            simulator_process.set_aircraft_controls.call_args[0]
+
+        self.assertAlmostEqual(aileron, 0.2, 6)
+        self.assertAlmostEqual(throttle, 0.5, 6)
+        self.assertEqual(controls_protocol.get_statistics()["coalesced"], 1)
+
+
+class SimulatorProcessTests(TestCase):
+    def setUp(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulation_builder = SimulationBuilder(huginn_data_path)
+
+        self.simulator_process = SimulatorProcess(simulation_builder)
+        self.simulator_process.start()
+
+    def tearDown(self):
+        self.simulator_process.stop()
+
+    def test_simulator_is_running(self):
+        simulation_time = self.simulator_process.simulation_time
+
+        time.sleep(0.5)
+
+        self.assertTrue(self.simulator_process.is_alive())
+        self.assertFalse(self.simulator_process.is_paused())
+        self.assertGreater(self.simulator_process.simulation_time,
+                           simulation_time)
+        self.assertAlmostEqual(self.simulator_process.dt, configuration.DT,
+                               6)
+        self.assertEqual(self.simulator_process.aircraft.type, "Rascal")
+
+    def test_pause_and_resume(self):
+        self.simulator_process.pause()
+
+        self.assertTrue(self.simulator_process.is_paused())
+
+        simulation_time = self.simulator_process.simulation_time
+
+        time.sleep(0.1)
+
+        self.assertEqual(self.simulator_process.simulation_time,
+                         simulation_time)
+
+        self.simulator_process.resume()
+
+        self.assertFalse(self.simulator_process.is_paused())
+
+    def test_run_for(self):
+        self.simulator_process.pause()
+
+        simulation_time = self.simulator_process.simulation_time
+
+        self.assertTrue(self.simulator_process.run_for(1.0))
+
+        self.assertAlmostEqual(self.simulator_process.simulation_time,
+                               simulation_time + 1.0,
+                               1)
+
+    def test_set_aircraft_controls(self):
+        self.simulator_process.set_aircraft_controls(0.1, 0.2, 0.3, 0.4)
+
+        time.sleep(0.1)
+
+        controls = self.simulator_process.aircraft.controls
+
+        self.assertAlmostEqual(controls.aileron, 0.1, 3)
+        self.assertAlmostEqual(controls.elevator, 0.2, 3)
+        self.assertAlmostEqual(controls.rudder, 0.3, 3)
+        self.assertAlmostEqual(controls.throttle, 0.4, 3)
+
+    def test_sensor_data(self):
+        accelerometer = self.simulator_process.aircraft.sensors.accelerometer
+        gps = self.simulator_process.aircraft.instruments.gps
+        fdm = self.simulator_process.state.fdm
+
+        self.assertIsNotNone(accelerometer.x)
+        self.assertAlmostEqual(gps.latitude, fdm.position.latitude, 3)
+
+    def test_get_scheduler_statistics(self):
+        time.sleep(0.1)
+
+        statistics = self.simulator_process.scheduler.get_statistics()
+
+        self.assertGreater(statistics["steps"], 0)
+
+    def test_get_sensor_history(self):
+        time.sleep(0.1)
+
+        accelerometer = self.simulator_process.aircraft.sensors.accelerometer
+
+        resource = SensorHistoryResource(accelerometer)
+
+        history_data = resource.get_history_data()
+
+        self.assertEqual(history_data["fields"], ["x", "y", "z"])
+        self.assertGreater(history_data["samples"], 0)
+
+    def test_sensor_data_history_request(self):
+        time.sleep(0.1)
+
+        factory = SensorDataFactory(self.simulator_process.aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.send_response_string = MagicMock()
+
+        sensor_data_request = fdm_pb2.SensorDataRequest()
+        sensor_data_request.type = fdm_pb2.ACCELEROMETER_REQUEST
+        sensor_data_request.since = 0.0
+
+        protocol.handle_sensor_data_request(sensor_data_request)
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.ParseFromString(
+            protocol.send_response_string.call_args[0][0])
+
+        self.assertEqual(sensor_data_response.type,
+                         fdm_pb2.ACCELEROMETER_REQUEST)
+        self.assertEqual(list(sensor_data_response.history.fields),
+                         ["x", "y", "z"])
+        self.assertGreater(len(sensor_data_response.history.time), 0)
+
+    def test_update_initial_condition(self):
+        resource = InitialConditionResource(
+            self.simulator_process.initial_condition)
+
+        resource.update_initial_conditions({"altitude": 150.0,
+                                            "heading": 90.0})
+
+        response = resource.get()
+
+        self.assertAlmostEqual(response["altitude"], 150.0, 3)
+        self.assertAlmostEqual(response["heading"], 90.0, 3)
+
+    def test_get_property_values(self):
+        resource = PropertiesResource(self.simulator_process)
+
+        property_values = resource.get_property_values(
+            ["position/h-sl-ft", "velocities/vtrue-kts"])
+
+        self.assertEqual(sorted(property_values.keys()),
+                         ["position/h-sl-ft", "velocities/vtrue-kts"])
+
+    def test_fail_to_get_unknown_property_values(self):
+        resource = PropertiesResource(self.simulator_process)
+
+        with self.assertRaises(PropertyError):
+            resource.get_property_values(["position/invalid-property"])
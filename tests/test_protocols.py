@@ -1,12 +1,17 @@
 from unittest import TestCase
+import struct
 
 from mock import MagicMock
 
 from huginn.protocols import ControlsProtocol, SimulatorDataProtocol,\
                              SimulatorDataClient, ControlsClient,\
-                             SensorDataFactory
+                             SensorDataFactory, SimulatorDataPublisher,\
+                             is_multicast_address, TelemetryProtocol,\
+                             TelemetrySubscriptionClient,\
+                             SensorDataClientProtocolFactory
 from huginn.aircraft import Aircraft
 from huginn.protobuf import fdm_pb2
+from huginn.telemetry import TelemetryEncoder
 from huginn.fdm import FDMBuilder, FDM
 from huginn import configuration
 from huginn.simulator import Simulator
@@ -44,12 +49,141 @@ class TestControlsProtocol(TestCase):
         port = 12345
              
         controls_protocol.datagramReceived(controls_datagram, (host, port))
+
+        self.assertTrue(controls_protocol.apply_controls())
         
         self.assertAlmostEqual(aircraft.controls.aileron, aileron, 3)
         self.assertAlmostEqual(aircraft.controls.elevator, elevator, 3)
         self.assertAlmostEqual(aircraft.controls.rudder, rudder, 3)
         self.assertAlmostEqual(aircraft.controls.throttle, throttle, 3)
 
+    def create_controls_datagram(self, aileron, sequence=None):
+        controls = fdm_pb2.ControlsUpdate()
+        controls.aileron = aileron
+        controls.elevator = 0.2
+        controls.rudder = 0.3
+        controls.throttle = 0.4
+
+        if sequence is not None:
+            controls.sequence = sequence
+
+        return controls.SerializeToString()
+
+    def test_apply_the_latest_controls_once(self):
+        controls_protocol = ControlsProtocol(None)
+        controls_protocol.set_aircraft_controls = MagicMock()
+
+        for aileron in [0.1, 0.2, 0.3]:
+            controls_protocol.datagramReceived(
+                self.create_controls_datagram(aileron), ("127.0.0.1", 12345))
+
+        controls_protocol.set_aircraft_controls.assert_not_called()
+
+        self.assertTrue(controls_protocol.apply_controls())
+        self.assertFalse(controls_protocol.apply_controls())
+
+        controls_protocol.set_aircraft_controls.assert_called_once_with(
+            0.3, 0.2, 0.3, 0.4)
+
+        self.assertEqual(controls_protocol.get_statistics(),
+                         {"received": 3, "invalid": 0, "dropped": 0,
+                          "coalesced": 2, "applied": 1})
+
+    def test_apply_the_average_controls(self):
+        controls_protocol = ControlsProtocol(None, merge_policy="average")
+        controls_protocol.set_aircraft_controls = MagicMock()
+
+        for aileron in [0.1, 0.2, 0.6]:
+            controls_protocol.datagramReceived(
+                self.create_controls_datagram(aileron), ("127.0.0.1", 12345))
+
+        controls_protocol.apply_controls()
+
+        values = controls_protocol.set_aircraft_controls.call_args[0]
+
+        self.assertAlmostEqual(values[0], 0.3)
+        self.assertAlmostEqual(values[3], 0.4)
+        self.assertEqual(controls_protocol.coalesced, 2)
+
+    def test_invalid_merge_policy(self):
+        self.assertRaises(ValueError, ControlsProtocol, None, "qwerty")
+
+    def test_drop_stale_packets(self):
+        controls_protocol = ControlsProtocol(None)
+        controls_protocol.set_aircraft_controls = MagicMock()
+
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.5, 5), ("127.0.0.1", 12345))
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.3, 3), ("127.0.0.1", 12345))
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.5, 5), ("127.0.0.1", 12345))
+
+        controls_protocol.apply_controls()
+
+        controls_protocol.set_aircraft_controls.assert_called_once_with(
+            0.5, 0.2, 0.3, 0.4)
+        self.assertEqual(controls_protocol.dropped, 2)
+
+        # every client has its own sequence numbers
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.1, 1), ("127.0.0.1", 12346))
+
+        self.assertTrue(controls_protocol.apply_controls())
+        self.assertEqual(controls_protocol.dropped, 2)
+
+    def test_accept_packets_after_a_client_restart(self):
+        controls_protocol = ControlsProtocol(None, sequence_window=10)
+        controls_protocol.set_aircraft_controls = MagicMock()
+
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.5, 50), ("127.0.0.1", 12345))
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.1, 0), ("127.0.0.1", 12345))
+
+        controls_protocol.apply_controls()
+
+        controls_protocol.set_aircraft_controls.assert_called_once_with(
+            0.1, 0.2, 0.3, 0.4)
+        self.assertEqual(controls_protocol.dropped, 0)
+
+    def test_accept_packets_after_a_client_restart_within_the_window(self):
+        clock = MagicMock(return_value=100.0)
+
+        controls_protocol = ControlsProtocol(None, sequence_window=100,
+                                             sequence_timeout=1.0,
+                                             clock=clock)
+        controls_protocol.set_aircraft_controls = MagicMock()
+
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.5, 50), ("127.0.0.1", 12345))
+
+        clock.return_value = 100.5
+
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.7, 0), ("127.0.0.1", 12345))
+
+        self.assertEqual(controls_protocol.dropped, 1)
+
+        clock.return_value = 101.5
+
+        controls_protocol.datagramReceived(
+            self.create_controls_datagram(0.1, 1), ("127.0.0.1", 12345))
+
+        controls_protocol.apply_controls()
+
+        controls_protocol.set_aircraft_controls.assert_called_once_with(
+            0.1, 0.2, 0.3, 0.4)
+        self.assertEqual(controls_protocol.dropped, 1)
+
+    def test_invalid_datagram(self):
+        controls_protocol = ControlsProtocol(None)
+
+        controls_protocol.datagramReceived(b"qwerty", ("127.0.0.1", 12345))
+
+        self.assertEqual(controls_protocol.invalid, 1)
+        self.assertFalse(controls_protocol.apply_controls())
+
 class TestSimulatorDataProtocol(TestCase):
     def test_get_simulator_data(self):
         huginn_data_path = configuration.get_data_path()
@@ -143,6 +277,467 @@ class TestSimulatorDataProtocol(TestCase):
         self.assertAlmostEqual(simulator_data.forces.y_total, fdm.forces.y_total, 3)
         self.assertAlmostEqual(simulator_data.forces.z_total, fdm.forces.z_total, 3)
 
+class TestSimulatorDataPublisher(TestCase):
+    def setUp(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        self.simulator = Simulator(fdmexec)
+
+        self.publisher = SimulatorDataPublisher(self.simulator)
+        self.publisher.transport = MagicMock()
+
+        self.publisher.add_subscriber("127.0.0.1", 10301)
+        self.publisher.add_subscriber("127.0.0.1", 10302)
+        self.publisher.add_subscriber("127.0.0.2", 10303)
+
+    def test_send_the_same_datagram_to_every_subscriber(self):
+        self.publisher.publish()
+
+        self.assertEqual(self.publisher.encoded_messages, 1)
+        self.assertEqual(self.publisher.transport.write.call_count, 3)
+
+        datagrams = [call_args[0][0] for call_args
+                     in self.publisher.transport.write.call_args_list]
+        addresses = [call_args[0][1] for call_args
+                     in self.publisher.transport.write.call_args_list]
+
+        self.assertEqual(addresses, [("127.0.0.1", 10301),
+                                     ("127.0.0.1", 10302),
+                                     ("127.0.0.2", 10303)])
+
+        expected_datagram = self.publisher.get_simulator_data()\
+            .SerializeToString()
+
+        # every datagram ends with the sequence number and the send time of
+        # the subscriber
+        for datagram in datagrams:
+            self.assertTrue(datagram.startswith(expected_datagram))
+
+    def test_number_the_messages_of_every_subscriber(self):
+        self.publisher.publish()
+        self.publisher.publish([("127.0.0.1", 10302)])
+
+        sequences = []
+
+        for call_args in self.publisher.transport.write.call_args_list:
+            simulator_data = fdm_pb2.SimulatorData()
+            simulator_data.ParseFromString(call_args[0][0])
+
+            self.assertTrue(simulator_data.HasField("send_time"))
+            self.assertAlmostEqual(simulator_data.time, self.simulator.simulation_time, 3)
+
+            sequences.append((call_args[0][1], simulator_data.sequence))
+
+        self.assertEqual(sequences, [(("127.0.0.1", 10301), 0),
+                                     (("127.0.0.1", 10302), 0),
+                                     (("127.0.0.2", 10303), 0),
+                                     (("127.0.0.1", 10302), 1)])
+
+    def test_share_encoding_between_update_groups(self):
+        self.publisher.publish([("127.0.0.1", 10301)])
+        self.publisher.publish([("127.0.0.1", 10302), ("127.0.0.2", 10303)])
+
+        self.assertEqual(self.publisher.encoded_messages, 1)
+        self.assertEqual(self.publisher.transport.write.call_count, 3)
+
+    def test_encode_again_after_simulation_step(self):
+        self.publisher.publish()
+
+        self.simulator.step()
+
+        self.publisher.publish()
+
+        self.assertEqual(self.publisher.encoded_messages, 2)
+
+        first_datagram = self.publisher.transport.write.call_args_list[0][0][0]
+        last_datagram = self.publisher.transport.write.call_args_list[-1][0][0]
+
+        first_simulator_data = fdm_pb2.SimulatorData()
+        first_simulator_data.ParseFromString(first_datagram)
+
+        last_simulator_data = fdm_pb2.SimulatorData()
+        last_simulator_data.ParseFromString(last_datagram)
+
+        self.assertGreater(last_simulator_data.time,
+                           first_simulator_data.time)
+
+    def test_do_not_encode_without_subscribers(self):
+        publisher = SimulatorDataPublisher(self.simulator)
+        publisher.transport = MagicMock()
+
+        publisher.publish()
+
+        self.assertEqual(publisher.encoded_messages, 0)
+        publisher.transport.write.assert_not_called()
+
+    def test_set_multicast_options(self):
+        publisher = SimulatorDataPublisher(self.simulator, multicast_ttl=4,
+                                           multicast_interface="192.168.1.10")
+        publisher.transport = MagicMock()
+
+        publisher.startProtocol()
+
+        publisher.transport.setTTL.assert_called_once_with(4)
+        publisher.transport.setOutgoingInterface.assert_called_once_with("192.168.1.10")
+
+    def test_has_multicast_subscribers(self):
+        self.assertFalse(self.publisher.has_multicast_subscribers())
+
+        self.publisher.add_subscriber("239.1.2.3", 10302)
+
+        self.assertTrue(self.publisher.has_multicast_subscribers())
+
+class TestIsMulticastAddress(TestCase):
+    def test_is_multicast_address(self):
+        self.assertTrue(is_multicast_address("224.0.0.1"))
+        self.assertTrue(is_multicast_address("239.255.255.255"))
+        self.assertFalse(is_multicast_address("127.0.0.1"))
+        self.assertFalse(is_multicast_address("240.0.0.1"))
+        self.assertFalse(is_multicast_address("localhost"))
+
+class MockClock(object):
+    def __init__(self):
+        self.time = 100.0
+
+    def __call__(self):
+        return self.time
+
+class TestTelemetryProtocol(TestCase):
+    def setUp(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        self.simulator = Simulator(fdmexec)
+        self.clock = MockClock()
+
+        self.protocol = TelemetryProtocol(self.simulator, max_subscriptions=2,
+                                          max_lease=30.0, clock=self.clock)
+        self.protocol.transport = MagicMock()
+
+    def create_request(self, port, update_rate=0.1, fields=None, lease=10.0):
+        request = fdm_pb2.TelemetrySubscriptionRequest()
+        request.port = port
+        request.update_rate = update_rate
+        request.lease = lease
+        request.fields.extend(fields or [])
+
+        return request
+
+    def sent_simulator_data(self):
+        sent_simulator_data = []
+
+        for call_args in self.protocol.transport.write.call_args_list:
+            simulator_data = fdm_pb2.SimulatorData()
+            simulator_data.ParseFromString(call_args[0][0])
+
+            sent_simulator_data.append((call_args[0][1], simulator_data))
+
+        return sent_simulator_data
+
+    def test_subscribe(self):
+        request = self.create_request(10401, fields=["orientation", "position"])
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertTrue(response.accepted)
+        self.assertAlmostEqual(response.lease, 10.0, 3)
+
+        subscription = self.protocol.subscriptions[("127.0.0.1", 10401)]
+
+        self.assertAlmostEqual(subscription.update_rate, 0.1, 3)
+        self.assertEqual(subscription.fields, ("position", "orientation"))
+        self.assertAlmostEqual(subscription.expires_at, 110.0, 3)
+
+    def test_lease_is_limited(self):
+        request = self.create_request(10401, lease=100.0)
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertTrue(response.accepted)
+        self.assertAlmostEqual(response.lease, 30.0, 3)
+
+    def test_reject_invalid_fields(self):
+        request = self.create_request(10401, fields=["position", "qwerty"])
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertFalse(response.accepted)
+        self.assertIn("qwerty", response.error)
+        self.assertEqual(len(self.protocol.subscriptions), 0)
+
+    def test_reject_invalid_update_rate(self):
+        request = self.create_request(10401, update_rate=0.0)
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertFalse(response.accepted)
+
+    def test_reject_too_many_subscriptions(self):
+        for port in [10401, 10402]:
+            response = self.protocol.handle_subscription_request(self.create_request(port), "127.0.0.1")
+
+            self.assertTrue(response.accepted)
+
+        response = self.protocol.handle_subscription_request(self.create_request(10403), "127.0.0.1")
+
+        self.assertFalse(response.accepted)
+
+        # a subscription can still be renewed
+        response = self.protocol.handle_subscription_request(self.create_request(10401), "127.0.0.1")
+
+        self.assertTrue(response.accepted)
+
+    def test_renew_subscription(self):
+        self.protocol.handle_subscription_request(self.create_request(10401), "127.0.0.1")
+
+        self.clock.time = 105.0
+
+        request = self.create_request(10401, update_rate=0.5, fields=["gps"])
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertEqual(len(self.protocol.subscriptions), 1)
+
+        subscription = self.protocol.subscriptions[("127.0.0.1", 10401)]
+
+        self.assertAlmostEqual(subscription.update_rate, 0.5, 3)
+        self.assertEqual(subscription.fields, ("gps",))
+        self.assertAlmostEqual(subscription.expires_at, 115.0, 3)
+
+    def test_unsubscribe(self):
+        self.protocol.handle_subscription_request(self.create_request(10401), "127.0.0.1")
+
+        request = fdm_pb2.TelemetrySubscriptionRequest()
+        request.port = 10401
+        request.unsubscribe = True
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertTrue(response.accepted)
+        self.assertEqual(len(self.protocol.subscriptions), 0)
+
+    def test_respond_to_subscription_request(self):
+        request = self.create_request(10401)
+
+        self.protocol.datagramReceived(request.SerializeToString(), ("127.0.0.1", 45678))
+
+        datagram, address = self.protocol.transport.write.call_args[0]
+
+        response = fdm_pb2.TelemetrySubscriptionResponse()
+        response.ParseFromString(datagram)
+
+        self.assertTrue(response.accepted)
+        self.assertEqual(address, ("127.0.0.1", 45678))
+        self.assertIn(("127.0.0.1", 10401), self.protocol.subscriptions)
+
+    def test_send_only_the_requested_fields(self):
+        request = self.create_request(10401, fields=["position", "orientation"])
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.protocol.update()
+
+        address, simulator_data = self.sent_simulator_data()[0]
+
+        self.assertEqual(address, ("127.0.0.1", 10401))
+        self.assertAlmostEqual(simulator_data.time, self.simulator.simulation_time, 3)
+        self.assertTrue(simulator_data.HasField("position"))
+        self.assertTrue(simulator_data.HasField("orientation"))
+        self.assertFalse(simulator_data.HasField("gps"))
+        self.assertFalse(simulator_data.HasField("forces"))
+
+        full_datagram = self.protocol.get_simulator_data().SerializeToString()
+
+        self.assertLess(len(self.protocol.transport.write.call_args[0][0]), len(full_datagram))
+
+    def test_send_all_the_fields_by_default(self):
+        self.protocol.handle_subscription_request(self.create_request(10401), "127.0.0.1")
+
+        self.protocol.update()
+
+        _, simulator_data = self.sent_simulator_data()[0]
+
+        self.assertTrue(simulator_data.HasField("gps"))
+        self.assertTrue(simulator_data.HasField("forces"))
+
+    def test_update_at_the_subscription_rate(self):
+        self.protocol.handle_subscription_request(self.create_request(10401, update_rate=0.1), "127.0.0.1")
+        self.protocol.handle_subscription_request(self.create_request(10402, update_rate=0.5), "127.0.0.1")
+
+        for i in range(10):
+            self.clock.time = 100.0 + i * 0.1 + 0.001
+            self.protocol.update()
+
+        addresses = [address for address, _ in self.sent_simulator_data()]
+
+        self.assertEqual(addresses.count(("127.0.0.1", 10401)), 10)
+        self.assertEqual(addresses.count(("127.0.0.1", 10402)), 2)
+
+    def test_share_encoding_between_subscriptions(self):
+        for port in [10401, 10402]:
+            request = self.create_request(port, fields=["position"])
+            self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.protocol.update()
+
+        self.assertEqual(self.protocol.transport.write.call_count, 2)
+        self.assertEqual(self.protocol.encoded_messages, 1)
+
+    def test_number_the_subscription_messages(self):
+        request = self.create_request(10401, update_rate=0.1)
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        request = self.create_request(10402, update_rate=0.1)
+        request.delta_encoding = True
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        for i in range(3):
+            self.clock.time = 100.0 + i * 0.1 + 0.001
+            self.protocol.update()
+
+        simulator_data_sequences = []
+        frame_sequences = []
+
+        for call_args in self.protocol.transport.write.call_args_list:
+            datagram, address = call_args[0]
+
+            if address == ("127.0.0.1", 10401):
+                message = fdm_pb2.SimulatorData()
+                sequences = simulator_data_sequences
+            else:
+                message = fdm_pb2.TelemetryFrame()
+                sequences = frame_sequences
+
+            message.ParseFromString(datagram)
+
+            sequences.append((message.sequence, message.send_time))
+
+        send_times = [100.001, 100.101, 100.201]
+
+        for sequences in [simulator_data_sequences, frame_sequences]:
+            self.assertEqual([sequence for sequence, _ in sequences], [0, 1, 2])
+
+            for (_, send_time), expected_send_time in zip(sequences, send_times):
+                self.assertAlmostEqual(send_time, expected_send_time, 3)
+
+    def test_remove_expired_subscription(self):
+        self.protocol.handle_subscription_request(self.create_request(10401, lease=5.0), "127.0.0.1")
+
+        self.clock.time = 106.0
+
+        self.protocol.update()
+
+        self.assertEqual(len(self.protocol.subscriptions), 0)
+        self.protocol.transport.write.assert_not_called()
+
+    def test_delta_encoded_subscription(self):
+        request = self.create_request(10401, fields=["position"])
+        request.delta_encoding = True
+        request.keyframe_interval = 5
+
+        resolution = request.resolutions.add()
+        resolution.field = "position.altitude"
+        resolution.resolution = 0.5
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertTrue(response.accepted)
+
+        self.protocol.update()
+
+        datagram, address = self.protocol.transport.write.call_args[0]
+
+        frame = fdm_pb2.TelemetryFrame()
+        frame.ParseFromString(datagram)
+
+        self.assertEqual(address, ("127.0.0.1", 10401))
+        self.assertTrue(frame.keyframe)
+        self.assertEqual(list(frame.fields), ["position"])
+        self.assertAlmostEqual(frame.resolutions[2], 0.5, 3)
+        self.assertAlmostEqual(frame.values[2], self.simulator.state.fdm.position.altitude, 3)
+
+    def test_keep_the_encoder_when_the_subscription_is_renewed(self):
+        request = self.create_request(10401, fields=["position"])
+        request.delta_encoding = True
+
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        encoder = self.protocol.subscriptions[("127.0.0.1", 10401)].encoder
+
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertIs(self.protocol.subscriptions[("127.0.0.1", 10401)].encoder, encoder)
+
+        request.keyframe_interval = 3
+        self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertIsNot(self.protocol.subscriptions[("127.0.0.1", 10401)].encoder, encoder)
+
+    def test_reject_invalid_resolution(self):
+        request = self.create_request(10401)
+        request.delta_encoding = True
+
+        resolution = request.resolutions.add()
+        resolution.field = "position.altitude"
+        resolution.resolution = -1.0
+
+        response = self.protocol.handle_subscription_request(request, "127.0.0.1")
+
+        self.assertFalse(response.accepted)
+        self.assertEqual(len(self.protocol.subscriptions), 0)
+
+class TestTelemetrySubscriptionClient(TestCase):
+    def test_create_request(self):
+        client = TelemetrySubscriptionClient("127.0.0.1", 10400, 10401,
+                                             update_rate=0.2,
+                                             fields=["position"],
+                                             lease=20.0)
+
+        request = client.create_request()
+
+        self.assertEqual(request.port, 10401)
+        self.assertAlmostEqual(request.update_rate, 0.2, 3)
+        self.assertAlmostEqual(request.lease, 20.0, 3)
+        self.assertEqual(list(request.fields), ["position"])
+        self.assertFalse(request.unsubscribe)
+
+    def test_create_unsubscribe_request(self):
+        client = TelemetrySubscriptionClient("127.0.0.1", 10400, 10401)
+
+        request = client.create_request(unsubscribe=True)
+
+        self.assertEqual(request.port, 10401)
+        self.assertTrue(request.unsubscribe)
+
+    def test_create_delta_encoding_request(self):
+        client = TelemetrySubscriptionClient("127.0.0.1", 10400, 10401,
+                                             delta_encoding=True,
+                                             keyframe_interval=20,
+                                             resolutions={"position": 0.1})
+
+        request = client.create_request()
+
+        self.assertTrue(request.delta_encoding)
+        self.assertEqual(request.keyframe_interval, 20)
+        self.assertEqual(len(request.resolutions), 1)
+        self.assertEqual(request.resolutions[0].field, "position")
+        self.assertAlmostEqual(request.resolutions[0].resolution, 0.1, 3)
+
+    def test_subscription_response(self):
+        client = TelemetrySubscriptionClient("127.0.0.1", 10400, 10401)
+
+        response = fdm_pb2.TelemetrySubscriptionResponse()
+        response.accepted = False
+        response.error = "Too many telemetry subscriptions"
+
+        client.datagramReceived(response.SerializeToString(), ("127.0.0.1", 10400))
+
+        self.assertFalse(client.accepted)
+        self.assertEqual(client.error, "Too many telemetry subscriptions")
+
 class SimulatorDataMatcher(object):
     def __eq__(self, fdm_data):
         mock_simulator_data_datagram = MockSimulatorDataDatagram()
@@ -240,6 +835,101 @@ class TestSimulatorDataClient(TestCase):
 
         mock_simulator_data_listener.simulator_data_received.assert_called_once_with(SimulatorDataMatcher())
 
+    def test_join_multicast_group(self):
+        simulator_data_client = SimulatorDataClient("239.1.2.3")
+        simulator_data_client.transport = MagicMock()
+
+        simulator_data_client.startProtocol()
+
+        simulator_data_client.transport.joinGroup.assert_called_once_with("239.1.2.3", "")
+
+    def test_do_not_join_multicast_group_by_default(self):
+        simulator_data_client = SimulatorDataClient()
+        simulator_data_client.transport = MagicMock()
+
+        simulator_data_client.startProtocol()
+
+        simulator_data_client.transport.joinGroup.assert_not_called()
+
+    def test_received_telemetry_frames(self):
+        simulator_data_client = SimulatorDataClient(delta_encoding=True)
+
+        mock_simulator_data_listener = MockSimulatorDataListener()
+        mock_simulator_data_listener.simulator_data_received = MagicMock()
+
+        simulator_data_client.add_simulator_data_listener(mock_simulator_data_listener)
+
+        encoder = TelemetryEncoder(["position"], keyframe_interval=10)
+
+        simulator_data = fdm_pb2.SimulatorData()
+        simulator_data.time = 1.0
+        simulator_data.position.latitude = 37.9
+        simulator_data.position.longitude = 23.9
+        simulator_data.position.altitude = 300.0
+        simulator_data.position.heading = 45.0
+
+        simulator_data_client.datagramReceived(encoder.encode(simulator_data).SerializeToString(), ("127.0.0.1", 12345))
+
+        simulator_data.time = 1.1
+        simulator_data.position.altitude = 310.0
+
+        simulator_data_client.datagramReceived(encoder.encode(simulator_data).SerializeToString(), ("127.0.0.1", 12345))
+
+        self.assertEqual(mock_simulator_data_listener.simulator_data_received.call_count, 2)
+
+        received_data = mock_simulator_data_listener.simulator_data_received.call_args[0][0]
+
+        self.assertAlmostEqual(received_data.time, 1.1, 3)
+        self.assertAlmostEqual(received_data.position.latitude, 37.9, 5)
+        self.assertAlmostEqual(received_data.position.altitude, 310.0, 3)
+        self.assertFalse(received_data.HasField("gps"))
+
+    def test_telemetry_statistics(self):
+        simulator_data_client = SimulatorDataClient()
+        simulator_data_client.statistics.clock = MagicMock(return_value=1000.05)
+
+        mock_statistics_listener = MagicMock()
+        simulator_data_client.add_statistics_listener(mock_statistics_listener)
+
+        for sequence in [0, 1, 3, 2]:
+            simulator_data = fdm_pb2.SimulatorData()
+            simulator_data.time = sequence * 0.1
+            simulator_data.sequence = sequence
+            simulator_data.send_time = 1000.0
+
+            simulator_data_client.datagramReceived(simulator_data.SerializeToString(), ("127.0.0.1", 12345))
+
+        self.assertEqual(mock_statistics_listener.packet_received.call_count, 4)
+
+        packet = mock_statistics_listener.packet_received.call_args[0][0]
+
+        self.assertEqual(packet.sequence, 2)
+        self.assertTrue(packet.reordered)
+        self.assertAlmostEqual(packet.latency, 0.05, 3)
+
+        summary = simulator_data_client.statistics.get_summary()
+
+        self.assertEqual(summary["received"], 4)
+        self.assertEqual(summary["lost"], 0)
+        self.assertEqual(summary["reordered"], 1)
+
+    def test_drop_telemetry_frames_without_keyframe(self):
+        simulator_data_client = SimulatorDataClient(delta_encoding=True)
+
+        mock_simulator_data_listener = MockSimulatorDataListener()
+        mock_simulator_data_listener.simulator_data_received = MagicMock()
+
+        simulator_data_client.add_simulator_data_listener(mock_simulator_data_listener)
+
+        frame = fdm_pb2.TelemetryFrame()
+        frame.time = 1.0
+        frame.indexes.append(0)
+        frame.quantized_values.append(10)
+
+        simulator_data_client.datagramReceived(frame.SerializeToString(), ("127.0.0.1", 12345))
+
+        mock_simulator_data_listener.simulator_data_received.assert_not_called()
+
 class TestControlsClient(TestCase):
     def test_transmit_controls(self):
         protocol = ControlsClient("127.0.0.1", 12345)
@@ -247,16 +937,29 @@ class TestControlsClient(TestCase):
 
         protocol.transmit_controls(0.1, 0.2, 0.3, 0.4)
 
-        controls_data = fdm_pb2.Controls()
+        controls_data = fdm_pb2.ControlsUpdate()
         controls_data.aileron = 0.1
         controls_data.elevator = 0.2
         controls_data.rudder = 0.3
         controls_data.throttle = 0.4
+        controls_data.sequence = 0
 
         expected_datagram = controls_data.SerializeToString()
 
         protocol.send_datagram.assert_called_once_with(expected_datagram)
 
+    def test_increase_the_sequence_number(self):
+        protocol = ControlsClient("127.0.0.1", 12345)
+        protocol.send_datagram = MagicMock()
+
+        protocol.transmit_controls(0.1, 0.2, 0.3, 0.4)
+        protocol.transmit_controls(0.1, 0.2, 0.3, 0.4)
+
+        controls_data = fdm_pb2.ControlsUpdate()
+        controls_data.ParseFromString(protocol.send_datagram.call_args[0][0])
+
+        self.assertEqual(controls_data.sequence, 1)
+
 class TestSensorDataProtocol(TestCase):
     def test_fill_gps_data(self):
         huginn_data_path = configuration.get_data_path()
@@ -306,6 +1009,65 @@ class TestSensorDataProtocol(TestCase):
 
         self.assertEqual(sensor_data_response.type, fdm_pb2.ACCELEROMETER_REQUEST)
 
+    def test_fill_history_data(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        accelerometer = aircraft.sensors.accelerometer
+        start_time = fdmexec.GetSimTime()
+        accelerometer.update(start_time + 0.1)
+        accelerometer.update(start_time + 0.2)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+
+        protocol.fill_history_data(sensor_data_response,
+                                   fdm_pb2.ACCELEROMETER_REQUEST,
+                                   start_time)
+
+        history = sensor_data_response.history
+
+        self.assertEqual(sensor_data_response.type, fdm_pb2.ACCELEROMETER_REQUEST)
+        self.assertEqual(list(history.fields), ["x", "y", "z"])
+        self.assertEqual(len(history.time), 2)
+        self.assertAlmostEqual(history.time[1], start_time + 0.2)
+        self.assertEqual(len(history.values), 6)
+        self.assertAlmostEqual(history.values[3], accelerometer.x)
+        self.assertFalse(history.truncated)
+
+    def test_history_request_of_gps_data_is_invalid(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.send_response_string = MagicMock()
+
+        sensor_data_request = fdm_pb2.SensorDataRequest()
+        sensor_data_request.type = fdm_pb2.GPS_REQUEST
+        sensor_data_request.since = 0.0
+
+        protocol.handle_sensor_data_request(sensor_data_request)
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.ParseFromString(
+            protocol.send_response_string.call_args[0][0])
+
+        self.assertEqual(sensor_data_response.type, fdm_pb2.INVALID_REQUEST)
+
     def test_fill_gyroscope_data(self):
         huginn_data_path = configuration.get_data_path()
 
@@ -488,3 +1250,213 @@ class TestSensorDataProtocol(TestCase):
         expected_sensor_data_response.gps.heading = aircraft.instruments.gps.heading
         
         protocol.send_response_string.assert_called_once_with(expected_sensor_data_response.SerializeToString())
+
+    def test_handle_gyroscope_request(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.send_response_string = MagicMock()
+
+        sensor_data_request = fdm_pb2.SensorDataRequest()
+        sensor_data_request.type = fdm_pb2.GYROSCOPE_REQUEST
+
+        protocol.handle_sensor_data_request(sensor_data_request)
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.ParseFromString(
+            protocol.send_response_string.call_args[0][0])
+
+        self.assertEqual(sensor_data_response.type, fdm_pb2.GYROSCOPE_REQUEST)
+        self.assertTrue(sensor_data_response.HasField("gyroscope"))
+        self.assertFalse(sensor_data_response.HasField("accelerometer"))
+
+    def test_handle_batch_request(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.send_response_string = MagicMock()
+
+        sensor_data_request = fdm_pb2.SensorDataRequest()
+        sensor_data_request.type = fdm_pb2.BATCH_REQUEST
+        sensor_data_request.types.extend([fdm_pb2.GPS_REQUEST,
+                                          fdm_pb2.ACCELEROMETER_REQUEST,
+                                          fdm_pb2.INS_REQUEST])
+        sensor_data_request.request_id = 42
+
+        protocol.handle_sensor_data_request(sensor_data_request)
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.ParseFromString(
+            protocol.send_response_string.call_args[0][0])
+
+        self.assertEqual(sensor_data_response.type, fdm_pb2.BATCH_REQUEST)
+        self.assertEqual(sensor_data_response.request_id, 42)
+        self.assertAlmostEqual(sensor_data_response.gps.latitude, aircraft.instruments.gps.latitude)
+        self.assertAlmostEqual(sensor_data_response.accelerometer.x, aircraft.sensors.accelerometer.x)
+        self.assertAlmostEqual(sensor_data_response.ins.roll, aircraft.sensors.inertial_navigation_system.roll)
+        self.assertFalse(sensor_data_response.HasField("gyroscope"))
+
+    def test_batch_request_with_invalid_type(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.send_response_string = MagicMock()
+
+        sensor_data_request = fdm_pb2.SensorDataRequest()
+        sensor_data_request.type = fdm_pb2.BATCH_REQUEST
+        sensor_data_request.types.extend([fdm_pb2.GPS_REQUEST,
+                                          fdm_pb2.BATCH_REQUEST])
+
+        protocol.handle_sensor_data_request(sensor_data_request)
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.ParseFromString(
+            protocol.send_response_string.call_args[0][0])
+
+        self.assertEqual(sensor_data_response.type, fdm_pb2.INVALID_REQUEST)
+        self.assertFalse(sensor_data_response.HasField("gps"))
+
+    def test_pipelined_requests_over_one_connection(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.transport = MagicMock()
+
+        data = b""
+        for request_id, request_type in enumerate([fdm_pb2.GPS_REQUEST,
+                                                   fdm_pb2.THERMOMETER_REQUEST]):
+            sensor_data_request = fdm_pb2.SensorDataRequest()
+            sensor_data_request.type = request_type
+            sensor_data_request.request_id = request_id
+            request_string = sensor_data_request.SerializeToString()
+
+            data += struct.pack("!I", len(request_string)) + request_string
+
+        protocol.dataReceived(data)
+
+        self.assertEqual(protocol.transport.write.call_count, 2)
+        self.assertFalse(protocol.transport.loseConnection.called)
+
+        response_types = []
+        for call_args in protocol.transport.write.call_args_list:
+            sensor_data_response = fdm_pb2.SensorDataResponse()
+            sensor_data_response.ParseFromString(call_args[0][0][4:])
+
+            response_types.append((sensor_data_response.request_id,
+                                   sensor_data_response.type))
+
+        self.assertEqual(response_types, [(0, fdm_pb2.GPS_REQUEST),
+                                          (1, fdm_pb2.THERMOMETER_REQUEST)])
+
+    def test_invalid_request_does_not_close_the_connection(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        aircraft = Aircraft(fdmexec)
+
+        factory = SensorDataFactory(aircraft)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.send_response_string = MagicMock()
+        protocol.transport = MagicMock()
+
+        protocol.stringReceived(b"qwerty")
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.ParseFromString(
+            protocol.send_response_string.call_args[0][0])
+
+        self.assertEqual(sensor_data_response.type, fdm_pb2.INVALID_REQUEST)
+        self.assertFalse(protocol.transport.loseConnection.called)
+
+
+class TestSensorDataClientProtocol(TestCase):
+    def test_send_request_when_connected(self):
+        listener = MagicMock()
+        factory = SensorDataClientProtocolFactory(
+            fdm_pb2.BATCH_REQUEST, listener,
+            [fdm_pb2.GPS_REQUEST, fdm_pb2.INS_REQUEST])
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.makeConnection(MagicMock())
+
+        request_string = protocol.transport.write.call_args[0][0][4:]
+
+        sensor_data_request = fdm_pb2.SensorDataRequest()
+        sensor_data_request.ParseFromString(request_string)
+
+        self.assertEqual(sensor_data_request.type, fdm_pb2.BATCH_REQUEST)
+        self.assertEqual(list(sensor_data_request.types),
+                         [fdm_pb2.GPS_REQUEST, fdm_pb2.INS_REQUEST])
+        self.assertEqual(protocol.pending_requests, 1)
+        self.assertEqual(factory.connection, protocol)
+
+    def test_close_the_connection_after_the_response(self):
+        listener = MagicMock()
+        factory = SensorDataClientProtocolFactory(fdm_pb2.GPS_REQUEST,
+                                                  listener)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.makeConnection(MagicMock())
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.type = fdm_pb2.GPS_REQUEST
+
+        protocol.stringReceived(sensor_data_response.SerializeToString())
+
+        self.assertEqual(listener.received_responce.call_count, 1)
+        protocol.transport.loseConnection.assert_called_once_with()
+
+    def test_keep_the_connection_open(self):
+        listener = MagicMock()
+        factory = SensorDataClientProtocolFactory(fdm_pb2.GPS_REQUEST,
+                                                  listener, keep_alive=True)
+
+        protocol = factory.buildProtocol(("127.0.0.1", 12345))
+        protocol.makeConnection(MagicMock())
+        protocol.send_request(fdm_pb2.ACCELEROMETER_REQUEST)
+
+        self.assertEqual(protocol.pending_requests, 2)
+
+        sensor_data_response = fdm_pb2.SensorDataResponse()
+        sensor_data_response.type = fdm_pb2.GPS_REQUEST
+
+        protocol.stringReceived(sensor_data_response.SerializeToString())
+
+        self.assertEqual(protocol.pending_requests, 1)
+        self.assertFalse(protocol.transport.loseConnection.called)
@@ -1,5 +1,7 @@
 from unittest import TestCase, main
 
+from mock import MagicMock
+
 from tinydb import TinyDB, Query
 from tinydb.storages import MemoryStorage
 
@@ -15,16 +17,21 @@ from huginn.rest import (FDMResource, AccelerometerResource, GyroscopeResource,
                          AirspeedIndicatorResource, AltimeterResource,
                          AttitudeIndicatorResource, HeadingIndicatorResource,
                          VerticalSpeedIndicatorResource, WaypointResource,
-                         WaypointsResource)
+                         WaypointsResource, SchedulerResource,
+                         PropertiesResource, JobResource,
+                         SensorHistoryResource, ControlsResource)
 
 from huginn import configuration
 
 from huginn.fdm import (FDMBuilder, Accelerations, Velocities, Orientation,
                         Atmosphere, Forces, InitialCondition, Position)
 
-from huginn.fdm import FDM
+from huginn.fdm import FDM, PropertyError
 from huginn.aircraft import Aircraft
-from huginn.simulator import Simulator
+from huginn.simulator import Simulator, SimulationBuilder
+from huginn.scheduler import RealTimeScheduler
+from huginn.jobs import JobQueue, PropertyRead
+from huginn.protocols import ControlsProtocol
 from huginn.schemas import AccelerationsSchema
 from huginn.unit_conversions import convert_jsbsim_velocity
 
@@ -40,10 +47,11 @@ class FDMResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        aircraft = Aircraft(fdmexec)
-        fdm = FDM(fdmexec)
-        
-        resource = FDMResource(fdm, aircraft)
+        simulator = Simulator(fdmexec)
+        aircraft = simulator.aircraft
+        fdm = simulator.fdm
+
+        resource = FDMResource(simulator)
 
         fdm_data = resource.get()
 
@@ -189,6 +197,32 @@ class InertialNavigationSystemResourceTests(TestCase):
         self.assertAlmostEqual(aircraft.sensors.inertial_navigation_system.roll, inertial_navigation_system_data["roll"], 3)
         self.assertAlmostEqual(aircraft.sensors.inertial_navigation_system.pitch, inertial_navigation_system_data["pitch"], 3)
 
+class SensorHistoryResourceTests(TestCase):
+    def test_get_sensor_history(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        accelerometer = simulator.aircraft.sensors.accelerometer
+
+        start_time = simulator.simulation_time
+
+        simulator.run_for(0.1)
+
+        resource = SensorHistoryResource(accelerometer)
+
+        history_data = resource.get_history_data(start_time)
+
+        self.assertEqual(history_data["fields"], ["x", "y", "z"])
+        self.assertGreater(history_data["samples"], 1)
+        self.assertEqual(len(history_data["time"]), history_data["samples"])
+        self.assertGreater(history_data["time"][0], start_time)
+        self.assertAlmostEqual(history_data["time"][-1],
+                               simulator.simulation_time)
+        self.assertAlmostEqual(history_data["values"]["x"][-1],
+                               accelerometer.x)
+        self.assertFalse(history_data["truncated"])
+
 class EngineResourceTests(TestCase):
     def test_get_engine_data(self):
         huginn_data_path = configuration.get_data_path()
@@ -321,6 +355,163 @@ class SimulatorControlResourceTests(TestCase):
 
         self.assertGreater(simulator.simulation_time, start_time + 1.0)
 
+    def test_submit_run_for_job(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        job_queue = JobQueue(simulator)
+
+        start_time = simulator.simulation_time
+
+        simulator_control_resource = SimulatorControlResource(
+            simulator, job_queue=job_queue)
+
+        response = simulator_control_resource.execute_command(
+            "run_for", {"time_to_run": 1.0})
+
+        job = job_queue.get(response["job_id"])
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "run_for",
+                              "job_id": job.id})
+
+        self.assertEqual(simulator.simulation_time, start_time)
+
+        while not job_queue.is_empty():
+            job_queue.process()
+
+        self.assertTrue(job.finished)
+        self.assertGreater(simulator.simulation_time, start_time + 1.0)
+
+    def test_run_steps(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        start_time = simulator.simulation_time
+
+        simulator_control_resource = SimulatorControlResource(simulator)
+
+        response = simulator_control_resource.execute_command(
+            "run_steps", {"steps": 10})
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "run_steps"})
+
+        self.assertAlmostEqual(simulator.simulation_time,
+                               start_time + 10 * simulator.dt,
+                               6)
+
+        response = simulator_control_resource.execute_command("run_steps")
+
+        self.assertDictEqual(response,
+                             {"error": "no number of steps provided",
+                              "command": "run_steps"})
+
+    def test_submit_run_steps_job(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        job_queue = JobQueue(simulator)
+
+        simulator_control_resource = SimulatorControlResource(
+            simulator, job_queue=job_queue)
+
+        response = simulator_control_resource.execute_command(
+            "run_steps", {"steps": 10})
+
+        self.assertEqual(response["result"], "ok")
+        self.assertEqual(response["command"], "run_steps")
+
+        job_resource = JobResource(job_queue)
+
+        job_data = job_resource.get_job_data(response["job_id"])
+
+        self.assertEqual(job_data["status"], "pending")
+        self.assertEqual(job_data["steps"], 10)
+
+        while not job_queue.is_empty():
+            job_queue.process()
+
+        job_data = job_resource.get_job_data(response["job_id"], 1.0)
+
+        self.assertEqual(job_data["status"], "completed")
+        self.assertEqual(job_data["progress"], 1.0)
+        self.assertEqual(job_data["executed_steps"], 10)
+
+        self.assertIsNone(job_resource.get_job_data(1000))
+
+    def test_run_for_with_trajectory(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        simulator_control_resource = SimulatorControlResource(simulator)
+
+        response = simulator_control_resource.execute_command(
+            "run_for",
+            {"time_to_run": 0.1,
+             "properties": ["position/h-sl-ft", "velocities/vtrue-kts"],
+             "trajectory_format": "binary"}
+        )
+
+        self.assertEqual(response["result"], "ok")
+        self.assertEqual(response["trajectory"]["format"], "binary")
+        self.assertGreater(response["trajectory"]["samples"], 30)
+
+        response = simulator_control_resource.execute_command(
+            "run_for",
+            {"time_to_run": 0.1,
+             "properties": ["position/h-sl-ft"],
+             "trajectory_format": "xml"}
+        )
+
+        self.assertDictEqual(response,
+                             {"error": "invalid trajectory format",
+                              "command": "run_for"})
+
+    def test_submit_run_steps_job_with_trajectory(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        job_queue = JobQueue(simulator)
+
+        simulator_control_resource = SimulatorControlResource(
+            simulator, job_queue=job_queue)
+
+        response = simulator_control_resource.execute_command(
+            "run_steps",
+            {"steps": 10, "properties": ["position/h-sl-ft"],
+             "sample_interval": 5}
+        )
+
+        while not job_queue.is_empty():
+            job_queue.process()
+
+        job_resource = JobResource(job_queue)
+
+        job_data = job_resource.get_job_data(response["job_id"])
+
+        self.assertEqual(job_data["trajectory"]["samples"], 3)
+        self.assertEqual(len(job_data["trajectory"]["time"]), 3)
+
     def test_reset_simulator(self):
         huginn_data_path = configuration.get_data_path()
 
@@ -344,6 +535,187 @@ class SimulatorControlResourceTests(TestCase):
         self.assertAlmostEqual(simulator.simulation_time, fdmexec.GetSimTime(), 3)
         self.assertLess(simulator.simulation_time, start_time)
 
+    def test_save_and_restore_checkpoint(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        simulator_control_resource = SimulatorControlResource(simulator)
+
+        response = simulator_control_resource.execute_command(
+            "save_checkpoint", {"name": "test"})
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "save_checkpoint"})
+
+        start_time = simulator.simulation_time
+
+        simulator.run_for(1.0)
+
+        response = simulator_control_resource.execute_command(
+            "restore_checkpoint", {"name": "test"})
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "restore_checkpoint"})
+
+        self.assertAlmostEqual(simulator.simulation_time, start_time, 6)
+
+    def test_fail_to_restore_unknown_checkpoint(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        simulator_control_resource = SimulatorControlResource(simulator)
+
+        response = simulator_control_resource.execute_command(
+            "restore_checkpoint")
+
+        self.assertDictEqual(response,
+                             {"error": "failed to restore checkpoint default",
+                              "command": "restore_checkpoint"})
+
+    def test_submit_restore_checkpoint_job(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        job_queue = JobQueue(simulator)
+
+        simulator_control_resource = SimulatorControlResource(
+            simulator, job_queue=job_queue)
+
+        response = simulator_control_resource.execute_command(
+            "save_checkpoint", {"name": "test"})
+
+        save_job = job_queue.get(response["job_id"])
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "save_checkpoint",
+                              "job_id": save_job.id})
+
+        # the checkpoint is saved by the simulation loop
+        self.assertNotIn("test", simulator.checkpoints)
+
+        while not job_queue.is_empty():
+            job_queue.process()
+
+        self.assertTrue(save_job.finished)
+        self.assertIn("test", simulator.checkpoints)
+
+        start_time = simulator.simulation_time
+
+        simulator.run_for(1.0)
+
+        response = simulator_control_resource.execute_command(
+            "restore_checkpoint", {"name": "test"})
+
+        job = job_queue.get(response["job_id"])
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "restore_checkpoint",
+                              "job_id": job.id})
+
+        self.assertGreater(simulator.simulation_time, start_time + 1.0)
+
+        while not job_queue.is_empty():
+            job_queue.process()
+
+        self.assertTrue(job.finished)
+        self.assertAlmostEqual(simulator.simulation_time, start_time, 6)
+
+        response = simulator_control_resource.execute_command(
+            "restore_checkpoint", {"name": "abc"})
+
+        self.assertDictEqual(response,
+                             {"error": "failed to restore checkpoint abc",
+                              "command": "restore_checkpoint"})
+
+    def test_restore_checkpoint_that_will_be_saved_by_a_job(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        job_queue = JobQueue(simulator)
+
+        simulator_control_resource = SimulatorControlResource(
+            simulator, job_queue=job_queue)
+
+        simulator_control_resource.execute_command(
+            "save_checkpoint", {"name": "test"})
+
+        response = simulator_control_resource.execute_command(
+            "restore_checkpoint", {"name": "test"})
+
+        self.assertEqual(response["result"], "ok")
+
+        while not job_queue.is_empty():
+            job_queue.process()
+
+        self.assertEqual(job_queue.get(response["job_id"]).status,
+                         "completed")
+
+    def test_set_time_scale(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        scheduler = RealTimeScheduler(simulator)
+
+        simulator_control_resource = SimulatorControlResource(simulator,
+                                                              scheduler)
+
+        response = simulator_control_resource.execute_command(
+            "time_scale", {"time_scale": 4.0})
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "time_scale"})
+        self.assertEqual(scheduler.time_scale, 4.0)
+
+        response = simulator_control_resource.execute_command(
+            "time_scale", {"time_scale": "max"})
+
+        self.assertDictEqual(response,
+                             {"result": "ok",
+                              "command": "time_scale"})
+        self.assertIsNone(scheduler.time_scale)
+
+    def test_fail_to_set_invalid_time_scale(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+        scheduler = RealTimeScheduler(simulator)
+
+        simulator_control_resource = SimulatorControlResource(simulator,
+                                                              scheduler)
+
+        response = simulator_control_resource.execute_command(
+            "time_scale", {"time_scale": -1.0})
+
+        self.assertDictEqual(response,
+                             {"error": "invalid time scale",
+                              "command": "time_scale"})
+        self.assertEqual(scheduler.time_scale, 1.0)
+
 class AircraftResourceTests(TestCase):
     def test_get_aircraft_information(self):
         huginn_data_path = configuration.get_data_path()
@@ -395,7 +767,9 @@ class AccelerationsResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        accelerations_resource = AccelerationsResource(fdmexec)
+        simulator = Simulator(fdmexec)
+
+        accelerations_resource = AccelerationsResource(simulator)
 
         response = accelerations_resource.get()
 
@@ -419,7 +793,9 @@ class VelocitiesResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        velocities_resource = VelocitiesResource(fdmexec)
+        simulator = Simulator(fdmexec)
+
+        velocities_resource = VelocitiesResource(simulator)
 
         response = velocities_resource.get()
 
@@ -445,7 +821,9 @@ class OrientationResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        orientation_resource = OrientationResource(fdmexec)
+        simulator = Simulator(fdmexec)
+
+        orientation_resource = OrientationResource(simulator)
 
         response = orientation_resource.get()
 
@@ -463,7 +841,9 @@ class AtmosphereResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        atmosphere_resource = AtmosphereResource(fdmexec)
+        simulator = Simulator(fdmexec)
+
+        atmosphere_resource = AtmosphereResource(simulator)
 
         response = atmosphere_resource.get()
 
@@ -483,7 +863,9 @@ class ForceResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        forces_resource = ForcesResource(fdmexec)
+        simulator = Simulator(fdmexec)
+
+        forces_resource = ForcesResource(simulator)
 
         response = forces_resource.get()
 
@@ -506,7 +888,7 @@ class InitialConditionResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        ic_resource = InitialConditionResource(fdmexec)
+        ic_resource = InitialConditionResource(InitialCondition(fdmexec))
 
         response = ic_resource.get()
 
@@ -524,7 +906,7 @@ class InitialConditionResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        ic_resource = InitialConditionResource(fdmexec)
+        ic_resource = InitialConditionResource(InitialCondition(fdmexec))
         
         new_ic = {
             "latitude": 10.0,
@@ -544,6 +926,58 @@ class InitialConditionResourceTests(TestCase):
         self.assertAlmostEqual(response["airspeed"], 60.0, 3)
         self.assertAlmostEqual(response["heading"], 90.0, 3)
 
+class PropertiesResourceTests(TestCase):
+    def test_get_property_values(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+        simulator = Simulator(fdmexec)
+
+        properties_resource = PropertiesResource(simulator)
+
+        property_values = properties_resource.get_property_values(
+            ["position/h-sl-ft", "velocities/vtrue-kts"])
+
+        self.assertEqual(len(property_values), 2)
+        self.assertAlmostEqual(property_values["position/h-sl-ft"],
+                               fdmexec.GetPropertyValue("position/h-sl-ft"),
+                               6)
+        self.assertAlmostEqual(
+            property_values["velocities/vtrue-kts"],
+            fdmexec.GetPropertyValue("velocities/vtrue-kts"),
+            6
+        )
+
+    def test_get_property_values_read_by_the_simulation_loop(self):
+        property_read = PropertyRead(["position/h-sl-ft"])
+        property_read.finish({"position/h-sl-ft": 1000.0})
+
+        job_queue = MagicMock()
+        job_queue.read_properties.return_value = property_read
+
+        properties_resource = PropertiesResource(MagicMock(), job_queue)
+
+        property_values = properties_resource.get_property_values(
+            ["position/h-sl-ft"])
+
+        self.assertEqual(property_values, {"position/h-sl-ft": 1000.0})
+        job_queue.read_properties.assert_called_once_with(
+            ["position/h-sl-ft"])
+
+    def test_fail_to_get_unknown_property_values(self):
+        property_read = PropertyRead(["position/invalid"])
+        property_read.finish(error="Unknown properties position/invalid")
+
+        job_queue = MagicMock()
+        job_queue.read_properties.return_value = property_read
+
+        properties_resource = PropertiesResource(MagicMock(), job_queue)
+
+        with self.assertRaises(PropertyError):
+            properties_resource.get_property_values(["position/invalid"])
+
+
 class PositionResourceTests(TestCase):
     def test_get_position(self):
         huginn_data_path = configuration.get_data_path()
@@ -551,7 +985,9 @@ class PositionResourceTests(TestCase):
         fdm_builder = FDMBuilder(huginn_data_path)
         fdmexec = fdm_builder.create_fdm()
 
-        position_resource = PositionResource(fdmexec)
+        simulator = Simulator(fdmexec)
+
+        position_resource = PositionResource(simulator)
 
         response = position_resource.get()
 
@@ -733,5 +1169,43 @@ class WaypointsResourceTests(TestCase):
 
         self.assertItemsEqual(waypoints, expected_waypoints)
 
+
+class SchedulerResourceTests(TestCase):
+    def test_get_scheduler_statistics(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        scheduler = RealTimeScheduler(simulator)
+        scheduler.tick()
+
+        scheduler_resource = SchedulerResource(scheduler)
+
+        response = scheduler_resource.get()
+
+        self.assertEqual(response, scheduler.get_statistics())
+        self.assertEqual(response["ticks"], 1)
+
+
+class ControlsResourceTests(TestCase):
+    def test_get_controls_statistics(self):
+        controls_protocol = ControlsProtocol(MagicMock(), "average")
+        controls_protocol.received = 10
+        controls_protocol.dropped = 2
+        controls_protocol.coalesced = 3
+
+        controls_resource = ControlsResource(controls_protocol)
+
+        response = controls_resource.get()
+
+        self.assertEqual(response["received"], 10)
+        self.assertEqual(response["dropped"], 2)
+        self.assertEqual(response["coalesced"], 3)
+        self.assertEqual(response["merge_policy"], "average")
+
+
 if __name__ == "__main__":
     main()
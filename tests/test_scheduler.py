@@ -0,0 +1,195 @@
+from unittest import TestCase
+
+from huginn.scheduler import RealTimeScheduler
+from huginn.simulator import Simulator
+from huginn.fdm import FDMBuilder
+from huginn import configuration
+
+
+class MockClock(object):
+    def __init__(self, increment=0.0):
+        self.time = 100.0
+        self.increment = increment
+
+    def __call__(self):
+        current_time = self.time
+        self.time += self.increment
+
+        return current_time
+
+
+def create_simulator():
+    huginn_data_path = configuration.get_data_path()
+
+    fdm_builder = FDMBuilder(huginn_data_path)
+    fdmexec = fdm_builder.create_fdm()
+
+    return Simulator(fdmexec)
+
+
+class RealTimeSchedulerTests(TestCase):
+    def test_keep_up_with_wall_clock_time(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, clock)
+
+        start_time = simulator.simulation_time
+
+        scheduler.tick()
+
+        for _ in range(100):
+            clock.time += simulator.dt * 3
+            self.assertTrue(scheduler.tick())
+
+        self.assertAlmostEqual(simulator.simulation_time - start_time,
+                               simulator.dt * 300,
+                               6)
+        self.assertEqual(scheduler.steps, 300)
+        self.assertEqual(scheduler.overruns, 0)
+        self.assertAlmostEqual(scheduler.lag, 0.0, 6)
+
+    def test_limit_steps_per_tick(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 5, 1.0, clock)
+
+        scheduler.tick()
+
+        clock.time += simulator.dt * 8
+        scheduler.tick()
+
+        self.assertEqual(scheduler.steps, 5)
+        self.assertEqual(scheduler.overruns, 1)
+        self.assertAlmostEqual(scheduler.lag, simulator.dt * 3, 6)
+
+        clock.time += simulator.dt
+        scheduler.tick()
+
+        self.assertEqual(scheduler.steps, 9)
+        self.assertEqual(scheduler.overruns, 1)
+        self.assertAlmostEqual(scheduler.lag, 0.0, 6)
+
+    def test_drop_time_when_lag_is_too_large(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 5, 1.0, clock)
+
+        scheduler.tick()
+
+        clock.time += 2.0
+        scheduler.tick()
+
+        self.assertEqual(scheduler.steps, 0)
+        self.assertEqual(scheduler.resynchronizations, 1)
+        self.assertAlmostEqual(scheduler.dropped_time, 2.0, 6)
+        self.assertAlmostEqual(scheduler.lag, 0.0, 6)
+
+    def test_do_not_run_while_paused(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 5, 1.0, clock)
+
+        scheduler.tick()
+
+        simulator.pause()
+        simulation_time = simulator.simulation_time
+
+        clock.time += 10.0
+        scheduler.tick()
+
+        self.assertEqual(simulator.simulation_time, simulation_time)
+
+        simulator.resume()
+        scheduler.tick()
+
+        clock.time += simulator.dt
+        scheduler.tick()
+
+        self.assertEqual(scheduler.steps, 1)
+        self.assertEqual(scheduler.resynchronizations, 0)
+
+    def test_achieved_rate(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, clock)
+
+        scheduler.tick()
+
+        for _ in range(int(1.0 / simulator.dt) + 1):
+            clock.time += simulator.dt
+            scheduler.tick()
+
+        self.assertAlmostEqual(scheduler.achieved_rate, 1.0 / simulator.dt,
+                               delta=5.0)
+        self.assertAlmostEqual(scheduler.real_time_factor, 1.0, 2)
+
+    def test_run_faster_than_real_time(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, clock)
+        scheduler.time_scale = 4.0
+
+        start_time = simulator.simulation_time
+
+        scheduler.tick()
+
+        for _ in range(10):
+            clock.time += simulator.dt * 3
+            self.assertTrue(scheduler.tick())
+
+        self.assertAlmostEqual(simulator.simulation_time - start_time,
+                               simulator.dt * 120,
+                               6)
+        self.assertEqual(scheduler.steps, 120)
+        self.assertEqual(scheduler.overruns, 0)
+
+    def test_run_slower_than_real_time(self):
+        simulator = create_simulator()
+        clock = MockClock()
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, clock)
+        scheduler.time_scale = 0.5
+
+        scheduler.tick()
+
+        for _ in range(10):
+            clock.time += simulator.dt * 2
+            self.assertTrue(scheduler.tick())
+
+        self.assertEqual(scheduler.steps, 10)
+
+    def test_run_as_fast_as_possible(self):
+        simulator = create_simulator()
+        clock = MockClock(0.003)
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, clock)
+        scheduler.time_scale = None
+
+        start_time = simulator.simulation_time
+
+        self.assertTrue(scheduler.tick())
+
+        self.assertEqual(scheduler.steps, 6)
+        self.assertAlmostEqual(simulator.simulation_time - start_time,
+                               simulator.dt * 6,
+                               6)
+        self.assertIsNone(scheduler.get_statistics()["time_scale"])
+
+    def test_fail_to_set_invalid_time_scale(self):
+        simulator = create_simulator()
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, MockClock())
+
+        with self.assertRaises(ValueError):
+            scheduler.time_scale = 0.0
+
+    def test_get_statistics(self):
+        simulator = create_simulator()
+        scheduler = RealTimeScheduler(simulator, 10, 1.0, MockClock())
+
+        statistics = scheduler.get_statistics()
+
+        self.assertEqual(statistics["ticks"], 0)
+        self.assertEqual(statistics["steps"], 0)
+        self.assertEqual(statistics["overruns"], 0)
+        self.assertEqual(statistics["max_steps_per_tick"], 10)
+        self.assertEqual(statistics["time_scale"], 1.0)
+        self.assertEqual(statistics["lag"], 0.0)
+        self.assertEqual(statistics["achieved_rate"], 0.0)
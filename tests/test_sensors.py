@@ -10,7 +10,8 @@ from huginn.unit_conversions import convert_jsbsim_temperature,\
 from huginn.fdm import FDMBuilder
 from huginn.sensors import Sensors, Accelerometer, Gyroscope, Thermometer,\
                            PressureSensor, PitotTube, InertialNavigationSystem,\
-                           Sensor
+                           Sensor, NoiseGenerator, SensorScheduler,\
+                           SensorHistory
 
 class AccelerometerTests(TestCase):
     def test_accelerometer(self):
@@ -36,6 +37,7 @@ class AccelerometerTests(TestCase):
         fdmexec = fdm_builder.create_fdm()
 
         accelerometer = Accelerometer(fdmexec)
+        scheduler = SensorScheduler([accelerometer])
 
         accelerometer._x_measurement_noise = 0.0
 
@@ -49,6 +51,7 @@ class AccelerometerTests(TestCase):
         run_until = fdmexec.GetSimTime() + (1.0/accelerometer.update_rate) + 1.0
         while fdmexec.GetSimTime() < run_until:
             fdmexec.Run()
+            scheduler.tick(fdmexec.GetSimTime())
 
         #self.assertAlmostEqual(accelerometer.x, accelerometer.true_x + accelerometer._x_measurement_noise, 3)
 
@@ -79,6 +82,7 @@ class GyroscopeTests(TestCase):
         fdmexec = fdm_builder.create_fdm()
 
         gyroscope = Gyroscope(fdmexec)
+        scheduler = SensorScheduler([gyroscope])
 
         gyroscope._roll_rate_measurement_noise = 0.0
 
@@ -89,6 +93,7 @@ class GyroscopeTests(TestCase):
         run_until = fdmexec.GetSimTime() + (1.0/gyroscope.update_rate) + 1.0
         while fdmexec.GetSimTime() < run_until:
             fdmexec.Run()
+            scheduler.tick(fdmexec.GetSimTime())
 
         self.assertNotEqual(gyroscope.roll_rate_measurement_noise, 0.0)
 
@@ -113,6 +118,7 @@ class ThermometerTests(TestCase):
         fdmexec = fdm_builder.create_fdm()
 
         thermometer = Thermometer(fdmexec)
+        scheduler = SensorScheduler([thermometer])
 
         thermometer._measurement_noise = 0.0
 
@@ -124,6 +130,7 @@ class ThermometerTests(TestCase):
         run_until = fdmexec.GetSimTime() + (1.0/thermometer.update_rate) + 1.0
         while fdmexec.GetSimTime() < run_until:
             fdmexec.Run()
+            scheduler.tick(fdmexec.GetSimTime())
 
         self.assertNotEqual(thermometer.measurement_noise, 0.0)
         self.assertEqual(thermometer.measurement_noise, thermometer._measurement_noise)
@@ -149,6 +156,7 @@ class PressureSensorTests(TestCase):
         fdmexec = fdm_builder.create_fdm()
 
         pressure_sensor = PressureSensor(fdmexec)
+        scheduler = SensorScheduler([pressure_sensor])
 
         pressure_sensor._measurement_noise = 0.0
 
@@ -160,6 +168,7 @@ class PressureSensorTests(TestCase):
         run_until = fdmexec.GetSimTime() + (1.0/pressure_sensor.update_rate) + 1.0
         while fdmexec.GetSimTime() < run_until:
             fdmexec.Run()
+            scheduler.tick(fdmexec.GetSimTime())
 
         self.assertNotEqual(pressure_sensor.measurement_noise, 0.0)
         self.assertEqual(pressure_sensor.measurement_noise, pressure_sensor._measurement_noise)
@@ -185,6 +194,7 @@ class PitotTubeTests(TestCase):
         fdmexec = fdm_builder.create_fdm()
 
         pitot_tube = PitotTube(fdmexec)
+        scheduler = SensorScheduler([pitot_tube])
 
         pitot_tube._measurement_noise = 0.0
 
@@ -196,6 +206,7 @@ class PitotTubeTests(TestCase):
         run_until = fdmexec.GetSimTime() + (1.0/pitot_tube.update_rate) + 1.0
         while fdmexec.GetSimTime() < run_until:
             fdmexec.Run()
+            scheduler.tick(fdmexec.GetSimTime())
 
         self.assertNotEqual(pitot_tube.measurement_noise, 0.0)
         self.assertEqual(pitot_tube.measurement_noise, pitot_tube._measurement_noise)
@@ -234,6 +245,7 @@ class InertialNavigationSystemTests(TestCase):
         fdmexec = fdm_builder.create_fdm()
 
         ins = InertialNavigationSystem(fdmexec)
+        scheduler = SensorScheduler([ins])
 
         ins._roll_measurement_noise = 0.0
         ins._pitch_measurement_noise = 0.0
@@ -263,6 +275,7 @@ class InertialNavigationSystemTests(TestCase):
         run_until = fdmexec.GetSimTime() + (1.0/ins.update_rate) + 1.0
         while fdmexec.GetSimTime() < run_until:
             fdmexec.Run()
+            scheduler.tick(fdmexec.GetSimTime())
 
         self.assertNotEqual(ins.roll_measurement_noise, 0.0)
         self.assertEqual(ins._roll_measurement_noise, ins.roll_measurement_noise)
@@ -357,6 +370,28 @@ class SensorTests(TestCase):
         self.assertAlmostEqual(sensors.inertial_navigation_system.true_heading, math.degrees(fdmexec.GetPropagate().GetEuler(3)), 3)
 
 
+    def test_get_state(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        sensors = Sensors(fdmexec)
+
+        state = sensors.get_state()
+
+        self.assertEqual(state.accelerometer.x, sensors.accelerometer.x)
+        self.assertEqual(state.gyroscope.roll_rate,
+                         sensors.gyroscope.roll_rate)
+        self.assertEqual(state.thermometer.temperature,
+                         sensors.thermometer.temperature)
+        self.assertEqual(state.pressure_sensor.pressure,
+                         sensors.pressure_sensor.pressure)
+        self.assertEqual(state.pitot_tube.pressure,
+                         sensors.pitot_tube.pressure)
+        self.assertEqual(state.inertial_navigation_system.altitude,
+                         sensors.inertial_navigation_system.altitude)
+
 class MockSensor(Sensor):
     def __init__(self, fdmexec, update_rate):
         super(MockSensor, self).__init__(fdmexec, update_rate)
@@ -369,29 +404,248 @@ class MockSensor(Sensor):
         return 0.0
 
 class SensorTests(TestCase):
-    def test_schedule_update(self):
+    def test_sensor_is_not_updated_when_read(self):
         huginn_data_path = configuration.get_data_path()
 
         fdm_builder = FDMBuilder(huginn_data_path)
         fdm_builder.aircraft = "Rascal"
         fdmexec = fdm_builder.create_fdm()
 
-        update_rate = 50
-
-        sensor = MockSensor(fdmexec, update_rate)
+        sensor = MockSensor(fdmexec, 50)
 
         sensor._update_sensor = MagicMock()
 
-        data = sensor.value
+        while fdmexec.GetSimTime() < sensor._update_at + 0.1:
+            fdmexec.Run()
+
+        self.assertEqual(sensor.value, 0.0)
 
         sensor._update_sensor.assert_not_called()
 
-        while fdmexec.GetSimTime() < sensor._update_at + 0.1:
-            fdmexec.Run()
+class SensorSchedulerTests(TestCase):
+    def test_tick(self):
+        fdmexec = MagicMock()
+        fdmexec.GetSimTime.return_value = 0.0
+
+        sensor_1 = MockSensor(fdmexec, 10.0)
+        sensor_1._update_sensor = MagicMock()
+
+        sensor_2 = MockSensor(fdmexec, 2.0)
+        sensor_2._update_sensor = MagicMock()
+
+        scheduler = SensorScheduler([sensor_1, sensor_2])
+
+        scheduler.tick(0.05)
+
+        sensor_1._update_sensor.assert_not_called()
+        sensor_2._update_sensor.assert_not_called()
+
+        scheduler.tick(0.1)
+
+        self.assertEqual(sensor_1._update_sensor.call_count, 1)
+        sensor_2._update_sensor.assert_not_called()
+        self.assertAlmostEqual(sensor_1._update_at, 0.2)
+
+        scheduler.tick(0.5)
+
+        self.assertEqual(sensor_1._update_sensor.call_count, 2)
+        self.assertEqual(sensor_2._update_sensor.call_count, 1)
+
+    def test_sensors_are_updated_when_the_simulation_time_moves_back(self):
+        fdmexec = MagicMock()
+        fdmexec.GetSimTime.return_value = 10.0
+
+        sensor = MockSensor(fdmexec, 2.0)
+        sensor._update_sensor = MagicMock()
+
+        scheduler = SensorScheduler([sensor])
+
+        scheduler.tick(0.0)
+
+        sensor._update_sensor.assert_called_once_with()
+        self.assertAlmostEqual(sensor._update_at, 0.5)
+
+    def test_update(self):
+        fdmexec = MagicMock()
+        fdmexec.GetSimTime.return_value = 0.0
+
+        sensor = MockSensor(fdmexec, 2.0)
+        sensor._update_sensor = MagicMock()
+
+        scheduler = SensorScheduler([sensor])
+
+        scheduler.update(0.1)
+
+        sensor._update_sensor.assert_called_once_with()
+        self.assertAlmostEqual(sensor._update_at, 0.6)
+
+class NoiseGeneratorTests(TestCase):
+    def test_same_seed_creates_same_noise(self):
+        noise_generator_1 = NoiseGenerator(seed=10, block_size=4)
+        noise_generator_2 = NoiseGenerator(seed=10, block_size=4)
+
+        # generate more samples than the block size so that the block is
+        # refilled
+        samples_1 = [noise_generator_1.normal(1.0, 0.5) for _ in range(10)]
+        samples_2 = [noise_generator_2.normal(1.0, 0.5) for _ in range(10)]
+
+        self.assertEqual(samples_1, samples_2)
+
+    def test_different_seed_creates_different_noise(self):
+        noise_generator_1 = NoiseGenerator(seed=10)
+        noise_generator_2 = NoiseGenerator(seed=11)
+
+        self.assertNotEqual(noise_generator_1.normal(0.0, 1.0),
+                            noise_generator_2.normal(0.0, 1.0))
+
+    def test_seed(self):
+        noise_generator = NoiseGenerator(seed=10, block_size=4)
+
+        samples = [noise_generator.normal(0.0, 1.0) for _ in range(6)]
+
+        noise_generator.seed(10)
+
+        self.assertEqual([noise_generator.normal(0.0, 1.0) for _ in range(6)],
+                         samples)
+
+    def test_zero_sigma(self):
+        noise_generator = NoiseGenerator(seed=10)
+
+        self.assertEqual(noise_generator.normal(1.5, 0.0), 1.5)
+
+    def test_restore_state(self):
+        noise_generator = NoiseGenerator(seed=10, block_size=4)
+
+        noise_generator.normal(0.0, 1.0)
+
+        state = noise_generator.get_state()
+
+        samples = [noise_generator.normal(0.0, 1.0) for _ in range(6)]
+
+        noise_generator.set_state(state)
+
+        self.assertEqual([noise_generator.normal(0.0, 1.0) for _ in range(6)],
+                         samples)
+
+    def test_noise_is_the_numpy_normal_sequence_of_the_seed(self):
+        from numpy.random import RandomState
+
+        noise_generator = NoiseGenerator(seed=10, block_size=4)
+
+        samples = [noise_generator.normal(0.0, 1.0) for _ in range(8)]
+
+        self.assertEqual(samples,
+                         RandomState(10).standard_normal(8).tolist())
+
+class SensorsSeedTests(TestCase):
+    def test_sensors_with_the_same_seed_have_the_same_noise(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        sensors_1 = Sensors(fdmexec, seed=5)
+        sensors_2 = Sensors(fdmexec, seed=5)
+
+        self.assertEqual(sensors_1.accelerometer.x_measurement_noise,
+                         sensors_2.accelerometer.x_measurement_noise)
+        self.assertEqual(sensors_1.pitot_tube.measurement_noise,
+                         sensors_2.pitot_tube.measurement_noise)
+
+        # every sensor uses a different seed
+        self.assertNotEqual(sensors_1.accelerometer.noise.normal(0.0, 1.0),
+                            sensors_1.gyroscope.noise.normal(0.0, 1.0))
+
+        sensors_2.seed(5)
+        sensors_1.seed(5)
+
+        self.assertEqual(sensors_1.gyroscope.noise.normal(0.0, 1.0),
+                         sensors_2.gyroscope.noise.normal(0.0, 1.0))
+
+    def test_get_sensors(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        sensors = Sensors(fdmexec)
+
+        self.assertEqual(sensors.get_sensors(),
+                         [sensors.accelerometer, sensors.gyroscope,
+                          sensors.thermometer, sensors.pressure_sensor,
+                          sensors.pitot_tube,
+                          sensors.inertial_navigation_system])
+
+class SensorHistoryTests(TestCase):
+    def test_get_samples(self):
+        history = SensorHistory(["x", "y"], 5)
+
+        history.add(0.1, [1.0, 2.0])
+        history.add(0.2, [3.0, 4.0])
+        history.add(0.3, [5.0, 6.0])
+
+        self.assertEqual(history.samples, 3)
+        self.assertAlmostEqual(history.last_time, 0.3)
+        self.assertEqual(history.get_samples(),
+                         [[0.1, 1.0, 2.0], [0.2, 3.0, 4.0], [0.3, 5.0, 6.0]])
+        self.assertEqual(history.get_samples(0.1),
+                         [[0.2, 3.0, 4.0], [0.3, 5.0, 6.0]])
+        self.assertEqual(history.get_samples(0.3), [])
+        self.assertFalse(history.is_truncated(0.0))
+
+    def test_oldest_samples_are_overwritten(self):
+        history = SensorHistory(["x"], 3)
+
+        for i in range(5):
+            history.add(i * 0.1, [float(i)])
+
+        self.assertEqual(history.samples, 3)
+        self.assertEqual([sample[1] for sample in history.get_samples()],
+                         [2.0, 3.0, 4.0])
+        self.assertTrue(history.is_truncated())
+        self.assertTrue(history.is_truncated(0.05))
+        self.assertFalse(history.is_truncated(0.1))
+
+    def test_history_is_cleared_when_the_simulation_time_moves_back(self):
+        history = SensorHistory(["x"], 3)
+
+        history.add(1.0, [1.0])
+        history.add(1.1, [2.0])
+        history.add(0.0, [3.0])
+
+        self.assertEqual(history.get_samples(), [[0.0, 3.0]])
+
+    def test_to_dict(self):
+        history = SensorHistory(["x", "y"], 5)
+
+        history.add(0.1, [1.0, 2.0])
+        history.add(0.2, [3.0, 4.0])
+
+        self.assertEqual(history.to_dict(0.1), {
+            "fields": ["x", "y"],
+            "samples": 1,
+            "truncated": False,
+            "time": [0.2],
+            "values": {"x": [3.0], "y": [4.0]}
+        })
+
+    def test_sensor_update_adds_a_sample(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        accelerometer = Accelerometer(fdmexec)
+
+        accelerometer.update(fdmexec.GetSimTime() + 1.0)
 
-        data = sensor.value
+        samples = accelerometer.history.get_samples()
 
-        sensor._update_sensor.assert_called_once()
+        self.assertEqual(accelerometer.history.fields, ["x", "y", "z"])
+        self.assertEqual(len(samples), 2)
+        self.assertEqual(samples[-1][1:], [accelerometer.x,
+                                          accelerometer.y,
+                                          accelerometer.z])
 
 if __name__ == "__main__":
     main()
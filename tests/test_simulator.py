@@ -1,7 +1,8 @@
 from unittest import TestCase
+from mock import MagicMock
 
 from huginn.simulator import Simulator, SimulationBuilder
-from huginn.fdm import FDMBuilder
+from huginn.fdm import FDMBuilder, PropertyError
 from huginn import configuration
 
 class SimulatorBuilderTests(TestCase):
@@ -28,6 +29,18 @@ class SimulatorBuilderTests(TestCase):
         self.assertEqual(simulator.simulation_time, configuration.DT)
         self.assertTrue(simulator.is_paused())
 
+    def test_create_simulation_with_a_sensor_seed(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulation_builder = SimulationBuilder(huginn_data_path)
+        simulation_builder.sensor_seed = 5
+
+        simulator = simulation_builder.create_simulator()
+
+        self.assertIsNotNone(simulator)
+        self.assertEqual(simulator.sensor_scheduler.sensors,
+                         simulator.aircraft.sensors.get_sensors())
+
 class TestSimulator(TestCase):
     def test_run_with_real_fdmexec(self):
         huginn_data_path = configuration.get_data_path()
@@ -101,6 +114,21 @@ class TestSimulator(TestCase):
 
         self.assertTrue(result)
 
+    def test_step_updates_the_sensors(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        accelerometer = simulator.aircraft.sensors.accelerometer
+        ins = simulator.aircraft.sensors.inertial_navigation_system
+
+        self.assertTrue(simulator.run_for(1.0))
+
+        self.assertAlmostEqual(accelerometer.true_x,
+                               simulator.fdm.accelerations.x, 3)
+        self.assertLessEqual(ins._updated_at, simulator.simulation_time)
+        self.assertGreater(ins._update_at, simulator.simulation_time)
+
     def test_run_for(self):
         huginn_data_path = configuration.get_data_path()
 
@@ -119,3 +147,229 @@ class TestSimulator(TestCase):
 
         self.assertTrue(result)
         self.assertAlmostEqual(expected_end_time, simulator.simulation_time, 2)
+
+    def test_run_steps(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        start_time = simulator.simulation_time
+
+        self.assertTrue(simulator.run_steps(10))
+        self.assertAlmostEqual(simulator.simulation_time,
+                               start_time + 10 * simulator.dt,
+                               6)
+
+        self.assertFalse(simulator.run_steps(0))
+
+    def test_record_trajectory(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        payload = simulator.record_trajectory(["position/h-sl-ft"],
+                                              time_to_run=0.1,
+                                              sample_interval=3)
+
+        self.assertEqual(payload["properties"], ["position/h-sl-ft"])
+        self.assertGreater(payload["samples"], 10)
+        self.assertFalse(payload["truncated"])
+        self.assertAlmostEqual(payload["time"][-1] - payload["time"][-2],
+                               3 * simulator.dt,
+                               6)
+
+    def test_run_for_calls_the_callback_after_every_step(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        simulation_times = []
+
+        def callback(simulator):
+            simulation_times.append(simulator.simulation_time)
+
+        result = simulator.run_for(0.1, callback)
+
+        self.assertTrue(result)
+        self.assertGreater(len(simulation_times), 1)
+        self.assertAlmostEqual(simulation_times[-1],
+                               simulator.simulation_time,
+                               6)
+
+    def test_state_is_updated_after_step(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        state = simulator.state
+
+        self.assertAlmostEqual(state.fdm.time, simulator.simulation_time, 6)
+
+        result = simulator.step()
+
+        self.assertTrue(result)
+        self.assertIsNot(simulator.state, state)
+        self.assertAlmostEqual(simulator.state.fdm.time,
+                               simulator.simulation_time, 6)
+        self.assertGreater(simulator.state.fdm.time, state.fdm.time)
+
+        self.assertAlmostEqual(simulator.state.fdm.position.latitude,
+                               simulator.fdm.position.latitude, 6)
+        self.assertAlmostEqual(simulator.state.fdm.velocities.true_airspeed,
+                               simulator.fdm.velocities.true_airspeed, 6)
+        self.assertAlmostEqual(simulator.state.aircraft.engine.thrust,
+                               simulator.aircraft.engine.thrust, 6)
+        self.assertAlmostEqual(simulator.state.aircraft.controls.elevator,
+                               simulator.aircraft.controls.elevator, 6)
+
+    def test_state_is_captured_by_the_simulation_step(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        self.assertTrue(simulator.step())
+
+        # reading the state must not access the flight dynamics model
+        # because the readers might run on a different thread
+        simulator.fdm.get_state = MagicMock()
+        simulator.aircraft.get_state = MagicMock()
+
+        state = simulator.state
+
+        self.assertAlmostEqual(state.fdm.time, simulator.simulation_time, 6)
+        simulator.fdm.get_state.assert_not_called()
+        simulator.aircraft.get_state.assert_not_called()
+
+    def test_state_is_immutable(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        with self.assertRaises(AttributeError):
+            simulator.state.fdm.position.latitude = 10.0
+
+    def test_restore_checkpoint(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+        simulator.pause()
+
+        simulator.set_aircraft_controls(0.1, 0.2, 0.3, 0.4)
+
+        self.assertTrue(simulator.save_checkpoint("test"))
+
+        simulation_time = simulator.simulation_time
+        latitude = simulator.fdm.position.latitude
+        altitude = simulator.fdm.position.altitude
+        airspeed = simulator.fdm.velocities.true_airspeed
+        accelerometer = simulator.aircraft.sensors.accelerometer
+        x_measurement_noise = accelerometer.x_measurement_noise
+
+        simulator.set_aircraft_controls(0.0, 0.0, 0.0, 0.0)
+        simulator.run_for(2.0)
+
+        self.assertTrue(simulator.restore_checkpoint("test"))
+
+        self.assertAlmostEqual(simulator.simulation_time, simulation_time, 6)
+        self.assertAlmostEqual(simulator.state.fdm.time, simulation_time, 6)
+        self.assertAlmostEqual(simulator.fdm.position.latitude, latitude, 6)
+        self.assertAlmostEqual(simulator.fdm.position.altitude, altitude, 1)
+        self.assertAlmostEqual(simulator.fdm.velocities.true_airspeed,
+                               airspeed, 1)
+        self.assertAlmostEqual(simulator.aircraft.controls.aileron, 0.1, 3)
+        self.assertAlmostEqual(simulator.aircraft.controls.elevator, 0.2, 3)
+        self.assertAlmostEqual(simulator.aircraft.controls.rudder, 0.3, 3)
+        self.assertAlmostEqual(simulator.aircraft.controls.throttle, 0.4, 3)
+        self.assertEqual(accelerometer.x_measurement_noise,
+                         x_measurement_noise)
+        self.assertFalse(simulator.crashed)
+
+    def test_checkpoint_contains_the_engine_and_tank_properties(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        self.assertTrue(simulator.save_checkpoint("test"))
+
+        properties = simulator.checkpoints["test"].properties
+
+        self.assertIn("fcs/throttle-cmd-norm[0]", properties)
+        self.assertIn("fcs/mixture-pos-norm[0]", properties)
+        self.assertIn("propulsion/engine[0]/set-running", properties)
+        self.assertIn("propulsion/tank[0]/contents-lbs", properties)
+
+    def test_fail_to_restore_unknown_checkpoint(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdm_builder.aircraft = "Rascal"
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        self.assertFalse(simulator.restore_checkpoint("abc"))
+
+    def test_reset_uses_the_stored_trim_solution(self):
+        huginn_data_path = configuration.get_data_path()
+
+        simulator = SimulationBuilder(huginn_data_path).create_simulator()
+
+        self.assertEqual(len(simulator.trim_cache), 1)
+
+        self.assertTrue(simulator.reset())
+
+        self.assertEqual(simulator.trim_cache.hits, 1)
+        self.assertEqual(len(simulator.trim_cache), 1)
+
+    def test_get_property_values(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        property_reader = simulator.get_property_reader(["position/h-sl-ft"])
+
+        self.assertIs(simulator.get_property_reader(["position/h-sl-ft"]),
+                      property_reader)
+
+        self.assertEqual(simulator.get_property_values(["position/h-sl-ft"]),
+                         {"position/h-sl-ft":
+                          fdmexec.GetPropertyValue("position/h-sl-ft")})
+
+    def test_fail_to_read_unknown_properties(self):
+        huginn_data_path = configuration.get_data_path()
+
+        fdm_builder = FDMBuilder(huginn_data_path)
+        fdmexec = fdm_builder.create_fdm()
+
+        simulator = Simulator(fdmexec)
+
+        with self.assertRaises(PropertyError):
+            simulator.get_property_values(["position/h-sl-ft",
+                                           "position/invalid-property"])
@@ -0,0 +1,382 @@
+from unittest import TestCase
+import math
+
+from huginn.telemetry import (TelemetryEncoder, TelemetryDecoder,
+                              TelemetryError, TelemetryStatistics,
+                              get_values, get_resolution,
+                              SIMULATOR_DATA_FIELDS)
+from huginn.protobuf import fdm_pb2
+
+
+def create_simulator_data(time=1.0, offset=0.0):
+    simulator_data = fdm_pb2.SimulatorData()
+    simulator_data.time = time
+
+    for index, (field, value) in enumerate(get_values()):
+        setattr(getattr(simulator_data, field), value, index + 0.5 + offset)
+
+    return simulator_data
+
+
+class GetValuesTests(TestCase):
+    def test_get_values(self):
+        values = get_values(["orientation", "position"])
+
+        self.assertEqual(values, [("orientation", "phi"),
+                                  ("orientation", "theta"),
+                                  ("orientation", "psi"),
+                                  ("position", "latitude"),
+                                  ("position", "longitude"),
+                                  ("position", "altitude"),
+                                  ("position", "heading")])
+
+    def test_get_all_the_values(self):
+        fields = [field for field, _ in get_values()]
+
+        self.assertEqual(tuple(sorted(set(fields))),
+                         tuple(sorted(SIMULATOR_DATA_FIELDS)))
+        self.assertNotIn("time", fields)
+
+    def test_invalid_field(self):
+        self.assertRaises(TelemetryError, get_values, ["position", "qwerty"])
+
+    def test_get_resolution(self):
+        resolutions = {"position": 0.5, "position.altitude": 0.25}
+
+        self.assertAlmostEqual(get_resolution(resolutions, "position", "altitude"), 0.25)
+        self.assertAlmostEqual(get_resolution(resolutions, "position", "heading"), 0.5)
+        self.assertAlmostEqual(get_resolution(resolutions, "forces", "x_body"), 0.001)
+
+
+class TelemetryEncoderTests(TestCase):
+    def test_first_frame_is_a_keyframe(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=10)
+
+        simulator_data = create_simulator_data()
+
+        frame = encoder.encode(simulator_data)
+
+        self.assertTrue(frame.keyframe)
+        self.assertEqual(list(frame.fields), ["position"])
+        self.assertEqual(list(frame.values),
+                         [simulator_data.position.latitude,
+                          simulator_data.position.longitude,
+                          simulator_data.position.altitude,
+                          simulator_data.position.heading])
+        self.assertEqual(len(frame.resolutions), 4)
+        self.assertEqual(len(frame.indexes), 0)
+
+    def test_send_only_the_changed_values(self):
+        encoder = TelemetryEncoder(["position"],
+                                   resolutions={"position": 0.1},
+                                   keyframe_interval=10)
+
+        simulator_data = create_simulator_data()
+        encoder.encode(simulator_data)
+
+        simulator_data.time = 2.0
+        simulator_data.position.altitude += 0.01
+        simulator_data.position.heading += 1.0
+
+        frame = encoder.encode(simulator_data)
+
+        self.assertFalse(frame.keyframe)
+        self.assertAlmostEqual(frame.time, 2.0)
+        self.assertEqual(list(frame.indexes), [3])
+        self.assertEqual(list(frame.quantized_values),
+                         [int(round(simulator_data.position.heading /
+                                    get_resolution({"position": 0.1},
+                                                   "position", "heading")))])
+
+    def test_small_changes_accumulate(self):
+        encoder = TelemetryEncoder(["position"],
+                                   resolutions={"position": 0.1},
+                                   keyframe_interval=10)
+
+        simulator_data = create_simulator_data()
+        encoder.encode(simulator_data)
+
+        changed_frames = 0
+        for _ in range(10):
+            simulator_data.position.altitude += 0.02
+            frame = encoder.encode(simulator_data)
+
+            changed_frames += len(frame.indexes)
+
+        self.assertGreaterEqual(changed_frames, 1)
+        self.assertLessEqual(changed_frames, 3)
+
+    def test_keyframe_interval(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=3)
+
+        keyframes = [encoder.encode(create_simulator_data()).keyframe
+                     for _ in range(7)]
+
+        self.assertEqual(keyframes, [True, False, False, True, False, False,
+                                     True])
+
+    def test_delta_frames_are_smaller(self):
+        encoder = TelemetryEncoder()
+
+        keyframe = encoder.encode(create_simulator_data())
+
+        simulator_data = create_simulator_data(time=1.1)
+        simulator_data.position.altitude += 1.0
+        frame = encoder.encode(simulator_data)
+
+        self.assertLess(len(frame.SerializeToString()),
+                        len(keyframe.SerializeToString()) / 10)
+
+    def test_send_a_keyframe_when_a_value_is_not_finite(self):
+        encoder = TelemetryEncoder(["position"],
+                                   resolutions={"position": 0.1},
+                                   keyframe_interval=10)
+        decoder = TelemetryDecoder()
+
+        simulator_data = create_simulator_data()
+        decoder.decode(encoder.encode(simulator_data))
+
+        simulator_data.position.altitude = float("nan")
+        simulator_data.position.heading = float("inf")
+
+        frame = encoder.encode(simulator_data)
+
+        self.assertTrue(frame.keyframe)
+        self.assertTrue(math.isnan(frame.values[2]))
+        self.assertTrue(math.isinf(frame.values[3]))
+
+        decoded_data = decoder.decode(frame)
+        self.assertTrue(math.isnan(decoded_data.position.altitude))
+
+        # the values that are still not finite aren't sent again
+        frame = encoder.encode(simulator_data)
+
+        self.assertFalse(frame.keyframe)
+        self.assertEqual(len(frame.indexes), 0)
+
+        simulator_data.position.altitude = 100.0
+
+        frame = encoder.encode(simulator_data)
+
+        self.assertFalse(frame.keyframe)
+        self.assertEqual(list(frame.indexes), [2])
+
+        decoded_data = decoder.decode(frame)
+        self.assertAlmostEqual(decoded_data.position.altitude, 100.0, 3)
+        self.assertTrue(math.isinf(decoded_data.position.heading))
+
+    def test_invalid_settings(self):
+        self.assertRaises(TelemetryError, TelemetryEncoder,
+                          keyframe_interval=0)
+        self.assertRaises(TelemetryError, TelemetryEncoder,
+                          resolutions={"position": 0.0})
+        self.assertRaises(TelemetryError, TelemetryEncoder,
+                          resolutions={"position.qwerty": 0.1})
+        self.assertRaises(TelemetryError, TelemetryEncoder, ["qwerty"])
+
+
+class TelemetryDecoderTests(TestCase):
+    def test_decode_frames(self):
+        resolutions = {"position": 0.01, "position.latitude": 1e-7}
+        encoder = TelemetryEncoder(["position", "orientation"], resolutions,
+                                   keyframe_interval=5)
+        decoder = TelemetryDecoder()
+
+        for step in range(12):
+            simulator_data = create_simulator_data(time=step * 0.1,
+                                                   offset=step * 0.123)
+
+            frame = fdm_pb2.TelemetryFrame()
+            frame.ParseFromString(encoder.encode(simulator_data)
+                                  .SerializeToString())
+
+            decoded_data = decoder.decode(frame)
+
+            self.assertAlmostEqual(decoded_data.time, step * 0.1)
+            self.assertFalse(decoded_data.HasField("gps"))
+            self.assertEqual(decoder.fields, ("position", "orientation"))
+
+            for field, value in get_values(["position", "orientation"]):
+                resolution = get_resolution(resolutions, field, value)
+
+                self.assertLessEqual(
+                    abs(getattr(getattr(decoded_data, field), value) -
+                        getattr(getattr(simulator_data, field), value)),
+                    resolution / 2.0 + 1e-9)
+
+    def test_drop_frames_before_the_first_keyframe(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=5)
+        decoder = TelemetryDecoder()
+
+        encoder.encode(create_simulator_data())
+        frame = encoder.encode(create_simulator_data(offset=1.0))
+
+        self.assertIsNone(decoder.decode(frame))
+        self.assertEqual(decoder.dropped_frames, 1)
+
+    def test_copy_the_sequence_number(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=5)
+        decoder = TelemetryDecoder()
+
+        frame = encoder.encode(create_simulator_data())
+        frame.sequence = 12
+        frame.send_time = 1000.0
+
+        simulator_data = decoder.decode(frame)
+
+        self.assertEqual(simulator_data.sequence, 12)
+        self.assertAlmostEqual(simulator_data.send_time, 1000.0)
+
+    def test_drop_invalid_frame(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=5)
+        decoder = TelemetryDecoder()
+
+        decoder.decode(encoder.encode(create_simulator_data()))
+
+        frame = fdm_pb2.TelemetryFrame()
+        frame.time = 1.0
+        frame.indexes.append(4)
+        frame.quantized_values.append(10)
+
+        self.assertIsNone(decoder.decode(frame))
+        self.assertEqual(decoder.dropped_frames, 1)
+
+    def test_wait_for_keyframe_after_a_lost_frame(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=5)
+        decoder = TelemetryDecoder()
+
+        frames = []
+
+        for sequence in range(7):
+            frame = encoder.encode(create_simulator_data(offset=sequence))
+            frame.sequence = sequence
+            frames.append(frame)
+
+        self.assertIsNotNone(decoder.decode(frames[0]))
+
+        # frame 1 has been lost
+        self.assertIsNone(decoder.decode(frames[2]))
+        self.assertIsNone(decoder.decode(frames[3]))
+        self.assertIsNone(decoder.decode(frames[4]))
+        self.assertEqual(decoder.dropped_frames, 3)
+
+        self.assertTrue(frames[5].keyframe)
+        self.assertIsNotNone(decoder.decode(frames[5]))
+
+        simulator_data = decoder.decode(frames[6])
+
+        self.assertIsNotNone(simulator_data)
+        self.assertAlmostEqual(simulator_data.position.altitude,
+                               create_simulator_data(offset=6)
+                               .position.altitude, 2)
+
+    def test_drop_reordered_frame(self):
+        encoder = TelemetryEncoder(["position"], keyframe_interval=5)
+        decoder = TelemetryDecoder()
+
+        frames = []
+
+        for sequence in range(4):
+            frame = encoder.encode(create_simulator_data(offset=sequence))
+            frame.sequence = sequence
+            frames.append(frame)
+
+        self.assertIsNotNone(decoder.decode(frames[0]))
+        self.assertIsNotNone(decoder.decode(frames[1]))
+        self.assertIsNotNone(decoder.decode(frames[2]))
+
+        # frame 1 arrives again after frame 2
+        self.assertIsNone(decoder.decode(frames[1]))
+        self.assertEqual(decoder.dropped_frames, 1)
+
+        simulator_data = decoder.decode(frames[3])
+
+        self.assertIsNotNone(simulator_data)
+        self.assertAlmostEqual(simulator_data.position.altitude,
+                               create_simulator_data(offset=3)
+                               .position.altitude, 2)
+
+
+class TelemetryStatisticsTests(TestCase):
+    def test_messages_in_order(self):
+        statistics = TelemetryStatistics()
+
+        for sequence in range(5):
+            packet = statistics.update(sequence, sequence * 0.1,
+                                       1000.0 + sequence * 0.1,
+                                       1000.02 + sequence * 0.1)
+
+            self.assertEqual(packet.lost, 0)
+            self.assertFalse(packet.reordered)
+            self.assertFalse(packet.duplicate)
+            self.assertAlmostEqual(packet.latency, 0.02)
+
+        summary = statistics.get_summary()
+
+        self.assertEqual(summary["received"], 5)
+        self.assertEqual(summary["expected"], 5)
+        self.assertEqual(summary["lost"], 0)
+        self.assertAlmostEqual(summary["loss_rate"], 0.0)
+        self.assertAlmostEqual(summary["jitter"], 0.0)
+        self.assertAlmostEqual(summary["mean_latency"], 0.02)
+        self.assertAlmostEqual(summary["min_latency"], 0.02)
+        self.assertAlmostEqual(summary["max_latency"], 0.02)
+
+    def test_lost_messages(self):
+        statistics = TelemetryStatistics()
+
+        statistics.update(0, 0.0, 1000.0, 1000.0)
+        packet = statistics.update(3, 0.3, 1000.3, 1000.3)
+
+        self.assertEqual(packet.lost, 2)
+        self.assertEqual(statistics.lost, 2)
+        self.assertAlmostEqual(statistics.loss_rate, 0.5)
+
+    def test_reordered_messages(self):
+        statistics = TelemetryStatistics()
+
+        statistics.update(0, 0.0, 1000.0, 1000.0)
+        statistics.update(2, 0.2, 1000.2, 1000.2)
+        packet = statistics.update(1, 0.1, 1000.1, 1000.25)
+
+        self.assertTrue(packet.reordered)
+        self.assertEqual(statistics.reordered, 1)
+        self.assertEqual(statistics.lost, 0)
+
+    def test_duplicate_messages(self):
+        statistics = TelemetryStatistics()
+
+        statistics.update(0, 0.0, 1000.0, 1000.0)
+        packet = statistics.update(0, 0.0, 1000.0, 1000.1)
+
+        self.assertTrue(packet.duplicate)
+        self.assertEqual(statistics.duplicates, 1)
+        self.assertEqual(statistics.received, 1)
+
+    def test_jitter(self):
+        statistics = TelemetryStatistics()
+
+        statistics.update(0, 0.0, 1000.0, 1000.01)
+        statistics.update(1, 0.1, 1000.1, 1000.13)
+
+        self.assertAlmostEqual(statistics.jitter, 0.02 / 16.0)
+
+    def test_sequence_restart(self):
+        statistics = TelemetryStatistics(reorder_window=10)
+
+        for sequence in range(50):
+            statistics.update(sequence, 0.0, 1000.0, 1000.0)
+
+        statistics.update(0, 0.0, 1000.0, 1000.0)
+
+        self.assertEqual(statistics.resets, 1)
+        self.assertEqual(statistics.received, 1)
+        self.assertEqual(statistics.lost, 0)
+
+    def test_use_the_clock_when_the_receive_time_is_not_set(self):
+        statistics = TelemetryStatistics(clock=lambda: 1000.5)
+
+        packet = statistics.update(0, 0.0, 1000.0)
+
+        self.assertAlmostEqual(packet.receive_time, 1000.5)
+        self.assertAlmostEqual(packet.latency, 0.5)
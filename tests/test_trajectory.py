@@ -0,0 +1,104 @@
+from unittest import TestCase
+
+from huginn.trajectory import (TrajectoryRecorder, TrajectoryError,
+                               create_recorder, decode_trajectory,
+                               get_sample_capacity, COLUMNS_FORMAT,
+                               BINARY_FORMAT)
+from huginn.simulator import Simulator
+from huginn.fdm import FDMBuilder
+from huginn import configuration
+
+
+def create_simulator():
+    huginn_data_path = configuration.get_data_path()
+
+    fdm_builder = FDMBuilder(huginn_data_path)
+    fdmexec = fdm_builder.create_fdm()
+
+    return Simulator(fdmexec)
+
+
+class GetSampleCapacityTests(TestCase):
+    def test_get_sample_capacity(self):
+        self.assertEqual(get_sample_capacity(0.01, 1, steps=10), 11)
+        self.assertEqual(get_sample_capacity(0.01, 5, steps=10), 3)
+        self.assertEqual(get_sample_capacity(0.01, 1, time_to_run=1.0), 103)
+
+
+class TrajectoryRecorderTests(TestCase):
+    def test_record_samples(self):
+        simulator = create_simulator()
+
+        properties = ["position/h-sl-ft", "velocities/vtrue-kts"]
+
+        recorder = create_recorder(simulator, properties, 2, steps=10)
+
+        start_time = simulator.simulation_time
+
+        recorder.start(simulator)
+        self.assertTrue(simulator.run_steps(10, recorder))
+
+        self.assertEqual(recorder.samples, 6)
+        self.assertFalse(recorder.truncated)
+
+        payload = recorder.get_payload(COLUMNS_FORMAT)
+
+        self.assertEqual(payload["properties"], properties)
+        self.assertEqual(payload["samples"], 6)
+        self.assertEqual(len(payload["time"]), 6)
+        self.assertAlmostEqual(payload["time"][0], start_time, 6)
+        self.assertAlmostEqual(payload["time"][-1],
+                               simulator.simulation_time,
+                               6)
+        self.assertAlmostEqual(payload["time"][1] - payload["time"][0],
+                               2 * simulator.dt,
+                               6)
+        self.assertAlmostEqual(
+            payload["values"]["position/h-sl-ft"][-1],
+            simulator.fdmexec.GetPropertyValue("position/h-sl-ft"),
+            6
+        )
+
+    def test_binary_payload(self):
+        simulator = create_simulator()
+
+        properties = ["position/h-sl-ft", "velocities/vtrue-kts"]
+
+        recorder = create_recorder(simulator, properties, steps=5)
+
+        recorder.start(simulator)
+        simulator.run_steps(5, recorder)
+
+        columns_payload = recorder.get_payload(COLUMNS_FORMAT)
+        binary_payload = recorder.get_payload(BINARY_FORMAT)
+
+        self.assertEqual(binary_payload["columns"], 3)
+
+        trajectory = decode_trajectory(binary_payload)
+
+        self.assertEqual(trajectory, decode_trajectory(columns_payload))
+        self.assertEqual(len(trajectory["time"]), 6)
+        self.assertEqual(len(trajectory["position/h-sl-ft"]), 6)
+
+    def test_truncate_samples(self):
+        simulator = create_simulator()
+
+        recorder = TrajectoryRecorder(simulator.fdmexec,
+                                      ["position/h-sl-ft"], 3)
+
+        recorder.start(simulator)
+        simulator.run_steps(5, recorder)
+
+        self.assertEqual(recorder.samples, 3)
+        self.assertTrue(recorder.truncated)
+
+    def test_invalid_recorder(self):
+        simulator = create_simulator()
+
+        self.assertRaises(TrajectoryError, TrajectoryRecorder,
+                          simulator.fdmexec, [], 10)
+        self.assertRaises(TrajectoryError, TrajectoryRecorder,
+                          simulator.fdmexec, ["position/h-sl-ft"], 10, 0)
+        self.assertRaises(TrajectoryError, TrajectoryRecorder,
+                          simulator.fdmexec, ["position/h-sl-ft"],
+                          configuration.MAX_TRAJECTORY_SAMPLES + 1)
@@ -0,0 +1,101 @@
+from unittest import TestCase
+from tempfile import mkdtemp
+from shutil import rmtree
+from os.path import join
+
+from huginn.trim import TrimCache, get_trim_key
+from huginn.fdm import (FDMBuilder, InitialCondition, TRIM_MODE_FULL,
+                        TRIM_MODE_LONGITUDINAL)
+from huginn.aircraft import Aircraft
+from huginn import configuration
+
+
+def create_fdmexec():
+    huginn_data_path = configuration.get_data_path()
+
+    fdm_builder = FDMBuilder(huginn_data_path)
+    fdmexec = fdm_builder.create_fdm()
+
+    return fdmexec
+
+
+class GetTrimKeyTests(TestCase):
+    def test_nearly_identical_initial_conditions_have_the_same_key(self):
+        fdmexec = create_fdmexec()
+
+        key = get_trim_key(fdmexec, TRIM_MODE_FULL)
+
+        initial_condition = InitialCondition(fdmexec)
+        initial_condition.altitude = initial_condition.altitude + 0.001
+
+        self.assertEqual(get_trim_key(fdmexec, TRIM_MODE_FULL), key)
+
+        initial_condition.altitude = initial_condition.altitude + 10.0
+
+        self.assertNotEqual(get_trim_key(fdmexec, TRIM_MODE_FULL), key)
+
+    def test_key_depends_on_trim_mode(self):
+        fdmexec = create_fdmexec()
+
+        self.assertNotEqual(get_trim_key(fdmexec, TRIM_MODE_FULL),
+                            get_trim_key(fdmexec, TRIM_MODE_LONGITUDINAL))
+
+    def test_key_depends_on_aircraft_model(self):
+        fdmexec = create_fdmexec()
+
+        key = get_trim_key(fdmexec, TRIM_MODE_FULL)
+
+        self.assertEqual(key.split(",")[0], fdmexec.GetModelName())
+
+
+class TrimCacheTests(TestCase):
+    def setUp(self):
+        self.temp_directory = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.temp_directory)
+
+    def test_use_stored_trim_solution(self):
+        fdmexec = create_fdmexec()
+        aircraft = Aircraft(fdmexec)
+        aircraft.start_engines()
+
+        trim_cache = TrimCache()
+
+        self.assertTrue(aircraft.trim(TRIM_MODE_FULL, trim_cache))
+        self.assertEqual(trim_cache.misses, 1)
+        self.assertEqual(len(trim_cache), 1)
+
+        elevator = aircraft.controls.elevator
+        throttle = aircraft.controls.throttle
+
+        aircraft.controls.elevator = 0.0
+        aircraft.controls.throttle = 0.0
+
+        fdmexec.ResetToInitialConditions(0)
+        fdmexec.RunIC()
+
+        self.assertTrue(aircraft.trim(TRIM_MODE_FULL, trim_cache))
+        self.assertEqual(trim_cache.hits, 1)
+        self.assertAlmostEqual(aircraft.controls.elevator, elevator, 3)
+        self.assertAlmostEqual(aircraft.controls.throttle, throttle, 3)
+
+    def test_load_trim_solutions_from_file(self):
+        trim_cache_file = join(self.temp_directory, "trim.json")
+
+        fdmexec = create_fdmexec()
+        aircraft = Aircraft(fdmexec)
+        aircraft.start_engines()
+
+        aircraft.trim(TRIM_MODE_FULL, TrimCache(trim_cache_file))
+
+        trim_cache = TrimCache(trim_cache_file)
+
+        self.assertEqual(len(trim_cache), 1)
+
+        fdmexec = create_fdmexec()
+        aircraft = Aircraft(fdmexec)
+        aircraft.start_engines()
+
+        self.assertTrue(aircraft.trim(TRIM_MODE_FULL, trim_cache))
+        self.assertEqual(trim_cache.hits, 1)
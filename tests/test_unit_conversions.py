@@ -1,4 +1,9 @@
-from unittest import TestCase
+from unittest import TestCase, skipUnless
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from huginn.unit_conversions import (convert_jsbsim_acceleration,
                                      convert_jsbsim_angular_acceleration,
@@ -8,6 +13,16 @@ from huginn.unit_conversions import (convert_jsbsim_acceleration,
                                      convert_jsbsim_temperature,
                                      convert_jsbsim_density,
                                      convert_jsbsim_force,
+                                     convert_feet_to_meters,
+                                     convert_meters_to_feet,
+                                     convert_knots_to_meters_per_second,
+                                     convert_meters_per_second_to_knots,
+                                     convert_meters_per_second_to_feet_per_minute,
+                                     convert_inches_of_mercury_to_pascal,
+                                     convert_values,
+                                     FEET_TO_METERS,
+                                     RANKINE_TO_KELVIN,
+                                     RANKINE_TO_KELVIN_OFFSET,
                                      ur)
 
 class AccelerationConversionTests(TestCase):
@@ -98,3 +113,123 @@ class MPStoFPMConversionTests(TestCase):
 
         self.assertAlmostEqual(feet_per_minute.magnitude, expected_feet_per_minute, 3)
         
+
+
+class PintComparisonTests(TestCase):
+    values = [-1234.5, -1.0, 0.0, 0.5, 1.0, 42.42, 98765.4321]
+
+    def assert_conversion_matches_pint(self, conversion, from_unit, to_unit):
+        for value in self.values:
+            expected_value = (value * from_unit).to(to_unit).magnitude
+
+            self.assertAlmostEqual(conversion(value), expected_value, 6)
+
+    def test_acceleration(self):
+        self.assert_conversion_matches_pint(convert_jsbsim_acceleration,
+                                            ur.foot / (ur.second ** 2.0),
+                                            ur.meter / (ur.second ** 2.0))
+
+    def test_angular_acceleration(self):
+        self.assert_conversion_matches_pint(
+            convert_jsbsim_angular_acceleration,
+            ur.radian / (ur.second ** 2.0),
+            ur.degree / (ur.second ** 2.0)
+        )
+
+    def test_angular_velocity(self):
+        self.assert_conversion_matches_pint(convert_jsbsim_angular_velocity,
+                                            ur.radian / ur.second,
+                                            ur.degree / ur.second)
+
+    def test_velocity(self):
+        self.assert_conversion_matches_pint(convert_jsbsim_velocity,
+                                            ur.feet_per_second,
+                                            ur.meters_per_second)
+
+    def test_pressure(self):
+        self.assert_conversion_matches_pint(convert_jsbsim_pressure,
+                                            ur.pound_force_per_square_foot,
+                                            ur.pascal)
+
+    def test_temperature(self):
+        for value in [0.0, 491.67, 518.67, 1000.0]:
+            expected_value = ur.Quantity(value, ur.rankine).to(ur.kelvin)
+
+            self.assertAlmostEqual(convert_jsbsim_temperature(value),
+                                   expected_value.magnitude, 6)
+
+    def test_density(self):
+        self.assert_conversion_matches_pint(convert_jsbsim_density,
+                                            ur.slug_per_cubic_feet,
+                                            ur.kilogram_per_cubic_meter)
+
+    def test_force(self):
+        self.assert_conversion_matches_pint(convert_jsbsim_force,
+                                            ur.force_pound,
+                                            ur.newton)
+
+    def test_feet_to_meters(self):
+        self.assert_conversion_matches_pint(convert_feet_to_meters,
+                                            ur.foot,
+                                            ur.meter)
+
+    def test_meters_to_feet(self):
+        self.assert_conversion_matches_pint(convert_meters_to_feet,
+                                            ur.meter,
+                                            ur.foot)
+
+    def test_knots_to_meters_per_second(self):
+        self.assert_conversion_matches_pint(
+            convert_knots_to_meters_per_second,
+            ur.knot,
+            ur.meters_per_second
+        )
+
+    def test_meters_per_second_to_knots(self):
+        self.assert_conversion_matches_pint(
+            convert_meters_per_second_to_knots,
+            ur.meters_per_second,
+            ur.knot
+        )
+
+    def test_meters_per_second_to_feet_per_minute(self):
+        self.assert_conversion_matches_pint(
+            convert_meters_per_second_to_feet_per_minute,
+            ur.meters_per_second,
+            ur.feet_per_minute
+        )
+
+    def test_inches_of_mercury_to_pascal(self):
+        self.assert_conversion_matches_pint(
+            convert_inches_of_mercury_to_pascal,
+            ur.in_Hg,
+            ur.pascal
+        )
+
+class ConvertValuesTests(TestCase):
+    def test_convert_list_of_values(self):
+        converted_values = convert_values([1.0, 2.0, 3.0], FEET_TO_METERS)
+
+        self.assertEqual(len(converted_values), 3)
+        self.assertAlmostEqual(converted_values[0], 0.3048, 6)
+        self.assertAlmostEqual(converted_values[1], 0.6096, 6)
+        self.assertAlmostEqual(converted_values[2], 0.9144, 6)
+
+    def test_convert_values_with_offset(self):
+        converted_values = convert_values((491.67, 0.0),
+                                          RANKINE_TO_KELVIN,
+                                          RANKINE_TO_KELVIN_OFFSET)
+
+        self.assertAlmostEqual(converted_values[0], 273.15, 6)
+        self.assertAlmostEqual(converted_values[1], 0.0, 6)
+
+    @skipUnless(numpy, "numpy is not installed")
+    def test_convert_numpy_array(self):
+        values = numpy.array([1.0, 2.0, 3.0])
+
+        converted_values = convert_values(values, FEET_TO_METERS)
+
+        self.assertIsInstance(converted_values, numpy.ndarray)
+        for value, converted_value in zip(values, converted_values):
+            expected_value = (value * ur.foot).to(ur.meter).magnitude
+            self.assertAlmostEqual(converted_value, expected_value, 6)
@@ -0,0 +1,147 @@
+"""
+Measure the time needed to read every field of the fdm wrappers.
+
+The results can be saved in json format and compared with the results of
+another run, for example one that was executed on an older version of
+Huginn.
+
+    python fdm_accessor_benchmark.py --output before.json
+    python fdm_accessor_benchmark.py --compare before.json
+"""
+
+
+from argparse import ArgumentParser
+import json
+import timeit
+
+from huginn import configuration
+from huginn.fdm import (FDMBuilder, FDM, Accelerations, Velocities, Position,
+                        Orientation, Atmosphere, Forces, AccelerationsState,
+                        VelocitiesState, PositionState, OrientationState,
+                        AtmosphereState, ForcesState)
+
+
+WRAPPERS = [
+    ("accelerations", Accelerations, AccelerationsState),
+    ("velocities", Velocities, VelocitiesState),
+    ("position", Position, PositionState),
+    ("orientation", Orientation, OrientationState),
+    ("atmosphere", Atmosphere, AtmosphereState),
+    ("forces", Forces, ForcesState)
+]
+
+
+def measure(function, number, repeat):
+    """Returns the fastest time in microseconds that a call to the function
+    needed"""
+    timer = timeit.Timer(function)
+
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def measure_fields(fdmexec, number, repeat):
+    """Returns the access time of every field of the fdm wrappers"""
+    results = {}
+
+    for name, wrapper_class, state_class in WRAPPERS:
+        wrapper = wrapper_class(fdmexec)
+
+        for field in state_class._fields:
+            # bind the loop variables so every timer reads its own field
+            def read_field(wrapper=wrapper, field=field):
+                return getattr(wrapper, field)
+
+            results["%s.%s" % (name, field)] = measure(read_field, number,
+                                                       repeat)
+
+    return results
+
+
+def run_benchmark(number, repeat):
+    """Execute the benchmark and return the results"""
+    fdmexec = FDMBuilder(configuration.get_data_path()).create_fdm()
+    fdm = FDM(fdmexec)
+
+    fields = measure_fields(fdmexec, number, repeat)
+
+    return {
+        "fields": fields,
+        "field_average": sum(fields.values()) / len(fields),
+        "get_state": measure(fdm.get_state, number // 10 or 1, repeat),
+        "create_wrappers": measure(lambda: FDM(fdmexec), number // 10 or 1,
+                                   repeat)
+    }
+
+
+def print_results(results, previous_results=None):
+    """Print the benchmark results and the speedup compared to the previous
+    results"""
+    def print_row(name, value, previous_value):
+        if previous_value is None:
+            print("%-36s %10.3f" % (name, value))
+        else:
+            print("%-36s %10.3f %10.3f %8.2fx" % (
+                name, previous_value, value, previous_value / value))
+
+    if previous_results is None:
+        print("%-36s %10s" % ("field", "time (us)"))
+        previous_fields = {}
+    else:
+        print("%-36s %10s %10s %9s" % ("field", "before (us)", "after (us)",
+                                       "speedup"))
+        previous_fields = previous_results["fields"]
+
+    for name in sorted(results["fields"]):
+        print_row(name, results["fields"][name], previous_fields.get(name))
+
+    print("")
+
+    for name in ["field_average", "get_state", "create_wrappers"]:
+        previous_value = None
+
+        if previous_results is not None:
+            previous_value = previous_results.get(name)
+
+        print_row(name, results[name], previous_value)
+
+
+def get_arguments():
+    parser = ArgumentParser(description="Measure the access time of the fdm "
+                                        "wrapper fields")
+
+    parser.add_argument("--number", action="store", type=int, default=10000,
+                        help="the number of times every field is read in a "
+                             "measurement")
+
+    parser.add_argument("--repeat", action="store", type=int, default=5,
+                        help="the number of measurements")
+
+    parser.add_argument("--output", action="store",
+                        help="save the results in this json file")
+
+    parser.add_argument("--compare", action="store",
+                        help="compare with the results in this json file")
+
+    return parser.parse_args()
+
+
+def main():
+    args = get_arguments()
+
+    results = run_benchmark(args.number, args.repeat)
+
+    previous_results = None
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous_results = json.load(f)
+
+    print_results(results, previous_results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Measure the overhead of the Huginn code that runs in every simulation step
+and in every client request.
+
+The benchmark uses the bundled Rascal model and doesn't need a running
+simulator. The results can be saved in json format and compared with the
+results of another commit.
+
+    python hot_path_benchmark.py --output before.json
+    python hot_path_benchmark.py --compare before.json --max-regression 0.1
+"""
+
+
+from argparse import ArgumentParser
+from datetime import datetime
+import json
+import platform
+import subprocess
+import timeit
+
+from huginn import configuration
+from huginn.simulator import SimulationBuilder
+
+from fdm_accessor_benchmark import measure_fields
+
+
+class WebSocketFactory(object):
+    """The factory object that the websocket protocol reads the simulator
+    from"""
+    def __init__(self, simulator):
+        self.simulator = simulator
+
+
+def measure(function, number, repeat):
+    """Returns the fastest time in microseconds that a call to the function
+    needed"""
+    timer = timeit.Timer(function)
+
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def create_simulator():
+    """Create a trimmed simulator that uses the default Rascal model"""
+    simulator_builder = SimulationBuilder(configuration.get_data_path())
+
+    simulator = simulator_builder.create_simulator()
+
+    # the simulator is paused so that the client benchmarks don't depend on
+    # the steps executed by the step benchmark
+    simulator.pause()
+
+    return simulator
+
+
+def benchmark_simulator_step(simulator, number, repeat):
+    return measure(simulator.step, number, repeat)
+
+
+def benchmark_sensors(simulator, number, repeat):
+    sensors = simulator.aircraft.sensors
+    accelerometer = sensors.accelerometer
+    scheduler = simulator.sensor_scheduler
+    simulation_time = simulator.simulation_time
+
+    return {
+        "accelerometer_x": measure(lambda: accelerometer.x, number, repeat),
+        "sensors_state": measure(sensors.get_state, number // 10 or 1,
+                                 repeat),
+        "sensor_scheduler_tick": measure(
+            lambda: scheduler.tick(simulation_time), number, repeat)
+    }
+
+
+class DiscardTransport(object):
+    """A transport that discards the datagrams"""
+    def write(self, datagram, address):
+        pass
+
+
+def benchmark_simulator_data(simulator, number, repeat):
+    from huginn.protocols import SimulatorDataProtocol, SimulatorDataPublisher
+    from huginn.telemetry import TelemetryEncoder
+
+    protocol = SimulatorDataProtocol(simulator, "127.0.0.1",
+                                     configuration.FDM_CLIENT_PORT)
+
+    def encode():
+        return protocol.get_simulator_data().SerializeToString()
+
+    # the simulator is paused, so the publisher encodes the simulator data
+    # only once and this measures the cost of sending them to the clients
+    publisher = SimulatorDataPublisher(simulator)
+    publisher.transport = DiscardTransport()
+
+    for port in range(configuration.FDM_CLIENT_PORT,
+                      configuration.FDM_CLIENT_PORT + 4):
+        publisher.add_subscriber("127.0.0.1", port)
+
+    # the simulator is paused, so after the keyframe the delta frames don't
+    # contain any values and this measures the cost of the comparisons
+    encoder = TelemetryEncoder()
+    simulator_data = protocol.get_simulator_data()
+    keyframe_size = len(encoder.encode(simulator_data).SerializeToString())
+
+    def delta_encode():
+        return encoder.encode(simulator_data).SerializeToString()
+
+    return {
+        "simulator_data_encode": measure(encode, number // 10 or 1, repeat),
+        "simulator_data_size": len(encode()),
+        "simulator_data_publish": measure(publisher.publish, number, repeat),
+        "telemetry_delta_encode": measure(delta_encode, number // 10 or 1,
+                                          repeat),
+        "telemetry_keyframe_size": keyframe_size
+    }
+
+
+def benchmark_sensor_data(simulator, number, repeat):
+    from huginn.protobuf import fdm_pb2
+    from huginn.protocols import SensorDataFactory
+
+    factory = SensorDataFactory(simulator.aircraft)
+    protocol = factory.buildProtocol(("127.0.0.1", configuration.SENSORS_PORT))
+
+    # the responses are discarded because there isn't a connected client
+    protocol.send_response_string = lambda response_string: None
+
+    sensor_data_request = fdm_pb2.SensorDataRequest()
+    sensor_data_request.type = fdm_pb2.BATCH_REQUEST
+    sensor_data_request.types.extend([fdm_pb2.GPS_REQUEST,
+                                      fdm_pb2.ACCELEROMETER_REQUEST,
+                                      fdm_pb2.GYROSCOPE_REQUEST,
+                                      fdm_pb2.INS_REQUEST])
+    request_string = sensor_data_request.SerializeToString()
+
+    return {
+        "sensor_data_batch_request": measure(
+            lambda: protocol.stringReceived(request_string),
+            number // 10 or 1, repeat)
+    }
+
+
+def benchmark_rest(simulator, number, repeat):
+    from flask import Flask
+    from flask_restful import Api
+
+    from huginn.rest import FDMResource, AccelerationsResource
+
+    fdm_resource = FDMResource(simulator)
+    accelerations_resource = AccelerationsResource(simulator)
+
+    app = Flask(__name__)
+    api = Api(app)
+    api.add_resource(FDMResource, "/fdm",
+                     resource_class_args=(simulator,))
+
+    client = app.test_client()
+
+    return {
+        "fdm_resource_get": measure(fdm_resource.get, number, repeat),
+        "fdm_resource_request": measure(lambda: client.get("/fdm"),
+                                        number // 100 or 1, repeat),
+        "object_resource_dump": measure(accelerations_resource.get,
+                                        number // 10 or 1, repeat)
+    }
+
+
+def benchmark_websocket(simulator, number, repeat):
+    from huginn.http import SimulatorDataWebSocketProtocol
+
+    protocol = SimulatorDataWebSocketProtocol()
+    protocol.factory = WebSocketFactory(simulator)
+
+    # the messages are discarded because there isn't a connected client
+    protocol.sendMessage = lambda payload, isBinary: None
+
+    return {
+        "websocket_send_flight_data": measure(protocol.send_flight_data,
+                                              number, repeat)
+    }
+
+
+def get_commit():
+    """Returns the current git commit or None if it isn't available"""
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "HEAD"],
+                                         stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode("utf8").strip()
+
+
+def run_benchmark(number, repeat):
+    """Execute the benchmarks and return the results"""
+    simulator = create_simulator()
+
+    results = {}
+
+    results.update(benchmark_sensors(simulator, number, repeat))
+    results.update(benchmark_simulator_data(simulator, number, repeat))
+    results.update(benchmark_sensor_data(simulator, number, repeat))
+    results.update(benchmark_rest(simulator, number, repeat))
+    results.update(benchmark_websocket(simulator, number, repeat))
+
+    fields = measure_fields(simulator.fdmexec, number, repeat)
+    results["fdm_field_average"] = sum(fields.values()) / len(fields)
+
+    simulator.resume()
+
+    step_time = benchmark_simulator_step(simulator, number // 10 or 1,
+                                         repeat)
+
+    results["simulator_step"] = step_time
+    results["simulator_steps_per_second"] = 1e6 / step_time
+
+    return {
+        "commit": get_commit(),
+        "date": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "number": number,
+        "repeat": repeat,
+        "results": results,
+        "fdm_fields": fields
+    }
+
+
+# the results that are not times, so a larger value isn't a regression
+NON_TIME_RESULTS = ["simulator_data_size", "simulator_steps_per_second",
+                    "telemetry_keyframe_size"]
+
+
+def find_regressions(results, previous_results, max_regression):
+    """Returns the names of the benchmarks that are slower than the previous
+    results by more than the given fraction"""
+    regressions = []
+
+    for name, value in results["results"].items():
+        previous_value = previous_results["results"].get(name)
+
+        if previous_value is None or name in NON_TIME_RESULTS:
+            continue
+
+        if value > previous_value * (1.0 + max_regression):
+            regressions.append(name)
+
+    return sorted(regressions)
+
+
+def print_results(results, previous_results=None):
+    """Print the benchmark results and the change compared to the previous
+    results"""
+    if previous_results is None:
+        print("%-32s %12s" % ("benchmark", "value"))
+    else:
+        print("%-32s %12s %12s %8s" % ("benchmark", "before", "after",
+                                       "change"))
+
+    for name in sorted(results["results"]):
+        value = results["results"][name]
+
+        previous_value = None
+        if previous_results is not None:
+            previous_value = previous_results["results"].get(name)
+
+        if previous_value is None:
+            print("%-32s %12.3f" % (name, value))
+        else:
+            change = (value - previous_value) / previous_value * 100.0
+
+            print("%-32s %12.3f %12.3f %+7.1f%%" % (name, previous_value,
+                                                    value, change))
+
+
+def get_arguments():
+    parser = ArgumentParser(description="Measure the overhead of the Huginn "
+                                        "hot paths")
+
+    parser.add_argument("--number", action="store", type=int, default=10000,
+                        help="the number of calls in every measurement")
+
+    parser.add_argument("--repeat", action="store", type=int, default=5,
+                        help="the number of measurements")
+
+    parser.add_argument("--output", action="store",
+                        help="save the results in this json file")
+
+    parser.add_argument("--compare", action="store",
+                        help="compare with the results in this json file")
+
+    parser.add_argument("--max-regression", action="store", type=float,
+                        help="exit with an error if a benchmark is slower "
+                             "than the compared results by more than this "
+                             "fraction")
+
+    return parser.parse_args()
+
+
+def main():
+    args = get_arguments()
+
+    results = run_benchmark(args.number, args.repeat)
+
+    previous_results = None
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous_results = json.load(f)
+
+    print_results(results, previous_results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+
+    if previous_results is not None and args.max_regression is not None:
+        regressions = find_regressions(results, previous_results,
+                                       args.max_regression)
+
+        if regressions:
+            print("")
+            print("regressions: %s" % ", ".join(regressions))
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
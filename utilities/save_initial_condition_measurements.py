@@ -1,6 +1,7 @@
-from huginn.fdm import FDMBuilder
+from huginn.fdm import FDMBuilder, PropertyReader
 from huginn import configuration
 
+
 def main():
     huginn_data_path = configuration.get_data_path()
 
@@ -8,12 +9,18 @@ def main():
     fdm_builder.aircraft = "Rascal"
     fdmexec = fdm_builder.create_fdm()
 
-    with open("fdm_properties.txt", "r") as f, open("fdm_property_values.txt", "w") as o:
-        for line in f:
-            property_name = line.strip()
-            property_value = fdmexec.GetPropertyValue(property_name)
+    with open("fdm_properties.txt", "r") as f:
+        property_names = [line.strip() for line in f if line.strip()]
+
+    property_reader = PropertyReader(fdmexec, property_names)
+    property_values = property_reader.read()
+
+    with open("fdm_property_values.txt", "w") as o:
+        for property_name, property_value in zip(property_names,
+                                                 property_values):
             print("%s\t%f" % (property_name, property_value))
             o.write("%s\t%f\n" % (property_name, property_value))
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,180 @@
+"""
+Measure the time that the Huginn command line tools need to start.
+
+Every entry point module is imported in a new python interpreter and the
+import time is reported together with the heavy dependencies that were
+loaded. The time needed to load the flight dynamics model and to create a
+trimmed simulator is also reported.
+"""
+
+
+from argparse import ArgumentParser
+import json
+import subprocess
+import sys
+
+
+ENTRY_POINTS = [
+    "huginn.cli.huginn_start",
+    "huginn.cli.huginn_control",
+    "huginn.cli.huginn_record",
+    "huginn.cli.huginn_data",
+    "huginn.cli.huginn_waypoints",
+    "huginn.cli.huginn_batch",
+    "huginn.cli.huginn_montecarlo"
+]
+
+HEAVY_MODULES = ["PyJSBSim", "pint", "flask", "flask_restful", "autobahn",
+                 "tinydb", "marshmallow", "twisted", "google.protobuf",
+                 "pkg_resources"]
+
+IMPORT_BENCHMARK = """
+import json
+import sys
+import time
+
+start = time.time()
+import %(module)s
+elapsed = time.time() - start
+
+print(json.dumps({
+    "time": elapsed,
+    "modules": [name for name in %(heavy_modules)r if name in sys.modules]
+}))
+"""
+
+MODEL_LOAD_BENCHMARK = """
+import json
+import time
+
+from huginn import configuration
+from huginn.fdm import FDMBuilder
+from huginn.simulator import SimulationBuilder
+
+data_path = configuration.get_data_path()
+
+start = time.time()
+FDMBuilder(data_path).create_fdm()
+fdm_time = time.time() - start
+
+start = time.time()
+SimulationBuilder(data_path).create_simulator()
+simulator_time = time.time() - start
+
+print(json.dumps({"fdm": fdm_time, "simulator": simulator_time}))
+"""
+
+
+def run_benchmark(code):
+    """Execute the benchmark code in a new python interpreter and return
+    the results that it printed"""
+    output = subprocess.check_output([sys.executable, "-c", code])
+
+    return json.loads(output.decode("utf8").strip().splitlines()[-1])
+
+
+def measure_import_time(module, repeat):
+    """Import the module in a new interpreter and return the fastest import
+    time and the heavy modules that were loaded"""
+    code = IMPORT_BENCHMARK % {"module": module,
+                               "heavy_modules": HEAVY_MODULES}
+
+    results = [run_benchmark(code) for _ in range(repeat)]
+
+    return {
+        "time": min([result["time"] for result in results]),
+        "modules": results[0]["modules"]
+    }
+
+
+def measure_model_load_time(repeat):
+    """Returns the fastest time needed to load the flight dynamics model and
+    to create a trimmed simulator"""
+    results = [run_benchmark(MODEL_LOAD_BENCHMARK) for _ in range(repeat)]
+
+    return {
+        "fdm": min([result["fdm"] for result in results]),
+        "simulator": min([result["simulator"] for result in results])
+    }
+
+
+def get_arguments():
+    parser = ArgumentParser(description="Measure the startup time of the "
+                                        "Huginn tools")
+
+    parser.add_argument("--repeat", action="store", type=int, default=5,
+                        help="the number of times every measurement will be "
+                             "repeated")
+
+    parser.add_argument("--budget", action="store", type=float,
+                        help="the maximum import time in seconds of every "
+                             "entry point")
+
+    parser.add_argument("--skip-model", action="store_true",
+                        help="don't measure the model load time")
+
+    parser.add_argument("--json", action="store_true",
+                        help="print the results in json format")
+
+    return parser.parse_args()
+
+
+def main():
+    args = get_arguments()
+
+    results = {"entry_points": {}}
+
+    for module in ENTRY_POINTS:
+        try:
+            results["entry_points"][module] = measure_import_time(
+                module, args.repeat)
+        except subprocess.CalledProcessError:
+            results["entry_points"][module] = {"time": None,
+                                               "modules": [],
+                                               "error": True}
+
+    if not args.skip_model:
+        results["model"] = measure_model_load_time(args.repeat)
+
+    over_budget = []
+
+    if args.budget is not None:
+        over_budget = [module
+                       for module, result in results["entry_points"].items()
+                       if result["time"] is None or
+                       result["time"] > args.budget]
+
+        results["budget"] = args.budget
+        results["over_budget"] = over_budget
+
+    if args.json:
+        print(json.dumps(results, indent=4, sort_keys=True))
+    else:
+        print("%-32s %10s  %s" % ("entry point", "import (s)", "modules"))
+
+        for module in ENTRY_POINTS:
+            result = results["entry_points"][module]
+
+            if result["time"] is None:
+                print("%-32s %10s" % (module, "failed"))
+            else:
+                print("%-32s %10.3f  %s" % (module, result["time"],
+                                            ", ".join(result["modules"])))
+
+        if "model" in results:
+            print("")
+            print("fdm load time: %.3f seconds" % results["model"]["fdm"])
+            print("simulator creation time: %.3f seconds" %
+                  results["model"]["simulator"])
+
+        if over_budget:
+            print("")
+            print("over the %.3f seconds budget: %s" % (
+                args.budget, ", ".join(over_budget)))
+
+    if over_budget:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()